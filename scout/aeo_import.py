@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Stream and cache imports of EIA AEO delimited data files
+
+The residential and commercial baseline data modules read several large
+delimited AEO output files (e.g., RDM_DBOUT, KDBOUT, KSDOUT, ktek) into
+numpy structured arrays, row by row. This module provides the pieces those
+imports share: a line stream that removes NULL characters (present in some
+AEO files) as each line is read, rather than after reading the full file
+into memory to test for them; and a cache that stores each imported array
+as a '.npy' file keyed by a hash of the source file's contents and the
+import settings, such that repeat baseline builds load the arrays directly
+instead of parsing the files again. The source file hashes are in turn
+indexed by file size and modification time, such that unchanged files are
+not read in full to check the cache.
+"""
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+import numpy
+
+
+def strip_nulls(lines):
+    """Remove NULL characters from lines of text as they are read.
+
+    Args:
+        lines (iterable): Lines of text (e.g., an open file).
+
+    Yields:
+        Each line with any NULL characters removed.
+    """
+    for line in lines:
+        yield line.replace('\0', '')
+
+
+def file_hash(fpath, chunk_size=1 << 20):
+    """Find the checksum of a file's contents, reading it in chunks.
+
+    Args:
+        fpath (Path): Path of the file.
+        chunk_size (int): Number of bytes read at a time.
+
+    Returns:
+        SHA-256 hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(fpath, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImportCache(object):
+    """Cache of structured arrays imported from AEO data files.
+
+    Attributes:
+        cache_dir (Path): Folder in which cached arrays are stored.
+        parsers (list): Modules defining parsers that the import functions
+            draw on, beyond this module and the modules of the import
+            functions themselves.
+        file_hashes_path (Path): Index of previously computed file checksums,
+            keyed by file path.
+        file_hashes (dict): File checksums by file path, along with the file
+            sizes and modification times used to reuse the checksums.
+    """
+
+    def __init__(self, cache_dir, parsers=()):
+        self.cache_dir = Path(cache_dir)
+        self.parsers = list(parsers)
+        self.file_hashes_path = self.cache_dir / "file_hashes.json"
+        try:
+            with open(self.file_hashes_path, "r") as handle:
+                self.file_hashes = json.load(handle)
+        except (OSError, ValueError):
+            self.file_hashes = {}
+
+    def load(self, fpath, import_func, *args):
+        """Import a data file, or load the array previously imported from it.
+
+        Note:
+            Cached arrays are keyed on the data file's location and
+            contents, the import function and its arguments, and the code of
+            the modules defining the import function and the parsers it draws
+            on, such that a change to any of these leads to the file being
+            imported again. Once imported again, the array cached from the
+            previous version of the file or code is removed.
+
+        Args:
+            fpath (Path): Path of the data file.
+            import_func (function): Function that imports the data file to a
+                numpy structured array, given the file path and 'args'.
+            args: Further arguments to 'import_func'.
+
+        Returns:
+            numpy.ndarray: Data imported from the file.
+        """
+        fpath = Path(fpath)
+        prev_hashes = dict(self.file_hashes)
+        cache_path = self.cache_path(fpath, import_func, *args)
+        if self.file_hashes != prev_hashes:
+            self.save()
+        try:
+            return numpy.load(cache_path, allow_pickle=False)
+        except (FileNotFoundError, ValueError, EOFError):
+            pass
+        data = import_func(fpath, *args)
+        # Write the array under a temporary name first, such that an
+        # interrupted write does not leave a partial array to be loaded
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as handle:
+                numpy.save(handle, data, allow_pickle=False)
+            tmp_path.replace(cache_path)
+        # Use the imported data directly if they cannot be cached
+        except (OSError, ValueError):
+            pass
+        else:
+            self.remove_stale(cache_path)
+        return data
+
+    def cache_path(self, fpath, import_func, *args):
+        """Find the location of the cached array for an imported data file.
+
+        Args:
+            fpath (Path): Path of the data file.
+            import_func (function): Function that imports the data file.
+            args: Further arguments to 'import_func'.
+
+        Returns:
+            Path of the cached array, named for the data file, an identifier
+            of the file's location and import settings, and a key for the
+            versions of the file and the import code.
+        """
+        code_files = sorted(set(x for x in [
+            getattr(sys.modules.get(import_func.__module__), "__file__",
+                    None), __file__] + [
+            getattr(x, "__file__", None) for x in self.parsers] if x))
+        src_id, key = [hashlib.sha256(str(x).encode("utf-8")).hexdigest()[
+            :16] for x in [
+                [str(fpath.resolve()), import_func.__module__,
+                 import_func.__qualname__, repr(args)],
+                [self.file_hash(fpath)] + [
+                    self.file_hash(x) for x in code_files]]]
+        return self.cache_dir / (
+            fpath.name + "-" + src_id + "-" + key + ".npy")
+
+    def file_hash(self, fpath):
+        """Find the checksum of a file, reusing a previous checksum when the
+        file's size and modification time are unchanged.
+
+        Args:
+            fpath (Path): Path of the file.
+
+        Returns:
+            SHA-256 hex digest of the file contents.
+        """
+        f_stat = os.stat(fpath)
+        f_id = [f_stat.st_size, f_stat.st_mtime_ns]
+        f_key = str(Path(fpath).resolve())
+        if f_key in self.file_hashes and self.file_hashes[f_key][:2] == f_id:
+            return self.file_hashes[f_key][2]
+        self.file_hashes[f_key] = f_id + [file_hash(fpath)]
+        return self.file_hashes[f_key][2]
+
+    def save(self):
+        """Write out the index of file checksums.
+
+        Note:
+            The index is left as is if it cannot be written, in which case
+            the checksums are computed again in later runs.
+        """
+        tmp_path = self.file_hashes_path.with_name(
+            self.file_hashes_path.name + ".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as handle:
+                json.dump(self.file_hashes, handle, indent=2)
+            tmp_path.replace(self.file_hashes_path)
+        except OSError:
+            pass
+
+    def remove_stale(self, cache_path):
+        """Remove arrays cached from previous versions of a file or its code.
+
+        Note:
+            Arrays that cannot be removed (e.g., because another process has
+            them open on a platform that does not allow the removal of open
+            files) are left in place.
+
+        Args:
+            cache_path (Path): Path of the current cached array.
+        """
+        # Arrays cached for the same file and import settings share the
+        # part of the name that identifies them
+        prefix = cache_path.name.rsplit("-", 1)[0] + "-"
+        for stale_path in self.cache_dir.iterdir():
+            if stale_path.name.startswith(prefix) and stale_path != \
+                    cache_path and stale_path.suffix == ".npy":
+                try:
+                    stale_path.unlink()
+                except OSError:
+                    pass
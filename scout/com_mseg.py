@@ -5,9 +5,14 @@ import numpy.lib.recfunctions as recfn
 import re
 import csv
 import json
-import io
 from functools import reduce
+from scout.aeo_import import ImportCache, strip_nulls
 from scout.config import FilePaths as fp
+from scout.mseg import GroupedIndex
+
+# Columns by which the commercial building data are indexed, in the order
+# of the values used to select data for each microsegment
+catg_index_cols = ['Label', 'Division', 'BldgType', 'EndUse', 'Fuel']
 
 
 class EIAData(object):
@@ -272,6 +277,178 @@ def json_interpreter(key_series):
     return interpreted_values
 
 
+def sd_tech_name(description, lighting=False):
+    """Find the generalized technology name for a service demand description.
+
+    Technology names are found using a regex search of the 'Description'
+    field in the service demand data, which removes any text describing
+    the vintage or efficiency level of the technology (e.g., '2003
+    installed base'). For lighting, modifier text is also dropped from
+    the names of linear fluorescent bulb types (e.g., 'T8 F32 Commodity'
+    becomes 'T8 F32').
+
+    Args:
+        description (str): Technology description from the service
+            demand data.
+        lighting (bool): True if the description is for a lighting
+            technology.
+
+    Returns:
+        The technology name, or None if the description is for a
+        placeholder or empty row that should be removed from the data.
+    """
+
+    # Identify the technology name from the 'Description' column in
+    # the data using a regex set up to match any text '.+?' that
+    # appears before the first occurrence of one or more spaces
+    # followed by a 2 and three other numbers (i.e., 2009 or 2035)
+    tech_name = re.search(r'.+?(?=\s+2[0-9]{3})', description)
+
+    # Also check the special case where the technology name is so
+    # long that the year number is partially truncated at the end
+    # of the string
+    exc_tech_name = re.search(r'.+?(?=\s+2[0-9]{1,2}$)', description)
+
+    # If the regex matched, use the matching text, which describes the
+    # technology without scenario-specific text like '2003 installed base'
+    if tech_name:
+        name = tech_name.group(0)
+    # Else check to see if the description indicates a placeholder
+    # row or is an empty string, which should be deleted before the
+    # technologies are summarized
+    elif re.search('placeholder', description) or \
+            re.search(r'^(?![\s\S])', description):
+        return None
+    # Else check for a special case where the year in the technology
+    # name sought by the tech_name regex didn't match because the year
+    # in the name is partially truncated at the end of the string
+    elif exc_tech_name:
+        name = exc_tech_name.group(0)
+    # Implicitly, if the text does not match either regex, it is
+    # assumed that it does not need to be edited or removed
+    else:
+        name = description
+
+    # Special filtering for lighting to identify linear fluorescent types
+    if lighting:
+        lf_name = re.search('^(T[0-9] F[0-9]{2})', name)
+        if lf_name:
+            name = lf_name.group(0)
+
+    return name
+
+
+class ServiceDemandShares(object):
+    """Technology service demand and energy shares for all microsegments.
+
+    The service demand data are summed by census division, building
+    type, end use, fuel type, and technology in a single pass over the
+    data, and the fractional contribution of each technology to the
+    energy use in each microsegment is calculated for all technologies
+    and microsegments at once. Obtaining the data for a microsegment is
+    then a dict lookup and a slice of the grouped results, rather than a
+    filtering and regrouping of the service demand data for each node
+    in the microsegments JSON.
+
+    Attributes:
+        tval (numpy.ndarray): Service demand for each technology (row)
+            in each year (column), with rows sorted by microsegment and
+            then technology name.
+        tval_pct (numpy.ndarray): Fractional contribution to the energy
+            use in the microsegment from each technology in each year.
+        technames (list): Technology names (truncated to 43 characters)
+            corresponding to the rows of 'tval' and 'tval_pct'.
+        blocks (dict): The start and end rows for each microsegment,
+            keyed by census division, building type, end use, and fuel
+            type numbers.
+    """
+
+    def __init__(self, sd_array, yrs):
+        # Convert the years list from a list of integers to a list of strings
+        yrs = [str(yr) for yr in yrs]
+
+        # Find the technology names for each unique description (and
+        # end use, since lighting names are handled differently), which
+        # is much faster than searching the description of every row
+        light = CommercialTranslationDicts().endusedict['lighting']
+        descs, desc_idx = np.unique(
+            np.rec.fromarrays([sd_array['Description'], sd_array['s'] == light]),
+            return_inverse=True)
+        desc_names = [sd_tech_name(desc, lighting)
+                      for desc, lighting in descs.tolist()]
+        keep = np.array([name is not None for name in desc_names],
+                        dtype=bool)[desc_idx.reshape(-1)]
+        names = np.array([name or '' for name in desc_names],
+                         dtype=sd_array['Description'].dtype)[
+                            desc_idx.reshape(-1)][keep]
+        sd_array = sd_array[keep]
+
+        # Combine integer codes for each microsegment and technology name
+        # into a single code for each row that sorts as those keys would
+        codes = np.zeros(len(sd_array), dtype='i8')
+        for col in [sd_array['r'], sd_array['b'], sd_array['s'],
+                    sd_array['f'], names]:
+            vals, col_codes = np.unique(col, return_inverse=True)
+            codes = codes * max(len(vals), 1) + col_codes.reshape(-1)
+        group_codes, group_idx, group_rows = np.unique(
+            codes, return_index=True, return_inverse=True)
+        group_rows = group_rows.reshape(-1)
+
+        # Sum the service demand, and the service demand weighted by the
+        # equipment efficiency, over the rows for each technology (note
+        # that the recfn module introduces the structured_to_unstructured
+        # function to convert the structured array into a standard numpy
+        # array, which allows the use of arithmetic across years)
+        sd_vals = recfn.structured_to_unstructured(sd_array[yrs], dtype='<f8')
+        self.tval, self.tval_pct = (
+            np.zeros((len(group_codes), len(yrs))) for n in range(2))
+        np.add.at(self.tval, group_rows, sd_vals)
+        np.add.at(self.tval_pct, group_rows,
+                  sd_vals / sd_array['Eff'][:, np.newaxis])
+
+        # Identify the rows for each microsegment, which are contiguous
+        # since the rows are sorted by microsegment and then technology
+        mseg_keys = sd_array[['r', 'b', 's', 'f']][group_idx].tolist()
+        starts = [idx for idx in range(len(mseg_keys))
+                  if idx == 0 or mseg_keys[idx] != mseg_keys[idx - 1]]
+        ends = starts[1:] + [len(mseg_keys)]
+        self.blocks = {mseg_keys[start]: (start, end)
+                       for start, end in zip(starts, ends)}
+
+        # Where at least one technology in a microsegment has non-zero
+        # service demand, suppress any divide by zero warnings and
+        # calculate the percentage contribution of each technology by
+        # year (since tval_pct is initially a measure of absolute energy
+        # service weighted by equipment efficiency)
+        for start, end in self.blocks.values():
+            mseg_pct = self.tval_pct[start:end]
+            if mseg_pct.any():
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    mseg_pct = mseg_pct / np.sum(mseg_pct, axis=0)
+                    # Replace nan from 0/0 with 0
+                    self.tval_pct[start:end] = np.nan_to_num(mseg_pct)
+
+        # Truncate the technology names to 43 characters to match the
+        # truncated strings used for the cost, performance, and lifetime data
+        self.technames = [name[:43] for name in names[group_idx].tolist()]
+
+    def select(self, sel):
+        """Select the technology data for a microsegment.
+
+        Args:
+            sel (list): A list of integers that specifies the desired
+                census division, building type, end use, and fuel type.
+
+        Returns:
+            The service demand and fractional contribution to energy use
+            for each technology (row in the arrays) in each year (column
+            in the arrays), and a list of the technology names.
+        """
+        start, end = self.blocks.get(tuple(sel[:4]), (0, 0))
+        return (self.tval[start:end], self.tval_pct[start:end],
+                self.technames[start:end])
+
+
 def sd_mseg_percent(sd_array, sel, yrs):
     """Calculate technology-specific fractions of energy use in a microsegment.
 
@@ -288,139 +465,35 @@ def sd_mseg_percent(sd_array, sel, yrs):
     where the end use has available service demand data.
 
     Args:
-        sd_array (numpy.ndarray): Service demand data for commercial
-            building equipment, specified by technology, building
-            vintage, performance level, and the other microsegment
-            parameters that appear in 'sel'.
+        sd_array (numpy.ndarray or ServiceDemandShares): Service demand
+            data for commercial building equipment, specified by
+            technology, building vintage, performance level, and the
+            other microsegment parameters that appear in 'sel', or
+            those data already grouped for all microsegments.
         sel (list): A list of integers that specifies the desired
             census division, building type, end use, and fuel type.
         yrs (list): A list of integers representing the range of years
             common to all of the AEO data, precalculated for speed.
 
     Returns:
-        A numpy array of the fractional contribution to energy in the
+        A numpy array of the absolute service demand and a numpy array
+        of the fractional contribution to energy in the
         specified microsegment from each technology (row in the array)
         for each year (column in the array) in 'yrs'. Also, a list of
         technology names in the same order as the rows in the numpy array.
     """
 
-    # Convert the years list from a list of integers to a list of strings
-    yrs = [str(yr) for yr in yrs]
-
     # Filter service demand data based on the specified census
-    # division, building type, end use, and fuel type
-    filtered = sd_array[np.all([sd_array['r'] == sel[0],
-                                sd_array['b'] == sel[1],
-                                sd_array['s'] == sel[2],
-                                sd_array['f'] == sel[3]], axis=0)]
-
-    # Initialize list of rows to remove from 'filtered' based on a
-    # regex search of the 'Description' text
-    rows_to_remove = []
-
-    # Replace technology descriptions in the array 'filtered' with
-    # generalized names, removing any text describing the vintage or
-    # efficiency level and preparing to delete placeholder rows
-    # (placeholder rows are in the data as imported)
-    for idx, row in enumerate(filtered):
-
-        # Identify the technology name from the 'Description' column in
-        # the data using a regex set up to match any text '.+?' that
-        # appears before the first occurrence of one or more spaces
-        # followed by a 2 and three other numbers (i.e., 2009 or 2035)
-        tech_name = re.search(r'.+?(?=\s+2[0-9]{3})', row['Description'])
-
-        # Also check the special case where the technology name is so
-        # long that the year number is partially truncated at the end
-        # of the string
-        exc_tech_name = re.search(
-            r'.+?(?=\s+2[0-9]{1,2}$)',
-            row['Description'])
-
-        # If the regex matched, overwrite the original description with
-        # the matching text, which describes the technology without
-        # scenario-specific text like '2003 installed base'
-        if tech_name:
-            filtered['Description'][idx] = tech_name.group(0)
-        # Else check to see if the description indicates a placeholder
-        # row, which should be deleted before the technologies are
-        # summarized and returned from this function
-        elif re.search('placeholder', row['Description']):
-            rows_to_remove.append(idx)
-        # Else check to see if the description is an empty string,
-        # and if so, add it to the list of rows to remove
-        elif re.search(r'^(?![\s\S])', row['Description']):
-            rows_to_remove.append(idx)
-        # Else check for a special case where the year in the
-        # technology name sought by the tech_name regex didn't match
-        # because the year in the name is partially truncated at
-        # the end of the technology name string
-        elif exc_tech_name:
-            filtered['Description'][idx] = exc_tech_name.group(0)
-        # Implicitly, if the text does not match either regex, it
-        # is assumed that it does not need to be edited or removed
-
-    # Delete the placeholder rows from the filtered array
-    filtered = np.delete(filtered, rows_to_remove, 0)
-
-    # Special filtering for lighting to drop special modifier text
-    # in the descriptions of linear fluorescent bulb types (e.g.,
-    # replace 'T8 F32 Commodity' with 'T8 F32') now that year
-    # details have been removed
-    if sel[2] == CommercialTranslationDicts().endusedict['lighting']:
-        for idx, row in enumerate(filtered):
-            # Identify linear fluorescent types
-            tech_name = re.search('^(T[0-9] F[0-9]{2})', row['Description'])
-            if tech_name:
-                filtered['Description'][idx] = tech_name.group(0)
-
-    # Because different technologies are sometimes coded with the same
-    # technology type number (especially in lighting, where lighting
-    # types are often differentiated by vintage and technology type
-    # numbers), technologies must be identified using the simplified
-    # names now recorded in the 'Description' field
-    technames = list(np.unique(filtered['Description']))
-
-    # Truncate the technology names to 43 characters to match the
-    # truncated strings used for the cost, performance, and lifetime data
-    trunc_technames = [entry[:43] for entry in technames]
-
-    # Set up numpy array to store restructured data, in which each row
-    # will correspond to a single technology
-    tval, tval_pct = (
-        np.zeros((len(trunc_technames), len(yrs))) for n in range(2))
-
-    # Combine the data recorded for each unique technology
-    for idx, name in enumerate(technames):
-
-        # Extract entries for a given technology type number
-        entries = filtered[filtered['Description'] == name]
-
-        # Calculate the sum of all year columns and write it to the
-        # appropriate row in the tval array (note that the recfn module
-        # introduces the structured_to_unstructured function to
-        # convert the structured array into a standard numpy array,
-        # which allows the use of the .sum() function)
-        tval[idx, ] = np.sum(recfn.structured_to_unstructured(
-            entries[yrs], dtype='<f8'), axis=0)
-
-        # Calculate the sum of all the year columns (service demand
-        # values) weighted by the equipment efficiency for each equipment
-        # type and performance level using the same recfn function used
-        # for the service demand array 'tval'
-        tval_pct[idx, ] = np.sum(recfn.structured_to_unstructured(
-            entries[yrs], dtype='<f8')/entries['Eff'][:, np.newaxis], axis=0)
-
-    # If at least one entry in tval_pct is non-zero (tval_pct.any() == True),
-    # suppress any divide by zero warnings and calculate the percentage
-    # contribution of each technology by year (since tval_pct is initially
-    # a measure of absolute energy service weighted by equipment efficiency)
-    if tval_pct.any():
-        with np.errstate(divide='ignore', invalid='ignore'):
-            tval_pct = tval_pct / np.sum(tval_pct, axis=0)
-            tval_pct = np.nan_to_num(tval_pct)  # Replace nan from 0/0 with 0
-
-    return (tval, tval_pct, trunc_technames)
+    # division, building type, end use, and fuel type, unless the
+    # data have already been grouped for all microsegments
+    if not isinstance(sd_array, ServiceDemandShares):
+        sd_array = ServiceDemandShares(
+            sd_array[np.all([sd_array['r'] == sel[0],
+                             sd_array['b'] == sel[1],
+                             sd_array['s'] == sel[2],
+                             sd_array['f'] == sel[3]], axis=0)], yrs)
+
+    return sd_array.select(sel)
 
 
 def catg_data_selector(db_array, sel, section_label, yrs):
@@ -434,10 +507,11 @@ def catg_data_selector(db_array, sel, section_label, yrs):
     if applicable, end use/MEL type, and fuel type.
 
     Args:
-        db_array (numpy.ndarray): An array of commercial building data,
-            including total energy use by end use/fuel type and all
-            MELs types, new and surviving square footage, and other
-            parameters.
+        db_array (numpy.ndarray or GroupedIndex): An array of commercial
+            building data, including total energy use by end use/fuel
+            type and all MELs types, new and surviving square footage,
+            and other parameters, or those data indexed by the columns
+            in 'catg_index_cols'.
         sel (list): A list of integers that specifies the desired
             census division, building type, end use, and fuel type.
         section_label (str): The name of the particular data to be extracted.
@@ -458,26 +532,21 @@ def catg_data_selector(db_array, sel, section_label, yrs):
     # Also separately handle other fuel types, which must be filtered
     # using a different method since multiple numeric indices for fuel type
     # are combined together
+    if not isinstance(db_array, GroupedIndex):
+        db_array = GroupedIndex(db_array, catg_index_cols)
     if 'SurvFloorTotal' in section_label or 'CMNewFloorSpace' in section_label:
-        filtered = db_array[np.all([db_array['Label'] == section_label,
-                                    db_array['Division'] == sel[0],
-                                    db_array['BldgType'] == sel[1]], axis=0)]
+        filtered = db_array.select(section_label, sel[0], sel[1])
     elif isinstance(sel[3], tuple):  # Tuple of fuel type codes present
-        filtered = db_array[np.all([db_array['Label'] == section_label,
-                                    db_array['Division'] == sel[0],
-                                    db_array['BldgType'] == sel[1],
-                                    db_array['EndUse'] == sel[2]], axis=0)]
+        filtered = db_array.select(section_label, sel[0], sel[1], sel[2])
         filtered = filtered[np.isin(filtered['Fuel'], sel[3])]
         # Sum over all fuel types selected
         tyr = np.unique(filtered['Year'])
         filtered = np.array([(i, filtered[filtered['Year'] == i]['Amount'].sum()) for i in tyr],
                             dtype=[('Year', 'i4'), ('Amount', 'f8')])
     else:
-        filtered = db_array[np.all([db_array['Label'] == section_label,
-                                    db_array['Division'] == sel[0],
-                                    db_array['BldgType'] == sel[1],
-                                    db_array['EndUse'] == sel[2],
-                                    db_array['Fuel'] == sel[3]], axis=0)]
+        # Copy the selected rows, which are otherwise a view of the
+        # indexed data, before the years are adjusted
+        filtered = db_array.select(section_label, *sel[:4]).copy()
 
     # Adjust years reported based on the pivot year
     filtered['Year'] = filtered['Year'] + UsefulVars().pivot_year
@@ -515,12 +584,13 @@ def data_handler(db_array, sd_array, load_array, key_series, sd_end_uses, yrs):
     TBTU (10^12 BTU) to MMBTU (10^6 BTU.)
 
     Args:
-        db_array (numpy.ndarray): An array of commercial building data,
-            including total energy use by end use/fuel type and all
-            MELs types, new and surviving square footage, and other
-            parameters.
-        sd_array (numpy.ndarray): Service demand data for commercial
-            building equipment, given by technology and performance level.
+        db_array (numpy.ndarray or GroupedIndex): An array of commercial
+            building data, including total energy use by end use/fuel
+            type and all MELs types, new and surviving square footage,
+            and other parameters, or those data indexed for selection.
+        sd_array (numpy.ndarray or ServiceDemandShares): Service demand
+            data for commercial building equipment, given by technology
+            and performance level, or those data grouped by microsegment.
         load_array (numpy.ndarray): Thermal load components data
             (i.e., energy exchange between buildings and their
             surroundings through walls, foundations, etc.) for
@@ -678,7 +748,8 @@ def walk(db_array, sd_array, load_array, sd_end_uses, json_db, years, key_list=[
     (formatted as a nested dict) to each leaf/terminal node in the
     structure, constructing a list of the applicable keys that define
     the location of the terminal node and then call the appropriate
-    functions to process the imported data. """
+    functions to process the imported data, which are provided already
+    indexed and grouped by microsegment. """
 
     # Explore data structure from current level
     for key, item in json_db.items():
@@ -867,22 +938,14 @@ def dtype_array(data_file_path, delim_char=',', hl=None):
     # Open the target CSV formatted data file
     with open(data_file_path) as thefile:
 
-        # Read the text file, handling two cases: (1) a file with
-        # NULL bytes and (2) a file with no NULL bytes. In the former
-        # case, the loop inside csv.reader is used to detect NULL
-        # characters and act appropriately (by removing them prior to
-        # converting to a csv.reader object) if they are encountered.
-        # The skipinitialspace option ensures proper reading of
+        # Read the text file, removing any NULL characters from each
+        # line as it is read, prior to parsing by csv.reader. The
+        # skipinitialspace option ensures proper reading of
         # double-quoted text strings in the AEO data that have the
         # delimiter inside them (e.g., cooking equipment descriptions).
-        if '\0' in open(data_file_path).read():  # NULL bytes detected
-            filecont = csv.reader((x.replace('\0', '') for x in thefile),
-                                  delimiter=delim_char, skipinitialspace=True,
-                                  escapechar='\\')
-        else:  # No NULL bytes, proceed normally
-            filecont = csv.reader(thefile,
-                                  delimiter=delim_char, skipinitialspace=True,
-                                  escapechar='\\')
+        filecont = csv.reader(strip_nulls(thefile),
+                              delimiter=delim_char, skipinitialspace=True,
+                              escapechar='\\')
 
         # Skip the specified number of extraneous leading lines in
         # the file that do not include the column headers
@@ -950,32 +1013,25 @@ def data_import(data_file_path, dtype_list, delim_char=',', hl=None, cols=[]):
 
     # Open the target CSV formatted data file
     with open(data_file_path) as thefile:
+        lines = thefile
         # For some cooking equipment descriptions in the service demand
         # data, 11 inches is encoded as 11", which by default leaves
         # the closing double-quote character in the description strings
         # while removing the " that denoted inches; by inserting an
-        # escape character before the " denoting inches, the text will
-        # be handled correctly by csv.reader
+        # escape character before the " denoting inches (in each line
+        # as it is read), the text will be handled correctly by csv.reader
         if re.match('.*SDOUT', re.escape(str(data_file_path))):
-            cont = thefile.read().replace('11"', '11\\"')
-            thefile = io.StringIO(cont)
+            lines = (x.replace('11"', '11\\"') for x in thefile)
 
         # This use of csv.reader assumes that the default setting of
         # quotechar '"' is appropriate; the skipinitialspace option
         # ensures proper reading of double-quoted text strings in the
         # AEO data that have the delimiter inside them (e.g., cooking
-        # equipment descriptions); the loop which csv.reader is called
-        # is used to detect NULL characters and act appropriately (by
-        # removing them prior to converting to a csv.reader object)
-        # if they are encountered
-        if '\0' in open(data_file_path).read():  # NULL bytes detected
-            filecont = csv.reader((x.replace('\0', '') for x in thefile),
-                                  delimiter=delim_char, skipinitialspace=True,
-                                  escapechar='\\')
-        else:  # No NULL bytes, proceed normally
-            filecont = csv.reader(thefile,
-                                  delimiter=delim_char, skipinitialspace=True,
-                                  escapechar='\\')
+        # equipment descriptions); any NULL characters are removed from
+        # each line as it is read, prior to parsing by csv.reader
+        filecont = csv.reader(strip_nulls(lines),
+                              delimiter=delim_char, skipinitialspace=True,
+                              escapechar='\\')
 
         # Create list to be populated with tuples of each row of data
         # from the data file
@@ -1031,6 +1087,21 @@ def data_import(data_file_path, dtype_list, delim_char=',', hl=None, cols=[]):
         return final_struct
 
 
+def eia_data_import(data_file_path, delim_char=','):
+    """Determine the data types of a data file and import it.
+
+    Args:
+        data_file_path (str): The full path to the data file to be imported.
+        delim_char (str, optional): The delimiting character, defaults to ','.
+
+    Returns:
+        A numpy structured array of the imported data file, with column
+        data types determined by dtype_array.
+    """
+    dtypes = dtype_array(data_file_path, delim_char)
+    return data_import(data_file_path, dtypes, delim_char)
+
+
 def str_cleaner(data_array, column_name, return_str_len=False):
     """Clean up formatting of technology description strings in imported data.
 
@@ -1277,19 +1348,21 @@ def main():
     handyvars = UsefulVars()
     eiadata = EIAData()
 
+    # Import data files via arrays cached from previous imports of the
+    # same files, where available
+    import_cache = ImportCache(fp.AEO_IMPORT_CACHE)
+
     # Import EIA AEO 'SDOUT' service demand file
-    serv_dtypes = dtype_array(eiadata.serv_dmd)
-    serv_data = data_import(eiadata.serv_dmd, serv_dtypes)
+    serv_data = import_cache.load(eiadata.serv_dmd, eia_data_import)
     serv_data = str_cleaner(serv_data, 'Description')
 
     # Import EIA AEO 'DBOUT' additional data file
-    catg_dtypes = dtype_array(eiadata.catg_dmd)
-    catg_data = data_import(eiadata.catg_dmd, catg_dtypes)
+    catg_data = import_cache.load(eiadata.catg_dmd, eia_data_import)
     catg_data = str_cleaner(catg_data, 'Label')
 
     # Import thermal loads data
-    load_dtypes = dtype_array(handyvars.com_tloads, '\t')
-    load_data = data_import(handyvars.com_tloads, load_dtypes, '\t')
+    load_data = import_cache.load(
+        handyvars.com_tloads, eia_data_import, '\t')
 
     # Import and process onsite generation from DGENOUT.txt
     onsite_gen = onsite_prep(eiadata.com_generation)
@@ -1307,6 +1380,13 @@ def main():
     # Define years vector using year data from metadata
     years = list(range(metajson['min year'], metajson['max year'] + 1))
 
+    # Index the commercial building data by section label and
+    # microsegment, and sum the service demand data by microsegment and
+    # technology, such that the data for each node in the microsegments
+    # JSON are obtained without filtering the full arrays
+    catg_index = GroupedIndex(catg_data, catg_index_cols)
+    serv_shares = ServiceDemandShares(serv_data, years)
+
     # Import empty microsegments JSON file and traverse database structure
     try:
         with open(handyvars.json_in, 'r') as jsi, open(handyvars.json_out,
@@ -1314,7 +1394,7 @@ def main():
             msjson = json.load(jsi)
 
             # Proceed recursively through database structure
-            result = walk(catg_data, serv_data, load_data,
+            result = walk(catg_index, serv_shares, load_data,
                           serv_data_end_uses, msjson, years)
 
             # Clean up double-counted unspecified and other energy use
@@ -11,6 +11,7 @@ import warnings
 import json
 import csv
 import itertools as it
+from scout.aeo_import import ImportCache
 from scout.config import FilePaths as fp
 
 
@@ -1063,6 +1064,26 @@ def kprem_import(data_file_path, dtype_list, hl):
         return final_struct
 
 
+def tech_data_import(data_file_path, skip_lines, wanted_cols):
+    """Import the columns of interest from the technology data file.
+
+    Args:
+        data_file_path (str): The full path to the ktek data file.
+        skip_lines (int): The number of lines of preamble that precede
+            the data in the file.
+        wanted_cols (list): A list of strings that represent the names of
+            the columns from the ktek data that should be kept.
+
+    Returns:
+        A numpy structured array of the technology cost, performance,
+        and lifetime data in the columns specified by 'wanted_cols'.
+    """
+    tech_dtypes = cm.dtype_array(data_file_path, ',', skip_lines - 1)
+    col_indices, tech_dtypes = dtype_reducer(tech_dtypes, wanted_cols)
+    return cm.data_import(data_file_path, tech_dtypes, ',', skip_lines,
+                          col_indices)
+
+
 def dtype_reducer(the_dtype, wanted_cols):
     """Remove extraneous columns from the dtype definition.
 
@@ -1136,30 +1157,30 @@ def main():
     handyvars = UsefulVars()
     eiadata = EIAData()
 
+    # Import data files via arrays cached from previous imports of the
+    # same files, where available (the technology data are imported with
+    # the parsers in com_mseg)
+    import_cache = ImportCache(fp.AEO_IMPORT_CACHE, [cm])
+
     # Import technology cost, performance, and lifetime data in
     # EIA AEO 'KTEK' data file (2 rows of headers found in ktek.csv)
-    tech_dtypes = cm.dtype_array(eiadata.cpl_data, ',',
-                                 handyvars.cpl_data_skip_lines - 1)
-
-    col_indices, tech_dtypes = dtype_reducer(tech_dtypes,
-                                             handyvars.columns_to_keep)
-    tech_data = cm.data_import(eiadata.cpl_data, tech_dtypes, ',',
-                               handyvars.cpl_data_skip_lines, col_indices)
+    tech_data = import_cache.load(
+        eiadata.cpl_data, tech_data_import, handyvars.cpl_data_skip_lines,
+        handyvars.columns_to_keep)
     tech_data = cm.str_cleaner(tech_data, 'technology name')
 
     # Import EIA AEO 'KSDOUT' service demand data
-    serv_dtypes = cm.dtype_array(cm.EIAData().serv_dmd)
-    serv_data = cm.data_import(cm.EIAData().serv_dmd, serv_dtypes)
+    serv_data = import_cache.load(cm.EIAData().serv_dmd, cm.eia_data_import)
     serv_data, tval = cm.str_cleaner(serv_data, 'Description', True)
 
     # Import EIA AEO 'KDBOUT' additional data file
-    catg_dtypes = cm.dtype_array(cm.EIAData().catg_dmd)
-    catg_data = cm.data_import(cm.EIAData().catg_dmd, catg_dtypes)
+    catg_data = import_cache.load(cm.EIAData().catg_dmd, cm.eia_data_import)
     catg_data = cm.str_cleaner(catg_data, 'Label')
 
     # Import EIA AEO 'kprem' time preference premium data
-    tpp_data = kprem_import(eiadata.tpp_data, handyvars.tpp_dtypes,
-                            handyvars.tpp_data_skip_lines)
+    tpp_data = import_cache.load(
+        eiadata.tpp_data, kprem_import, handyvars.tpp_dtypes,
+        handyvars.tpp_data_skip_lines)
 
     # Import metadata generated based on EIA AEO data files
     with open(handyvars.aeo_metadata, 'r') as metadata:
@@ -40,6 +40,9 @@ class FilePaths:
     GENERATED = _parent_dir / "generated"
     ECM_COMP = GENERATED / "ecm_competition_data"
     EFF_FS_SPLIT = GENERATED / "eff_fs_splt_data"
+    ECM_PREP_CACHE = GENERATED / "ecm_prep_cache"
+    MAPPED_INPUTS = GENERATED / "mapped_inputs"
+    AEO_IMPORT_CACHE = GENERATED / "aeo_import_cache"
     INPUTS = _parent_dir / "inputs"
     RESULTS = _parent_dir / "results"
     PLOTS = RESULTS / "plots"
@@ -63,7 +66,8 @@ class FilePaths:
                 file paths are values.
         """
 
-        downstream_map = {"GENERATED": ["ECM_COMP", "EFF_FS_SPLIT"],
+        downstream_map = {"GENERATED": ["ECM_COMP", "EFF_FS_SPLIT", "ECM_PREP_CACHE",
+                                        "MAPPED_INPUTS", "AEO_IMPORT_CACHE"],
                           "INPUTS": ["METADATA_PATH"],
                           "RESULTS": ["PLOTS"]}
 
@@ -295,6 +299,10 @@ class Config:
                     "`retrofit_multiplier` and `retrofit_mult_year` must be specified if"
                     " `retrofit_type` is 'increasing'.")
 
+            # parallel preparation
+            if args.workers < 1:
+                raise ValueError("`workers` must be an integer of 1 or greater.")
+
             # fugitive emissions
             if ("typical refrigerant" in args.fugitive_emissions and
                     "low-gwp refrigerant" in args.fugitive_emissions):
@@ -302,6 +310,11 @@ class Config:
                     "The `fugitive_emissions` argument can only accept one of 'typical"
                     " refrigerant' and 'low-gwp refrigerant'")
 
+        if self.key == "run":
+            # parallel competition
+            if args.workers < 1:
+                raise ValueError("`workers` must be an integer of 1 or greater.")
+
     def create_argparse(self, parser: argparse.ArgumentParser,  # noqa: F821
                         schema_data: dict, group: str = None):
         """Extracts arguments from the config schema and writes argparse arguments. This method
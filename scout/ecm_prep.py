@@ -15,14 +15,20 @@ from functools import reduce  # forward compatibility for Python 3
 import operator
 from ast import literal_eval
 import math
+import hashlib
+import sys
 import pandas as pd
 import time
 from datetime import datetime
 from pathlib import PurePath, Path
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from scout.ecm_prep_args import ecm_args
 from scout.config import FilePaths as fp
 from scout.config import LogConfig
+from scout.mapped_json import MappedJSON
+from scout import json_writer
+from scout.profiler import Profiler
 import traceback
 import logging
 logger = logging.getLogger(__name__)
@@ -64,7 +70,77 @@ class MyEncoder(json.JSONEncoder):
             return super(MyEncoder, self).default(obj)
 
 
+class SharedDataError(Exception):
+    """Error raised on an attempt to modify data shared across measures.
+
+    Note:
+        This error deliberately does not derive from TypeError, KeyError, or
+        any other error type that measure preparation handles as a sign of
+        missing or malformed input data, such that a missed in-place update
+        of shared data fails loudly instead of being handled as a data issue.
+    """
+    pass
+
+
+class ReadOnlyDict(dict):
+    """Dict that cannot be modified in place, for data shared across measures.
+
+    Note:
+        Copying or pickling a read-only dict yields a regular, modifiable
+        dict of the type the data were originally stored in (e.g.,
+        OrderedDict), such that measures may freely update copies of the
+        shared data. Attempts to modify the dict in place raise a
+        SharedDataError; read-only numpy arrays raise numpy's ValueError.
+
+    Attributes:
+        thaw_type (type): Dict type to restore in copies of the data.
+    """
+
+    __slots__ = ("thaw_type",)
+
+    def __init__(self, data=(), thaw_type=dict):
+        super().__init__(data)
+        self.thaw_type = thaw_type
+
+    def _read_only(self, *args, **kwargs):
+        raise SharedDataError(
+            "Data shared across measures cannot be modified; modify a copy "
+            "of the data instead")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = \
+        setdefault = update = _read_only
+
+    def __reduce__(self):
+        """Copy and pickle the data as a regular dict of the original type."""
+        return (self.thaw_type, (), None, None, iter(self.items()))
+
+    @classmethod
+    def freeze(cls, data):
+        """Make dicts (including those nested in dicts or lists) and numpy
+        arrays in input data read-only.
+
+        Args:
+            data: Data to freeze.
+
+        Returns:
+            Read-only version of the input data.
+        """
+        if isinstance(data, cls):
+            return data
+        elif isinstance(data, dict):
+            return cls(((k, cls.freeze(v)) for k, v in data.items()),
+                       thaw_type=type(data))
+        elif isinstance(data, list):
+            return [cls.freeze(x) for x in data]
+        elif isinstance(data, numpy.ndarray):
+            data.flags.writeable = False
+        return data
+
+
 class Utils:
+    # File suffixes of ECM competition data by 'comp_data_format' option
+    comp_data_suffixes = {"gzip": ".pkl.gz", "pickle": ".pkl"}
+
     @classmethod
     def load_json(cls, filepath: Path) -> dict:
         """Loads data from a .json file
@@ -84,14 +160,64 @@ class Utils:
 
     @classmethod
     def dump_json(cls, data, filepath: Path):
-        """Export data to .json file
+        """Export data to .json file, writing one top-level entry at a time
 
         Args:
             data: data to write to .json file
             filepath (pathlib.Path): filepath of .json file
         """
-        with open(filepath, "w") as handle:
-            json.dump(data, handle, indent=2, cls=MyEncoder)
+        json_writer.dump_json(data, filepath, indent=2, cls=MyEncoder)
+
+    @classmethod
+    def comp_data_name(cls, filepath: Path) -> str:
+        """Find the name of the ECM that a competition data file belongs to
+
+        Args:
+            filepath (pathlib.Path): filepath of competition data file
+
+        Returns:
+            str: ECM name
+        """
+        for suffix in cls.comp_data_suffixes.values():
+            if filepath.name.endswith(suffix):
+                return filepath.name[:-len(suffix)]
+        return filepath.name
+
+    @classmethod
+    def load_comp_data(cls, folder: Path, name: str):
+        """Loads ECM competition data, in any of the supported file formats
+
+        Args:
+            folder (pathlib.Path): folder of competition data files
+            name (str): ECM name
+
+        Returns:
+            ECM competition data
+        """
+        for data_format, suffix in cls.comp_data_suffixes.items():
+            filepath = folder / (name + suffix)
+            if filepath.exists():
+                opener = gzip.open if data_format == "gzip" else open
+                with opener(filepath, 'rb') as handle:
+                    return pickle.load(handle)
+        raise FileNotFoundError(f"No competition data found for '{name}' in '{folder}'")
+
+    @classmethod
+    def dump_comp_data(cls, data, folder: Path, name: str, data_format: str = "gzip"):
+        """Export ECM competition data, removing any data for the ECM in other formats
+
+        Args:
+            data: ECM competition data to write
+            folder (pathlib.Path): folder of competition data files
+            name (str): ECM name
+            data_format (str): 'comp_data_format' option value
+        """
+        opener = gzip.open if data_format == "gzip" else open
+        with opener(folder / (name + cls.comp_data_suffixes[data_format]), 'wb') as handle:
+            pickle.dump(data, handle, -1)
+        for other_format, suffix in cls.comp_data_suffixes.items():
+            if other_format != data_format:
+                (folder / (name + suffix)).unlink(missing_ok=True)
 
     @classmethod
     def update_active_measures(cls,
@@ -139,6 +265,338 @@ class Utils:
         return run_setup
 
 
+class ECMPrepCache(object):
+    """Content-addressed cache of prepared individual measure data.
+
+    Note:
+        Each cached measure is keyed on a hash of its definition, the user
+        options that bear on results, the contents of the baseline/TSV/
+        conversion input files, the modeling time horizon, and the code of
+        this module and the modules it draws on to prepare measures, such
+        that a measure whose key is unchanged since it was last prepared can
+        reuse its competition, efficient fuel split, summary, and sector
+        shape data without being prepared again. Once a measure is prepared
+        again, the data cached for its previous key are removed.
+
+    Attributes:
+        cache_dir (Path): Folder in which cached measure data are stored.
+        file_hashes_path (Path): Index of previously computed input file
+            checksums, keyed by file path.
+        file_hashes (dict): Input file checksums by file path, along with the
+            file sizes and modification times used to reuse the checksums.
+        base_key (str): Hash of the cache inputs common to all measures.
+        meas_keys (dict): Cache keys for the measures examined in this run.
+    """
+
+    # User options with no bearing on prepared measure data
+    ignore_opts = ["verbose", "yaml", "ecm_directory", "ecm_files", "ecm_files_user",
+                   "ecm_packages", "ecm_files_regex", "workers", "no_cache",
+                   "comp_data_format", "profile"]
+    # Modules other than this one whose code bears on prepared measure data
+    code_modules = ["scout.config", "scout.mapped_json", "scout.json_writer"]
+
+    def __init__(self, handyfiles, handyvars, opts):
+        self.cache_dir = handyfiles.ecm_prep_cache
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.file_hashes_path = self.cache_dir / "file_hashes.json"
+        try:
+            self.file_hashes = Utils.load_json(self.file_hashes_path)
+        except (FileNotFoundError, ValueError):
+            self.file_hashes = {}
+        # Checksum all baseline, TSV, and conversion input files, excluding
+        # files generated by ecm_prep and ECM definitions (the latter are
+        # covered by the measure-specific portion of the cache key); note
+        # that certain input data are read from a zipped version of the file
+        # path stored in 'handyfiles'
+        inputs = {}
+        for attr, fpath in sorted(vars(handyfiles).items()):
+            if not isinstance(fpath, PurePath) or any([
+                    fpath.is_relative_to(x) for x in [fp.GENERATED, fp.ECM_DEF]]):
+                continue
+            for f in [fpath, fpath.with_suffix(".gz")]:
+                if f.is_file():
+                    inputs[attr + f.suffix] = self.file_hash(f)
+        base_data = {
+            "opts": {k: v for k, v in vars(opts).items() if k not in self.ignore_opts},
+            "aeo_years": handyvars.aeo_years,
+            "inputs": inputs,
+            "code": [self.file_hash(Path(x)) for x in [__file__] + [
+                sys.modules[m].__file__ for m in self.code_modules]]}
+        self.base_key = self.hash_data(base_data)
+        self.meas_keys = {}
+
+    def file_hash(self, fpath):
+        """Find the checksum of a file, reusing a previous checksum when the
+        file's size and modification time are unchanged.
+
+        Args:
+            fpath (Path): Path of file to checksum.
+
+        Returns:
+            SHA-256 checksum of the file contents.
+        """
+        f_stat = stat(fpath)
+        f_id = [f_stat.st_size, f_stat.st_mtime_ns]
+        f_key = str(Path(fpath).resolve())
+        if f_key in self.file_hashes and self.file_hashes[f_key][:2] == f_id:
+            return self.file_hashes[f_key][2]
+        f_hash = hashlib.sha256()
+        with open(fpath, "rb") as handle:
+            for chunk in iter(lambda: handle.read(2 ** 20), b""):
+                f_hash.update(chunk)
+        self.file_hashes[f_key] = f_id + [f_hash.hexdigest()]
+        return self.file_hashes[f_key][2]
+
+    @staticmethod
+    def hash_data(data):
+        """Find the checksum of JSON-serializable data.
+
+        Args:
+            data: Data to checksum.
+
+        Returns:
+            SHA-256 checksum of the data's canonical JSON representation.
+        """
+        return hashlib.sha256(json.dumps(
+            data, sort_keys=True, cls=MyEncoder, default=str).encode(
+                "utf-8")).hexdigest()
+
+    def meas_key(self, meas_dict, handyfiles):
+        """Find the cache key for a measure definition.
+
+        Args:
+            meas_dict (dict): Measure definition.
+            handyfiles (object): Input files of use across Measure methods.
+
+        Returns:
+            Cache key for the measure.
+        """
+        # Checksum any custom savings shape or backup fuel fraction files the
+        # measure definition points to
+        meas_files = {}
+        tsv_features = meas_dict.get("tsv_features")
+        if isinstance(tsv_features, dict) and isinstance(tsv_features.get(
+                "shape"), dict) and isinstance(tsv_features["shape"].get(
+                "custom_annual_savings"), str):
+            f = handyfiles.tsv_shape_data / tsv_features["shape"]["custom_annual_savings"]
+            if f.is_file():
+                meas_files["custom_annual_savings"] = self.file_hash(f)
+        if isinstance(meas_dict.get("backup_fuel_fraction"), str):
+            f = handyfiles.backup_fuel_data / meas_dict["backup_fuel_fraction"]
+            if f.is_file():
+                meas_files["backup_fuel_fraction"] = self.file_hash(f)
+
+        return self.hash_data({
+            "base": self.base_key, "measure": meas_dict, "files": meas_files})
+
+    def restore(self, meas_dicts, ctrb_ms_pkg_prep, handyfiles):
+        """Retrieve cached data for measures whose cache key is unchanged.
+
+        Note:
+            Measures that contribute to packages being prepared and measures
+            that serve as counterfactuals for isolating envelope impacts are
+            always prepared, since their full Measure objects are needed.
+
+        Args:
+            meas_dicts (list): Measure definitions to prepare.
+            ctrb_ms_pkg_prep (list): Names of measures that contribute to pkgs.
+            handyfiles (object): Input files of use across Measure methods.
+
+        Returns:
+            Measure definitions that still require preparation and a list of
+            dicts with the cached competition, summary, sector shape, and
+            efficient fuel split data for the remaining measures.
+        """
+        meas_toprep, meas_cached = [], []
+        for m in meas_dicts:
+            if m["name"] in ctrb_ms_pkg_prep or "(CF)" in m["name"]:
+                meas_toprep.append(m)
+                continue
+            self.meas_keys[m["name"]] = self.meas_key(m, handyfiles)
+            try:
+                with gzip.open(self.cache_path(m["name"]), 'r') as zp:
+                    meas_cached.append(pickle.load(zp))
+            # Unreadable cache entries are handled as cache misses
+            except (OSError, EOFError, pickle.UnpicklingError):
+                meas_toprep.append(m)
+
+        return meas_toprep, meas_cached
+
+    def store(self, compete, summary, shapes, eff_fs_splt):
+        """Cache prepared data for a measure.
+
+        Args:
+            compete (dict): Measure competition data.
+            summary (dict): Measure high-level summary data.
+            shapes (dict): Measure sector shape data.
+            eff_fs_splt (dict): Measure efficient fuel split data.
+        """
+        # Only measures assigned a cache key in this run are stored
+        if summary["name"] not in self.meas_keys:
+            return
+        cache_file = self.cache_path(summary["name"])
+        # Write to a temporary file first such that an interrupted write does
+        # not leave a partial cache entry behind
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with gzip.open(tmp_file, 'w') as zp:
+            pickle.dump({"compete": compete, "summary": summary, "shapes": shapes,
+                         "eff_fs_splt": eff_fs_splt}, zp, -1)
+        tmp_file.replace(cache_file)
+        self.remove_stale(cache_file)
+
+    def cache_path(self, name):
+        """Find the location of the cached data for a measure.
+
+        Args:
+            name (str): Measure name.
+
+        Returns:
+            Path of the cached data, named for the measure and its cache key.
+        """
+        name_id = hashlib.sha256(name.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / (name_id + "-" + self.meas_keys[name] + ".pkl.gz")
+
+    def remove_stale(self, cache_file):
+        """Remove data cached for a measure under previous cache keys.
+
+        Note:
+            Cached data that cannot be removed are left in place.
+
+        Args:
+            cache_file (Path): Path of the measure's current cached data.
+        """
+        # Data cached for the same measure share the part of the file name
+        # that identifies the measure
+        prefix = cache_file.name.split("-", 1)[0] + "-"
+        for stale_file in self.cache_dir.iterdir():
+            if stale_file.name.startswith(prefix) and stale_file != cache_file \
+                    and stale_file.name.endswith(".pkl.gz"):
+                try:
+                    stale_file.unlink()
+                except OSError:
+                    pass
+
+    def save(self):
+        """Write out the index of input file checksums."""
+        Utils.dump_json(self.file_hashes, self.file_hashes_path)
+
+
+class TSVFactorCache(object):
+    """Size-bounded store of time-sensitive valuation (TSV) factors and hourly
+    load shapes, shared by all measures prepared in the current process.
+
+    Note:
+        Annual energy/cost/carbon re-weighting factors and sector-level hourly
+        load shapes are keyed on the baseline segment, the content of the
+        measure's TSV features and the TSV->AEO year mappings, the user options
+        that bear on the factors, and the identities of the load, price, and
+        emissions data the factors are calculated from; the cache entries hold
+        the latter data, such that their identities cannot be reused while
+        the entries remain. Least recently used entries are discarded once
+        the maximum number of entries is reached.
+
+    Attributes:
+        maxsize (int): Maximum number of factor entries to retain.
+        factors (OrderedDict): Cached factors and shapes, from least to most
+            recently used.
+        scaling (dict): Hourly price/emissions scaling factors by data source,
+            region, and (for prices) signs of the retail electricity rates.
+        hits (int): Number of factor lookups served from the cache.
+        misses (int): Number of factor lookups not found in the cache.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.factors = OrderedDict()
+        self.scaling = {}
+        self.hits, self.misses = (0 for n in range(2))
+
+    def get(self, key):
+        """Retrieve cached TSV factors and shapes.
+
+        Args:
+            key (tuple): Cache key for the factors.
+
+        Returns:
+            Copies of the cached annual re-weighting factors and hourly load
+            shapes, or None if no factors are cached for the key.
+        """
+        try:
+            tsv_fracs, tsv_shapes = self.factors[key][1:]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.factors.move_to_end(key)
+        self.hits += 1
+        if tsv_shapes is not None:
+            tsv_shapes = {k: v.tolist() for k, v in tsv_shapes.items()}
+        return copy.deepcopy(tsv_fracs), tsv_shapes
+
+    def put(self, key, tsv_fracs, tsv_shapes, refs):
+        """Cache TSV factors and shapes.
+
+        Args:
+            key (tuple): Cache key for the factors.
+            tsv_fracs (dict): Annual energy, cost, and carbon re-weighting
+                factors.
+            tsv_shapes (dict): Hourly fractions of annual baseline and
+                efficient energy use (or None).
+            refs (tuple): Data keyed by identity in the cache key.
+        """
+        # Shapes are stored as arrays, which are more compact than lists
+        if tsv_shapes is not None:
+            tsv_shapes = {k: numpy.array(v) for k, v in tsv_shapes.items()}
+        self.factors[key] = (refs, copy.deepcopy(tsv_fracs), tsv_shapes)
+        self.factors.move_to_end(key)
+        while len(self.factors) > self.maxsize:
+            self.factors.popitem(last=False)
+
+    def clear(self):
+        """Discard all cached data and reset hit/miss counts."""
+        self.factors.clear()
+        self.scaling.clear()
+        self.hits, self.misses = (0 for n in range(2))
+
+    @classmethod
+    def digest(cls, data, hasher=None):
+        """Find the checksum of data that may include numpy arrays.
+
+        Args:
+            data: Data to checksum (nested dicts/lists of arrays and scalars).
+            hasher (object): Running checksum to update (used in recursion).
+
+        Returns:
+            SHA-256 checksum of the data (None in recursive calls).
+        """
+        top = hasher is None
+        if top:
+            hasher = hashlib.sha256()
+        if isinstance(data, dict):
+            hasher.update(b"{")
+            for k in sorted(data.keys(), key=str):
+                hasher.update(repr(k).encode("utf-8") + b":")
+                cls.digest(data[k], hasher)
+            hasher.update(b"}")
+        elif isinstance(data, (list, tuple)):
+            hasher.update(b"[")
+            for x in data:
+                cls.digest(x, hasher)
+            hasher.update(b"]")
+        elif isinstance(data, numpy.ndarray):
+            hasher.update(repr((data.dtype.str, data.shape)).encode("utf-8"))
+            hasher.update(numpy.ascontiguousarray(data).tobytes())
+        else:
+            hasher.update(repr(data).encode("utf-8") + b",")
+        if top:
+            return hasher.hexdigest()
+
+
+# Time-sensitive valuation factors shared across measures in this process
+tsv_factor_cache = TSVFactorCache()
+# Time and memory use of the phases of measure preparation in this process
+prep_profiler = Profiler()
+
+
 class UsefulInputFiles(object):
     """Class of input file paths to be used by this routine.
 
@@ -168,8 +626,12 @@ class UsefulInputFiles(object):
             needed to run measure competition in the analysis engine.
         ecm_eff_fs_splt_data (tuple): Folder with data needed to determine the
             fuel splits of efficient case results for fuel switching measures.
+        ecm_prep_cache (tuple): Folder with cached prepared measure data.
+        mapped_inputs (Path): Folder of memory-mapped copies of large inputs.
         run_setup (str): Names of active measures that should be run in
             the analysis engine.
+        profile (Path): Reports of the time and memory use of each phase of
+            measure preparation (without file extension).
         cpi_data (tuple): Historical Consumer Price Index data.
         ss_data (tuple): Site-source, emissions, and price data, national.
         ss_data_nonfs (tuple): Site-source, emissions, and price data,
@@ -248,7 +710,10 @@ class UsefulInputFiles(object):
         self.ecm_prep_env_cf_shapes = fp.GENERATED / "ecm_prep_env_cf_shapes.json"
         self.ecm_compete_data = fp.ECM_COMP
         self.ecm_eff_fs_splt_data = fp.EFF_FS_SPLIT
+        self.ecm_prep_cache = fp.ECM_PREP_CACHE
+        self.mapped_inputs = fp.MAPPED_INPUTS
         self.run_setup = fp.GENERATED / "run_setup.json"
+        self.profile = fp.GENERATED / "profile_ecm_prep"
         self.cpi_data = fp.CONVERT_DATA / "cpi.csv"
         self.tsv_shape_data = (
             fp.ECM_DEF / "energyplus_data" / "savings_shapes")
@@ -455,6 +920,8 @@ class UsefulVars(object):
         tsv_climate_regions (list): Possible ASHRAE climate regions for
             time-sensitive analysis and metrics.
         tsv_nerc_regions (list): Possible NERC regions for time-sensitive data.
+        tsv_hourly_day (numpy.ndarray): Day of year for each of 8760 hours.
+        tsv_hourly_hr (numpy.ndarray): Hour of day for each of 8760 hours.
         tsv_metrics_data (str): Includes information on max/min net system load
             hours, peak/take net system load windows, and peak days by EMM
             region/season, as well as days of year to attribute to each season.
@@ -462,6 +929,8 @@ class UsefulVars(object):
         tsv_hourly_emissions (dict): Dict for storing hourly emissions factors.
         tsv_hourly_lafs (dict): Dict for storing annual energy, cost, and
             carbon adjustment factors by region, building type, and end use.
+        tsv_features_digest (str): Checksum of a measure's TSV features, used
+            to share TSV factors across measures (see 'TSVFactorCache').
         emm_name_num_map (dict): Maps EMM region names to EIA region numbers.
         cz_emm_map (dict): Maps climate zones to EMM region net system load
             shape data.
@@ -473,8 +942,16 @@ class UsefulVars(object):
             sensitive valuation for heating (no load shapes for these gains).
         skipped_ecms (int): List of names for ECMs skipped due to errors.
         save_shp_warn (list): Tracks missing savings shape error history.
+        measure_attrs (tuple): Attributes that are updated as each measure
+            is prepared, and are therefore copied for each measure (see
+            'MeasureVars'); all other attributes are shared across measures
+            and are made read-only once initialized.
     """
 
+    measure_attrs = (
+        "sf_to_house", "tsv_hourly_price", "tsv_hourly_emissions",
+        "tsv_hourly_lafs", "tsv_features_digest", "save_shp_warn")
+
     def __init__(self, base_dir, handyfiles, opts):
         # Set adoption schemes to use in preparing ECM data. Note that high-
         # level technical potential (TP) market data are always prepared, even
@@ -1507,6 +1984,11 @@ class UsefulVars(object):
 
         # Set valid types of TSV feature types
         self.tsv_feature_types = ["shed", "shift", "shape"]
+        # Set the day of year (0-364) and hour of day (0-23) that correspond
+        # to each of the 8760 hourly elements of time-sensitive data; used
+        # to build day/hour masks when applying TSV features and metrics
+        self.tsv_hourly_day, self.tsv_hourly_hr = numpy.divmod(
+            numpy.arange(8760), 24)
 
         # Initialize handy TSV variables if selected region setting supports
         # TSV (EMM, state)
@@ -1743,9 +2225,7 @@ class UsefulVars(object):
                     "peak days": {
                         "summer": 183,
                         "winter": 1
-                    },
-                    "hourly index": list(enumerate(
-                        itertools.product(range(365), range(24))))
+                    }
                 }
             else:
                 self.tsv_metrics_data = None
@@ -1790,7 +2270,17 @@ class UsefulVars(object):
             "windows solar", "equipment gain", "people gain",
             "other heat gain")
         self.skipped_ecms = []
+        self.tsv_features_digest = None
         self.save_shp_warn = []
+        self.freeze()
+
+    def freeze(self):
+        """Make variables shared across measures read-only."""
+        for attr, val in list(vars(self).items()):
+            # Skip per-measure variables and the list of skipped ECMs, which
+            # is updated across all measures
+            if attr not in self.measure_attrs and attr != "skipped_ecms":
+                setattr(self, attr, ReadOnlyDict.freeze(val))
 
     def set_peak_take(self, sysload_dat, restrict_key):
         """Fill in dicts with seasonal system load shape data.
@@ -1937,6 +2427,48 @@ class UsefulVars(object):
         return convert_fact
 
 
+class MeasureVars(object):
+    """Per-measure view of the global variables in a UsefulVars object.
+
+    Note:
+        Variables that are updated as a measure is prepared (see
+        'UsefulVars.measure_attrs') are copied for each measure; all other
+        variables are read directly from the UsefulVars object, which is
+        shared across measures. Copies of the view continue to share the
+        UsefulVars object, while pickled views omit it; the shared variables
+        must be re-attached to unpickled views via the 'shared' attribute.
+
+    Attributes:
+        shared (object): Global variables shared across measures.
+    """
+
+    def __init__(self, handyvars):
+        self.shared = handyvars
+        for attr in handyvars.measure_attrs:
+            if hasattr(handyvars, attr):
+                setattr(self, attr, copy.deepcopy(getattr(handyvars, attr)))
+
+    def __getattr__(self, name):
+        # Only reached for variables not stored with the measure
+        try:
+            shared = self.__dict__["shared"]
+        except KeyError:
+            raise AttributeError(name) from None
+        return getattr(shared, name)
+
+    def __deepcopy__(self, memo):
+        new_vars = MeasureVars.__new__(MeasureVars)
+        for attr, val in vars(self).items():
+            if attr == "shared":
+                new_vars.shared = val
+            else:
+                setattr(new_vars, attr, copy.deepcopy(val, memo))
+        return new_vars
+
+    def __getstate__(self):
+        return {k: v for k, v in vars(self).items() if k != "shared"}
+
+
 class EPlusMapDicts(object):
     """Class of dicts used to map Scout measure definitions to EnergyPlus.
 
@@ -2290,9 +2822,10 @@ class Measure(object):
                 self.usr_opts["health_costs"] = "Uniform EE-high"
         self.eff_fs_splt = {a_s: {} for a_s in handyvars.adopt_schemes_prep}
         self.sector_shapes = None
-        # Deep copy handy vars to avoid any dependence of changes to these vars
-        # across other measures that use them
-        self.handyvars = copy.deepcopy(handyvars)
+        # Copy handy vars that are updated in preparing the measure to avoid
+        # any dependence of changes to these vars across other measures that
+        # use them; all other handy vars are shared (read-only) across measures
+        self.handyvars = MeasureVars(handyvars)
         # Set the rate of baseline retrofitting for ECM stock-and-flow calcs
         try:
             # Check first to see whether pulling up retrofit rate errors
@@ -2782,6 +3315,16 @@ class Measure(object):
                     "mseg_out_break"]["energy"]["efficient-captured"] = \
                     copy.deepcopy(self.handyvars.out_break_in)
 
+    def mseg_count(self):
+        """Count the contributing microsegments of the measure's markets.
+
+        Returns:
+            Number of contributing microsegments for the first adoption
+            scenario (the same microsegments contribute to each scenario).
+        """
+        return len(next(iter(self.markets.values()))["mseg_adjust"][
+            "contributing mseg keys and values"])
+
     def fill_eplus(self, msegs, eplus_dir, eplus_coltypes,
                    eplus_files, vintage_weights, base_cols):
         """Fill in measure performance with EnergyPlus simulation results.
@@ -3169,6 +3712,10 @@ class Measure(object):
         # measure cost updates
         meas_incent_flag = ""
 
+        # Initialize measure diffusion fractions by year (found for the first
+        # microsegment partitioned below)
+        diffuse_fracs = None
+
         # Loop through discovered key chains to find needed performance/cost
         # and stock/energy information for measure
         for ind, mskeys in enumerate(ms_iterable):
@@ -6131,6 +6678,10 @@ class Measure(object):
                     # fractions have been calculated
                     if calc_sect_shapes is True and tsv_shapes is not None:
                         tsv_shapes["baseline"] = [0 for x in range(8760)]
+                # Find measure diffusion fractions by year, which apply to all
+                # of the measure's microsegments (find only once)
+                if diffuse_fracs is None:
+                    diffuse_fracs = self.find_diffuse_fracs(warn_list)
                 for adopt_scheme in self.handyvars.adopt_schemes_prep:
                     # Update total, competed, and efficient stock, energy,
                     # carbon and baseline/measure cost info. based on adoption
@@ -6158,11 +6709,12 @@ class Measure(object):
                      add_fs_energy_cost_eff_remain_switch,
                      mkt_scale_frac_fin, warn_list] = \
                         self.partition_microsegment(
-                            adopt_scheme, diffuse_params, mskeys, bldg_sect,
-                            sqft_subst, mkt_scale_frac, new_constr, add_stock,
-                            add_energy, add_carb, add_fmeth, f_refr,
-                            cost_base, cost_meas, cost_energy_base,
-                            cost_energy_meas, rel_perf, life_base, life_meas,
+                            adopt_scheme, diffuse_params, diffuse_fracs,
+                            mskeys, bldg_sect, sqft_subst, mkt_scale_frac,
+                            new_constr, add_stock, add_energy, add_carb,
+                            add_fmeth, f_refr, cost_base, cost_meas,
+                            cost_energy_base, cost_energy_meas, rel_perf,
+                            life_base, life_meas,
                             site_source_conv_base, site_source_conv_meas,
                             intensity_carb_base, intensity_carb_meas,
                             energy_total_scnd, tsv_scale_fracs, tsv_shapes,
@@ -6714,31 +7266,42 @@ class Measure(object):
                 # where multiplication of scaling factor by retail rate will
                 # result in negative prices and force such cases to zero.
                 if self.handyvars.tsv_hourly_price[mskeys[1]] is None:
-                    cost_fact_hourly, self.handyvars.tsv_hourly_price[
-                        mskeys[1]] = ({} for n in range(2))
-                    # Loop through all years in price shape data and record
-                    # final scaling factors
-                    for yr in tsv_data["price"][
-                            "electricity price shapes"].keys():
-                        # Since scaling factor calculation depends on retail
-                        # energy rates ('cost_energy_meas'), which are only
-                        # available for AEO year range, check for inclusion of
-                        # year from price shape data in AEO range; if not in
-                        # range, set all price scaling factors to 1 for year
-                        if yr in self.handyvars.aeo_years:
-                            cost_fact_hourly[yr], \
-                                self.handyvars.tsv_hourly_price[
-                                mskeys[1]][yr] = ([(
-                                    (0.59 + 0.41 * x) if (
-                                        cost_energy_meas[yr] *
-                                        (0.59 + 0.41 * x) >= 0) else 0) for
-                                    x in tsv_data["price"][
-                                     "electricity price shapes"][yr][
-                                     mskeys[1]]] for n in range(2))
-                        else:
-                            cost_fact_hourly[yr], \
-                                self.handyvars.tsv_hourly_price[
-                                mskeys[1]][yr] = ([1] * 8760 for n in range(2))
+                    price_shapes = tsv_data["price"][
+                        "electricity price shapes"]
+                    # Scaling factors only depend on the retail rates through
+                    # the signs of those rates; reuse factors calculated for
+                    # other measures with the same price data, region, and
+                    # retail rate signs
+                    price_key = (id(price_shapes), mskeys[1], tuple(
+                        numpy.sign(cost_energy_meas[yr]) for yr in
+                        price_shapes.keys() if yr in
+                        self.handyvars.aeo_years))
+                    try:
+                        cost_fact_hourly = tsv_factor_cache.scaling[
+                            price_key][1]
+                    except KeyError:
+                        cost_fact_hourly = {}
+                        # Loop through all years in price shape data and record
+                        # final scaling factors
+                        for yr in price_shapes.keys():
+                            # Since scaling factor calculation depends on
+                            # retail energy rates ('cost_energy_meas'), which
+                            # are only available for AEO year range, check for
+                            # inclusion of year from price shape data in AEO
+                            # range; if not in range, set all price scaling
+                            # factors to 1 for year
+                            if yr in self.handyvars.aeo_years:
+                                price_fact = 0.59 + 0.41 * numpy.asarray(
+                                    price_shapes[yr][mskeys[1]], dtype=float)
+                                cost_fact_hourly[yr] = numpy.where(
+                                    cost_energy_meas[yr] * price_fact >= 0,
+                                    price_fact, 0)
+                            else:
+                                cost_fact_hourly[yr] = numpy.ones(8760)
+                        tsv_factor_cache.scaling[price_key] = (
+                            price_shapes, cost_fact_hourly)
+                    self.handyvars.tsv_hourly_price[mskeys[1]] = \
+                        cost_fact_hourly
                 else:
                     cost_fact_hourly = \
                         self.handyvars.tsv_hourly_price[mskeys[1]]
@@ -6749,12 +7312,20 @@ class Measure(object):
                 # region (dict with keys distinguished by year, *CURRENTLY*
                 # every two years beginning in 2018)
                 if self.handyvars.tsv_hourly_emissions[mskeys[1]] is None:
-                    carbon_fact_hourly,  self.handyvars.tsv_hourly_emissions[
-                        mskeys[1]] = ({yr: tsv_data["emissions"][
-                            "average carbon emissions rates"][yr][
-                            mskeys[1]] for yr in tsv_data["emissions"][
-                            "average carbon emissions rates"].keys()} for
-                            n in range(2))
+                    carb_shapes = tsv_data["emissions"][
+                        "average carbon emissions rates"]
+                    carb_key = (id(carb_shapes), mskeys[1])
+                    try:
+                        carbon_fact_hourly = tsv_factor_cache.scaling[
+                            carb_key][1]
+                    except KeyError:
+                        carbon_fact_hourly = {yr: numpy.asarray(
+                            carb_shapes[yr][mskeys[1]], dtype=float) for
+                            yr in carb_shapes.keys()}
+                        tsv_factor_cache.scaling[carb_key] = (
+                            carb_shapes, carbon_fact_hourly)
+                    self.handyvars.tsv_hourly_emissions[mskeys[1]] = \
+                        carbon_fact_hourly
                 else:
                     carbon_fact_hourly = self.handyvars.tsv_hourly_emissions[
                         mskeys[1]]
@@ -6762,15 +7333,37 @@ class Measure(object):
                 # emissions scaling factors
                 carb_yr_map = tsv_data["emissions_yr_map"]
 
-            # Use 8760 load shape information, combined with 8760 price and
-            # emissions shape information above, to calculate factors that
-            # modify annually-determined baseline and efficient energy, cost,
-            # and carbon totals such that they reflect sub-annual assessment
-            # of these totals
-            updated_tsv_fracs, updated_tsv_shapes = self.apply_tsv(
-                load_fact, ash_czone_wts, eplus_bldg_wts, cost_fact_hourly,
-                carbon_fact_hourly, mskeys, bldg_sect, eu, opts, cost_yr_map,
-                carb_yr_map)
+            # Check for factors already calculated for another measure with
+            # the same TSV features for the current combination of region,
+            # building type, and end use, and with the same load, price, and
+            # emissions data
+            if self.handyvars.tsv_features_digest is None:
+                self.handyvars.tsv_features_digest = \
+                    tsv_factor_cache.digest(self.tsv_features)
+            tsv_key = (
+                mskeys[1], bldg_sect, mskeys[2], mskeys[4], eu,
+                tsv_factor_cache.digest([
+                    self.handyvars.tsv_features_digest, cost_yr_map,
+                    carb_yr_map, opts.sect_shapes, opts.tsv_metrics,
+                    opts.alt_regions, (self.fuel_switch_to == "electricity" and
+                                       "electricity" not in mskeys)]),
+                id(load_fact), id(cost_fact_hourly), id(carbon_fact_hourly))
+            tsv_cached = tsv_factor_cache.get(tsv_key)
+            if tsv_cached is not None:
+                updated_tsv_fracs, updated_tsv_shapes = tsv_cached
+            else:
+                # Use 8760 load shape information, combined with 8760 price and
+                # emissions shape information above, to calculate factors that
+                # modify annually-determined baseline and efficient energy,
+                # cost, and carbon totals such that they reflect sub-annual
+                # assessment of these totals
+                updated_tsv_fracs, updated_tsv_shapes = self.apply_tsv(
+                    load_fact, ash_czone_wts, eplus_bldg_wts, cost_fact_hourly,
+                    carbon_fact_hourly, mskeys, bldg_sect, eu, opts,
+                    cost_yr_map, carb_yr_map)
+                tsv_factor_cache.put(
+                    tsv_key, updated_tsv_fracs, updated_tsv_shapes,
+                    (load_fact, cost_fact_hourly, carbon_fact_hourly))
             # Set adjustment factors for current combination of
             # region, building type, and end use such that they
             # need not be calculated again for this combination in
@@ -6805,8 +7398,10 @@ class Measure(object):
             load_fact (dict): Hourly energy load fractions of annual load.
             ash_cz_wts (list): Factors to map ASH climates -> EMM regions.
             eplus_bldg_wts (dict): Factors to map EPlus -> Scout bldg. types.
-            cost_fact_hourly (list): 8760 electricity price scaling factors.
-            carbon_fact_hourly (list): 8760 emissions scaling factors.
+            cost_fact_hourly (dict): 8760 electricity price scaling factors
+                (numpy.ndarray) by year.
+            carbon_fact_hourly (dict): 8760 emissions scaling factors
+                (numpy.ndarray) by year.
             mskeys (tuple): Microsegment information.
             bldg_sect (str): Building sector flag (residential/commercial).
             eu (str): End use for keying time sensitive load data.
@@ -6831,8 +7426,8 @@ class Measure(object):
         # Initialize hourly fractions of annual baseline and efficient energy
         # if sector-level load shape information is desired by the user
         if opts.sect_shapes is True:
-            energy_base_shape, energy_eff_shape = ([
-                0 for x in range(8760)] for n in range(2))
+            energy_base_shape, energy_eff_shape = (
+                numpy.zeros(8760) for n in range(2))
         # Initialize carbon/cost scaling factor variables, but only if
         # either measure TSV features are present or the user desires
         # TSV metrics outputs; assume these shapes are not necessary if
@@ -6915,6 +7510,11 @@ class Measure(object):
         else:
             tsv_adjustments = {}
 
+        # Set the day of year and hour of day for each of the 8760 hours,
+        # used to flag the hours that TSV features/metrics apply to
+        hr_days, hr_hrs = \
+            self.handyvars.tsv_hourly_day, self.handyvars.tsv_hourly_hr
+
         # Loop through all EPlus building types (which commercial load profiles
         # are broken out by) that map to the current Scout building type
         for bldg in eplus_bldg_wts.keys():
@@ -7039,6 +7639,7 @@ class Measure(object):
                 except (KeyError, TypeError):
                     base_load_hourly = load_fact[
                         load_fact_bldg_key]["load shape"]
+                base_load_hourly = numpy.asarray(base_load_hourly, dtype=float)
                 # Ensure that retrieved baseline load data are expected length
                 if len(base_load_hourly) != 8760:
                     warnings.warn(
@@ -7049,12 +7650,12 @@ class Measure(object):
                         "to ensure that 8760 data values are available for "
                         "this microsegment. Setting base load values to zero.")
                     # Set unexpected length to 8760 zeros and continue
-                    base_load_hourly = [0] * 8760
+                    base_load_hourly = numpy.zeros(8760)
                 # Ensure that retrieved baseline load data sum to 1, unless
                 # the data are all zeros (occurs for mobile homes in DC in
                 # 2024 end use load data)
-                elif round(numpy.nansum(base_load_hourly), 2) != 1 and any([
-                        x != 0 for x in base_load_hourly]):
+                elif round(numpy.nansum(base_load_hourly), 2) != 1 and \
+                        numpy.any(base_load_hourly != 0):
                     warnings.warn(
                         "Baseline load data do not sum to 1 ("
                         f"{round(sum(base_load_hourly), 2)}) for end use {mskeys[4]}, "
@@ -7063,10 +7664,10 @@ class Measure(object):
                         "to ensure that 8760 values are correct for "
                         "this microsegment. Setting base load values to zero.")
                     # Set unexpected value to 8760 zeros and continue
-                    base_load_hourly = [0] * 8760
+                    base_load_hourly = numpy.zeros(8760)
 
                 # Initialize efficient load shape as equal to base load
-                eff_load_hourly = copy.deepcopy(base_load_hourly)
+                eff_load_hourly = base_load_hourly.copy()
 
                 # Loop through all time-varying efficiency features in sorted
                 # order, applying each successively to the base load shape
@@ -7131,10 +7732,10 @@ class Measure(object):
                     except (TypeError, KeyError):
                         applicable_hrs = list(range(0, 24))
 
-                    # Set enumerate object for applicable day/hour ranges
-                    enumerate_list = list(
-                        enumerate(itertools.product(
-                            range(365), range(24))))
+                    # Flag the hours of the year that fall within the
+                    # applicable day and hour ranges
+                    day_mask = numpy.isin(hr_days, list(applicable_days))
+                    hr_mask = numpy.isin(hr_hrs, applicable_hrs)
 
                     # Apply time-varying impacts based on type of time-varying
                     # efficiency feature(s) specified for the measure
@@ -7152,17 +7753,26 @@ class Measure(object):
                             rel_save_tsv = 0
                         # Reflect the shed impacts on efficient load shape
                         # across all relevant hours of the year
-                        eff_load_hourly = [base_load_hourly[i] * (
-                            1 - rel_save_tsv) if (
-                            x in applicable_days and y in applicable_hrs) else
-                            eff_load_hourly[i] for
-                            i, (x, y) in enumerate_list]
+                        eff_load_hourly = numpy.where(
+                            day_mask & hr_mask,
+                            base_load_hourly * (1 - rel_save_tsv),
+                            eff_load_hourly)
                     # "Shift" time-varying efficiency features move a certain
                     # percentage of baseline load from one time period into
                     # another time period
                     elif "shift" in a:
                         # Set the number of hours earlier to shift the load
                         offset_hrs = tsv_adjustments[a]["offset_hrs_earlier"]
+                        # Set the index of the hour each load value is shifted
+                        # from, both within the year and (for shifts that run
+                        # past the end of the year) within the current day;
+                        # 'wrap' mode mirrors negative list indexing
+                        shift_ind = numpy.arange(8760) + offset_hrs
+                        shift_in_yr = (shift_ind <= 8759) & day_mask
+                        base_shift_yr = base_load_hourly.take(
+                            shift_ind, mode="wrap")
+                        base_shift_dy = base_load_hourly.take(
+                            (hr_hrs + offset_hrs) - 24, mode="wrap")
                         # If the user has not specified a time range for the
                         # load shifting, assume the measure shifts the entire
                         # load shape earlier by the number of hours set above
@@ -7171,12 +7781,8 @@ class Measure(object):
                             # across all 8760 hours of the year; the initial
                             # efficient load in hour X is now the load in hour
                             # X minus user-specified hour offset
-                            eff_load_hourly = [
-                                base_load_hourly[i + offset_hrs] if ((
-                                    i + offset_hrs) <= 8759 and
-                                    x in applicable_days) else
-                                base_load_hourly[(y + offset_hrs) - 24] for
-                                i, (x, y) in enumerate_list]
+                            eff_load_hourly = numpy.where(
+                                shift_in_yr, base_shift_yr, base_shift_dy)
                         # If the user has specified a time range for the load
                         # shifting, shift the load in accordance with range
                         else:
@@ -7211,41 +7817,25 @@ class Measure(object):
                             # user-specified % of load in the user-specified
                             # hour range and move it X hours earlier, where X
                             # is determined by the "offset_hours" parameter
-                            eff_load_hourly = [
-                                    (base_load_hourly[i] + (
-                                        base_load_hourly[
-                                            i + offset_hrs] *
-                                        rel_save_tsv)) if (
-                                        ((i + offset_hrs) <= 8759 and
-                                         x in applicable_days)
-                                        and y in hrs_to_shift_to and
-                                        y not in applicable_hrs) else
-                                    (base_load_hourly[i] * (
-                                      1 - rel_save_tsv) + (base_load_hourly[
-                                        i + offset_hrs] *
-                                        rel_save_tsv)) if (
-                                        ((i + offset_hrs) <= 8759 and
-                                         x in applicable_days)
-                                        and y in hrs_to_shift_to and
-                                        y in applicable_hrs) else
-                                    (base_load_hourly[i] +
-                                     base_load_hourly[
-                                        (y + offset_hrs) - 24] * rel_save_tsv)
-                                    if (y in hrs_to_shift_to and
-                                        y not in applicable_hrs and
-                                        x in applicable_days) else
-                                    (base_load_hourly[i] * (
-                                        1 - rel_save_tsv) + base_load_hourly[
-                                        (y + offset_hrs) - 24] * rel_save_tsv)
-                                    if (y in hrs_to_shift_to and
-                                        y in applicable_hrs and
-                                        x in applicable_days) else
-                                    eff_load_hourly[i] * (
-                                        1 - rel_save_tsv) if (
-                                        y in applicable_hrs and
-                                        x in applicable_days) else
-                                    eff_load_hourly[i] for i, (x, y) in
-                                    enumerate_list]
+                            # Note that conditions are checked in order,
+                            # with the first condition met setting the load
+                            to_mask = numpy.isin(hr_hrs, hrs_to_shift_to)
+                            eff_load_hourly = numpy.select([
+                                shift_in_yr & to_mask & ~hr_mask,
+                                shift_in_yr & to_mask & hr_mask,
+                                to_mask & ~hr_mask & day_mask,
+                                to_mask & hr_mask & day_mask,
+                                hr_mask & day_mask], [
+                                base_load_hourly + (
+                                    base_shift_yr * rel_save_tsv),
+                                base_load_hourly * (1 - rel_save_tsv) + (
+                                    base_shift_yr * rel_save_tsv),
+                                base_load_hourly + (
+                                    base_shift_dy * rel_save_tsv),
+                                base_load_hourly * (1 - rel_save_tsv) + (
+                                    base_shift_dy * rel_save_tsv),
+                                eff_load_hourly * (1 - rel_save_tsv)],
+                                default=eff_load_hourly)
 
                     # "Shape" time-sensitive efficiency features reshape
                     # the baseline load shape in accordance with custom load
@@ -7263,12 +7853,10 @@ class Measure(object):
                                 tsv_adjustments[a]["custom_daily_savings"]
                             # Reflect custom load savings in efficient load
                             # shape
-                            eff_load_hourly = [
-                                base_load_hourly[i] * (
-                                    1 - custom_save_shape[y]) if (
-                                    x in applicable_days) else
-                                eff_load_hourly[i] for
-                                i, (x, y) in enumerate_list]
+                            eff_load_hourly = numpy.where(
+                                day_mask, base_load_hourly * (1 - numpy.asarray(
+                                    custom_save_shape, dtype=float)[hr_hrs]),
+                                eff_load_hourly)
 
                         # Custom annual load savings shape information contains
                         # savings fractions for all 8760 hours of the year
@@ -7341,28 +7929,24 @@ class Measure(object):
                                 # baseline load shape that is specific to the
                                 # measure in question, which the measure load
                                 # shape is calculated relative to in input CSVs
-                                meas_base_adj = [(
-                                    custom_hr_save_shape[
-                                        "CSV base frac. annual"][x] /
-                                    base_load_hourly[x]) if (
-                                        numpy.isfinite(base_load_hourly[x]) and
-                                        base_load_hourly[x] != 0) else 1
-                                    for x in range(8760)]
+                                meas_base_adj = numpy.divide(
+                                    numpy.asarray(custom_hr_save_shape[
+                                        "CSV base frac. annual"], dtype=float),
+                                    base_load_hourly, out=numpy.ones(8760),
+                                    where=(numpy.isfinite(base_load_hourly) &
+                                           (base_load_hourly != 0)))
                                 # Pull in relative hourly savings fractions to
                                 # apply to baseline to get to efficient shape
-                                hr_chg = custom_hr_save_shape[
-                                    "CSV relative change"]
+                                hr_chg = numpy.asarray(custom_hr_save_shape[
+                                    "CSV relative change"], dtype=float)
                                 # Apply hourly baseline adjustment and relative
                                 # load change to derive efficient shape
-                                eff_load_hourly = [(
-                                    base_load_hourly[x] * meas_base_adj[x] *
-                                    hr_chg[x]) for x in range(8760)]
+                                eff_load_hourly = (
+                                    base_load_hourly * meas_base_adj * hr_chg)
                                 # Ensure all efficient load fractions are
                                 # greater than zero
-                                eff_load_hourly = [
-                                    eff_load_hourly[x] if
-                                    eff_load_hourly[x] >= 0
-                                    else 0 for x in range(8760)]
+                                eff_load_hourly = numpy.where(
+                                    eff_load_hourly >= 0, eff_load_hourly, 0)
                         else:
                             # Throw an error if the load reshaping operation
                             # name is invalid
@@ -7382,24 +7966,18 @@ class Measure(object):
                 # energy to reflect baseline hourly load shape plus effects of
                 # time-sensitive measure features on the baseline load (if any)
                 if opts.sect_shapes is True:
-                    # Base load weighted by contribution of climate for load
-                    # to EMM region
-                    base_ls_wt = [
-                        x * emm_adj_wt for x in base_load_hourly]
-                    # Efficient load weighted by contribution of climate for
-                    # load to current EMM region
-                    eff_ls_wt = [
-                        x * emm_adj_wt for x in eff_load_hourly]
-                    # Add to existing base load fractions (across all climates
-                    # that overlap with the current EMM region)
-                    energy_base_shape = [
-                        energy_base_shape[x] + base_ls_wt[x] for
-                        x in range(len(energy_base_shape))]
-                    # Add to existing efficient load fractions (across all
-                    # climates that overlap with the current EMM region)
-                    energy_eff_shape = [
-                        energy_eff_shape[x] + eff_ls_wt[x] for
-                        x in range(len(energy_eff_shape))]
+                    # Add base load weighted by contribution of climate for
+                    # load to EMM region to existing base load fractions
+                    # (across all climates that overlap with the current EMM
+                    # region)
+                    energy_base_shape = energy_base_shape + (
+                        base_load_hourly * emm_adj_wt)
+                    # Add efficient load weighted by contribution of climate
+                    # for load to current EMM region to existing efficient load
+                    # fractions (across all climates that overlap with the
+                    # current EMM region)
+                    energy_eff_shape = energy_eff_shape + (
+                        eff_load_hourly * emm_adj_wt)
 
                 # Further adjust baseline and efficient load shapes
                 # to account for time sensitive valuation (TSV) output metrics
@@ -7521,22 +8099,18 @@ class Measure(object):
                     # only the hourly values that fall within the applicable
                     # hour and day ranges from above; set all inapplicable
                     # values to zero (to maintain full 8760 list length)
-                    base_load_hourly, eff_load_hourly = [[
-                        (x[i] / avg_len) if (
-                            (d + 1) in tsv_metrics_days and
-                            (h + 1) in tsv_metrics_hrs)
-                        else 0 for
-                        i, (d, h) in
-                        self.handyvars.tsv_metrics_data["hourly index"]] for
+                    metrics_mask = numpy.isin(
+                        hr_days + 1, tsv_metrics_days) & numpy.isin(
+                        hr_hrs + 1, tsv_metrics_hrs)
+                    base_load_hourly, eff_load_hourly = [numpy.where(
+                        metrics_mask, x / avg_len, 0) for
                         x in [base_load_hourly, eff_load_hourly]]
 
                 # Sum across all 8760 hourly baseline and efficient load
                 # values to arrive at final factor used to rescale
                 # annually-determined energy totals
-                energy_scale_base += numpy.sum([
-                    x * emm_adj_wt for x in base_load_hourly])
-                energy_scale_eff += numpy.sum([
-                    x * emm_adj_wt for x in eff_load_hourly])
+                energy_scale_base += numpy.sum(base_load_hourly * emm_adj_wt)
+                energy_scale_eff += numpy.sum(eff_load_hourly * emm_adj_wt)
 
         # Finalize carbon/cost scaling factor variables, but only if
         # either measure TSV features are present or the user desires
@@ -7549,24 +8123,20 @@ class Measure(object):
             # hourly price scaling factors; calculate across available
             # projection years for the price scaling factors
             for yr in cost_scale_base.keys():
-                cost_scale_base[yr] += numpy.sum([
-                    x * y for x, y in zip(
-                        base_load_hourly, cost_fact_hourly[yr])])
-                cost_scale_eff[yr] += numpy.sum([
-                    x * y for x, y in zip(
-                        eff_load_hourly, cost_fact_hourly[yr])])
+                cost_scale_base[yr] += numpy.sum(
+                    base_load_hourly * cost_fact_hourly[yr])
+                cost_scale_eff[yr] += numpy.sum(
+                    eff_load_hourly * cost_fact_hourly[yr])
 
             # Calculate baseline/efficient emissions rescaling factors as the
             # sums of the hourly baseline/efficient load shape multiplied by
             # the hourly emissions scaling factors; calculate across available
             # projection years for the emissions scaling factors
             for yr in carb_scale_base.keys():
-                carb_scale_base[yr] += numpy.sum([
-                    x * y for x, y in zip(
-                        base_load_hourly, carbon_fact_hourly[yr])])
-                carb_scale_eff[yr] += numpy.sum([
-                    x * y for x, y in zip(
-                        eff_load_hourly, carbon_fact_hourly[yr])])
+                carb_scale_base[yr] += numpy.sum(
+                    base_load_hourly * carbon_fact_hourly[yr])
+                carb_scale_eff[yr] += numpy.sum(
+                    eff_load_hourly * carbon_fact_hourly[yr])
 
             # Extend price/emissions factors across all years in the AEO time
             # horizon
@@ -7625,14 +8195,14 @@ class Measure(object):
         # system that wasn't there before)
         if self.fuel_switch_to == "electricity" and \
                 "electricity" not in mskeys and opts.sect_shapes is True:
-            energy_base_shape = [0 for x in range(len(energy_base_shape))]
+            energy_base_shape = numpy.zeros(len(energy_base_shape), dtype=int)
 
         # Return hourly fractions of annual baseline and efficient energy
         # if sector-level load shape information is desired by the user
         if opts.sect_shapes is True:
             updated_tsv_shapes = {
-                "baseline": energy_base_shape,
-                "efficient": energy_eff_shape}
+                "baseline": energy_base_shape.tolist(),
+                "efficient": energy_eff_shape.tolist()}
         else:
             updated_tsv_shapes = None
         # Return the final energy, cost, and emissions rescaling factors
@@ -7930,9 +8500,139 @@ class Measure(object):
 
         return cost_meas_fin, cost_meas_units_fin, cost_base_units_fin
 
+    def find_diffuse_fracs(self, warn_list):
+        """Find fractions of a measure's market reached by diffusion, by year.
+
+        Note:
+            Diffusion fractions depend only on the measure's 'diffusion'
+            attribute and the modeling time horizon, and are therefore found
+            once per measure and applied to all of its microsegments.
+
+        Args:
+            warn_list (list): Warning messages to append to.
+
+        Returns:
+            Dict of diffusion fractions by year in the modeling time horizon.
+        """
+        # Diffusion coefficients
+        # 1) Initialize dictionary
+        years_diff_fraction_dictionary = {}
+        # 2) Let us check if the diffusion coefficients are defined:
+        try:
+            self.diffusion
+        except (NameError, AttributeError):
+            # If not present, we set it to 1
+            for year in self.handyvars.aeo_years:
+                years_diff_fraction_dictionary[str(year)] = 1
+        else:
+            # 3) Check if diffusion parameters are defined as fractions
+            if ('fraction_' in list(self.diffusion.keys())[0]):
+                try:
+                    # The diffusion fraction dictionary is converted to a pandas dataframe
+                    df = pd.DataFrame(self.diffusion.items(), columns=['years', 'diff'])
+                    df['years'] = df['years'].str.replace('fraction_', '')
+                    if str(self.handyvars.aeo_years[0]) not in df['years']:
+                        df.loc[len(df.index), :] = [str(self.handyvars.aeo_years[0]), numpy.nan]
+                    if str(self.handyvars.aeo_years[-1]) not in df['years']:
+                        df.loc[len(df.index), :] = [str(self.handyvars.aeo_years[-1]), numpy.nan]
+                    # The years column is used as index
+                    df['years'] = pd.to_datetime(df['years'])
+                    df.index = df['years']
+                    df.drop(['years'], axis=1, inplace=True)
+                    # Force all values to be floats
+                    df["diff"] = pd.to_numeric(df["diff"], downcast="float")
+                    # The data are resampled yearly
+                    df = df.resample('YE').mean()
+                    # If there is any value greater than 1, set it to 1
+                    if (df['diff'] > 1).any():
+                        warn_list.append("WARNING: Some declared diffusion fractions are greater"
+                                         " than 1. Their value has been changed to 1.")
+                        df.loc[df['diff'] > 1, 'diff'] = 1
+                    # if there is any value smaller than 0, set it to 0
+                    if (df['diff'] < 0).any():
+                        warn_list.append("WARNING: Some declared diffusion fractions are smaller"
+                                         " than 0. Their value has been changed to 0.")
+                        df.loc[df['diff'] < 0, 'diff'] = 0
+                    # The data are interpolated to fill up values for each year
+                    df = df.interpolate(method='linear',
+                                        limit_direction='both',
+                                        limit_area='inside')
+                    # if values for the first and for the last years are not specified, the first
+                    # declared value is used for all the first years and the last declared value
+                    # is used for all the last years.
+                    if df['diff'].isna().values.any():
+                        warn_list.append("WARNING: Not enough data were provided for first and"
+                                         " last years of the considered simulation period.\n"
+                                         "\tThe simulation will continue assuming plausible"
+                                         " diffusion fraction values.")
+                        df = df.interpolate(method='linear').bfill()
+                    # The time span for the diffusion fraction is limited to the simulation period
+                    df = df[(
+                             df.index.year >= int(self.handyvars.aeo_years[0])
+                            ) &
+                            (
+                             df.index.year <
+                             (int(self.handyvars.aeo_years[-1])
+                              + 1)
+                            )]
+                    fractions = df['diff'].to_list()
+                    # for year in range_years:
+                    for i in range(0, len(self.handyvars.aeo_years)):
+                        years_diff_fraction_dictionary[
+                                        str(self.handyvars.aeo_years[i])
+                                                      ] = fractions[i]
+
+                except (NameError, AttributeError, ValueError):
+                    # This takes care of fractions defined
+                    # as strings not convertible to floats
+                    warn_list.append('WARNING: Diffusion parameters are not '
+                                     'properly defined in the measure\n==>'
+                                     'diffusion parameters set to 1 for'
+                                     ' every year.')
+                    for year in self.handyvars.aeo_years:
+                        years_diff_fraction_dictionary[str(year)] = 1
+            # 4) check if diffusion parameters are defined as
+            # p and q for Bass Diffusion Model
+            elif ('bass_model_p' in self.diffusion.keys())\
+                &\
+                 ('bass_model_q' in self.diffusion.keys()):
+                try:
+                    p = float(self.diffusion['bass_model_p'])
+                    q = float(self.diffusion['bass_model_q'])
+                except ValueError:
+                    warn_list.append('WARNING: Diffusion parameters are not '
+                                     'properly defined in the measure\n==>'
+                                     'diffusion parameters set to 1 for'
+                                     ' every year.')
+                    # If not present, we set it to 1
+                    for year in self.handyvars.aeo_years:
+                        years_diff_fraction_dictionary[str(year)] = 1
+                else:
+                    for i in range(0, len(self.handyvars.aeo_years)):
+                        # Bass diffusion model
+                        value = (1 - math.exp(-(p+q)*(float(
+                            self.handyvars.aeo_years[i]
+                            ) - float(self.handyvars.aeo_years[0]))))\
+                            /\
+                            ((1 + (q/p) * math.exp(-(p+q)*(
+                                float(self.handyvars.aeo_years[i])
+                                - float(self.handyvars.aeo_years[0])))))
+                        years_diff_fraction_dictionary[str(
+                            self.handyvars.aeo_years[i])] = value
+            else:
+                warn_list.append('WARNING: Diffusion parameters are not '
+                                 'properly defined in the measure\n==>'
+                                 'diffusion parameters set to 1 for'
+                                 ' every year.')
+                # 5) If not present, we set it to 1
+                for year in self.handyvars.aeo_years:
+                    years_diff_fraction_dictionary[str(year)] = 1
+
+        return years_diff_fraction_dictionary
+
     def partition_microsegment(
-            self, adopt_scheme, diffuse_params, mskeys, bldg_sect, sqft_subst,
-            mkt_scale_frac, new_constr, stock_total_init, energy_total_init,
+            self, adopt_scheme, diffuse_params, diffuse_fracs, mskeys,
+            bldg_sect, sqft_subst, mkt_scale_frac, new_constr, stock_total_init, energy_total_init,
             carb_total_init, fmeth_total_init, f_refr, cost_base, cost_meas,
             cost_energy_base, cost_energy_meas, rel_perf, life_base, life_meas,
             site_source_conv_base, site_source_conv_meas, intensity_carb_base,
@@ -7942,10 +8642,20 @@ class Measure(object):
             warn_list):
         """Find total, competed, and efficient portions of a mkt. microsegment.
 
+        Note:
+            Stock turnover is calculated one year at a time, since captured,
+            competed, and converted stock carry over from year to year and
+            linked heating/cooling and secondary microsegment data are read
+            and updated across calls; only the measure's diffusion fractions,
+            which apply to all of its microsegments, are found once per
+            measure (see 'find_diffuse_fracs') and passed in.
+
         Args:
             adopt_scheme (string): Assumed consumer adoption scenario.
             diffuse_params (NoneType): Parameters relating to the 'adjusted
                 adoption' consumer choice model (currently a placeholder).
+            diffuse_fracs (dict): Fractions of the measure's market reached
+                by diffusion, by year.
             mskeys (tuple): Dictionary key information for the currently
                 partitioned market microsegment (mseg type->reg->bldg->
                 fuel->end use->technology type->structure type).
@@ -8402,119 +9112,9 @@ class Measure(object):
         else:
             stk_serv_cap_cnv = 1
 
-        # DIFFUSION COEFFICIENTS
-        # 1) Initialize dictionary
-        years_diff_fraction_dictionary = {}
-        # 2) Let us check if the diffusion coefficients are defined:
-        try:
-            self.diffusion
-        except (NameError, AttributeError):
-            # If not present, we set it to 1
-            for year in self.handyvars.aeo_years:
-                years_diff_fraction_dictionary[str(year)] = 1
-        else:
-            # 3) Check if diffusion parameters are defined as fractions
-            if ('fraction_' in list(self.diffusion.keys())[0]):
-                try:
-                    # The diffusion fraction dictionary is converted to a pandas dataframe
-                    df = pd.DataFrame(self.diffusion.items(), columns=['years', 'diff'])
-                    df['years'] = df['years'].str.replace('fraction_', '')
-                    if str(self.handyvars.aeo_years[0]) not in df['years']:
-                        df.loc[len(df.index), :] = [str(self.handyvars.aeo_years[0]), numpy.nan]
-                    if str(self.handyvars.aeo_years[-1]) not in df['years']:
-                        df.loc[len(df.index), :] = [str(self.handyvars.aeo_years[-1]), numpy.nan]
-                    # The years column is used as index
-                    df['years'] = pd.to_datetime(df['years'])
-                    df.index = df['years']
-                    df.drop(['years'], axis=1, inplace=True)
-                    # Force all values to be floats
-                    df["diff"] = pd.to_numeric(df["diff"], downcast="float")
-                    # The data are resampled yearly
-                    df = df.resample('YE').mean()
-                    # If there is any value greater than 1, set it to 1
-                    if (df['diff'] > 1).any():
-                        warn_list.append("WARNING: Some declared diffusion fractions are greater"
-                                         " than 1. Their value has been changed to 1.")
-                        df.loc[df['diff'] > 1, 'diff'] = 1
-                    # if there is any value smaller than 0, set it to 0
-                    if (df['diff'] < 0).any():
-                        warn_list.append("WARNING: Some declared diffusion fractions are smaller"
-                                         " than 0. Their value has been changed to 0.")
-                        df.loc[df['diff'] < 0, 'diff'] = 0
-                    # The data are interpolated to fill up values for each year
-                    df = df.interpolate(method='linear',
-                                        limit_direction='both',
-                                        limit_area='inside')
-                    # if values for the first and for the last years are not specified, the first
-                    # declared value is used for all the first years and the last declared value
-                    # is used for all the last years.
-                    if df['diff'].isna().values.any():
-                        warn_list.append("WARNING: Not enough data were provided for first and"
-                                         " last years of the considered simulation period.\n"
-                                         "\tThe simulation will continue assuming plausible"
-                                         " diffusion fraction values.")
-                        df = df.interpolate(method='linear').bfill()
-                    # The time span for the diffusion fraction is limited to the simulation period
-                    df = df[(
-                             df.index.year >= int(self.handyvars.aeo_years[0])
-                            ) &
-                            (
-                             df.index.year <
-                             (int(self.handyvars.aeo_years[-1])
-                              + 1)
-                            )]
-                    fractions = df['diff'].to_list()
-                    # for year in range_years:
-                    for i in range(0, len(self.handyvars.aeo_years)):
-                        years_diff_fraction_dictionary[
-                                        str(self.handyvars.aeo_years[i])
-                                                      ] = fractions[i]
-
-                except (NameError, AttributeError, ValueError):
-                    # This takes care of fractions defined
-                    # as strings not convertible to floats
-                    warn_list.append('WARNING: Diffusion parameters are not '
-                                     'properly defined in the measure\n==>'
-                                     'diffusion parameters set to 1 for'
-                                     ' every year.')
-                    for year in self.handyvars.aeo_years:
-                        years_diff_fraction_dictionary[str(year)] = 1
-            # 4) check if diffusion parameters are defined as
-            # p and q for Bass Diffusion Model
-            elif ('bass_model_p' in self.diffusion.keys())\
-                &\
-                 ('bass_model_q' in self.diffusion.keys()):
-                try:
-                    p = float(self.diffusion['bass_model_p'])
-                    q = float(self.diffusion['bass_model_q'])
-                except ValueError:
-                    warn_list.append('WARNING: Diffusion parameters are not '
-                                     'properly defined in the measure\n==>'
-                                     'diffusion parameters set to 1 for'
-                                     ' every year.')
-                    # If not present, we set it to 1
-                    for year in self.handyvars.aeo_years:
-                        years_diff_fraction_dictionary[str(year)] = 1
-                else:
-                    for i in range(0, len(self.handyvars.aeo_years)):
-                        # Bass diffusion model
-                        value = (1 - math.exp(-(p+q)*(float(
-                            self.handyvars.aeo_years[i]
-                            ) - float(self.handyvars.aeo_years[0]))))\
-                            /\
-                            ((1 + (q/p) * math.exp(-(p+q)*(
-                                float(self.handyvars.aeo_years[i])
-                                - float(self.handyvars.aeo_years[0])))))
-                        years_diff_fraction_dictionary[str(
-                            self.handyvars.aeo_years[i])] = value
-            else:
-                warn_list.append('WARNING: Diffusion parameters are not '
-                                 'properly defined in the measure\n==>'
-                                 'diffusion parameters set to 1 for'
-                                 ' every year.')
-                # 5) If not present, we set it to 1
-                for year in self.handyvars.aeo_years:
-                    years_diff_fraction_dictionary[str(year)] = 1
+        # Set first year of the modeling time horizon, used to determine
+        # when stock captured after the start of the horizon turns over
+        first_yr = int(sorted(self.handyvars.aeo_years)[0])
 
         # Loop through and update stock, energy, and carbon mseg partitions for
         # each year in the modeling time horizon
@@ -8618,7 +9218,7 @@ class Measure(object):
                 # turnover, using the baseline lifetime (zero or negative
                 # value indicates turnover)
                 yrs_until_prevcapt_tover = int(life_base[yr]) - (
-                    int(yr) - int(sorted(self.handyvars.aeo_years)[0]))
+                    int(yr) - first_yr)
 
                 if not isinstance(yrs_until_prevcapt_tover, numpy.ndarray):
                     prev_capt_turnover = yrs_until_prevcapt_tover <= 0
@@ -8891,7 +9491,7 @@ class Measure(object):
                 # (to represent exogenous HP switching rates, if applicable)
                 # by further fraction to represent slow diffusion of info.
                 # for emerging technologies
-                diffuse_frac *= years_diff_fraction_dictionary[yr]
+                diffuse_frac *= diffuse_fracs[yr]
             # All other measure diffusion cases where diffusion scaling and
             # competed diffusion fractions were not already calculated
             elif not diffuse_frac_linked:
@@ -8904,7 +9504,7 @@ class Measure(object):
                 # (to represent exogenous HP switching rates, if applicable)
                 # by further fraction to represent slow diffusion of info.
                 # for emerging technologies
-                diffuse_frac *= years_diff_fraction_dictionary[yr]
+                diffuse_frac *= diffuse_fracs[yr]
             # Case where mseg's stock turnover and switching rates are linked
             # to another mseg and have already been calculated; set to those
             # rates, which were pulled above
@@ -13694,6 +14294,87 @@ class MeasurePackage(Measure):
         return pkg_brk
 
 
+# Read-only inputs shared across measures prepared in a worker process (set
+# once per worker by 'prep_worker_init')
+prep_worker_data = {}
+
+
+def prep_worker_init(handyvars, msegs, msegs_cpl, convert_data, tsv_data,
+                     opts, ctrb_ms_pkg_prep, tsv_data_nonfs):
+    """Store inputs common to all measures prepared in a worker process.
+
+    Args:
+        handyvars (object): Global variables of use across Measure methods.
+        msegs (dict): Baseline microsegment stock and energy use.
+        msegs_cpl (dict): Baseline technology cost, performance, and lifetime.
+        convert_data (dict): Measure cost unit conversion data.
+        tsv_data (dict): Data needed for time sensitive efficiency valuation.
+        opts (object): Stores user-specified execution options.
+        ctrb_ms_pkg_prep (list): Names of measures that contribute to pkgs.
+        tsv_data_nonfs (dict): If applicable, base-case TSV data to apply to
+            non-fuel switching measures under a high decarb. scenario.
+    """
+    # Global variables handed to a worker by pickle arrive as modifiable
+    # copies; ensure that they remain read-only
+    handyvars.freeze()
+    # Record the time and memory use of each measure's preparation if desired
+    prep_profiler.reset(opts.profile)
+    prep_worker_data.update({
+        "handyvars": handyvars, "msegs": msegs, "msegs_cpl": msegs_cpl,
+        "convert_data": convert_data, "tsv_data": tsv_data, "opts": opts,
+        "ctrb_ms_pkg_prep": ctrb_ms_pkg_prep,
+        "tsv_data_nonfs": tsv_data_nonfs})
+
+
+def prep_worker_measure(m):
+    """Check inputs for and finalize markets of a measure in a worker process.
+
+    Args:
+        m (object): Measure object to prepare.
+
+    Returns:
+        Prepared Measure object, a list of the error tracebacks (if any)
+        raised while checking its inputs and finalizing its markets, records
+        of the time and memory use of these phases (if profiled), and the
+        numbers of time-sensitive valuation factor lookups for the measure
+        that were and were not found in the worker's cache.
+    """
+    err_list = []
+    tsv_counts = (tsv_factor_cache.hits, tsv_factor_cache.misses)
+    # Re-attach global variables, which are not sent with each measure
+    m.handyvars.shared = prep_worker_data["handyvars"]
+    # Try/except allows continuation past malformed ECMs; modifications of
+    # shared data are errors in the code rather than the ECM, and are raised
+    try:
+        with prep_profiler.phase("check_meas_inputs", m.name):
+            m.check_meas_inputs()
+    except SharedDataError:
+        raise
+    except Exception:
+        err_list.append(traceback.format_exc())
+    # Try/except allows continuation when individual ECMs error
+    try:
+        with prep_profiler.phase("fill_mkts", m.name) as prof_rec:
+            m.fill_mkts(
+                prep_worker_data["msegs"], prep_worker_data["msegs_cpl"],
+                prep_worker_data["convert_data"], prep_worker_data["tsv_data"],
+                prep_worker_data["opts"], prep_worker_data["ctrb_ms_pkg_prep"],
+                prep_worker_data["tsv_data_nonfs"])
+            prof_rec["msegs"] = m.mseg_count()
+    except SharedDataError:
+        raise
+    except Exception:
+        err_list.append(traceback.format_exc())
+    # Hand back the records for the measure's phases
+    prof_recs, prep_profiler.records = prep_profiler.records, []
+    # Hand back the measure's cache lookups, which are otherwise only counted
+    # in the worker
+    tsv_counts = (tsv_factor_cache.hits - tsv_counts[0],
+                  tsv_factor_cache.misses - tsv_counts[1])
+
+    return m, err_list, prof_recs, tsv_counts
+
+
 def prepare_measures(measures, convert_data, msegs, msegs_cpl, handyvars,
                      handyfiles, cbecs_sf_byvint, tsv_data, base_dir, opts,
                      ctrb_ms_pkg_prep, tsv_data_nonfs):
@@ -13769,29 +14450,87 @@ def prepare_measures(measures, convert_data, msegs, msegs_cpl, handyvars,
     # preparation due to Exceptions
     remove_inds = []
 
-    # Check that all Measure objects have valid market inputs before proceeding
-    for m_ind, m in enumerate(meas_update_objs):
-        # Try/except allows continuation past malformed ECMs
-        try:
-            # Check that the measure's applicable baseline market input definitions
-            # are valid before attempting to retrieve data on this baseline market
-            m.check_meas_inputs()
-        except Exception:
-            prep_error(m.name, handyvars, handyfiles)
-            # Add measure index to removal list
-            remove_inds.append(m_ind)
-
-    # Finalize 'markets' attribute for all Measure objects
-    for m_ind, m in enumerate(meas_update_objs):
-        # Try/except allows continuation when individual ECMs error
-        try:
-            m.fill_mkts(
-                msegs, msegs_cpl, convert_data, tsv_data, opts,
-                ctrb_ms_pkg_prep, tsv_data_nonfs)
-        except Exception:
-            prep_error(m.name, handyvars, handyfiles)
-            # Add measure index to removal list
-            remove_inds.append(m_ind)
+    # Discard any time-sensitive valuation factors cached for data from a
+    # previous preparation run in this process
+    tsv_factor_cache.clear()
+
+    # Set the number of worker processes to use in preparing measures (no
+    # more workers than there are measures to prepare)
+    n_workers = min(opts.workers, len(meas_update_objs))
+
+    # Check inputs and finalize 'markets' attribute for Measure objects across
+    # a pool of worker processes; the large baseline inputs are handed to each
+    # worker once via the pool initializer rather than with every measure
+    if n_workers > 1:
+        logger.info("Preparing measures across " + str(n_workers) +
+                    " worker processes...")
+        with ProcessPoolExecutor(
+                max_workers=n_workers, initializer=prep_worker_init,
+                initargs=(handyvars, msegs, msegs_cpl, convert_data, tsv_data,
+                          opts, ctrb_ms_pkg_prep, tsv_data_nonfs)) as executor:
+            # Results are returned in the order measures were submitted,
+            # such that outputs match those of the serial preparation
+            for m_ind, (m, err_list, prof_recs, tsv_counts) in enumerate(
+                    executor.map(prep_worker_measure, meas_update_objs)):
+                # Re-attach global variables, which are not returned with
+                # each measure
+                m.handyvars.shared = handyvars
+                meas_update_objs[m_ind] = m
+                prep_profiler.add(prof_recs)
+                # Count the measure's time-sensitive valuation factor lookups
+                # in the workers with those of this process
+                tsv_factor_cache.hits += tsv_counts[0]
+                tsv_factor_cache.misses += tsv_counts[1]
+                # Report errors for the measure in the parent process, where
+                # skipped measures are tracked
+                for err_dets in err_list:
+                    prep_error(m.name, handyvars, handyfiles, err_dets)
+                    # Add measure index to removal list
+                    remove_inds.append(m_ind)
+    else:
+        # Check that all Measure objects have valid market inputs before
+        # proceeding
+        for m_ind, m in enumerate(meas_update_objs):
+            # Try/except allows continuation past malformed ECMs; modifications
+            # of shared data are errors in the code rather than the ECM, and
+            # are raised
+            try:
+                # Check that the measure's applicable baseline market input
+                # definitions are valid before attempting to retrieve data on
+                # this baseline market
+                with prep_profiler.phase("check_meas_inputs", m.name):
+                    m.check_meas_inputs()
+            except SharedDataError:
+                raise
+            except Exception:
+                prep_error(m.name, handyvars, handyfiles)
+                # Add measure index to removal list
+                remove_inds.append(m_ind)
+
+        # Finalize 'markets' attribute for all Measure objects
+        for m_ind, m in enumerate(meas_update_objs):
+            # Try/except allows continuation when individual ECMs error
+            try:
+                with prep_profiler.phase("fill_mkts", m.name) as prof_rec:
+                    m.fill_mkts(
+                        msegs, msegs_cpl, convert_data, tsv_data, opts,
+                        ctrb_ms_pkg_prep, tsv_data_nonfs)
+                    prof_rec["msegs"] = m.mseg_count()
+            except SharedDataError:
+                raise
+            except Exception:
+                prep_error(m.name, handyvars, handyfiles)
+                # Add measure index to removal list
+                remove_inds.append(m_ind)
+
+    # Report reuse of time-sensitive valuation factors across measures (in
+    # the case of worker processes, reuse across measures prepared by the
+    # same worker)
+    if tsv_factor_cache.hits or tsv_factor_cache.misses:
+        logger.info(
+            "Time-sensitive valuation factors reused " +
+            str(tsv_factor_cache.hits) + " times, calculated " +
+            str(tsv_factor_cache.misses) + " times")
 
     # Remove measure objects with exceptions from further preparation
     meas_update_objs = [
@@ -13856,20 +14595,16 @@ def prepare_packages(packages, meas_update_objs, meas_summary,
                     # high level summary data (reformatted during initialization)
                     meas_obj.technology_type = meas_summary_data[0][
                         "technology_type"]
-                    # Assemble folder path for measure competition data
-                    meas_folder_name = handyfiles.ecm_compete_data
-                    # Assemble file name for measure competition data
-                    meas_file_name = meas_obj.name + ".pkl.gz"
                     # Load and set competition data for the missing measure object
-                    with gzip.open(meas_folder_name / meas_file_name, 'r') as zp:
-                        try:
-                            meas_comp_data = pickle.load(zp)
-                        except Exception as e:
-                            raise Exception(
-                                "Error reading in competition data of " +
-                                "contributing ECM '" + meas_obj.name +
-                                "' for package '" + p["name"] + "': " +
-                                str(e)) from None
+                    try:
+                        meas_comp_data = Utils.load_comp_data(
+                            handyfiles.ecm_compete_data, meas_obj.name)
+                    except Exception as e:
+                        raise Exception(
+                            "Error reading in competition data of " +
+                            "contributing ECM '" + meas_obj.name +
+                            "' for package '" + p["name"] + "': " +
+                            str(e)) from None
                     for adopt_scheme in handyvars.adopt_schemes_prep:
                         meas_obj.markets[adopt_scheme]["master_mseg"] = \
                             meas_summary_data[0]["markets"][adopt_scheme][
@@ -13924,24 +14659,29 @@ def prepare_packages(packages, meas_update_objs, meas_summary,
             # for further evaluation like any other regular measure
             if packaged_measure is not False:
                 meas_update_objs.append(packaged_measure)
+        except SharedDataError:
+            raise
         except Exception:
             prep_error(p["name"], handyvars, handyfiles)
 
     return meas_update_objs
 
 
-def prep_error(meas_name, handyvars, handyfiles):
+def prep_error(meas_name, handyvars, handyfiles, err_dets=None):
     """Prepare and write out error messages for skipped measures/packages.
 
     Args:
         meas_name (str): Measure or package name.
         handyvars (object): Global variables of use across Measure methods.
         handyfiles (object): Input files of use across Measure methods.
+        err_dets (str): Error traceback, if already pulled (e.g., from a
+            worker process); defaults to the exception currently handled.
     """
     # # Complete the update to the console for each measure being processed
     # print("Error")
     # Pull full error traceback
-    err_dets = traceback.format_exc()
+    if err_dets is None:
+        err_dets = traceback.format_exc()
     # Construct error message to write out
     err_msg = (
         "\nECM '" + meas_name + "' produced the following exception that "
@@ -14749,6 +15489,113 @@ def dict_raise_on_duplicates(ordered_pairs):
     return d
 
 
+def import_supporting_data(handyfiles, handyvars, opts, meas_toprep_indiv):
+    """Import baseline, conversion, and time sensitive data to prepare measures with.
+
+    Args:
+        handyfiles (object): Input files of use across Measure methods.
+        handyvars (object): Global variables of use across Measure methods.
+        opts (object): Stores user-specified execution options.
+        meas_toprep_indiv (list): Individual measure definitions to prepare.
+
+    Returns:
+        Baseline microsegment stock and energy use, baseline technology cost,
+        performance, and lifetime, measure cost unit conversion data,
+        commercial square footage by vintage data, and (if applicable) data
+        needed for time sensitive efficiency valuation, including base-case
+        data to apply to non-fuel switching measures.
+    """
+    # Large baseline and time sensitive data files are read through
+    # memory-mapped binary copies that are compiled on first use
+    mapped_json = MappedJSON(handyfiles.mapped_inputs)
+    # Import baseline microsegments (gzipped for EMM/state regions)
+    msegs = mapped_json.load(handyfiles.msegs_in)
+    # Import baseline cost, performance, and lifetime data
+    msegs_cpl = mapped_json.load(handyfiles.msegs_cpl_in)
+    # Import measure cost unit conversion data
+    convert_data = Utils.load_json(handyfiles.cost_convert_in)
+    # Import CBECS square footage by vintage data (used to map EnergyPlus
+    # commercial building vintages to Scout building vintages)
+    cbecs_sf_byvint = Utils.load_json(handyfiles.cbecs_sf_byvint)[
+        "commercial square footage by vintage"]
+    if (opts.alt_regions in ['EMM', 'State'] and ((
+            opts.tsv_metrics is not False or any([
+            ("tsv_features" in m.keys() and m["tsv_features"] is not None)
+            for m in meas_toprep_indiv])) or
+            opts is not None and opts.sect_shapes is True)):
+        # Import load, price, and emissions shape data needed for time
+        # sensitive analysis of measure energy efficiency impacts
+        tsv_load_data = mapped_json.load(
+            handyfiles.tsv_load_data.with_suffix('.gz'))
+        # When sector shapes are specified and no other time sensitive
+        # valuation or features are present, assume that hourly price
+        # and emissions data will not be needed
+        if ((opts.sect_shapes is True)
+            and opts.tsv_metrics is False and all([(
+                "tsv_features" not in m.keys() or
+                m["tsv_features"] is None) for m in meas_toprep_indiv])):
+            tsv_data, tsv_data_nonfs = ({
+                "load": tsv_load_data, "price": None,
+                "price_yr_map": None, "emissions": None,
+                "emissions_yr_map": None} for n in range(2))
+        else:
+            tsv_cost_data = mapped_json.load(
+                handyfiles.tsv_cost_data.with_suffix('.gz'))
+            # Case where the user assesses time sensitive cost
+            # factors for before grid decarbonization for non-fuel
+            # switching measures
+            if handyfiles.tsv_cost_data_nonfs is not None:
+                tsv_cost_nonfs_data = mapped_json.load(
+                    handyfiles.tsv_cost_data_nonfs.with_suffix('.gz'))
+            else:
+                tsv_cost_nonfs_data = None
+
+            tsv_carbon_data = mapped_json.load(
+                handyfiles.tsv_carbon_data.with_suffix('.gz'))
+            # Case where the user assesses time sensitive emissions
+            # factors for before grid decarbonization for non-fuel
+            # switching measures
+            if handyfiles.tsv_carbon_data_nonfs is not None:
+                tsv_carbon_nonfs_data = mapped_json.load(
+                    handyfiles.tsv_carbon_data_nonfs.with_suffix('.gz'))
+            else:
+                tsv_carbon_nonfs_data = None
+
+            # Map years available in 8760 TSV cost/carbon data to AEO yrs.
+            tsv_cost_yrmap = tsv_cost_carb_yrmap(
+                tsv_cost_data["electricity price shapes"],
+                handyvars.aeo_years)
+            tsv_carbon_yrmap = tsv_cost_carb_yrmap(
+                tsv_carbon_data["average carbon emissions rates"],
+                handyvars.aeo_years)
+            # Stitch together load shape, cost, emissions, and year
+            # mapping datasets
+            tsv_data = {
+                "load": tsv_load_data, "price": tsv_cost_data,
+                "price_yr_map": tsv_cost_yrmap,
+                "emissions": tsv_carbon_data,
+                "emissions_yr_map": tsv_carbon_yrmap}
+            # Case where the user assesses time sensitive emissions/cost
+            # factors for before grid decarbonization for non-fuel
+            # switching measures
+            if all([x is not None for x in [
+                    tsv_cost_nonfs_data, tsv_carbon_nonfs_data]]):
+                tsv_data_nonfs = {
+                    "load": tsv_load_data, "price": tsv_cost_nonfs_data,
+                    "price_yr_map": tsv_cost_yrmap,
+                    "emissions": tsv_carbon_nonfs_data,
+                    "emissions_yr_map": tsv_carbon_yrmap}
+            else:
+                tsv_data_nonfs = None
+
+    else:
+        tsv_data, tsv_data_nonfs = (None for n in range(2))
+
+    logger.info("Supporting data import complete")
+
+    return msegs, msegs_cpl, convert_data, cbecs_sf_byvint, tsv_data, tsv_data_nonfs
+
+
 def main(opts: argparse.NameSpace):  # noqa: F821
     """Import and prepare measure attributes for analysis engine.
 
@@ -14764,6 +15611,9 @@ def main(opts: argparse.NameSpace):  # noqa: F821
 
     # Configure logger specific to ecm_prep
     configure_ecm_prep_logger(opts)
+    # Record the time and memory use of each phase of the routine if desired
+    prep_profiler.reset(opts.profile)
+    prof_rec = prep_profiler.start("load inputs")
 
     # Set current working directory
     base_dir = getcwd()
@@ -14910,18 +15760,18 @@ def main(opts: argparse.NameSpace):  # noqa: F821
             # or e) command line arguments applied to the measure are not
             # consistent with those reported out the last time the measure
             # was prepared (based on 'usr_opts' attribute), excepting
-            # the 'verbose', 'yaml', and 'ecm_directory' options, which have no bearing
+            # the 'verbose', 'yaml', 'ecm_directory', 'workers', 'no_cache',
+            # 'comp_data_format', and 'profile' options, which have no bearing
             # on results
             compete_files = [x for x in handyfiles.ecm_compete_data.iterdir() if not
                              x.name.startswith('.')]
-            ignore_opts = ["verbose", "yaml", "ecm_directory", "ecm_files", "ecm_files_user",
-                           "ecm_packages", "ecm_files_regex"]
+            ignore_opts = ECMPrepCache.ignore_opts
             update_indiv_ecm = ((ecm_prep_exists and stat(
                 handyfiles.indiv_ecms / mi).st_mtime > stat(
                 handyfiles.ecm_prep).st_mtime) or
                 (len(match_in_prep_file) == 0 or (
                     "(CF)" not in meas_dict["name"] and all([all([
-                        x["name"] != Path(y.stem).stem for y in
+                        x["name"] != Utils.comp_data_name(y) for y in
                         compete_files]) for
                         x in match_in_prep_file])) or
                     (opts is None and not all([all([
@@ -15206,7 +16056,7 @@ def main(opts: argparse.NameSpace):  # noqa: F821
         # costs (if applicable) than in the current run
 
         # Check for existing competition data for the package (condition b)
-        name_mask = all(m["name"] != Path(y.stem).stem for y in
+        name_mask = all(m["name"] != Utils.comp_data_name(y) for y in
                         handyfiles.ecm_compete_data.iterdir())
         exst_ecms_mask = exst_engy_save_mask = exst_cost_red_mask = False
         exst_pkg_env_mask_1 = exst_pkg_env_mask_2 = False
@@ -15276,123 +16126,41 @@ def main(opts: argparse.NameSpace):  # noqa: F821
     meas_toprep_indiv = [m for m in meas_toprep_indiv if any([
         m["name"] in x for x in [meas_toprep_indiv_nopkg, ctrb_ms_pkg_prep]])]
 
-    logger.info("Importing supporting data...")
+    # Restore data for measures whose definitions, results-relevant user
+    # options, and input data are unchanged since they were last prepared
+    # from the cache of prepared measures, unless the user disables the cache
+    if opts.no_cache is not True:
+        ecm_cache = ECMPrepCache(handyfiles, handyvars, opts)
+        meas_toprep_indiv, meas_cached = ecm_cache.restore(
+            meas_toprep_indiv, ctrb_ms_pkg_prep, handyfiles)
+        if len(meas_cached) != 0:
+            logger.info("Restored " + str(len(meas_cached)) +
+                        " unchanged ECM(s) from the cache")
+    else:
+        ecm_cache, meas_cached = None, []
+    prep_profiler.stop(prof_rec)
+
     # If one or more measure definition is new or has been edited, proceed
     # further with 'ecm_prep.py' routine; otherwise end the routine
-    if len(meas_toprep_indiv) > 0 or len(meas_toprep_package) > 0:
-        # Import baseline microsegments
-        if opts.alt_regions in ['EMM', 'State']:  # Extract EMM/state files
-            bjszip = handyfiles.msegs_in
-            with gzip.GzipFile(bjszip, 'r') as zip_ref:
-                msegs = json.loads(zip_ref.read().decode('utf-8'))
-        else:
-            msegs = Utils.load_json(handyfiles.msegs_in)
-        # Import baseline cost, performance, and lifetime data
-        bjszip = handyfiles.msegs_cpl_in
-        with gzip.GzipFile(bjszip, 'r') as zip_ref:
-            msegs_cpl = json.loads(zip_ref.read().decode('utf-8'))
-        # Import measure cost unit conversion data
-        convert_data = Utils.load_json(handyfiles.cost_convert_in)
-        # Import CBECS square footage by vintage data (used to map EnergyPlus
-        # commercial building vintages to Scout building vintages)
-        cbecs_sf_byvint = Utils.load_json(handyfiles.cbecs_sf_byvint)[
-            "commercial square footage by vintage"]
-        if (opts.alt_regions in ['EMM', 'State'] and ((
-                opts.tsv_metrics is not False or any([
-                ("tsv_features" in m.keys() and m["tsv_features"] is not None)
-                for m in meas_toprep_indiv])) or
-                opts is not None and opts.sect_shapes is True)):
-            # Import load, price, and emissions shape data needed for time
-            # sensitive analysis of measure energy efficiency impacts
-            tsv_l = handyfiles.tsv_load_data
-            tsv_l_zip = tsv_l.with_suffix('.gz')
-            with gzip.GzipFile(tsv_l_zip, 'r') as zip_ref_l:
-                tsv_load_data = json.loads(zip_ref_l.read().decode('utf-8'))
-            # When sector shapes are specified and no other time sensitive
-            # valuation or features are present, assume that hourly price
-            # and emissions data will not be needed
-            if ((opts.sect_shapes is True)
-                and opts.tsv_metrics is False and all([(
-                    "tsv_features" not in m.keys() or
-                    m["tsv_features"] is None) for m in meas_toprep_indiv])):
-                tsv_data, tsv_data_nonfs = ({
-                    "load": tsv_load_data, "price": None,
-                    "price_yr_map": None, "emissions": None,
-                    "emissions_yr_map": None} for n in range(2))
-            else:
-                tsv_c = handyfiles.tsv_cost_data
-                tsv_c_zip = tsv_c.with_suffix('.gz')
-                with gzip.GzipFile(tsv_c_zip, 'r') as zip_ref_c:
-                    tsv_cost_data = \
-                        json.loads(zip_ref_c.read().decode('utf-8'))
-                # Case where the user assesses time sensitive cost
-                # factors for before grid decarbonization for non-fuel
-                # switching measures
-                if handyfiles.tsv_cost_data_nonfs is not None:
-                    tsv_c_nonfs = handyfiles.tsv_cost_data_nonfs
-                    tsv_c_nonfs_zip = tsv_c_nonfs.with_suffix('.gz')
-                    with gzip.GzipFile(tsv_c_nonfs_zip, 'r') as \
-                            zip_ref_nonfs_c:
-                        tsv_cost_nonfs_data = \
-                            json.loads(zip_ref_nonfs_c.read().decode('utf-8'))
-                else:
-                    tsv_cost_nonfs_data = None
-
-                tsv_cb = handyfiles.tsv_carbon_data
-                tsv_cb_zip = tsv_cb.with_suffix('.gz')
-                with gzip.GzipFile(tsv_cb_zip, 'r') as zip_ref_cb:
-                    tsv_carbon_data = \
-                        json.loads(zip_ref_cb.read().decode('utf-8'))
-                # Case where the user assesses time sensitive emissions
-                # factors for before grid decarbonization for non-fuel
-                # switching measures
-                if handyfiles.tsv_carbon_data_nonfs is not None:
-                    tsv_cb_nonfs = handyfiles.tsv_carbon_data_nonfs
-                    tsv_cb_nonfs_zip = tsv_cb_nonfs.with_suffix('.gz')
-                    with gzip.GzipFile(tsv_cb_nonfs_zip, 'r') as \
-                            zip_ref_nonfs_cb:
-                        tsv_carbon_nonfs_data = \
-                            json.loads(zip_ref_nonfs_cb.read().decode('utf-8'))
-                else:
-                    tsv_carbon_nonfs_data = None
-
-                # Map years available in 8760 TSV cost/carbon data to AEO yrs.
-                tsv_cost_yrmap = tsv_cost_carb_yrmap(
-                    tsv_cost_data["electricity price shapes"],
-                    handyvars.aeo_years)
-                tsv_carbon_yrmap = tsv_cost_carb_yrmap(
-                    tsv_carbon_data["average carbon emissions rates"],
-                    handyvars.aeo_years)
-                # Stitch together load shape, cost, emissions, and year
-                # mapping datasets
-                tsv_data = {
-                    "load": tsv_load_data, "price": tsv_cost_data,
-                    "price_yr_map": tsv_cost_yrmap,
-                    "emissions": tsv_carbon_data,
-                    "emissions_yr_map": tsv_carbon_yrmap}
-                # Case where the user assesses time sensitive emissions/cost
-                # factors for before grid decarbonization for non-fuel
-                # switching measures
-                if all([x is not None for x in [
-                        tsv_cost_nonfs_data, tsv_carbon_nonfs_data]]):
-                    tsv_data_nonfs = {
-                        "load": tsv_load_data, "price": tsv_cost_nonfs_data,
-                        "price_yr_map": tsv_cost_yrmap,
-                        "emissions": tsv_carbon_nonfs_data,
-                        "emissions_yr_map": tsv_carbon_yrmap}
-                else:
-                    tsv_data_nonfs = None
-
+    if len(meas_toprep_indiv) > 0 or len(meas_toprep_package) > 0 or \
+            len(meas_cached) > 0:
+        # Import supporting data, unless all measures are restored from cache
+        if len(meas_toprep_indiv) > 0 or len(meas_toprep_package) > 0:
+            logger.info("Importing supporting data...")
+            with prep_profiler.phase("import_supporting_data"):
+                msegs, msegs_cpl, convert_data, cbecs_sf_byvint, tsv_data, \
+                    tsv_data_nonfs = import_supporting_data(
+                        handyfiles, handyvars, opts, meas_toprep_indiv)
         else:
-            tsv_data, tsv_data_nonfs = (None for n in range(2))
-
-        logger.info("Supporting data import complete")
+            msegs, msegs_cpl, convert_data, cbecs_sf_byvint, tsv_data, \
+                tsv_data_nonfs = (None for n in range(6))
 
         # Prepare new or edited measures for use in analysis engine
-        meas_prepped_objs = prepare_measures(
-            meas_toprep_indiv, convert_data, msegs, msegs_cpl, handyvars,
-            handyfiles, cbecs_sf_byvint, tsv_data, base_dir, opts,
-            ctrb_ms_pkg_prep, tsv_data_nonfs)
+        with prep_profiler.phase("prepare_measures"):
+            meas_prepped_objs = prepare_measures(
+                meas_toprep_indiv, convert_data, msegs, msegs_cpl, handyvars,
+                handyfiles, cbecs_sf_byvint, tsv_data, base_dir, opts,
+                ctrb_ms_pkg_prep, tsv_data_nonfs)
 
         # If there are skipped ECMs, remove any packages that depend on them
         # To do so, obtain list of ECMs with the skipped ECMs excluded; thus
@@ -15408,9 +16176,10 @@ def main(opts: argparse.NameSpace):  # noqa: F821
 
         # Prepare measure packages for use in analysis engine (if needed)
         if meas_toprep_package:
-            meas_prepped_objs = prepare_packages(
-                meas_toprep_package, meas_prepped_objs, meas_summary,
-                handyvars, handyfiles, base_dir, opts, convert_data)
+            with prep_profiler.phase("prepare_packages"):
+                meas_prepped_objs = prepare_packages(
+                    meas_toprep_package, meas_prepped_objs, meas_summary,
+                    handyvars, handyfiles, base_dir, opts, convert_data)
 
         # Warn users about skipped ECMs before completing prep execution
         if len(handyvars.skipped_ecms) != 0:
@@ -15437,9 +16206,27 @@ def main(opts: argparse.NameSpace):  # noqa: F821
         # Split prepared measure data into subsets needed to set high-level
         # measure attributes information and to execute measure competition
         # in the analysis engine
-        meas_prepped_compete, meas_prepped_summary, meas_prepped_shapes, \
-            meas_eff_fs_splt = split_clean_data(
-                meas_prepped_objs, handyvars.full_dat_out)
+        with prep_profiler.phase("split_clean_data"):
+            meas_prepped_compete, meas_prepped_summary, meas_prepped_shapes, \
+                meas_eff_fs_splt = split_clean_data(
+                    meas_prepped_objs, handyvars.full_dat_out)
+
+        if ecm_cache is not None:
+            # Cache data for newly prepared measures (packages and measures
+            # that contribute to them are not cached)
+            for m_i in range(len(meas_prepped_summary)):
+                ecm_cache.store(
+                    meas_prepped_compete[m_i], meas_prepped_summary[m_i],
+                    meas_prepped_shapes[m_i], meas_eff_fs_splt[m_i])
+            ecm_cache.save()
+            # Add data for measures restored from the cache to the data for
+            # newly prepared measures, reflecting current user options
+            for m in meas_cached:
+                m["summary"]["usr_opts"] = vars(opts)
+                meas_prepped_compete.append(m["compete"])
+                meas_prepped_summary.append(m["summary"])
+                meas_prepped_shapes.append(m["shapes"])
+                meas_eff_fs_splt.append(m["eff_fs_splt"])
 
         # Add all prepared high-level measure information to existing
         # high-level data and to list of active measures for analysis;
@@ -15504,28 +16291,30 @@ def main(opts: argparse.NameSpace):  # noqa: F821
         logger.info("Writing output data...")
 
         # Write prepared measure competition data and (if applicable) efficient
-        # fuel switching splits by microsegment to zipped JSONs
-        for ind, m in enumerate(meas_prepped_objs):
+        # fuel switching splits by microsegment to pickle files
+        for ind, m in enumerate(meas_prepped_summary):
             # Ensure that competed data is not written out for
             # counterfactual measures or measures that contribute to
             # packages, with the exception of HVAC measures in a package that
             # the user has requested be written out for eventual competition
             # with the packages they contribute to
-            if "(CF)" not in m.name and (
-                    m.name not in ctrb_ms_pkg_prep or (
+            if "(CF)" not in m["name"] and (
+                    m["name"] not in ctrb_ms_pkg_prep or (
                     opts.pkg_env_costs == '1' and
-                    m.technology_type["primary"][0] == "supply")):
-                # Assemble file name for measure competition data
-                meas_file_name = m.name + ".pkl.gz"
-                # Assemble folder path for measure competition data
-                comp_folder_name = handyfiles.ecm_compete_data
-                with gzip.open(comp_folder_name / meas_file_name, 'w') as zp:
-                    pickle.dump(meas_prepped_compete[ind], zp, -1)
+                    m["technology_type"]["primary"][0] == "supply")):
+                prof_rec = prep_profiler.start(
+                    "write competition data", m["name"])
+                # Write measure competition data in the user-specified format
+                Utils.dump_comp_data(
+                    meas_prepped_compete[ind], handyfiles.ecm_compete_data,
+                    m["name"], opts.comp_data_format)
                 if len(meas_eff_fs_splt[ind].keys()) != 0:
-                    # Assemble path for measure efficient fs split data
-                    fs_splt_folder_name = handyfiles.ecm_eff_fs_splt_data
-                    with gzip.open(fs_splt_folder_name / meas_file_name, 'w') as zp:
-                        pickle.dump(meas_eff_fs_splt[ind], zp, -1)
+                    # Write measure efficient fs split data
+                    Utils.dump_comp_data(
+                        meas_eff_fs_splt[ind], handyfiles.ecm_eff_fs_splt_data,
+                        m["name"], opts.comp_data_format)
+                prep_profiler.stop(prof_rec)
+        prof_rec = prep_profiler.start("write JSON outputs")
         # Write prepared high-level measure attributes data to JSON
         Utils.dump_json(meas_summary, handyfiles.ecm_prep)
         # If applicable, write sector shape data to JSON
@@ -15555,11 +16344,17 @@ def main(opts: argparse.NameSpace):  # noqa: F821
             "out_break_eus_w_fsplits": handyvars.out_break_eus_w_fsplits
         }
         Utils.dump_json(glob_vars, handyfiles.glob_vars)
+        prep_profiler.stop(prof_rec)
     else:
         logger.info("No new ECM updates available")
 
     # Write lists of active/inactive measures to be used in the analysis engine
     Utils.dump_json(run_setup, handyfiles.run_setup)
+    # Write reports of the time and memory use of each phase if desired
+    if opts.profile is True:
+        prep_profiler.write(handyfiles.profile)
+        logger.info("Profile of ECM preparation written to " +
+                    str(handyfiles.profile) + ".json/.csv")
 
 
 if __name__ == "__main__":
@@ -24,15 +24,30 @@ script checks for the correct input file and produces an instructive
 error message if the file is missing.
 """
 
+import argparse
 import copy
+import os
 import numpy as np
 import json
 import functools as ft
 import math
-import gzip
+import numbers
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from scout import mseg, com_mseg as cm
 from scout.config import FilePaths as fp
+from scout.json_writer import dump_json
+
+# Codes for the type of data to convert (1 – Energy, stock, and square
+# footage data; 2 – Cost, performance, and lifetime data) and the regional
+# breakdown to use (1 – AIA climate zones; 2 – EMM regions; 3 – States)
+# that correspond to the names used in batch mode targets
+BATCH_DATA_TYPES = {"energy": '1', "stock": '1', "cpl": '2'}
+BATCH_GEO_BREAKS = {"aia": '1', "emm": '2', "state": '3'}
+
+# Census division data shared by the targets converted in a batch mode
+# worker process, keyed by the code for the type of data
+convert_worker_data = {}
 
 
 class UsefulVars(object):
@@ -612,37 +627,12 @@ def merge_sum(base_dict, add_dict, cd_num, reg_name, res_convert_array,
         values for the particular census division specified in 'cd'
         converted to the custom region 'cz'.
     """
-    # List of fuel types to iterate over for updating with corresponding conversion factors.
-    fuel_types = ["electricity", "natural gas", "distillate", "other fuel"]
     # Initialize key_list with an empty array prior to looping through the
     # microsegments database structure.
     if key_list is None:
         key_list = []
 
-    import numbers
     import warnings
-    import copy
-
-    def _is_number(x):
-        return isinstance(x, numbers.Number)
-
-    def _to_list_of_lists(lst):
-        """Wrap flat list -> list-of-lists, keep list-of-lists unchanged."""
-        if lst and _is_number(lst[0]):
-            return [lst]
-        return lst
-
-    def _pad_with_zeros(a, b):
-        """
-        Pad the shorter of two *lists of lists* with zero-vectors so that
-        their lengths match. Keeps arithmetic aligned.
-        """
-        max_len = max(len(a), len(b))
-        elem_len = len(a[0]) if a else len(b[0]) if b else 2
-        zero_vec = [0.0] * elem_len
-        a.extend(copy.deepcopy(zero_vec) for _ in range(max_len - len(a)))
-        b.extend(copy.deepcopy(zero_vec) for _ in range(max_len - len(b)))
-        return a, b
 
     # Loop through both dicts to find all keys
     for (k, i) in sorted(base_dict.items()):
@@ -662,150 +652,14 @@ def merge_sum(base_dict, add_dict, cd_num, reg_name, res_convert_array,
         # and lifetime data are being processed, skip the "unspecified"
         # building type and the "other" end use where it appears as
         # an unmodified zero in certain building and fuel type combinations
-        if not (
-            cpl and (
-                (k == 'other' and not isinstance(i, dict)) or
-                k == 'unspecified')):
-            # Identify appropriate census division to custom region
-            # conversion weighting factor array as a function of building
-            # type; k and k2 correspond to the current top level/parent key,
-            # thus k and k2 are equal to a building type immediately
-            # prior to traversing the entire child tree for that
-            # building type, for which the conversion number array
-            # cd_to_cz_factor will be the same. Ensure that the walk is
-            # currently at the building type level by checking keys from the
-            # next level down (the fuel type level) against expected fuel types
-            # Record building type flag
-            if ((k in flag_map_dat["res_bldg_types"] and
-                any([x in flag_map_dat["res_fuel_types"] for
-                     x in base_dict[k].keys()])) or
-                (k in flag_map_dat["com_bldg_types"] and
-                    any([x in flag_map_dat["com_fuel_types"] for
-                        x in base_dict[k].keys()]))):
-                if k in flag_map_dat["res_bldg_types"]:
-                    cd_to_cz_factor = res_convert_array
-                    bldg_flag = "res"
-                elif k in flag_map_dat["com_bldg_types"]:
-                    cd_to_cz_factor = com_convert_array
-                    bldg_flag = "com"
-            # Flag the current fuel type being updated, which is relevant
-            # to ultimate selection of conversion factor from the conversion
-            # array when translating to EMM region or state, in which case
-            # conversion factors are different for different fuels. Use the
-            # expectation that conversion arrays will be in dict format in the
-            # EMM region or state case (with keys for fuel conversion factors)
-            # to trigger the fuel flag update
-            elif (k in flag_map_dat["res_fuel_types"] or
-                    k in flag_map_dat["com_fuel_types"]) and \
-                    type(res_convert_array) is dict:
-                fuel_flag = k
-            # When updating total building stock or square footage data for
-            # EMM regions or states, which are not keyed by fuel type, set the
-            # fuel type flag accordingly; for states, this will pull in
-            # mapping data based on consumption splits across all fuels; for
-            # EMM regions, this will pull in mapping data based on
-            # total electricity
-            elif (k in ["total homes", "new homes", "total square footage",
-                        "new square footage"]):
-                fuel_flag = "building stock and square footage"
-
-            # Flag the current end use being updated, which is relevant to
-            # ultimate selection of conversion factor from the conversion
-            # array when translating electricity stock/energy data to EMM
-            # region or state, in which case conversion factors are based on
-            # the EULP and are different for different end uses
-            elif (fuel_flag and fuel_flag in fuel_types) and \
-                (type(cd_to_cz_factor[fuel_flag]) is dict) and \
-                any([k in x for x in [flag_map_dat["res_eus"],
-                                      flag_map_dat["com_eus"]]]):
-
-                if k == "ventilation":
-                    # Only process "ventilation" if the fuel type is "electricity"
-                    # and the parent end use is "fans and pumps"
-                    if fuel_flag != "electricity" or "fans and pumps" not in key_list:
-                        eu_flag = "misc"  # Skip mapping to EULP data
-                    else:
-                        eu_find = [i[0] for i in flag_map_dat["eulp_map"][fuel_flag].items()
-                                   if k in i[1]]
-                        if len(eu_find) == 1:
-                            eu_flag = eu_find[0]
-                        else:
-                            raise ValueError(
-                                "Could not match Scout end use: " + bldg_flag +
-                                " " + fuel_flag + " " + " " + k + " to EULP data")
-                # Handle special cases of "other" end use technologies in
-                # Scout, which are sometimes handled at the end-use level in
-                # the EULP data (e.g., washing), and the case of cooking,
-                # which has EULP data for residential but not commercial
-                elif k != "other" and (k != "cooking" or (
-                        k == "cooking" and bldg_flag == "res")):
-                    # Find the EULP end use for the current Scout end use
-                    eu_find = [i[0] for i in flag_map_dat["eulp_map"][fuel_flag].items()
-                               if k in i[1]]
-                    # If there was not a unique match, warn user
-                    if len(eu_find) == 1:
-                        eu_flag = eu_find[0]
-                    else:
-                        raise ValueError(
-                            "Could not match Scout end use: " + bldg_flag +
-                            " " + fuel_flag + " " + " " + k + " to EULP data")
-                else:
-                    eu_flag = "misc"
-
-            # Process end uses/technologies that were not initially matched
-            # in the clause above
-            elif eu_flag == "misc":
-                # Case where "other" tech. in Scout data is assigned unique
-                # end-use profile in the EULP data; match tech. to EULP end use
-                if k in flag_map_dat["eulp_other_tech"]:
-                    # Find the EULP end use for the current Scout technology;
-                    # note that technology name will be included in EULP
-                    # mapping dict items w/ "other", e.g., "other-[tech name]"
-                    eu_find = [
-                        i[0] for i in flag_map_dat["eulp_map"][fuel_flag].items() if any([
-                            k in x for x in i[1]])]
-                    # If there was not a unique match, warn user
-                    if len(eu_find) == 1:
-                        eu_flag = eu_find[0]
-                    else:
-                        raise ValueError(
-                            "Could not match Scout end use: "
-                            + bldg_flag + " " + fuel_flag + " " +
-                            " " + k + " to EULP data")
-                # All other cases without unique EULP end-use profiles are
-                # assigned to the miscellaneous profile
-                else:
-                    eu_flag = "misc"
-            # Flag for technology type if heating or cooling end use
-            elif k in ["supply", "demand"]:
-                tech_typ_flag = k
-            # For electric heating and cooling end uses, which may have factors further
-            # disaggregated by equipment type, flag the technology currently being updated
-            elif fuel_flag == "electricity" and eu_flag in ["heating", "cooling"]:
-                # For equipment ('supply'), aggregation factors will be keyed in by equipment name
-                if tech_typ_flag == "supply":
-                    # Check which technology name the current Scout equipment type maps to in the
-                    # EULP disaggregation factors and set that name as the technology flag to use
-                    # in pulling the factors later
-                    if any([k in x[1] for x in flag_map_dat[
-                            "eulp_map"]["electric technologies"][bldg_flag].items()]):
-                        tech_flag = [x[0] for x in flag_map_dat["eulp_map"][
-                            "electric technologies"][bldg_flag].items() if k in x[1]][0]
-                    # If still at the equipment level (e.g., not at the energy/stock key level below
-                    # it or at the year level below that) and there was no mapping available for a
-                    # technology that should have it, throw an error
-                    elif isinstance(i, dict) and k not in ["energy", "stock"]:
-                        raise ValueError(
-                            "Cannot map Scout technology " + k + " to any technology name in the "
-                            "EULP-based disaggregation factors")
-                # For envelope ('demand'), aggregation factors will be summarized across 'all'
-                # heating and cooling technologies (e.g., equivalent to end-use-level disagg.)
-                elif tech_typ_flag == "demand":
-                    tech_flag = "all"
-                # Ensure that technology type is either supply (equipment) or demand (envelope)
-                else:
-                    raise ValueError("Technology type " + tech_typ_flag + " unexpected for "
-                                     "heating or cooling end use; must be 'supply' or 'demand'.")
+        if not skip_cpl_key(k, i, cpl):
+            # Update the flags used to select the conversion factor
+            cd_to_cz_factor, bldg_flag, fuel_flag, eu_flag, tech_typ_flag, \
+                tech_flag = mseg_flags(
+                    k, base_dict, (cd_to_cz_factor, bldg_flag, fuel_flag,
+                                   eu_flag, tech_typ_flag, tech_flag),
+                    res_convert_array, com_convert_array, flag_map_dat,
+                    key_list)
 
             # Recursively loop through both dicts
             if isinstance(i, dict):
@@ -815,89 +669,12 @@ def merge_sum(base_dict, add_dict, cd_num, reg_name, res_convert_array,
                           tech_typ_flag, tech_flag, stock_energy_flag=current_stock_energy_flag,
                           key_list=key_list + [k])
             elif type(base_dict[k]) is not str:
-                # Check whether the conversion array needs to be further keyed
-                # by fuel type and by end use, as is the case when converting to EMM region or
-                # state and using EULP data to disaggregate to those regions; in such cases, the
-                # fuel and end use flags indicate the key values for pulling appropriate data
-
-                if type(cd_to_cz_factor) is dict:
-                    # Data may be further broken out by end use
-                    if (fuel_flag and fuel_flag in fuel_types) and eu_flag:
-
-                        # Ensure that data for the current end use can be
-                        # pulled and that data converted from pandas df
-                        # are in format that is JSON serializable
-                        try:
-                            # Restrict conversion array by fuel, stock/energy var, and end use
-                            convert_array = cd_to_cz_factor[
-                                fuel_flag][current_stock_energy_flag][eu_flag]
-                            # Case where technology-specific factors are available
-                            if tech_flag and "Technology" in convert_array.dtype.names:
-                                convert_fact_init = float(convert_array[convert_array[
-                                    'Technology'] == tech_flag][cd_num][reg_name])
-                            # Case where technology-specific factors are not available
-                            else:
-                                convert_fact_init = float(convert_array[cd_num][reg_name])
-                            # For residential disaggregation based on EULP data, account for the
-                            # fact that ResStock data do not include AK or HI, and the Pacific
-                            # CDIV (#9, index 8 in Python) data need to be adjusted down using
-                            # external estimates on how much of the region's energy use is
-                            # attributable to AK or HI by fuel type
-                            if bldg_flag == "res" and cd_num == 8 and ak_hi_res:
-                                # Set to external disagg factors for AK and HI region loops
-                                if reg_name in ["AK", "HI"]:
-                                    # Energy by fuel type for either AK or HI
-                                    convert_fact = ak_hi_res[reg_name][fuel_flag]
-                                # For all other regions within CDIV 9, adjust down to reflect
-                                # the share of AK/HI
-                                else:
-                                    # Sum AK and HI energy by fuel type
-                                    ak_plus_hi = (
-                                        ak_hi_res["AK"][fuel_flag] + ak_hi_res["HI"][fuel_flag])
-                                    # Scale other regions by 1 - sum of AK and HI energy by fuel
-                                    convert_fact = (convert_fact_init * (1 - ak_plus_hi))
-                            else:
-                                convert_fact = convert_fact_init
-                        except IndexError:
-                            raise ValueError(
-                                "End use: " + bldg_flag + " " + fuel_flag +
-                                " " + eu_flag + " not present in EULP "
-                                "disaggregration data")
-                    else:
-                        # Handle case where for building stock and square footage,
-                        # conversion data are further distinguished by whether
-                        # they apply to number of homes or square footage
-                        try:
-                            convert_fact = cd_to_cz_factor[
-                                           fuel_flag][cd_num][reg_name]
-                        except KeyError:
-                            try:
-                                convert_fact = cd_to_cz_factor[fuel_flag][
-                                    "homes"][cd_num][reg_name]
-                            except KeyError:
-                                convert_fact = cd_to_cz_factor[fuel_flag][
-                                    "square footage"][cd_num][reg_name]
-                else:
-                    # Find the conversion factor for the given combination of
-                    # census division and AIA climate zone
-                    convert_fact = cd_to_cz_factor[cd_num][reg_name]
+                convert_fact = convert_factor(
+                    cd_to_cz_factor, cd_num, reg_name, ak_hi_res, bldg_flag,
+                    fuel_flag, eu_flag, tech_flag, current_stock_energy_flag)
                 if isinstance(base_dict[k], list):
-                    base_list = _to_list_of_lists(base_dict[k])
-                    add_list = _to_list_of_lists(add_dict[k2])
-                    base_list, add_list = _pad_with_zeros(base_list, add_list)
-
-                    if first_cd_flag:
-                        base_list = [[v * convert_fact for v in sub]
-                                     for sub in base_list]
-                    else:
-                        base_list = [[b + a * convert_fact for b, a in zip(sub_b, sub_a)]
-                                     for sub_b, sub_a in zip(base_list, add_list)]
-
-                    # restore original shape (flat vs nested)
-                    if _is_number(base_dict[k][0]) if base_dict[k] else False:
-                        base_dict[k] = base_list[0]
-                    else:
-                        base_dict[k] = base_list
+                    base_dict[k] = merge_list(
+                        base_dict[k], add_dict[k2], convert_fact, first_cd_flag)
                 else:
                     if first_cd_flag:
                         base_dict[k] = base_dict[k] * convert_fact
@@ -911,14 +688,360 @@ def merge_sum(base_dict, add_dict, cd_num, reg_name, res_convert_array,
     return base_dict
 
 
+def skip_cpl_key(k, node_k, cpl):
+    """Flag microsegment keys that are not converted for cost, performance, and lifetime data.
+
+    Args:
+        k (str): Key in the microsegments database.
+        node_k: Data under the key.
+        cpl (bool): True if cpl data are being processed.
+
+    Returns:
+        True if the data under the key are left as in the first census division.
+    """
+    return cpl and ((k == 'other' and not isinstance(node_k, dict)) or
+                    k == 'unspecified')
+
+
+def mseg_flags(k, node, flags, res_convert_array, com_convert_array,
+               flag_map_dat, key_list):
+    """Update the flags that select census division to custom region conversion factors.
+
+    The building type, fuel type, end use, and technology under a key in
+    the microsegments database determine which conversion factors apply to
+    the data below it. This function is called for each key as the
+    database is traversed (keys at each level in sorted order); flags that
+    are not updated by a key carry over to the keys that follow it at the
+    same level.
+
+    Args:
+        k (str): Current key in the microsegments database.
+        node (dict): Portion of the microsegments database that 'k' is a key of.
+        flags (tuple): Conversion factor data to use (residential or
+            commercial) and the building type, fuel type, end use,
+            technology type, and technology flags before 'k' is processed.
+        res_convert_array (numpy.ndarray or dict): Coefficients for converting
+            from census divisions to custom regions for residential buildings.
+        com_convert_array (numpy.ndarray or dict): Coefficients for converting
+            from census divisions to custom regions for commercial buildings.
+        flag_map_dat (dict): Info. used to flag building types, fuel types,
+            end uses, and map to NREL End Use Load Profiles (EULP) datasets.
+        key_list (list): Keys that specify the location of 'node' in the
+            microsegments database structure.
+
+    Returns:
+        Updated tuple of the conversion factor data and flags.
+    """
+    cd_to_cz_factor, bldg_flag, fuel_flag, eu_flag, tech_typ_flag, tech_flag = flags
+    # List of fuel types to iterate over for updating with corresponding conversion factors.
+    fuel_types = ["electricity", "natural gas", "distillate", "other fuel"]
+    i = node[k]
+    # Identify appropriate census division to custom region
+    # conversion weighting factor array as a function of building
+    # type; k corresponds to the current top level/parent key,
+    # thus k is equal to a building type immediately
+    # prior to traversing the entire child tree for that
+    # building type, for which the conversion number array
+    # cd_to_cz_factor will be the same. Ensure that the walk is
+    # currently at the building type level by checking keys from the
+    # next level down (the fuel type level) against expected fuel types
+    # Record building type flag
+    if ((k in flag_map_dat["res_bldg_types"] and
+        any([x in flag_map_dat["res_fuel_types"] for
+             x in node[k].keys()])) or
+        (k in flag_map_dat["com_bldg_types"] and
+            any([x in flag_map_dat["com_fuel_types"] for
+                x in node[k].keys()]))):
+        if k in flag_map_dat["res_bldg_types"]:
+            cd_to_cz_factor = res_convert_array
+            bldg_flag = "res"
+        elif k in flag_map_dat["com_bldg_types"]:
+            cd_to_cz_factor = com_convert_array
+            bldg_flag = "com"
+    # Flag the current fuel type being updated, which is relevant
+    # to ultimate selection of conversion factor from the conversion
+    # array when translating to EMM region or state, in which case
+    # conversion factors are different for different fuels. Use the
+    # expectation that conversion arrays will be in dict format in the
+    # EMM region or state case (with keys for fuel conversion factors)
+    # to trigger the fuel flag update
+    elif (k in flag_map_dat["res_fuel_types"] or
+            k in flag_map_dat["com_fuel_types"]) and \
+            type(res_convert_array) is dict:
+        fuel_flag = k
+    # When updating total building stock or square footage data for
+    # EMM regions or states, which are not keyed by fuel type, set the
+    # fuel type flag accordingly; for states, this will pull in
+    # mapping data based on consumption splits across all fuels; for
+    # EMM regions, this will pull in mapping data based on
+    # total electricity
+    elif (k in ["total homes", "new homes", "total square footage",
+                "new square footage"]):
+        fuel_flag = "building stock and square footage"
+
+    # Flag the current end use being updated, which is relevant to
+    # ultimate selection of conversion factor from the conversion
+    # array when translating electricity stock/energy data to EMM
+    # region or state, in which case conversion factors are based on
+    # the EULP and are different for different end uses
+    elif (fuel_flag and fuel_flag in fuel_types) and \
+        (type(cd_to_cz_factor[fuel_flag]) is dict) and \
+        any([k in x for x in [flag_map_dat["res_eus"],
+                              flag_map_dat["com_eus"]]]):
+
+        if k == "ventilation":
+            # Only process "ventilation" if the fuel type is "electricity"
+            # and the parent end use is "fans and pumps"
+            if fuel_flag != "electricity" or "fans and pumps" not in key_list:
+                eu_flag = "misc"  # Skip mapping to EULP data
+            else:
+                eu_find = [i[0] for i in flag_map_dat["eulp_map"][fuel_flag].items()
+                           if k in i[1]]
+                if len(eu_find) == 1:
+                    eu_flag = eu_find[0]
+                else:
+                    raise ValueError(
+                        "Could not match Scout end use: " + bldg_flag +
+                        " " + fuel_flag + " " + " " + k + " to EULP data")
+        # Handle special cases of "other" end use technologies in
+        # Scout, which are sometimes handled at the end-use level in
+        # the EULP data (e.g., washing), and the case of cooking,
+        # which has EULP data for residential but not commercial
+        elif k != "other" and (k != "cooking" or (
+                k == "cooking" and bldg_flag == "res")):
+            # Find the EULP end use for the current Scout end use
+            eu_find = [i[0] for i in flag_map_dat["eulp_map"][fuel_flag].items()
+                       if k in i[1]]
+            # If there was not a unique match, warn user
+            if len(eu_find) == 1:
+                eu_flag = eu_find[0]
+            else:
+                raise ValueError(
+                    "Could not match Scout end use: " + bldg_flag +
+                    " " + fuel_flag + " " + " " + k + " to EULP data")
+        else:
+            eu_flag = "misc"
+
+    # Process end uses/technologies that were not initially matched
+    # in the clause above
+    elif eu_flag == "misc":
+        # Case where "other" tech. in Scout data is assigned unique
+        # end-use profile in the EULP data; match tech. to EULP end use
+        if k in flag_map_dat["eulp_other_tech"]:
+            # Find the EULP end use for the current Scout technology;
+            # note that technology name will be included in EULP
+            # mapping dict items w/ "other", e.g., "other-[tech name]"
+            eu_find = [
+                i[0] for i in flag_map_dat["eulp_map"][fuel_flag].items() if any([
+                    k in x for x in i[1]])]
+            # If there was not a unique match, warn user
+            if len(eu_find) == 1:
+                eu_flag = eu_find[0]
+            else:
+                raise ValueError(
+                    "Could not match Scout end use: "
+                    + bldg_flag + " " + fuel_flag + " " +
+                    " " + k + " to EULP data")
+        # All other cases without unique EULP end-use profiles are
+        # assigned to the miscellaneous profile
+        else:
+            eu_flag = "misc"
+    # Flag for technology type if heating or cooling end use
+    elif k in ["supply", "demand"]:
+        tech_typ_flag = k
+    # For electric heating and cooling end uses, which may have factors further
+    # disaggregated by equipment type, flag the technology currently being updated
+    elif fuel_flag == "electricity" and eu_flag in ["heating", "cooling"]:
+        # For equipment ('supply'), aggregation factors will be keyed in by equipment name
+        if tech_typ_flag == "supply":
+            # Check which technology name the current Scout equipment type maps to in the
+            # EULP disaggregation factors and set that name as the technology flag to use
+            # in pulling the factors later
+            if any([k in x[1] for x in flag_map_dat[
+                    "eulp_map"]["electric technologies"][bldg_flag].items()]):
+                tech_flag = [x[0] for x in flag_map_dat["eulp_map"][
+                    "electric technologies"][bldg_flag].items() if k in x[1]][0]
+            # If still at the equipment level (e.g., not at the energy/stock key level below
+            # it or at the year level below that) and there was no mapping available for a
+            # technology that should have it, throw an error
+            elif isinstance(i, dict) and k not in ["energy", "stock"]:
+                raise ValueError(
+                    "Cannot map Scout technology " + k + " to any technology name in the "
+                    "EULP-based disaggregation factors")
+        # For envelope ('demand'), aggregation factors will be summarized across 'all'
+        # heating and cooling technologies (e.g., equivalent to end-use-level disagg.)
+        elif tech_typ_flag == "demand":
+            tech_flag = "all"
+        # Ensure that technology type is either supply (equipment) or demand (envelope)
+        else:
+            raise ValueError("Technology type " + tech_typ_flag + " unexpected for "
+                             "heating or cooling end use; must be 'supply' or 'demand'.")
+
+    return cd_to_cz_factor, bldg_flag, fuel_flag, eu_flag, tech_typ_flag, tech_flag
+
+
+def convert_factor(cd_to_cz_factor, cd_num, reg_name, ak_hi_res, bldg_flag,
+                   fuel_flag, eu_flag, tech_flag, stock_energy_flag):
+    """Find the factor that converts census division data to a custom region.
+
+    Args:
+        cd_to_cz_factor (numpy.ndarray or dict): Coefficients for converting
+            from census divisions to custom regions for the building type.
+        cd_num (int): The census division index (0-8).
+        reg_name (str): The custom region name.
+        ak_hi_res (dict): Share of Pacific CDIV's total consumption by fuel that goes to AK or HI.
+        bldg_flag (str): Building type flag ('res' or 'com').
+        fuel_flag (str): Fuel type flag.
+        eu_flag (str): End use flag.
+        tech_flag (str): Technology flag.
+        stock_energy_flag (str): Stock or energy flag.
+
+    Returns:
+        Numeric conversion factor from the census division to the custom region.
+    """
+    # List of fuel types to iterate over for updating with corresponding conversion factors.
+    fuel_types = ["electricity", "natural gas", "distillate", "other fuel"]
+    # Check whether the conversion array needs to be further keyed
+    # by fuel type and by end use, as is the case when converting to EMM region or
+    # state and using EULP data to disaggregate to those regions; in such cases, the
+    # fuel and end use flags indicate the key values for pulling appropriate data
+
+    if type(cd_to_cz_factor) is dict:
+        # Data may be further broken out by end use
+        if (fuel_flag and fuel_flag in fuel_types) and eu_flag:
+
+            # Ensure that data for the current end use can be
+            # pulled and that data converted from pandas df
+            # are in format that is JSON serializable
+            try:
+                # Restrict conversion array by fuel, stock/energy var, and end use
+                convert_array = cd_to_cz_factor[
+                    fuel_flag][stock_energy_flag][eu_flag]
+                # Case where technology-specific factors are available
+                if tech_flag and "Technology" in convert_array.dtype.names:
+                    convert_fact_init = float(convert_array[convert_array[
+                        'Technology'] == tech_flag][cd_num][reg_name])
+                # Case where technology-specific factors are not available
+                else:
+                    convert_fact_init = float(convert_array[cd_num][reg_name])
+                # For residential disaggregation based on EULP data, account for the
+                # fact that ResStock data do not include AK or HI, and the Pacific
+                # CDIV (#9, index 8 in Python) data need to be adjusted down using
+                # external estimates on how much of the region's energy use is
+                # attributable to AK or HI by fuel type
+                if bldg_flag == "res" and cd_num == 8 and ak_hi_res:
+                    # Set to external disagg factors for AK and HI region loops
+                    if reg_name in ["AK", "HI"]:
+                        # Energy by fuel type for either AK or HI
+                        convert_fact = ak_hi_res[reg_name][fuel_flag]
+                    # For all other regions within CDIV 9, adjust down to reflect
+                    # the share of AK/HI
+                    else:
+                        # Sum AK and HI energy by fuel type
+                        ak_plus_hi = (
+                            ak_hi_res["AK"][fuel_flag] + ak_hi_res["HI"][fuel_flag])
+                        # Scale other regions by 1 - sum of AK and HI energy by fuel
+                        convert_fact = (convert_fact_init * (1 - ak_plus_hi))
+                else:
+                    convert_fact = convert_fact_init
+            except IndexError:
+                raise ValueError(
+                    "End use: " + bldg_flag + " " + fuel_flag +
+                    " " + eu_flag + " not present in EULP "
+                    "disaggregration data")
+        else:
+            # Handle case where for building stock and square footage,
+            # conversion data are further distinguished by whether
+            # they apply to number of homes or square footage
+            try:
+                convert_fact = cd_to_cz_factor[
+                               fuel_flag][cd_num][reg_name]
+            except KeyError:
+                try:
+                    convert_fact = cd_to_cz_factor[fuel_flag][
+                        "homes"][cd_num][reg_name]
+                except KeyError:
+                    convert_fact = cd_to_cz_factor[fuel_flag][
+                        "square footage"][cd_num][reg_name]
+    else:
+        # Find the conversion factor for the given combination of
+        # census division and AIA climate zone
+        convert_fact = cd_to_cz_factor[cd_num][reg_name]
+
+    return convert_fact
+
+
+def merge_list(base, add, convert_fact, first_cd_flag):
+    """Add a census division's list data to custom region list data.
+
+    Args:
+        base (list): Custom region data, as a list of numbers or of lists of
+            numbers (padded with zeros in place to the length of 'add').
+        add (list): Census division data, structured as 'base' (padded with
+            zeros in place to the length of 'base').
+        convert_fact (float): Census division to custom region conversion factor.
+        first_cd_flag (boolean): Flag for the first census division in the
+            input data, for which 'base' is converted rather than added to.
+
+    Returns:
+        Updated custom region list data.
+    """
+
+    def _is_number(x):
+        return isinstance(x, numbers.Number)
+
+    def _to_list_of_lists(lst):
+        """Wrap flat list -> list-of-lists, keep list-of-lists unchanged."""
+        if lst and _is_number(lst[0]):
+            return [lst]
+        return lst
+
+    def _pad_with_zeros(a, b):
+        """
+        Pad the shorter of two *lists of lists* with zero-vectors so that
+        their lengths match. Keeps arithmetic aligned.
+        """
+        max_len = max(len(a), len(b))
+        elem_len = len(a[0]) if a else len(b[0]) if b else 2
+        zero_vec = [0.0] * elem_len
+        a.extend(copy.deepcopy(zero_vec) for _ in range(max_len - len(a)))
+        b.extend(copy.deepcopy(zero_vec) for _ in range(max_len - len(b)))
+        return a, b
+
+    base_list = _to_list_of_lists(base)
+    add_list = _to_list_of_lists(add)
+    base_list, add_list = _pad_with_zeros(base_list, add_list)
+
+    if first_cd_flag:
+        base_list = [[v * convert_fact for v in sub]
+                     for sub in base_list]
+    else:
+        base_list = [[b + a * convert_fact for b, a in zip(sub_b, sub_a)]
+                     for sub_b, sub_a in zip(base_list, add_list)]
+
+    # restore original shape (flat vs nested)
+    if _is_number(base[0]) if base else False:
+        return base_list[0]
+    return base_list
+
+
 def clim_converter(input_dict, res_convert_array, com_convert_array, data_in,
                    flag_map_dat, reg_list, cdiv_list, ak_hi_res):
     """Convert input data dict from a census division to a custom region basis.
 
-    This function principally serves to prepare the inputs for, and
-    then call, a function that performs the calculations to convert
-    data in the input_dict database specified for each microsegment
-    from a census division to a custom region basis.
+    The data below each census division share the structure of the data
+    for the first census division in the input dict. This structure is
+    traversed once, recording each number in the data (e.g., the value for
+    a given microsegment and year) across the census divisions as a row of
+    a (value x census division) array, grouped by the flags that select the
+    values' conversion factors (see 'mseg_flags'). Each group of values is
+    then converted to all custom regions at once using the (census division
+    x custom region) matrix of conversion factors for the group, and the
+    data for each custom region are rebuilt in the input structure. The
+    contributions of the census divisions are added in the same order as
+    in the 'merge_sum' function, such that the results are identical to
+    those of converting the data one census division and custom region at
+    a time with that function.
 
     Args:
         input_dict (dict): Data from JSON database, as imported,
@@ -945,6 +1068,7 @@ def clim_converter(input_dict, res_convert_array, com_convert_array, data_in,
         have been replaced by custom region keys, and the data
         have been updated to correspond to those custom regions.
     """
+    import warnings
 
     # Set boolean for whether cost, performance, and lifetime data
     # are being processed
@@ -953,50 +1077,156 @@ def clim_converter(input_dict, res_convert_array, com_convert_array, data_in,
     else:
         cpl_bool = False
 
-    # Set up empty dict to be updated with the results for each custom
-    # region as the data are converted
-    converted_dict = {}
-
-    # Add the values from each custom region to the converted_dict
-    for reg_name in reg_list:
-        # Create a copy of the input dict at the level below a census
-        # division or custom region (the structure below that level
-        # should be identical); uses the first census division in
-        # the data
-        first_cd = list(input_dict.keys())[0]
-        base_dict = copy.deepcopy(input_dict[first_cd])
-        # Loop through all census divisions to add their contributions
-        # to each custom region
-        for cdiv_ind, cdiv_name in enumerate(cdiv_list):
-            # Flag a loop through the first census division in the input
-            # dict for special handling in merge_sum function
-            if cdiv_name == first_cd:
-                first_cd_flag = True
+    # Find the census divisions present in the input dict (and their
+    # indices in the full census division list); the first census division
+    # in the input dict sets the structure of the converted data
+    cdivs = [(cdiv_ind, cdiv_name) for cdiv_ind, cdiv_name in enumerate(
+        cdiv_list) if cdiv_name in input_dict]
+    first_cd = list(input_dict.keys())[0]
+    if len(cdivs) == 0 or cdivs[0][1] != first_cd:
+        raise ValueError(
+            "First census division in the input data ('" + first_cd + "') "
+            "must be the first of the expected census divisions in the data")
+
+    # Initialize groups of numeric values that share conversion factors,
+    # keyed by their conversion flags, and the (group, row) location of
+    # each numeric value
+    groups, value_locs = {}, []
+    # Initialize list data, which are converted as in the 'merge_sum' function
+    list_leaves = []
+
+    def flatten(nodes, flags, stock_energy_flag, key_list):
+        """Record the values below a location in each census division's data.
+
+        Args:
+            nodes (list): Dicts at the current location in the data for each
+                census division in 'cdivs' (None where missing).
+            flags (tuple): Conversion factor data and flags at the location.
+            stock_energy_flag (str): Stock or energy flag at the location.
+            key_list (list): Keys that specify the location in the data.
+
+        Returns:
+            Structure of the data at the location, with ("value", index),
+            ("list", index), or ("raw", data) tuples in place of numbers,
+            lists, and data left unconverted (e.g., strings), respectively.
+        """
+        base = nodes[0]
+        struct = {}
+        for k in sorted(base.keys()):
+            # Data for each census division under the key; warn about data
+            # missing for a census division, which are then skipped
+            k_nodes = []
+            for (cdiv_ind, cdiv_name), node in zip(cdivs, nodes):
+                if node is not None and k not in node:
+                    warnings.warn(f"Key '{k}' not found in '{cdiv_name}' data – skipping")
+                    node = None
+                k_nodes.append(node[k] if node is not None else None)
+            if k in ("stock", "energy"):
+                k_stock_energy_flag = k
             else:
-                first_cd_flag = ""
-            # Make a copy of the portion of the input dict corresponding
-            # to the current census division, to be added to the base_dict
-            # data; if census division not present in the data, continue loop
-            try:
-                add_dict = copy.deepcopy(input_dict[cdiv_name])
-            except KeyError:
+                k_stock_energy_flag = stock_energy_flag
+            # Data for the first census division are used as is for keys
+            # that are not converted
+            if skip_cpl_key(k, base[k], cpl_bool):
+                struct[k] = ("raw", base[k])
                 continue
-            # Call the merge_sum function to replace base_dict with
-            # updated contents; this approach overwrites base_dict, which
-            # is intentional because it is the master dict that stores the
-            # data on a custom region basis as the contribution from each
-            # census division is added to the custom region by merge_sum
-            base_dict = merge_sum(base_dict, add_dict, cdiv_ind,
-                                  reg_name, res_convert_array,
-                                  com_convert_array, cpl_bool, flag_map_dat,
-                                  first_cd_flag, ak_hi_res, key_list=[])
-
-        # Once fully updated with the data from all census divisions,
-        # write the resulting data to a new variable and update the
-        # master dict with the data using the appropriate census
-        # division string name as the key
-        newadd = base_dict
-        converted_dict.update({reg_name: newadd})
+            # Update the flags used to select the conversion factors
+            flags = mseg_flags(
+                k, base, flags, res_convert_array, com_convert_array,
+                flag_map_dat, key_list)
+            if isinstance(base[k], dict):
+                struct[k] = flatten(
+                    [x if isinstance(x, dict) else None for x in k_nodes],
+                    flags, k_stock_energy_flag, key_list + [k])
+                continue
+            elif isinstance(base[k], str):
+                struct[k] = ("raw", base[k])
+                continue
+            # Flags that determine the values' conversion factors
+            cd_to_cz_factor, bldg_flag, fuel_flag, eu_flag, _, tech_flag = flags
+            factor_args = (cd_to_cz_factor, bldg_flag, fuel_flag, eu_flag,
+                           tech_flag, k_stock_energy_flag)
+            if isinstance(base[k], list):
+                struct[k] = ("list", len(list_leaves))
+                list_leaves.append((k_nodes, factor_args))
+            else:
+                group = groups.setdefault(
+                    (id(cd_to_cz_factor),) + factor_args[1:], {
+                        "factor_args": factor_args, "values": [],
+                        "present": []})
+                struct[k] = ("value", len(value_locs))
+                value_locs.append((group, len(group["values"])))
+                group["values"].append(
+                    [x if x is not None else 0 for x in k_nodes])
+                group["present"].append([x is not None for x in k_nodes])
+        # Keep the order of the keys in the input data
+        return {k: struct[k] for k in base.keys()}
+
+    struct = flatten([input_dict[cdiv_name] for _, cdiv_name in cdivs],
+                     (0, None, None, None, None, None), None, [])
+
+    def factors(factor_args, cdiv_mask):
+        """Find the (census division x custom region) conversion factors."""
+        cd_to_cz_factor, bldg_flag, fuel_flag, eu_flag, tech_flag, \
+            stock_energy_flag = factor_args
+        return np.array([[convert_factor(
+            cd_to_cz_factor, cdiv_ind, reg_name, ak_hi_res, bldg_flag, fuel_flag,
+            eu_flag, tech_flag, stock_energy_flag) if cdiv_present else 0
+            for reg_name in reg_list] for (cdiv_ind, _), cdiv_present in zip(
+                cdivs, cdiv_mask)], dtype=float)
+
+    # Convert each group of values to all custom regions, adding the
+    # contribution of each census division in turn
+    for group in groups.values():
+        values = np.array(group["values"], dtype=float)
+        present = np.array(group["present"], dtype=bool)
+        convert_fact = factors(group["factor_args"], present.any(axis=0))
+        converted = values[:, [0]] * convert_fact[0]
+        for cd_col in range(1, len(cdivs)):
+            converted = np.where(
+                present[:, [cd_col]],
+                converted + values[:, [cd_col]] * convert_fact[cd_col],
+                converted)
+        group["converted"] = converted
+    # Values for each custom region, in the order they were recorded
+    reg_values = np.empty((len(reg_list), len(value_locs)))
+    for ind, (group, row) in enumerate(value_locs):
+        reg_values[:, ind] = group["converted"][row]
+    reg_values = reg_values.tolist()
+
+    # Convert list data for each custom region
+    list_values = []
+    for k_nodes, factor_args in list_leaves:
+        convert_fact = factors(factor_args, [x is not None for x in k_nodes])
+        reg_lists = []
+        for reg_ind in range(len(reg_list)):
+            base_list = merge_list(
+                copy.deepcopy(k_nodes[0]), copy.deepcopy(k_nodes[0]),
+                convert_fact[0][reg_ind], True)
+            for cd_col in range(1, len(cdivs)):
+                if k_nodes[cd_col] is not None:
+                    base_list = merge_list(
+                        base_list, copy.deepcopy(k_nodes[cd_col]),
+                        convert_fact[cd_col][reg_ind], False)
+            reg_lists.append(base_list)
+        list_values.append(reg_lists)
+
+    def rebuild(node, reg_ind):
+        """Rebuild the converted data for a custom region."""
+        if isinstance(node, dict):
+            return {k: rebuild(v, reg_ind) for k, v in node.items()}
+        kind, data = node
+        if kind == "value":
+            return reg_values[reg_ind][data]
+        elif kind == "list":
+            return list_values[data][reg_ind]
+        else:
+            return copy.deepcopy(data)
+
+    # Set up dict of the converted data for each custom region
+    converted_dict = {}
+    for reg_ind, reg_name in enumerate(reg_list):
+        converted_dict[reg_name] = rebuild(struct, reg_ind)
 
     return converted_dict
 
@@ -1793,20 +2023,14 @@ def walk(cpl_data, conversions, perf_convert, years, json_db,
     return json_db
 
 
-def main():
-    """Import external data files, process data, and produce desired output.
-
-    This function calls the required external data, both the data to be
-    converted from a census division to a custom region basis, as well
-    as the applicable conversion factors.
+def prompt_input_var():
+    """Request user input on the data and regional breakdown to convert.
 
-    Because the conversion factors for the energy, stock, and square
-    footage data are slightly different than the factors for the cost,
-    performance, and lifetime data, when the script is run, this
-    function requests user input to determine the appropriate files
-    to import.
+    Returns:
+        List of the user's selections for the type of data to convert, the
+        regional breakdown to convert to, and (for energy/stock data broken
+        down by EMM region or state) the detailed disaggregation methods.
     """
-
     # Obtain user input regarding what data are to be processed. Include two
     # stages of input: one determining whether stock and energy data or cost/
     # performance/lifetime data are to be converted, and another determining
@@ -1876,6 +2100,21 @@ def main():
                 print('Please try again. Enter either 1, 2'
                       'Use ctrl-c to exit.')
 
+    return input_var
+
+
+def target_vars(input_var):
+    """Set up the file names used for a given data type and breakdown.
+
+    Args:
+        input_var (list): Type of data to convert, regional breakdown to
+            convert to, and detailed disaggregation methods, coded as in
+            the user prompts of 'prompt_input_var'.
+
+    Returns:
+        UsefulVars object configured for the data type and breakdown.
+    """
+
     # Instantiate object that contains useful variables
     handyvars = UsefulVars(input_var[1], input_var[2], input_var[3])
 
@@ -1886,6 +2125,30 @@ def main():
     elif input_var[0] == '2':
         handyvars.configure_for_cost_performance_lifetime_data()
 
+    return handyvars
+
+
+def convert_target(input_var, msjson_cdiv, copy_input=False):
+    """Convert census division data to a given regional breakdown.
+
+    Args:
+        input_var (list): Type of data to convert, regional breakdown to
+            convert to, and detailed disaggregation methods, coded as in
+            the user prompts of 'prompt_input_var'.
+        msjson_cdiv (dict): Census division data to convert.
+        copy_input (boolean): Flag to leave the census division data
+            unchanged where they are not converted (cost, performance, and
+            lifetime data for states), such that the data can be reused
+            for other conversions.
+
+    Returns:
+        Tuple of the converted data and the name of the output file for
+        the data type and breakdown.
+    """
+
+    # Set up file names for the data type and breakdown
+    handyvars = target_vars(input_var)
+
     # Set expected AIA climate zone names
     aia_list = ['AIA_CZ1', 'AIA_CZ2', 'AIA_CZ3', 'AIA_CZ4', 'AIA_CZ5']
     # Set expected Census Division names
@@ -2214,63 +2477,279 @@ def main():
     # Define years vector using year data from metadata
     years = list(range(metajson['min year'], metajson['max year'] + 1))
 
+    # Traverse the database that has data on a census division basis to
+    # convert it to a custom region basis; do not convert non-envelope
+    # technology characteristics data to a state-level resolution (these
+    # data remain with the original Census breakout)
+    if input_var[0] == '1' or (
+            input_var[0] == '2' and input_var[1] != '3'):
+        # For EMM or state converstions, pull in external estimates of AK/HI portion of Pacific
+        # CDIV's energy use to adjust some EULP-based disaggregation factors for EMMs and
+        # states (residential EULP data do not account for AK/HI)
+        if input_var[1] in ['2', '3']:
+            ak_hi_res = handyvars.ak_hi_res
+        else:
+            ak_hi_res = None
+        # Convert data
+        result = clim_converter(
+            msjson_cdiv, res_cd_cz_conv, com_cd_cz_conv, input_var[0],
+            flag_map_dat, reg_list, cdiv_list, ak_hi_res)
+    elif copy_input is True:
+        # Envelope data are added to the unconverted data below
+        result = copy.deepcopy(msjson_cdiv)
+    else:
+        result = msjson_cdiv
+
+    # If cost, performance, and lifetime data are indicated based
+    # on user input, open the envelope cost, performance, and
+    # lifetime database and the cost conversion factors database,
+    # then add those data to the microsegments data that were just
+    # converted to a custom region basis
+    if input_var[0] == '2':
+        with open(handyvars.addl_cpl_data, 'r') as jscpl, open(
+                handyvars.conv_factors, 'r') as jsconv:
+            jscpl_data = json.load(jscpl)
+            jsconv_data = json.load(jsconv)
+
+            # Add envelope components' cost, performance and
+            # lifetime data to the result dict
+            result = walk(
+                jscpl_data, jsconv_data, env_perf_convert, years, result,
+                aia_list, cdiv_list, emm_list)
+
+    return result, handyvars.json_out
+
+
+def write_output(result, json_out, compressed_only=False):
+    """Write converted data to JSON and (if applicable) gzipped JSON files.
+
+    Notes:
+        Cost, performance, and lifetime data and EMM/state energy and stock
+        data are also written to a gzipped file, which is encoded and
+        compressed one top-level entry at a time rather than from a copy of
+        the full data serialized in memory.
+
+    Args:
+        result (dict): Converted data.
+        json_out (str): Name of the output JSON file.
+        compressed_only (boolean): Flag to skip writing the indented JSON
+            file where a gzipped file is written.
+
+    Returns:
+        List of the names of the files written.
+    """
+    # Compress CPL files and stock/energy EMM and state files
+    if json_out.startswith('cpl') or json_out in [
+            'mseg_res_com_state.json', 'mseg_res_com_emm.json']:
+        zip_out = json_out.split('.')[0] + '.gz'
+    else:
+        zip_out = None
+    files_out = []
+    if zip_out is None or compressed_only is False:
+        dump_json(result, json_out, indent=2)
+        files_out.append(json_out)
+    if zip_out is not None:
+        dump_json(result, zip_out, indent=None, compress=True)
+        files_out.append(zip_out)
+    return files_out
+
+
+def parse_target(target):
+    """Translate a batch mode target into data type and breakdown codes.
+
+    Args:
+        target (str): Regional breakdown and data type, separated by a
+            colon (e.g., 'EMM:energy', 'state:cpl').
+
+    Returns:
+        Tuple of the codes for the type of data and regional breakdown, as
+        used in the user prompts of 'prompt_input_var'.
+    """
+    geo, _, data = target.lower().partition(":")
+    if geo not in BATCH_GEO_BREAKS or data not in BATCH_DATA_TYPES:
+        raise argparse.ArgumentTypeError(
+            "Invalid target '" + target + "'; targets take the form "
+            "<breakdown>:<data>, with breakdown one of " +
+            str(list(BATCH_GEO_BREAKS.keys())) + " and data one of " +
+            str(list(BATCH_DATA_TYPES.keys())))
+    return BATCH_DATA_TYPES[data], BATCH_GEO_BREAKS[geo]
+
+
+def parse_args(args=None):
+    """Parse command line arguments for batch mode conversions.
+
+    Args:
+        args (list): Optional arguments to parse in place of sys.argv.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description=(
+        "Convert census division data to custom regions. Without targets, "
+        "the data to convert are requested interactively."))
+    parser.add_argument(
+        "-t", "--targets", nargs="+", type=parse_target, metavar="GEO:DATA",
+        help=("Regional breakdowns (AIA, EMM, state) and data types (energy "
+              "or stock for energy, stock, and square footage data; cpl for "
+              "cost, performance, and lifetime data) to convert in batch "
+              "mode, e.g., 'AIA:energy EMM:energy EMM:cpl'"))
+    parser.add_argument(
+        "--fuel_disagg", choices=["elec", "all"], default="all",
+        help=("Fuel types to apply detailed disaggregation data to for EMM/"
+              "state energy and stock targets (default all)"))
+    parser.add_argument(
+        "--elec_disagg", choices=["tech", "end-use"], default="tech",
+        help=("Level of data to base detailed electricity disaggregation on "
+              "for EMM/state energy and stock targets (default tech)"))
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help=("Number of worker processes to convert targets across "
+              "(default one per target, up to the number of CPUs)"))
+    parser.add_argument(
+        "--json", action="store_true",
+        help=("Also write the indented JSON file for targets that are "
+              "written to gzipped files"))
+    return parser.parse_args(args)
+
+
+def convert_worker_init(msjson_by_type):
+    """Store the census division data shared by all targets in a worker.
+
+    Args:
+        msjson_by_type (dict): Census division data to convert, keyed by
+            the code for the type of data.
+    """
+    convert_worker_data.update(msjson_by_type)
+
+
+def convert_worker_target(input_var, compressed_only):
+    """Convert census division data for a batch mode target and write it.
+
+    Args:
+        input_var (list): Type of data to convert, regional breakdown to
+            convert to, and detailed disaggregation methods.
+        compressed_only (boolean): Flag to skip writing the indented JSON
+            file where a gzipped file is written.
+
+    Returns:
+        List of the names of the files written.
+    """
+    # Census division data are shared across targets; leave them unchanged
+    result, json_out = convert_target(
+        input_var, convert_worker_data[input_var[0]], copy_input=True)
+    return write_output(result, json_out, compressed_only)
+
+
+def batch_convert(targets, fuel_disagg_method='2', final_disagg_method='1',
+                  workers=None, compressed_only=True):
+    """Convert census division data for several targets in worker processes.
+
+    Notes:
+        The census division energy/stock and cost/performance/lifetime data
+        are each read once and handed to each worker process via the pool
+        initializer; each worker then converts and writes the outputs for
+        the targets it is given.
+
+    Args:
+        targets (list): Tuples of the codes for the type of data and
+            regional breakdown of each target, as returned by 'parse_target'.
+        fuel_disagg_method (str): Detailed disaggregation data applied to
+            EMM/state energy and stock data for electricity only ('1') or
+            all fuel types ('2').
+        final_disagg_method (str): Detailed electricity disaggregation of
+            EMM/state energy and stock data based on technology-level ('1')
+            or end-use-level ('2') data.
+        workers (int): Optional maximum number of worker processes.
+        compressed_only (boolean): Flag to skip writing the indented JSON
+            file where a gzipped file is written.
+
+    Returns:
+        List of the names of the files written.
+    """
+    # Set the full conversion settings of each distinct target; detailed
+    # disaggregation settings apply only to EMM/state energy and stock data
+    input_vars = []
+    for data_type, geo_break in targets:
+        if data_type == '1' and geo_break in ['2', '3']:
+            input_var = [data_type, geo_break, fuel_disagg_method,
+                         final_disagg_method]
+        else:
+            input_var = [data_type, geo_break, 0, 0]
+        if input_var not in input_vars:
+            input_vars.append(input_var)
+
+    # Read in the census division data needed across all targets once
+    msjson_by_type = {}
+    for input_var in input_vars:
+        if input_var[0] not in msjson_by_type:
+            with open(target_vars(input_var).json_in, 'r') as jsi:
+                msjson_by_type[input_var[0]] = json.load(jsi)
+
+    # Set the number of worker processes (no more than there are targets)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    n_workers = max(min(workers, len(input_vars)), 1)
+    files_out = []
+    if n_workers > 1:
+        with ProcessPoolExecutor(
+                max_workers=n_workers, initializer=convert_worker_init,
+                initargs=(msjson_by_type,)) as executor:
+            for target_files in executor.map(
+                    convert_worker_target, input_vars,
+                    [compressed_only] * len(input_vars)):
+                files_out.extend(target_files)
+    else:
+        convert_worker_init(msjson_by_type)
+        try:
+            for input_var in input_vars:
+                files_out.extend(
+                    convert_worker_target(input_var, compressed_only))
+        finally:
+            convert_worker_data.clear()
+    return files_out
+
+
+def main():
+    """Import external data files, process data, and produce desired output.
+
+    This function calls the required external data, both the data to be
+    converted from a census division to a custom region basis, as well
+    as the applicable conversion factors.
+
+    Because the conversion factors for the energy, stock, and square
+    footage data are slightly different than the factors for the cost,
+    performance, and lifetime data, when the script is run without
+    batch mode targets, this function requests user input to determine
+    the appropriate files to import. In batch mode, all targets given
+    are converted from a single read of the census division data.
+    """
+    opts = parse_args()
+
+    if opts.targets:
+        files_out = batch_convert(
+            opts.targets,
+            fuel_disagg_method={"elec": '1', "all": '2'}[opts.fuel_disagg],
+            final_disagg_method={"tech": '1', "end-use": '2'}[
+                opts.elec_disagg],
+            workers=opts.workers, compressed_only=(opts.json is False))
+        for file_out in files_out:
+            print("File " + file_out +
+                  " has been created with the updated data.")
+        return
+
+    # Obtain user input regarding what data are to be processed
+    input_var = prompt_input_var()
+
     # Open the microsegments JSON file that has data on a census
-    # division basis and traverse the database to convert it to
-    # a custom region basis
-    with open(handyvars.json_in, 'r') as jsi:
+    # division basis and convert it to a custom region basis
+    with open(target_vars(input_var).json_in, 'r') as jsi:
         msjson_cdiv = json.load(jsi)
-        # Do not convert non-envelope technology characteristics data to a
-        # state-level resolution (these data remain with the original
-        # Census breakout)
-        if input_var[0] == '1' or (
-                input_var[0] == '2' and input_var[1] != '3'):
-            # For EMM or state converstions, pull in external estimates of AK/HI portion of Pacific
-            # CDIV's energy use to adjust some EULP-based disaggregation factors for EMMs and
-            # states (residential EULP data do not account for AK/HI)
-            if input_var[1] in ['2', '3']:
-                ak_hi_res = handyvars.ak_hi_res
-            else:
-                ak_hi_res = None
-            # Convert data
-            result = clim_converter(
-                msjson_cdiv, res_cd_cz_conv, com_cd_cz_conv, input_var[0],
-                flag_map_dat, reg_list, cdiv_list, ak_hi_res)
-        else:
-            result = msjson_cdiv
-
-        # If cost, performance, and lifetime data are indicated based
-        # on user input, open the envelope cost, performance, and
-        # lifetime database and the cost conversion factors database,
-        # then add those data to the microsegments data that were just
-        # converted to a custom region basis
-        if input_var[0] == '2':
-            with open(handyvars.addl_cpl_data, 'r') as jscpl, open(
-                    handyvars.conv_factors, 'r') as jsconv:
-                jscpl_data = json.load(jscpl)
-                jsconv_data = json.load(jsconv)
-
-                # Add envelope components' cost, performance and
-                # lifetime data to the result dict
-                result = walk(
-                    jscpl_data, jsconv_data, env_perf_convert, years, result,
-                    aia_list, cdiv_list, emm_list)
+    result, json_out = convert_target(input_var, msjson_cdiv)
 
-    # Write the updated dict of data to a new JSON file
-    with open(handyvars.json_out, 'w') as jso:
-        json.dump(result, jso, indent=2)
-        # Compress CPL file
-        if handyvars.json_out.startswith('cpl'):
-            zip_out_cpl = handyvars.json_out.split('.')[0] + '.gz'
-            with gzip.GzipFile(zip_out_cpl, 'w') as fout_cpl:
-                fout_cpl.write(json.dumps(result).encode('utf-8'))
-        # Compress stock/energy EMM and state files
-        if handyvars.json_out in [
-                'mseg_res_com_state.json', 'mseg_res_com_emm.json']:
-            zip_out_se = handyvars.json_out.split('.')[0] + '.gz'
-            with gzip.GzipFile(zip_out_se, 'w') as fout_se:
-                fout_se.write(json.dumps(result).encode('utf-8'))
-        print("File " + handyvars.json_out +
-              " has been created with the updated data.")
+    # Write the updated dict of data to a new JSON file (and, if applicable,
+    # a gzipped file)
+    write_output(result, json_out)
+    print("File " + json_out + " has been created with the updated data.")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Write large JSON output files incrementally
+
+Measure-level outputs (e.g., ecm_prep.json, ecm_results.json) are dicts or
+lists with one entry per measure that can reach several hundred MB once
+serialized. Rather than encode the full structure in one pass (which, with
+indentation, runs through the pure-Python JSON encoder and writes the file in
+many small pieces), this module encodes and writes the top-level entries one
+at a time, optionally rounding float values as each entry is written. The
+text written matches that of 'json.dump' for the same indentation, such that
+the files can be read in exactly as before.
+"""
+import gzip
+import json
+from pathlib import Path
+
+
+def round_values(data, precision):
+    """Recursively round the float values in nested dicts in place.
+
+    Args:
+        data: Data to round (values in lists are not rounded).
+        precision (int): Number of decimal places to round to.
+
+    Returns:
+        Data with rounded float values.
+    """
+    if isinstance(data, dict):
+        for k, v in data.items():
+            data[k] = round_values(v, precision)
+    elif isinstance(data, float):
+        data = round(data, precision)
+    return data
+
+
+def dump_json(data, filepath: Path, indent=2, precision=None,
+              compress=False, cls=None):
+    """Write data to a JSON file one top-level entry at a time.
+
+    Args:
+        data (dict or list): Data to write.
+        filepath (pathlib.Path): Path of the JSON file.
+        indent (int): Optional indentation level; None writes the data without
+            indentation or line breaks, and with compact separators.
+        precision (int): Optional number of decimal places to round float
+            values in nested dicts to as each entry is written (note: the data
+            are rounded in place).
+        compress (boolean): Optional flag to gzip the output file.
+        cls (json.JSONEncoder): Optional encoder class for objects that are
+            not otherwise JSON serializable.
+    """
+    if indent is None:
+        separators = (",", ":")
+    else:
+        separators = (",", ": ")
+    if compress is True:
+        handle = gzip.open(filepath, "wt", compresslevel=6)
+    else:
+        handle = open(filepath, "w")
+
+    def encode(obj):
+        return json.dumps(obj, indent=indent, separators=separators, cls=cls)
+
+    with handle:
+        # Data without entries to write incrementally are written as is
+        if not isinstance(data, (dict, list)) or len(data) == 0:
+            handle.write(encode(data))
+            return
+        if isinstance(data, dict):
+            brackets = "{}"
+            entries = data.items()
+        else:
+            brackets = "[]"
+            entries = enumerate(data)
+        # Set the text preceding each entry, which is also added to the line
+        # breaks within the encoded entry to indent it one level
+        if indent is None:
+            line_start = ""
+        else:
+            line_start = "\n" + " " * indent
+        handle.write(brackets[0])
+        for ind, (k, v) in enumerate(entries):
+            if isinstance(data, dict):
+                # Round the entry's values as it is written (values in lists
+                # are not rounded)
+                if precision is not None:
+                    data[k] = v = round_values(v, precision)
+                # Encode dict keys as JSON does (e.g., converting numbers to
+                # strings)
+                if not isinstance(k, str):
+                    k = json.dumps(k)
+                text = json.dumps(k) + separators[1] + encode(v)
+            else:
+                text = encode(v)
+            if indent is not None:
+                text = text.replace("\n", line_start)
+            if ind > 0:
+                handle.write(separators[0])
+            handle.write(line_start + text)
+        if indent is not None:
+            handle.write("\n")
+        handle.write(brackets[1])
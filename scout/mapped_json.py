@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""Compile large JSON input files to memory-mapped binary copies
+
+Baseline microsegment stock/energy, technology cost/performance/lifetime,
+and hourly load, price, and emissions data are read from large (often
+gzipped) JSON files whose leaves are mostly year-keyed dicts and lists of
+numbers. Parsing these files into Python objects dominates the start-up
+time and memory use of the ecm_prep and run modules. This module compiles
+each file once into a pickled copy of its structure and a set of numpy
+arrays holding the numeric leaves (one array per set of year keys or list
+length), and loads the compiled copy with the arrays memory-mapped. Leaves
+are only built as Python dicts and lists when first accessed, and processes
+that read the same file share the pages of its arrays.
+"""
+import gzip
+import json
+import pickle
+import hashlib
+import shutil
+from os import stat
+from pathlib import Path
+import numpy
+
+
+class MappedBlock(object):
+    """Array of numeric leaves that share the same year keys or list length.
+
+    Attributes:
+        path (Path): Location of the array ('.npy') file.
+        keys (tuple or NoneType): Year keys of year-keyed dict leaves (None
+            for list leaves).
+        int_path (Path or NoneType): Location of an array that flags the
+            values of each leaf that were integers, for leaves that mix
+            integer and float values (None otherwise).
+    """
+
+    __slots__ = ("path", "keys", "int_path", "_data", "_ints")
+
+    def __init__(self, path, keys, int_path=None):
+        self.path = path
+        self.keys = keys
+        self.int_path = int_path
+        self._data, self._ints = (None for n in range(2))
+
+    def row(self, ind):
+        """Read the values of a leaf from the (memory-mapped) array.
+
+        Args:
+            ind (int): Row of the leaf in the array.
+
+        Returns:
+            Leaf values as a list of Python floats/integers.
+        """
+        if self._data is None:
+            self._data = numpy.load(self.path, mmap_mode="r")
+            if self.int_path is not None:
+                self._ints = numpy.load(self.int_path, mmap_mode="r")
+        vals = self._data[ind].tolist()
+        if self._ints is not None:
+            vals = [int(v) if i else v for v, i in zip(
+                vals, self._ints[ind].tolist())]
+        return vals
+
+    def __getstate__(self):
+        # Arrays are mapped again by each process that reads the block
+        return (self.path, self.keys, self.int_path)
+
+    def __setstate__(self, state):
+        self.path, self.keys, self.int_path = state
+        self._data, self._ints = (None for n in range(2))
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class MappedLeaf(object):
+    """Placeholder for a year-keyed dict or list of numbers in a block.
+
+    Attributes:
+        block (MappedBlock): Block the leaf values are stored in.
+        ind (int): Row of the leaf in the block.
+    """
+
+    __slots__ = ("block", "ind")
+
+    def __init__(self, block, ind):
+        self.block = block
+        self.ind = ind
+
+    def load(self):
+        """Build the leaf from its stored values.
+
+        Returns:
+            Year-keyed dict or list of numbers.
+        """
+        vals = self.block.row(self.ind)
+        if self.block.keys is None:
+            return vals
+        return dict(zip(self.block.keys, vals))
+
+    def __reduce__(self):
+        return (MappedLeaf, (self.block, self.ind))
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class MappedDict(dict):
+    """Dict whose numeric leaves are read from memory-mapped arrays on access.
+
+    Note:
+        Leaves are stored as placeholders until accessed, at which point the
+        leaf is built and stored in place of the placeholder. Copying or
+        pickling the dict retains any placeholders, such that copies (e.g.,
+        those sent to worker processes) read the same mapped arrays.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        val = dict.__getitem__(self, key)
+        if type(val) is MappedLeaf:
+            val = val.load()
+            dict.__setitem__(self, key, val)
+        return val
+
+    # Defining iteration here also routes dict(), dict.update(), and ** on
+    # these dicts through '__getitem__' rather than copying placeholders
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def pop(self, key, *default):
+        val = self.get(key, *default) if default else self[key]
+        dict.pop(self, key, None)
+        return val
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            dict.__setitem__(self, key, default)
+        return self[key]
+
+    def copy(self):
+        return MappedDict(dict.items(self))
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (MappedDict, (), None, None, iter(dict.items(self)))
+
+
+class MappedJSON(object):
+    """Compile and load memory-mapped copies of JSON input files.
+
+    Attributes:
+        store_dir (Path): Folder in which compiled copies are stored.
+    """
+
+    # Names of the files holding a compiled copy's structure and arrays
+    tree_file = "tree.pkl"
+    block_file = "block_{}.npy"
+    int_file = "block_{}_int.npy"
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+
+    def load(self, fpath):
+        """Load a JSON file (or gzipped JSON file) via its compiled copy.
+
+        Note:
+            The file is compiled the first time it is loaded, and again
+            whenever its size or modification time changes, at which point
+            the copy compiled from the file's previous version is removed.
+
+        Args:
+            fpath (Path): Path of the JSON file.
+
+        Returns:
+            Data from the JSON file, with nested dicts as 'MappedDict'.
+        """
+        fpath = Path(fpath)
+        copy_dir = self.copy_dir(fpath)
+        try:
+            return self.read(copy_dir)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            pass
+        data = self.parse(fpath)
+        try:
+            self.write(data, copy_dir)
+        # Use the parsed data directly if a compiled copy cannot be written
+        except OSError:
+            return data
+        self.remove_stale(copy_dir)
+        return self.read(copy_dir)
+
+    def copy_dir(self, fpath):
+        """Find the folder of a JSON file's compiled copy.
+
+        Args:
+            fpath (Path): Path of the JSON file.
+
+        Returns:
+            Folder named for the file and its location, followed by its
+            size and modification time.
+        """
+        f_stat = stat(fpath)
+        loc_id, f_id = [hashlib.sha256(str(x).encode("utf-8")).hexdigest()[
+            :16] for x in [fpath.resolve(), [
+                f_stat.st_size, f_stat.st_mtime_ns]]]
+        return self.store_dir / (fpath.name + "-" + loc_id + "-" + f_id)
+
+    def remove_stale(self, copy_dir):
+        """Remove copies compiled from previous versions of a JSON file.
+
+        Note:
+            Copies that cannot be removed (e.g., because another process
+            has their arrays mapped on a platform that does not allow the
+            removal of open files) are left in place.
+
+        Args:
+            copy_dir (Path): Folder of the current compiled copy.
+        """
+        # Copies of the same file share the part of the folder name that
+        # identifies the file and its location
+        prefix = copy_dir.name.rsplit("-", 1)[0] + "-"
+        for stale_dir in self.store_dir.iterdir():
+            if stale_dir.name.startswith(prefix) and stale_dir != copy_dir \
+                    and not stale_dir.name.endswith(".tmp"):
+                shutil.rmtree(stale_dir, ignore_errors=True)
+
+    @staticmethod
+    def parse(fpath):
+        """Parse a JSON file (or gzipped JSON file).
+
+        Args:
+            fpath (Path): Path of the JSON file.
+
+        Returns:
+            Data from the JSON file.
+        """
+        if fpath.suffix == ".gz":
+            with gzip.GzipFile(fpath, 'r') as zip_ref:
+                return json.loads(zip_ref.read().decode('utf-8'))
+        with open(fpath, 'r') as handle:
+            try:
+                return json.load(handle)
+            except ValueError as e:
+                raise ValueError(
+                    f"Error reading in '{fpath}': {str(e)}") from None
+
+    def read(self, copy_dir):
+        """Read a compiled copy of a JSON file.
+
+        Args:
+            copy_dir (Path): Folder of the compiled copy.
+
+        Returns:
+            Data from the compiled copy.
+        """
+        with open(copy_dir / self.tree_file, "rb") as handle:
+            data, blocks = pickle.load(handle)
+        # Point blocks to the arrays in the compiled copy's current location
+        for block in blocks:
+            block.path = copy_dir / block.path
+            if block.int_path is not None:
+                block.int_path = copy_dir / block.int_path
+        if type(data) is MappedLeaf:
+            data = data.load()
+        return data
+
+    def write(self, data, copy_dir):
+        """Write a compiled copy of JSON data.
+
+        Args:
+            data: Data from a JSON file.
+            copy_dir (Path): Folder to write the compiled copy to.
+        """
+        # Leaf values and integer flags by block signature
+        blocks, rows, ints = ({} for n in range(3))
+        tree = self.compile(data, blocks, rows, ints)
+        tmp_dir = copy_dir.with_name(copy_dir.name + ".tmp")
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        for sig, block in blocks.items():
+            numpy.save(tmp_dir / block.path, numpy.array(
+                rows[sig], dtype=(int if sig[2] == "int" else float)))
+            if block.int_path is not None:
+                numpy.save(tmp_dir / block.int_path, numpy.array(
+                    ints[sig], dtype=bool))
+        with open(tmp_dir / self.tree_file, "wb") as handle:
+            pickle.dump((tree, list(blocks.values())), handle,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_dir.replace(copy_dir)
+
+    def compile(self, node, blocks, rows, ints):
+        """Replace the numeric leaves of JSON data with block placeholders.
+
+        Args:
+            node: Data (or part of the data) from a JSON file.
+            blocks (dict): Blocks by signature (leaf type, year keys or list
+                length, and value type).
+            rows (dict): Leaf values by block signature.
+            ints (dict): Integer value flags by block signature (for blocks
+                of leaves that mix integer and float values).
+
+        Returns:
+            Data with nested dicts as 'MappedDict' and numeric leaves as
+            'MappedLeaf' placeholders.
+        """
+        if isinstance(node, dict):
+            if node and all(k.isdigit() for k in node.keys()):
+                vals, val_type = self.numeric(node.values())
+                if val_type:
+                    return self.add_leaf(
+                        ("dict", tuple(node.keys()), val_type), vals, blocks,
+                        rows, ints)
+            return MappedDict((k, self.compile(v, blocks, rows, ints)) for
+                              k, v in node.items())
+        elif isinstance(node, list):
+            vals, val_type = self.numeric(node)
+            if val_type:
+                return self.add_leaf(
+                    ("list", len(node), val_type), vals, blocks, rows, ints)
+        # Other values (including lists that hold dicts, which are not
+        # accessed through 'MappedDict') are stored as is
+        return node
+
+    @staticmethod
+    def numeric(vals):
+        """Determine whether leaf values can be stored in a block.
+
+        Args:
+            vals (iterable): Leaf values.
+
+        Returns:
+            The values as a list and their type ('int', 'float', or 'mixed'
+            for integers and floats), or an empty string if the values
+            cannot be stored exactly in a block.
+        """
+        vals = list(vals)
+        types = set(type(v) for v in vals)
+        if not vals or not types <= {int, float}:
+            return vals, ""
+        # Integers must be within the range that arrays store exactly
+        elif int in types and any(
+                abs(v) > 2 ** 53 for v in vals if type(v) is int):
+            return vals, ""
+        elif types == {int}:
+            return vals, "int"
+        elif types == {float}:
+            return vals, "float"
+        return vals, "mixed"
+
+    def add_leaf(self, sig, vals, blocks, rows, ints):
+        """Add leaf values to a block.
+
+        Args:
+            sig (tuple): Block signature.
+            vals (list): Leaf values.
+            blocks (dict): Blocks by signature.
+            rows (dict): Leaf values by block signature.
+            ints (dict): Integer value flags by block signature.
+
+        Returns:
+            Placeholder for the leaf.
+        """
+        if sig not in blocks:
+            n = len(blocks)
+            blocks[sig] = MappedBlock(
+                self.block_file.format(n),
+                (sig[1] if sig[0] == "dict" else None),
+                (self.int_file.format(n) if sig[2] == "mixed" else None))
+            rows[sig], ints[sig] = ([] for n in range(2))
+        rows[sig].append(vals)
+        if sig[2] == "mixed":
+            ints[sig].append([type(v) is int for v in vals])
+        return MappedLeaf(blocks[sig], len(rows[sig]) - 1)
@@ -6,6 +6,7 @@ import json
 import argparse
 import csv
 from scout import mseg_techdata as rmt
+from scout.aeo_import import ImportCache, strip_nulls
 from scout.config import FilePaths as fp
 
 
@@ -263,6 +264,81 @@ res_dictlist = [endusedict, cdivdict, bldgtypedict, fueldict,
                 technology_supplydict, technology_demanddict]
 
 
+# Columns used to index the rows of the AEO energy/stock data and the thermal
+# load components data for the selection of microsegment data
+nrg_stock_index_cols = ['CDIV', 'BLDG', 'ENDUSE', 'FUEL', 'EQPCLASS']
+tloads_index_cols = ['CDIV', 'BLDG', 'ENDUSE']
+
+
+class GroupedIndex(object):
+    """Index the rows of a structured array by the values of key columns.
+
+    The rows of the array are sorted once by the key columns, such that
+    the rows that share values for the key columns (or for any number of
+    the leading key columns) form a contiguous block of the sorted array.
+    Selecting the rows for a microsegment is then a dict lookup and a
+    slice of the sorted array, rather than a comparison of every row of
+    the array to the microsegment's filtering values.
+
+    Attributes:
+        columns (list): Names of the key columns, in the order used for
+            sorting and for the keys of selections.
+        data (numpy.ndarray): Rows of the array, sorted by the key columns
+            (rows with identical keys remain in their original order).
+        positions (numpy.ndarray): Position of each sorted row in the
+            original array.
+        blocks (list): Dicts (one per number of leading key columns) that
+            give the start and end of the sorted rows for each key.
+    """
+
+    def __init__(self, data, columns):
+        self.columns = columns
+        # Combine integer codes for the values in each key column into a
+        # single code for each row that sorts as the key columns would
+        codes = numpy.zeros(len(data), dtype='i8')
+        radices = []
+        for col in columns:
+            vals, col_codes = numpy.unique(data[col], return_inverse=True)
+            radices.append(max(len(vals), 1))
+            codes = codes * radices[-1] + col_codes.reshape(-1)
+        self.positions = numpy.argsort(codes, kind='stable')
+        self.data = data[self.positions]
+        codes = codes[self.positions]
+        self.blocks = []
+        for n_cols in range(1, len(columns) + 1):
+            # Codes shared by all rows with the same leading key values
+            prefix_codes = codes // int(numpy.prod(radices[n_cols:]))
+            starts = numpy.flatnonzero(numpy.diff(prefix_codes)) + 1
+            if len(data) > 0:
+                starts = numpy.concatenate([[0], starts])
+            ends = numpy.append(starts[1:], len(data)).tolist()
+            # Key values are those of the first row in each block
+            keys = zip(*[self.data[col][starts].tolist()
+                         for col in columns[:n_cols]])
+            self.blocks.append(dict(zip(keys, zip(starts.tolist(), ends))))
+
+    def select(self, *key):
+        """Select the rows with given values for the leading key columns.
+
+        Args:
+            key: Values of the first (or all) key columns, in order.
+
+        Returns:
+            Structured array of the matching rows, in their original order.
+        """
+        try:
+            start, end = self.blocks[len(key) - 1][key]
+        except KeyError:
+            return self.data[:0]
+        rows = self.data[start:end]
+        # Rows matching only some of the key columns are sorted by the
+        # remaining key columns; restore their original order
+        if len(key) < len(self.columns):
+            rows = rows[numpy.argsort(
+                self.positions[start:end], kind='stable')]
+        return rows
+
+
 def json_translator(dictlist, filterformat):
     """Determine filtering keys for finding information in the input data
 
@@ -395,7 +471,8 @@ def thermal_load_select(tl_data, sel):
     building envelope.
 
     Args:
-        tl_data (numpy.ndarray): An array of thermal load component factors.
+        tl_data (numpy.ndarray or GroupedIndex): An array of thermal load
+            component factors, or the array indexed by 'tloads_index_cols'.
         sel (list): A nested list of indices for selecting the relevant
             data, created by json_translator.
 
@@ -405,10 +482,12 @@ def thermal_load_select(tl_data, sel):
         census division, and building type.
     """
 
+    # Index the thermal loads data if not already done
+    if not isinstance(tl_data, GroupedIndex):
+        tl_data = GroupedIndex(tl_data, tloads_index_cols)
+
     # Select the appropriate data from the thermal loads data array
-    tl_data_sel = tl_data[numpy.all([tl_data['ENDUSE'] == sel[0][0],
-                                     tl_data['CDIV'] == sel[0][1],
-                                     tl_data['BLDG'] == sel[0][2]], axis=0)]
+    tl_data_sel = tl_data.select(sel[0][1], sel[0][2], sel[0][0])
 
     # Extract the demand modifier value (the fraction of heating or
     # cooling load gained/lost through the relevant exterior surface)
@@ -431,8 +510,9 @@ def nrg_stock_select(data, sel):
     and stock data always have a single key for each year.
 
     Args:
-        data (numpy.ndarray): An array of AEO energy, equipment stock,
-            and household count data given by microsegment.
+        data (numpy.ndarray or GroupedIndex): An array of AEO energy,
+            equipment stock, and household count data given by
+            microsegment, or the array indexed by 'nrg_stock_index_cols'.
         sel (list): A nested list of indices for selecting the relevant
             data, created by json_translator.
 
@@ -445,29 +525,20 @@ def nrg_stock_select(data, sel):
     group_stock = {}
     group_energy = {}
 
-    # Select data for the specified census division and building type
-    data_sel = data[numpy.all([data['CDIV'] == sel[0][1],
-                               data['BLDG'] == sel[0][2]], axis=0)]
+    # Index the energy and stock data if not already done
+    if not isinstance(data, GroupedIndex):
+        data = GroupedIndex(data, nrg_stock_index_cols)
 
-    # Multiple end uses can be provided, but try first to see if only
-    # one end use is provided; if not, select data for all of the
-    # end uses given
+    # Multiple end uses and/or fuel types can be provided; select
+    # data for each of the end uses and fuel types given
     if type(sel[0][0]) is not tuple:
-        data_sel = data_sel[numpy.all(
-            [data_sel['ENDUSE'] == sel[0][0]], axis=0)]
+        enduses = [sel[0][0]]
     else:
-        data_sel = data_sel[numpy.hstack([numpy.where(
-            data_sel['ENDUSE'] == i) for i in sel[0][0]]).flatten()]
-
-    # Multiple fuel types can be provided, but try first to see if only
-    # one fuel type is provided and if not, use a different approach to
-    # select data for all of the fuel types indicated
+        enduses = sel[0][0]
     if type(sel[0][3]) is not tuple:
-        data_sel = data_sel[numpy.all(
-            [data_sel['FUEL'] == sel[0][3]], axis=0)]
+        fuels = [sel[0][3]]
     else:
-        data_sel = data_sel[numpy.hstack([numpy.where(
-            data_sel['FUEL'] == i) for i in sel[0][3]]).flatten()]
+        fuels = sel[0][3]
 
     # If an equipment class is specified, select the subset of
     # applicable data as appropriate
@@ -476,14 +547,24 @@ def nrg_stock_select(data, sel):
     except IndexError:
         eqp = False
 
-    if eqp:
-        if isinstance(eqp, tuple):  # Lighting
-            data_sel = data_sel[
-                numpy.all([data_sel['EQPCLASS'] == eqp[0],
-                           data_sel['BULBTYPE'] == eqp[1]], axis=0)]
-        else:  # Other end uses
-            data_sel = data_sel[
-                numpy.all([data_sel['EQPCLASS'] == eqp], axis=0)]
+    # Gather the data for the specified census division and building type
+    # and each end use, fuel type, and (if given) equipment class; data
+    # are grouped by fuel type, then by end use, in the order given
+    data_sel = []
+    for fuel in fuels:
+        for enduse in enduses:
+            if eqp:
+                if isinstance(eqp, tuple):  # Lighting
+                    rows = data.select(
+                        sel[0][1], sel[0][2], enduse, fuel, eqp[0])
+                    rows = rows[rows['BULBTYPE'] == eqp[1]]
+                else:  # Other end uses
+                    rows = data.select(
+                        sel[0][1], sel[0][2], enduse, fuel, eqp)
+            else:
+                rows = data.select(sel[0][1], sel[0][2], enduse, fuel)
+            data_sel.append(rows)
+    data_sel = numpy.concatenate(data_sel)
 
     # Loop through the reduced numpy stock and energy array and
     # combine the reported values together
@@ -525,8 +606,9 @@ def sqft_homes_select(data, sel):
     use, building type, and technology type in each census division.
 
     Args:
-        data (numpy.ndarray): An array of AEO energy, equipment stock,
-            and household count data given by microsegment.
+        data (numpy.ndarray or GroupedIndex): An array of AEO energy,
+            equipment stock, and household count data given by
+            microsegment, or the array indexed by 'nrg_stock_index_cols'.
         sel (list): A nested list of indices for selecting the relevant
             data, created by json_translator.
 
@@ -543,17 +625,16 @@ def sqft_homes_select(data, sel):
     else:
         raise ValueError('Unexpected housing stock filtering information!')
 
+    # Index the energy and stock data if not already done
+    if not isinstance(data, GroupedIndex):
+        data = GroupedIndex(data, nrg_stock_index_cols)
+
     # Select home count or square footage data based on selection indices
     if technology_supplydict['total homes (tech level)'] in sel[0]:
-        data_sel = data[numpy.all([data['ENDUSE'] == sel[0][0],
-                                   data['CDIV'] == sel[0][1],
-                                   data['BLDG'] == sel[0][2],
-                                   data['FUEL'] == sel[0][3],
-                                   data['EQPCLASS'] == sel[0][4]], axis=0)]
+        data_sel = data.select(
+            sel[0][1], sel[0][2], sel[0][0], sel[0][3], sel[0][4])
     else:
-        data_sel = data[numpy.all([data['ENDUSE'] == sel[0][0],
-                                   data['CDIV'] == sel[0][1],
-                                   data['BLDG'] == sel[0][2]], axis=0)]
+        data_sel = data.select(sel[0][1], sel[0][2], sel[0][0])
 
     # Loop through the reduced numpy stock and energy (and ancillary
     # data) array and restructure the reported values
@@ -590,9 +671,11 @@ def list_generator(nrg_stock, tloads, filterdata, aeo_years, lt_factors):
     reported only for the first bulb type for each fixture type.
 
     Args:
-        nrg_stock (numpy.ndarray): An array of AEO energy, equipment
-            stock, and household count data given by microsegment.
-        loads (numpy.ndarray): An array of thermal load component factors.
+        nrg_stock (numpy.ndarray or GroupedIndex): An array of AEO energy,
+            equipment stock, and household count data given by
+            microsegment, or the array indexed by 'nrg_stock_index_cols'.
+        loads (numpy.ndarray or GroupedIndex): An array of thermal load
+            component factors, or the array indexed by 'tloads_index_cols'.
         filterdata (list): A list of keys from the microsegments JSON
             indicating the data to be obtained.
         aeo_years (int): The number of years of data reported in the
@@ -759,9 +842,11 @@ def walk(nrg_stock, loads, json_dict, yrs_range, lt_factors, key_list=[]):
     terminal node.
 
     Args:
-        nrg_stock (numpy.ndarray): An array of AEO energy, equipment
-            stock, and household count data given by microsegment.
-        loads (numpy.ndarray): An array of thermal load component factors.
+        nrg_stock (numpy.ndarray or GroupedIndex): An array of AEO energy,
+            equipment stock, and household count data given by
+            microsegment, or the array indexed by 'nrg_stock_index_cols'.
+        loads (numpy.ndarray or GroupedIndex): An array of thermal load
+            component factors, or the array indexed by 'tloads_index_cols'.
         json_dict (dict): The empty microsegments JSON structure.
         yrs_range (int): The number of years of data reported in the
             RESDBOUT file.
@@ -1287,16 +1372,10 @@ def data_import(data_file_path, dtype_list, delim_char=',', skip_rows=[]):
         # quotechar '"' is appropriate; the skipinitialspace option
         # ensures proper reading of double-quoted text strings in the
         # AEO data that have the delimiter inside them (e.g., cooking
-        # equipment descriptions); the loop which csv.reader is called
-        # is used to detect NULL characters and act appropriately (by
-        # removing them prior to converting to a csv.reader object)
-        # if they are encountered
-        if '\0' in open(data_file_path).read():  # NULL bytes detected
-            filecont = csv.reader((x.replace('\0', '') for x in thefile),
-                                  delimiter=delim_char, skipinitialspace=True)
-        else:  # No NULL bytes, proceed normally
-            filecont = csv.reader(thefile,
-                                  delimiter=delim_char, skipinitialspace=True)
+        # equipment descriptions); any NULL characters are removed from
+        # each line as it is read, prior to parsing by csv.reader
+        filecont = csv.reader(strip_nulls(thefile),
+                              delimiter=delim_char, skipinitialspace=True)
 
         # Create list to be populated with tuples of each row of data
         # from the data file
@@ -1421,6 +1500,39 @@ def str_cleaner(data_array, column_name):
     return data_array
 
 
+def res_energy_import(data_file_path, aeo_import_year):
+    """Import and clean the AEO residential energy and stock data.
+
+    Args:
+        data_file_path (str): The full path to the RESDBOUT data file.
+        aeo_import_year (int): Year of the AEO data to import (None for
+            the current year).
+
+    Returns:
+        A numpy structured array of the energy use, equipment stock, and
+        household count data, with the end use, equipment class, and bulb
+        type strings cleaned up.
+    """
+
+    if aeo_import_year == 2015:
+        ns_dtypes = dtype_array(data_file_path, '\t')
+        ns_data = data_import(data_file_path, ns_dtypes, '\t',
+                              ['SF', 'ST', 'FP'])
+    else:
+        ns_dtypes = dtype_array(data_file_path)
+        ns_data = data_import(data_file_path, ns_dtypes, ',',
+                              ['SF', 'ST', 'FP', 'HSHE', 'HSHN',
+                               'HSHA', 'CSHA', 'CSHE', 'CSHN'])
+
+    # Clean up all the columns from the imported data that have
+    # extraneous spaces in their entries
+    ns_data = str_cleaner(ns_data, 'ENDUSE')
+    ns_data = str_cleaner(ns_data, 'EQPCLASS')
+    ns_data = str_cleaner(ns_data, 'BULBTYPE')
+
+    return ns_data
+
+
 def update_lighting_dict():
     """Update the technology_supplydict to be compatible with the 2017 AEO.
 
@@ -1474,30 +1586,19 @@ def main():
     # how to specify the year range to be used for processing the data
     if aeo_import_year == 2015:
         yrs_range = metajson['max year'] - metajson['min year'] + 1
-
-        # Import EIA RESDBOUT.txt energy use and stock file
-        ns_dtypes = dtype_array(eiadata.res_energy, '\t')
-        ns_data = data_import(eiadata.res_energy, ns_dtypes, '\t',
-                              ['SF', 'ST', 'FP'])
     elif aeo_import_year in [2025, None]:
         yrs_range = metajson['max year'] - metajson['min year'] + 1
         update_lighting_dict()
 
-        # Import EIA RESDBOUT.txt energy use and stock file
-        ns_dtypes = dtype_array(eiadata.res_energy)
-        ns_data = data_import(eiadata.res_energy, ns_dtypes, ',',
-                              ['SF', 'ST', 'FP', 'HSHE', 'HSHN',
-                               'HSHA', 'CSHA', 'CSHE', 'CSHN'])
-
     # THIS APPROACH MAY NEED TO BE REVISITED IN THE FUTURE; AS IS,
     # IT DOES NOT ENSURE CONSISTENCY WITH THE OTHER AEO INPUT DATA
     # IN THE RANGE OF YEARS OF THE DATA REPORTED
 
-    # Clean up all the columns from the imported data that have
-    # extraneous spaces in their entries
-    ns_data = str_cleaner(ns_data, 'ENDUSE')
-    ns_data = str_cleaner(ns_data, 'EQPCLASS')
-    ns_data = str_cleaner(ns_data, 'BULBTYPE')
+    # Import EIA RESDBOUT.txt energy use and stock file, or the array
+    # cached from a previous import of the same file
+    import_cache = ImportCache(fp.AEO_IMPORT_CACHE)
+    ns_data = import_cache.load(
+        eiadata.res_energy, res_energy_import, aeo_import_year)
 
     # Import residential thermal load components data
     tl_dtypes = dtype_array(handyvars.res_tloads, '\t')
@@ -1554,9 +1655,14 @@ def main():
          handyvars.json_out, 'w') as jso:
         msjson = json.load(jsi)
 
+        # Index the energy/stock and thermal loads data once such that
+        # the data for each microsegment can be looked up directly
+        ns_index = GroupedIndex(ns_data, nrg_stock_index_cols)
+        tl_index = GroupedIndex(tl_data, tloads_index_cols)
+
         # Run through JSON objects, determine replacement information
         # to mine from the imported data, and make the replacements
-        result = walk(ns_data, tl_data, msjson, yrs_range, lt_wt_fac)
+        result = walk(ns_index, tl_index, msjson, yrs_range, lt_wt_fac)
 
         # Add in onsite generation for SF as a new end-use from
         # RGENOUT.txt
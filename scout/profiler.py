@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Record the time and memory use of the phases of ecm_prep and run
+
+When the 'profile' option is set, the main phases of measure preparation
+(e.g., input loading, checking measure inputs and filling measure markets
+for each measure, preparing packages, writing outputs) and of the analysis
+engine (e.g., calculating savings and metrics, competing measures, and
+finalizing outputs for each adoption scenario) are timed. For each phase,
+the wall time, CPU time (including that of finished worker processes), and
+peak resident memory of the process to that point are recorded, along with
+the measure and number of contributing microsegments the phase applies to
+(where relevant). Reports of the phases and of the totals for each measure
+are written to JSON and CSV files in ./generated.
+"""
+import csv
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+try:
+    import resource
+except ImportError:  # Resource usage is not available on Windows
+    resource = None
+
+
+class Profiler(object):
+    """Record wall time, CPU time, and peak memory use by phase.
+
+    Attributes:
+        enabled (boolean): Flag for whether phases are recorded.
+        records (list): Dicts with the timing and memory use of each
+            recorded phase, in the order the phases finished.
+    """
+
+    # Fields reported for each phase
+    fields = ["phase", "measure", "msegs", "wall_s", "cpu_s", "peak_rss_mb"]
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.records = []
+
+    @staticmethod
+    def usage():
+        """Find the CPU time and peak memory use of the process so far.
+
+        Returns:
+            CPU time (s) of the process and its finished child processes,
+            and peak resident memory (MB) of the process (None if resource
+            usage data are unavailable).
+        """
+        cpu = time.process_time()
+        if resource is None:
+            return cpu, None
+        child = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu += child.ru_utime + child.ru_stime
+        # Peak memory is reported in kB on Linux and in bytes on macOS
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak_rss /= 1024
+        return cpu, round(peak_rss / 1024, 1)
+
+    def start(self, name, measure=None, msegs=None):
+        """Start recording a phase.
+
+        Args:
+            name (str): Name of the phase.
+            measure (str): Optional name of the measure the phase applies to.
+            msegs (int): Optional number of microsegments the phase covers.
+
+        Returns:
+            Dict record of the phase, to be completed by 'stop'.
+        """
+        record = {"phase": name, "measure": measure, "msegs": msegs}
+        if self.enabled is True:
+            record["_start"] = (time.perf_counter(), self.usage()[0])
+        return record
+
+    def stop(self, record):
+        """Finish recording a phase and store its record.
+
+        Args:
+            record (dict): Record of the phase returned by 'start'.
+        """
+        if self.enabled is False:
+            return
+        wall_start, cpu_start = record.pop("_start")
+        cpu_end, peak_rss = self.usage()
+        record.update({
+            "wall_s": round(time.perf_counter() - wall_start, 4),
+            "cpu_s": round(cpu_end - cpu_start, 4),
+            "peak_rss_mb": peak_rss})
+        self.records.append(record)
+
+    @contextmanager
+    def phase(self, name, measure=None, msegs=None):
+        """Record the wall time, CPU time, and peak memory use of a phase.
+
+        Notes:
+            The record for the phase is yielded, such that details known only
+            once the phase is executed (e.g., the number of microsegments a
+            measure applies to) can be added to it. Phases may be nested.
+
+        Args:
+            name (str): Name of the phase.
+            measure (str): Optional name of the measure the phase applies to.
+            msegs (int): Optional number of microsegments the phase covers.
+
+        Yields:
+            Dict record of the phase.
+        """
+        record = self.start(name, measure, msegs)
+        try:
+            yield record
+        finally:
+            self.stop(record)
+
+    def reset(self, enabled):
+        """Clear the recorded phases and set whether phases are recorded.
+
+        Args:
+            enabled (boolean): Flag for whether phases are recorded.
+        """
+        self.enabled = enabled
+        self.records = []
+
+    def add(self, records):
+        """Add phase records (e.g., from a worker process) to the profile.
+
+        Args:
+            records (list): Dict records of phases.
+        """
+        if self.enabled is True:
+            self.records.extend(records)
+
+    def measure_totals(self):
+        """Sum the wall and CPU time of the recorded phases by measure.
+
+        Returns:
+            List of dicts with the total wall and CPU time across the phases
+            recorded for each measure and the measure's number of
+            microsegments, in descending order of wall time.
+        """
+        totals = {}
+        for rec in self.records:
+            if rec["measure"] is None:
+                continue
+            total = totals.setdefault(rec["measure"], {
+                "measure": rec["measure"], "msegs": None, "wall_s": 0,
+                "cpu_s": 0})
+            total["wall_s"] = round(total["wall_s"] + rec["wall_s"], 4)
+            total["cpu_s"] = round(total["cpu_s"] + rec["cpu_s"], 4)
+            if rec["msegs"] is not None:
+                total["msegs"] = rec["msegs"]
+        return sorted(totals.values(), key=lambda x: x["wall_s"],
+                      reverse=True)
+
+    def write(self, filepath: Path):
+        """Write reports of the recorded phases to JSON and CSV files.
+
+        Args:
+            filepath (Path): Path of the reports, without file extension;
+                the totals by measure are also written to a CSV file with
+                '_measures' appended to the name.
+        """
+        if self.enabled is False:
+            return
+        filepath = Path(filepath)
+        meas_totals = self.measure_totals()
+        with open(filepath.with_suffix(".json"), "w") as handle:
+            json.dump({"phases": self.records, "measures": meas_totals},
+                      handle, indent=2)
+        for fpath, rows, fields in [
+                (filepath.with_suffix(".csv"), self.records, self.fields),
+                (filepath.with_name(filepath.name + "_measures.csv"),
+                 meas_totals, ["measure", "msegs", "wall_s", "cpu_s"])]:
+            with open(fpath, "w", newline="") as handle:
+                writer = csv.DictWriter(handle, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(rows)
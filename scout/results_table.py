@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Write and read measure results as a long-format columnar table
+
+Measure results in ecm_results.json are nested dicts keyed by markets and
+savings type, adoption scheme, metric, and (for results by category)
+region, building class, end use, and possibly fuel type, with yearly values
+at the bottom of each branch. Analyses of these results typically flatten
+them into a table with one row per value, which requires parsing and walking
+the full set of results. This module writes the results once to a table with
+one row per measure, adoption scheme, markets and savings type, metric,
+category, and year, stored in a directory as one binary file per column.
+Columns of names (e.g., measure, metric, region) are stored as integer codes
+into lists of unique names, and the table is written in chunks of one measure
+each, with the names found in each chunk recorded in the table's metadata.
+Reading the table memory-maps the column files and only loads the chunks and
+rows that match the requested names.
+"""
+import json
+from pathlib import Path
+import numpy
+import pandas as pd
+
+
+class ResultsTable(object):
+    """Long-format table of measure results stored by column.
+
+    Attributes:
+        path (Path): Directory of the table's column and metadata files.
+        meta (dict): Table metadata, with the categories of each column of
+            names and the row offset, row count, and names of each chunk.
+    """
+
+    # Columns of names, in the order of the levels of the results dicts
+    name_cols = ["measure", "markets and savings type", "adoption scheme",
+                 "metric", "region", "building class", "end use", "fuel"]
+    # Column of the results years
+    year_col = "year"
+    # Column of the results values
+    value_col = "value"
+    # Data types of the column files
+    dtypes = dict([(c, "int32") for c in name_cols] + [
+        (year_col, "int16"), (value_col, "float64")])
+    # Markets and savings types in the results for each measure
+    mkt_types = {
+        "Markets and Savings (Overall)": "Overall",
+        "Markets and Savings (by Category)": "by Category"}
+    # Name of the metadata file
+    meta_file = "table.json"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / self.meta_file, "r") as handle:
+            self.meta = json.load(handle)
+
+    @classmethod
+    def write(cls, results, path: Path):
+        """Write measure results to a columnar table, one measure at a time.
+
+        Notes:
+            Results values that are not yearly numbers (e.g., the filter
+            variables of each measure), as well as entries in the results that
+            are not measures (e.g., on-site generation), are not written.
+
+        Args:
+            results (dict): Results for individual measures, structured as in
+                ecm_results.json.
+            path (Path): Directory to write the table to.
+
+        Returns:
+            Columnar table of the measure results.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        # Codes for each unique name in each column of names
+        codes = {c: {} for c in cls.name_cols}
+        chunks, offset = [], 0
+        col_files = {c: open(path / (c + ".bin"), "wb") for c in cls.dtypes}
+        try:
+            for meas, meas_results in results.items():
+                # Entries that are measures have markets and savings results
+                if not isinstance(meas_results, dict) or not any(
+                        x in meas_results.keys() for x in cls.mkt_types):
+                    continue
+                chunk = cls.flatten_measure(meas, meas_results, codes)
+                n_rows = len(chunk[cls.value_col])
+                for c, vals in chunk.items():
+                    numpy.asarray(vals, dtype=cls.dtypes[c]).tofile(
+                        col_files[c])
+                # Record the names present in the chunk
+                chunks.append({
+                    "offset": offset, "rows": n_rows,
+                    "codes": {c: sorted(set(chunk[c])) for c in cls.name_cols}})
+                offset += n_rows
+        finally:
+            for handle in col_files.values():
+                handle.close()
+        meta = {
+            "rows": offset, "dtypes": cls.dtypes,
+            "categories": {c: list(codes[c].keys()) for c in cls.name_cols},
+            "chunks": chunks}
+        with open(path / cls.meta_file, "w") as handle:
+            json.dump(meta, handle, indent=2)
+
+        return cls(path)
+
+    @classmethod
+    def flatten_measure(cls, meas, meas_results, codes):
+        """Flatten the markets and savings results for a measure into rows.
+
+        Args:
+            meas (str): Measure name.
+            meas_results (dict): Results for the measure.
+            codes (dict): Codes for each unique name in each column of names,
+                updated with the names found in the measure results.
+
+        Returns:
+            Dict of the measure's values for each column of the table.
+        """
+        chunk = {c: [] for c in cls.dtypes}
+        # Codes for missing names (e.g., the region of overall results)
+        missing = -1
+
+        def code(col, name):
+            return codes[col].setdefault(name, len(codes[col]))
+
+        def add_rows(node, row_codes):
+            # Yearly results
+            if all(not isinstance(v, dict) for v in node.values()):
+                yrs = [yr for yr, v in node.items() if isinstance(
+                    v, (int, float)) or v is None]
+                if len(yrs) == 0 or not all(yr.isdigit() for yr in yrs):
+                    return
+                if len(row_codes) > len(cls.name_cols):
+                    raise ValueError(
+                        "Unexpected nesting of results for measure '" +
+                        meas + "'")
+                full_codes = row_codes + [missing] * (
+                    len(cls.name_cols) - len(row_codes))
+                for c, c_code in zip(cls.name_cols, full_codes):
+                    chunk[c].extend([c_code] * len(yrs))
+                chunk[cls.year_col].extend(int(yr) for yr in yrs)
+                chunk[cls.value_col].extend(
+                    numpy.nan if node[yr] is None else node[yr] for yr in yrs)
+            # Results broken out further
+            else:
+                for k, v in node.items():
+                    if isinstance(v, dict):
+                        add_rows(v, row_codes + [code(
+                            cls.name_cols[len(row_codes)], k)])
+
+        for mkt_key, mkt_type in cls.mkt_types.items():
+            for scheme, scheme_results in meas_results.get(
+                    mkt_key, {}).items():
+                for metric, metric_results in scheme_results.items():
+                    if isinstance(metric_results, dict):
+                        add_rows(metric_results, [
+                            code("measure", meas),
+                            code("markets and savings type", mkt_type),
+                            code("adoption scheme", scheme),
+                            code("metric", metric)])
+
+        return chunk
+
+    def column(self, col, start=0, stop=None):
+        """Read (memory-map) the values of a column for a range of rows.
+
+        Args:
+            col (str): Column name.
+            start (int): Optional first row to read.
+            stop (int): Optional row to stop reading at (defaults to the
+                last row).
+
+        Returns:
+            Array of the column's (coded) values for the rows.
+        """
+        if self.meta["rows"] == 0:
+            return numpy.empty(0, dtype=self.dtypes[col])
+        vals = numpy.memmap(self.path / (col + ".bin"), mode="r",
+                            dtype=self.meta["dtypes"][col],
+                            shape=(self.meta["rows"],))
+        return vals[start:stop]
+
+    def load(self, filters=None):
+        """Load the rows of the table that match names in given columns.
+
+        Args:
+            filters (dict): Optional names (or lists of names) to select rows
+                by for any of the columns of names (e.g., {"metric": "Energy
+                Savings (MMBtu)", "region": ["AIA_CZ1", "AIA_CZ2"]}), and/or
+                years to select rows by for the year column.
+
+        Returns:
+            pandas.DataFrame of the selected rows, with categorical columns
+            of names.
+        """
+        if filters is None:
+            filters = {}
+        # Convert the names to select by to the codes of each column
+        filter_codes = {}
+        for col, names in filters.items():
+            if col not in self.name_cols + [self.year_col]:
+                raise ValueError(
+                    "Unexpected column '" + col + "' to select rows by")
+            if isinstance(names, (str, int)):
+                names = [names]
+            if col == self.year_col:
+                filter_codes[col] = [int(yr) for yr in names]
+            else:
+                cats = self.meta["categories"][col]
+                filter_codes[col] = [
+                    cats.index(x) for x in names if x in cats]
+        # Read the rows of each chunk that includes the names to select by
+        sel_rows = []
+        for chunk in self.meta["chunks"]:
+            if any(not set(codes).intersection(chunk["codes"][col]) for
+                   col, codes in filter_codes.items() if
+                   col != self.year_col):
+                continue
+            start, stop = chunk["offset"], chunk["offset"] + chunk["rows"]
+            keep = numpy.ones(chunk["rows"], dtype=bool)
+            for col, codes in filter_codes.items():
+                keep &= numpy.isin(self.column(col, start, stop), codes)
+            sel_rows.append(numpy.arange(start, stop)[keep])
+        if len(sel_rows) != 0:
+            sel_rows = numpy.concatenate(sel_rows)
+        else:
+            sel_rows = numpy.empty(0, dtype=int)
+
+        table = {}
+        for col in self.name_cols:
+            table[col] = pd.Categorical.from_codes(
+                numpy.asarray(self.column(col)[sel_rows]),
+                categories=self.meta["categories"][col])
+        for col in [self.year_col, self.value_col]:
+            table[col] = numpy.asarray(self.column(col)[sel_rows])
+
+        return pd.DataFrame(table)
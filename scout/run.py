@@ -5,16 +5,20 @@ import numpy
 import copy
 from numpy.linalg import LinAlgError
 from collections import OrderedDict, defaultdict
-import gzip
-import pickle
 from ast import literal_eval
 import math
 from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
 import numpy_financial as npf
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from scout.plots import run_plot
 from scout.config import FilePaths as fp
 from scout.config import Config
+from scout.mapped_json import MappedJSON
+from scout.ecm_prep import Utils
+from scout.json_writer import dump_json
+from scout.results_table import ResultsTable
+from scout.profiler import Profiler
 import warnings
 
 
@@ -32,10 +36,15 @@ class UsefulInputFiles(object):
         active_measures (str): Measures that are active for the analysis.
         meas_engine_out_ecms (tuple): Individual measure output summaries.
         meas_engine_out_agg (tuple): Portfolio output summaries.
+        meas_engine_out_table (Path): Columnar table of individual measure
+            output summaries (if required).
         comp_fracs_out (tuple): Competition adjustment fractions (if required)
+        profile (Path): Reports of the time and memory use of each phase of
+            the analysis (without file extension; if required).
         cpi_data (tuple). Consumer Price Index (CPI) data.
         htcl_totals (tuple): Heating/cooling energy totals by climate zone,
             building type, and structure type.
+        mapped_inputs (Path): Folder of memory-mapped copies of large inputs.
     """
 
     def __init__(self, energy_out, regions, grid_decarb):
@@ -46,7 +55,10 @@ class UsefulInputFiles(object):
         self.active_measures = fp.GENERATED / "run_setup.json"
         self.meas_engine_out_ecms = fp.RESULTS / "ecm_results.json"
         self.meas_engine_out_agg = fp.RESULTS / "agg_results.json"
+        self.meas_engine_out_table = fp.RESULTS / "ecm_results_table"
         self.comp_fracs_out = fp.RESULTS / "comp_fracs.json"
+        self.profile = fp.GENERATED / "profile_run"
+        self.mapped_inputs = fp.MAPPED_INPUTS
         self.cpi_data = fp.CONVERT_DATA / "cpi.csv"
         # Set heating/cooling energy totals file conditional on: 1) regional
         # breakout used, and 2) whether site energy data, source energy data
@@ -266,6 +278,59 @@ class UsefulVars(object):
             self.cost_convert[metr] = cpi_row_cmn / cpi_row_metr
 
 
+class CopyOnAccessDict(dict):
+    """Dict that shares its values with another dict until they are accessed.
+
+    Note:
+        Values are deep copied from the shared dict the first time they are
+        accessed, such that changes to accessed values do not affect the
+        shared dict and values that are never accessed are never copied.
+
+    Attributes:
+        copied (set): Keys of values that have already been copied.
+    """
+
+    __slots__ = ("copied",)
+
+    def __init__(self, shared):
+        dict.__init__(self, shared)
+        self.copied = set()
+
+    def __getitem__(self, key):
+        val = dict.__getitem__(self, key)
+        if key not in self.copied:
+            val = copy.deepcopy(val)
+            dict.__setitem__(self, key, val)
+            self.copied.add(key)
+        return val
+
+    def __setitem__(self, key, val):
+        dict.__setitem__(self, key, val)
+        self.copied.add(key)
+
+    # Defining iteration here also routes dict() and dict.update() on these
+    # dicts through '__getitem__' rather than sharing uncopied values
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    # Pickled copies (e.g., those sent to worker processes) keep sharing
+    # uncopied values with any shared dict pickled alongside them
+    def __reduce__(self):
+        return (CopyOnAccessDict, (dict(dict.items(self)),), self.copied)
+
+    def __setstate__(self, copied):
+        self.copied = copied
+
+
 class Measure(object):
     """Class representing individual efficiency measures.
 
@@ -411,12 +476,15 @@ class Engine(object):
         output_all (OrderedDict): Summary results across all active measures;
             also stores data on energy output type (site, source (fossil
             equivalent site-source) or source (captured energy site-source).
+        mseg_key_tuples (dict): Parsed contributing microsegment key chains,
+            keyed by their string representations.
     """
 
     def __init__(self, handyvars, opts, measure_objects, energy_out, brkout):
         self.handyvars = handyvars
         self.opts = opts
         self.measures = measure_objects
+        self.mseg_key_tuples = {}
         self.output_ecms, self.output_all = (OrderedDict() for n in range(2))
         self.output_all["All ECMs"] = OrderedDict([
             ("Markets and Savings (Overall)", OrderedDict())])
@@ -526,6 +594,10 @@ class Engine(object):
         # Find all active measures that require savings updates
         measures_update = [m for m in self.measures if m.update_results[
             "savings"][adopt_scheme][comp_scheme] is True]
+        # Initialize measures that require financial metric updates (with
+        # the financial metric calculation case(s) for each year) and the
+        # financial metric calculation cases across all of these measures
+        measures_fin, fin_cases = ([] for n in range(2))
 
         # Update measure savings and associated financial metrics
         for m in measures_update:
@@ -634,19 +706,14 @@ class Engine(object):
 
                 # Initialize per unit measure stock, energy, and carbon costs;
                 # per unit energy and carbon cost savings; per unit energy and
-                # carbon savings; unit stock, energy, and carbon costs to use
-                # in residential and commercial competition calculations; and
-                # financial metrics (irr, payback, cce, ccc)
+                # carbon savings; and the financial metric calculation
+                # case(s) to draw each year's metrics from
                 scostbase_unit, scostmeas_delt_unit, scostmeas_unit, \
                     ecost_meas_unit, ccost_meas_unit, \
                     ecostsave_unit, ccostsave_unit, esave_unit, \
-                    csave_unit, stock_unit_cost_res, stock_unit_cost_com, \
-                    energy_unit_cost_res, energy_unit_cost_com, \
-                    carb_unit_cost_res, carb_unit_cost_com, irr_e, irr_ec, \
-                    payback_e, payback_ec, cce, cce_bens, ccc, ccc_bens = ({
+                    csave_unit, fin_plan = ({
                         yr: None for yr in self.handyvars.aeo_years} for
-                        n in range(23))
-
+                        n in range(10))
                 # Calculate per unit stock costs, energy and carbon savings,
                 # and energy and carbon cost savings for each projection year;
                 # base calculations on competed stock in each year
@@ -757,41 +824,13 @@ class Engine(object):
 
                     # If the total baseline stock is zero or no measure units
                     # have been captured for a given year, set finance metrics
-                    # to 999
+                    # to 999 (flagged by a plan of None, the default)
                     if nunits_cmp == 0 or (
                         not isinstance(nunits_meas_cmp, numpy.ndarray) and
                         nunits_meas_cmp == 0 or
                             isinstance(nunits_meas_cmp, numpy.ndarray) and all(
                                 nunits_meas_cmp) == 0):
-                        if yr == self.handyvars.aeo_years[0]:
-                            stock_unit_cost_res[yr], \
-                                energy_unit_cost_res[yr], \
-                                carb_unit_cost_res[yr], \
-                                stock_unit_cost_com[yr], \
-                                energy_unit_cost_com[yr], \
-                                carb_unit_cost_com[yr], \
-                                irr_e[yr], irr_ec[yr], payback_e[yr], \
-                                payback_ec[yr], cce[yr], cce_bens[yr], \
-                                ccc[yr], ccc_bens[yr] = [
-                                    None for n in range(6)] + [
-                                    999 for n in range(8)]
-                        else:
-                            yr_prev = str(int(yr) - 1)
-                            stock_unit_cost_res[yr], \
-                                energy_unit_cost_res[yr], \
-                                carb_unit_cost_res[yr], \
-                                stock_unit_cost_com[yr], \
-                                energy_unit_cost_com[yr], \
-                                carb_unit_cost_com[yr], \
-                                irr_e[yr], irr_ec[yr], \
-                                payback_e[yr], payback_ec[yr], \
-                                cce[yr], cce_bens[yr], \
-                                ccc[yr], ccc_bens[yr] = [x[yr_prev] for x in [
-                                    stock_unit_cost_res, energy_unit_cost_res,
-                                    carb_unit_cost_res, stock_unit_cost_com,
-                                    energy_unit_cost_com, carb_unit_cost_com,
-                                    irr_e, irr_ec, payback_e, payback_ec, cce,
-                                    cce_bens, ccc, ccc_bens]]
+                        continue
                     # Otherwise, check whether any financial metric calculation
                     # inputs that can be arrays are in fact arrays
                     elif any(isinstance(x, numpy.ndarray) for x in [
@@ -851,96 +890,116 @@ class Engine(object):
                         if not isinstance(life_meas_tmp, numpy.ndarray):
                             life_meas_tmp = numpy.repeat(
                                 life_meas_tmp, len_arr)
-
-                        # Initialize numpy arrays for financial metrics outputs
-                        stock_unit_cost_res[yr], energy_unit_cost_res[yr], \
-                            carb_unit_cost_res[yr], stock_unit_cost_com[yr], \
-                            energy_unit_cost_com[yr], carb_unit_cost_com[yr], \
-                            irr_e[yr], irr_ec[yr], payback_e[yr], \
-                            payback_ec[yr], cce[yr], cce_bens[yr], ccc[yr], \
-                            ccc_bens[yr] = (numpy.repeat(None, len(
-                                scostmeas_delt_unit_tmp)) for v in range(14))
-
-                        # Run measure energy/carbon/cost savings and lifetime
-                        # inputs through "metric_update" function to yield
-                        # financial metric outputs. To handle inputs that are
-                        # arrays, use a for loop to generate an output for each
-                        # input array element one-by-one and append it to the
-                        # appropriate output list. Note that lifetime float
+                        # Add a financial metric calculation case for each
+                        # input array element. Note that lifetime float
                         # values are translated to integers, and all
                         # energy, carbon, and energy/carbon cost savings values
                         # are normalized by total applicable stock units
+                        fin_plan[yr] = []
                         for x in range(0, len(scostmeas_delt_unit_tmp)):
-                            stock_unit_cost_res[yr][x], \
-                                energy_unit_cost_res[yr][x], \
-                                carb_unit_cost_res[yr][x], \
-                                stock_unit_cost_com[yr][x], \
-                                energy_unit_cost_com[yr][x], \
-                                carb_unit_cost_com[yr][x], \
-                                irr_e[yr][x], irr_ec[yr][x], \
-                                payback_e[yr][x], payback_ec[yr][x], \
-                                cce[yr][x], cce_bens[yr][x], ccc[yr][x], \
-                                ccc_bens[yr][x] = self.metric_update(
-                                    m, int(round(life_base)),
-                                    int(round(life_meas_tmp[x])),
-                                    scostbase_unit[yr],
-                                    scostmeas_delt_unit_tmp[x],
-                                    esave_tmp_unit[x], ecostsave_tmp_unit[x],
-                                    csave_tmp_unit[x], ccostsave_tmp_unit[x],
-                                    scost_meas_tmp[x], ecost_meas_tmp[x],
-                                    ccost_meas_tmp[x])
-                    else:
-                        # Run measure energy/carbon/cost savings and lifetime
-                        # inputs through "metric_update" function to yield
-                        # financial metric outputs. Note that lifetime float
-                        # values are translated to integers, and all
-                        # energy, carbon, and energy/carbon cost savings values
-                        # are normalized by total applicable stock units
-                        stock_unit_cost_res[yr], energy_unit_cost_res[yr], \
-                            carb_unit_cost_res[yr], stock_unit_cost_com[yr], \
-                            energy_unit_cost_com[yr], carb_unit_cost_com[yr], \
-                            irr_e[yr], irr_ec[yr], payback_e[yr], \
-                            payback_ec[yr], cce[yr], cce_bens[yr], ccc[yr], \
-                            ccc_bens[yr] = \
-                            self.metric_update(
+                            fin_plan[yr].append(len(fin_cases))
+                            fin_cases.append((
                                 m, int(round(life_base)),
-                                int(round(life_meas)), scostbase_unit[yr],
-                                scostmeas_delt_unit[yr], esave_unit[yr],
-                                ecostsave_unit[yr], csave_unit[yr],
-                                ccostsave_unit[yr],
-                                scostmeas_unit[yr],
-                                ecost_meas_unit[yr],
-                                ccost_meas_unit[yr])
-
-                # Set measure financial metrics dict to update (across years)
-                metrics_finance = m.financial_metrics
-                # Update unit capital and operating costs
-                metrics_finance["unit cost"]["stock cost"]["residential"], \
-                    metrics_finance["unit cost"]["stock cost"][
-                    "commercial"] = [stock_unit_cost_res, stock_unit_cost_com]
-                metrics_finance["unit cost"]["energy cost"]["residential"], \
-                    metrics_finance["unit cost"]["energy cost"][
-                    "commercial"] = [energy_unit_cost_res,
-                                     energy_unit_cost_com]
-                metrics_finance["unit cost"]["carbon cost"]["residential"], \
-                    metrics_finance["unit cost"]["carbon cost"][
-                    "commercial"] = [carb_unit_cost_res, carb_unit_cost_com]
-                # Update internal rate of return
-                metrics_finance["irr (w/ energy costs)"] = irr_e
-                metrics_finance["irr (w/ energy and carbon costs)"] = irr_ec
-                # Update payback period
-                metrics_finance["payback (w/ energy costs)"] = payback_e
-                metrics_finance["payback (w/ energy and carbon costs)"] = \
-                    payback_ec
-                # Update cost of conserved energy
-                metrics_finance["cce"] = cce
-                metrics_finance["cce (w/ carbon cost benefits)"] = cce_bens
-                # Update cost of conserved carbon
-                metrics_finance["ccc"] = ccc
-                metrics_finance["ccc (w/ energy cost benefits)"] = ccc_bens
-
-                # Set measure consumer-level metrics to finalized status
-                m.update_results["financial metrics"] = False
+                                int(round(life_meas_tmp[x])),
+                                scostbase_unit[yr],
+                                scostmeas_delt_unit_tmp[x],
+                                esave_tmp_unit[x], ecostsave_tmp_unit[x],
+                                csave_tmp_unit[x], ccostsave_tmp_unit[x],
+                                scost_meas_tmp[x], ecost_meas_tmp[x],
+                                ccost_meas_tmp[x]))
+                    else:
+                        # Add a financial metric calculation case for the
+                        # year. Note that lifetime float values are
+                        # translated to integers, and all energy, carbon, and
+                        # energy/carbon cost savings values are normalized by
+                        # total applicable stock units
+                        fin_plan[yr] = len(fin_cases)
+                        fin_cases.append((
+                            m, int(round(life_base)), int(round(life_meas)),
+                            scostbase_unit[yr], scostmeas_delt_unit[yr],
+                            esave_unit[yr], ecostsave_unit[yr], csave_unit[yr],
+                            ccostsave_unit[yr], scostmeas_unit[yr],
+                            ecost_meas_unit[yr], ccost_meas_unit[yr]))
+
+                measures_fin.append((m, fin_plan))
+
+        # Run the measure energy/carbon/cost savings and lifetime inputs for
+        # all measures and years through the "metric_update_batch" function
+        # at once to yield financial metric outputs
+        if fin_cases:
+            fin_outputs = self.metric_update_batch(*zip(*fin_cases))
+
+        # Update measure financial metrics from the above outputs
+        for m, fin_plan in measures_fin:
+            # Initialize unit stock, energy, and carbon costs to use in
+            # residential and commercial competition calculations and
+            # financial metrics (irr, payback, cce, ccc)
+            stock_unit_cost_res, stock_unit_cost_com, \
+                energy_unit_cost_res, energy_unit_cost_com, \
+                carb_unit_cost_res, carb_unit_cost_com, irr_e, irr_ec, \
+                payback_e, payback_ec, cce, cce_bens, ccc, ccc_bens = ({
+                    yr: None for yr in self.handyvars.aeo_years} for
+                    n in range(14))
+            fin_metrics = [
+                stock_unit_cost_res, energy_unit_cost_res,
+                carb_unit_cost_res, stock_unit_cost_com,
+                energy_unit_cost_com, carb_unit_cost_com,
+                irr_e, irr_ec, payback_e, payback_ec, cce,
+                cce_bens, ccc, ccc_bens]
+            for yr in self.handyvars.aeo_years:
+                # Where finance metrics could not be calculated, set them to
+                # 999 in the first year and to the previous year's metrics
+                # thereafter
+                if fin_plan[yr] is None:
+                    if yr == self.handyvars.aeo_years[0]:
+                        for x, val in zip(fin_metrics, [
+                                None for n in range(6)] + [
+                                999 for n in range(8)]):
+                            x[yr] = val
+                    else:
+                        yr_prev = str(int(yr) - 1)
+                        for x in fin_metrics:
+                            x[yr] = x[yr_prev]
+                # Set metrics calculated across input array elements as
+                # numpy arrays
+                elif isinstance(fin_plan[yr], list):
+                    for ind, x in enumerate(fin_metrics):
+                        x[yr] = numpy.repeat(None, len(fin_plan[yr]))
+                        for elem, case in enumerate(fin_plan[yr]):
+                            x[yr][elem] = fin_outputs[case][ind]
+                else:
+                    for ind, x in enumerate(fin_metrics):
+                        x[yr] = fin_outputs[fin_plan[yr]][ind]
+
+            # Set measure financial metrics dict to update (across years)
+            metrics_finance = m.financial_metrics
+            # Update unit capital and operating costs
+            metrics_finance["unit cost"]["stock cost"]["residential"], \
+                metrics_finance["unit cost"]["stock cost"][
+                "commercial"] = [stock_unit_cost_res, stock_unit_cost_com]
+            metrics_finance["unit cost"]["energy cost"]["residential"], \
+                metrics_finance["unit cost"]["energy cost"][
+                "commercial"] = [energy_unit_cost_res,
+                                 energy_unit_cost_com]
+            metrics_finance["unit cost"]["carbon cost"]["residential"], \
+                metrics_finance["unit cost"]["carbon cost"][
+                "commercial"] = [carb_unit_cost_res, carb_unit_cost_com]
+            # Update internal rate of return
+            metrics_finance["irr (w/ energy costs)"] = irr_e
+            metrics_finance["irr (w/ energy and carbon costs)"] = irr_ec
+            # Update payback period
+            metrics_finance["payback (w/ energy costs)"] = payback_e
+            metrics_finance["payback (w/ energy and carbon costs)"] = \
+                payback_ec
+            # Update cost of conserved energy
+            metrics_finance["cce"] = cce
+            metrics_finance["cce (w/ carbon cost benefits)"] = cce_bens
+            # Update cost of conserved carbon
+            metrics_finance["ccc"] = ccc
+            metrics_finance["ccc (w/ energy cost benefits)"] = ccc_bens
+
+            # Set measure consumer-level metrics to finalized status
+            m.update_results["financial metrics"] = False
 
     def metric_update(self, m, life_base, life_meas, scost_base,
                       scost_meas_delt, esave, ecostsave, csave, ccostsave,
@@ -956,11 +1015,8 @@ class Engine(object):
 
         Args:
             m (object): Measure object.
-            nunits (int): Total competed baseline units in a given year.
-            nunits_meas (int): Total competed units captured by measure in
-                given year.
-            life_base (float): Baseline technology lifetime.
-            life_meas (float): Measure lifetime.
+            life_base (int): Baseline technology lifetime.
+            life_meas (int): Measure lifetime.
             scost_base (float): Per unit baseline capital cost in given year.
             scost_meas_delt (float): Per unit incremental capital
                 cost for measure over baseline unit in given year.
@@ -980,127 +1036,138 @@ class Engine(object):
             Consumer and portfolio-level financial metrics for the given
             measure cost savings inputs.
         """
+        return self.metric_update_batch(
+            [m], [life_base], [life_meas], [scost_base], [scost_meas_delt],
+            [esave], [ecostsave], [csave], [ccostsave], [scost_meas],
+            [ecost_meas], [ccost_meas])[0]
+
+    def metric_update_batch(self, ms, life_base, life_meas, scost_base,
+                            scost_meas_delt, esave, ecostsave, csave,
+                            ccostsave, scost_meas, ecost_meas, ccost_meas):
+        """Calculate measure financial metrics for many measures/years at once.
+
+        Notes:
+            Each set of inputs (case) is handled as in 'metric_update'. Cash
+            flows for all cases are stacked into arrays (cases x years of
+            measure life), such that the metrics for all cases are calculated
+            with array operations rather than case-by-case.
+
+        Args:
+            ms (list): Measure object for each case.
+            life_base (list): Baseline technology lifetime for each case.
+            life_meas (list): Measure lifetime for each case.
+            scost_base (list): Per unit baseline capital cost for each case.
+            scost_meas_delt (list): Per unit incremental measure capital
+                cost for each case.
+            esave (list): Per unit annual energy savings for each case.
+            ecostsave (list): Per unit annual energy cost savings for each
+                case.
+            csave (list): Per unit annual avoided carbon emissions for each
+                case.
+            ccostsave (list): Per unit annual carbon cost savings for each
+                case.
+            scost_meas (list): Per unit measure capital cost for each case.
+            ecost_meas (list): Per unit measure energy cost for each case.
+            ccost_meas (list): Per unit measure carbon cost for each case.
+
+        Returns:
+            List of the consumer and portfolio-level financial metrics
+            returned by 'metric_update' for each case.
+        """
+        life_base, life_meas_init = [
+            numpy.array(x, dtype=int) for x in [life_base, life_meas]]
+        scost_base, scost_meas_delt, esave, ecostsave, csave, ccostsave, \
+            scost_meas_arr, ecost_meas_arr, ccost_meas_arr = [
+                numpy.array(x, dtype=float) for x in [
+                    scost_base, scost_meas_delt, esave, ecostsave, csave,
+                    ccostsave, scost_meas, ecost_meas, ccost_meas]]
+        # Flag lighting equipment ECMs and residential/commercial sector
+        # applicability for each measure
+        res_bldgs = ["single family home", "multi family home", "mobile home"]
+        m_flags = {}
+        for m in ms:
+            if id(m) not in m_flags:
+                m_flags[id(m)] = (
+                    ("lighting" in m.end_use["primary"]) and (
+                        m.measure_type == "full service") and (
+                        m.technology_type["primary"] == "supply"),
+                    any([x in res_bldgs for x in m.bldg_type]),
+                    any([x not in res_bldgs for x in m.bldg_type]))
+        lighting, res, com = [numpy.array(x, dtype=bool) for x in zip(*[
+            m_flags[id(m)] for m in ms])]
+
+        # If the measure lifetime is less than 1 year, set it to 1 year
+        # (a minimum for measure lifetime to work in below calculations)
+        life_meas = numpy.maximum(life_meas_init, 1)
+        # Cash flow years (the first year is reserved for initial investment)
+        # and flags for the years within the measure life of each case
+        life_yrs = numpy.arange(life_meas.max() + 1)
+        in_life = (life_yrs > 0) & (life_yrs <= life_meas[:, None])
+
         # Develop four initial cash flow scenarios over the measure life:
         # 1) Cash flows considering capital costs only
         # 2) Cash flows considering capital costs and energy costs
         # 3) Cash flows considering capital costs and carbon costs
         # 4) Cash flows considering capital, energy, and carbon costs
 
-        # For lighting equipment ECMs only: determine when over the course of
-        # the ECM lifetime (if at all) a cost gain is realized from an avoided
-        # purchase of the baseline lighting technology due to longer measure
-        # lifetime; store this information in a list of year indicators for
-        # subsequent use below.  Example: an LED bulb lasts 30 years compared
+        # For lighting equipment ECMs only: flag the years over the course of
+        # the ECM lifetime (if any) in which a cost gain is realized from an
+        # avoided purchase of the baseline lighting technology due to longer
+        # measure lifetime. Example: an LED bulb lasts 30 years compared
         # to a baseline bulb's 10 years, meaning 3 purchases of the baseline
         # bulb would have occurred by the time the LED bulb has reached the
         # end of its life.
-        added_stockcost_gain_yrs = []
-        if (life_meas > life_base) and ("lighting" in m.end_use[
-            "primary"]) and (m.measure_type == "full service") and (
-                m.technology_type["primary"] == "supply"):
-            for i in range(1, life_meas):
-                if i % life_base == 0:
-                    added_stockcost_gain_yrs.append(i - 1)
-
-        # If the measure lifetime is less than 1 year, set it to 1 year
-        # (a minimum for measure lifetime to work in below calculations)
-        if life_meas < 1:
-            life_meas = 1
-
-        # Construct capital cost cash flows across measure life
-
-        # Initialize incremental and total capital cost cash flows with
-        # upfront incremental and total capital cost
-        cashflows_s_delt = numpy.array(scost_meas_delt)
-        cashflows_s_tot = numpy.array(scost_meas)
-
-        for life_yr in range(0, life_meas):
-            # Check whether an avoided cost of the baseline technology should
-            # be added for given year; if not, set this term to zero
-            if life_yr in added_stockcost_gain_yrs:
-                scost_life = scost_base
-            else:
-                scost_life = 0
-
-            # Add avoided capital costs as appropriate (e.g., for an LED
-            # lighting measure with a longer lifetime than the comparable
-            # baseline lighting technology)
-            cashflows_s_delt = numpy.append(cashflows_s_delt, scost_life)
-            cashflows_s_tot = numpy.append(cashflows_s_tot, scost_life)
+        added_stockcost_gain_yrs = (
+            lighting & (life_meas_init > life_base))[:, None] & (
+            life_yrs > 0) & (life_yrs < life_meas_init[:, None]) & (
+            life_yrs % numpy.maximum(life_base, 1)[:, None] == 0)
+
+        # Construct incremental and total capital cost cash flows with
+        # upfront incremental and total capital cost and any avoided capital
+        # costs across measure life (e.g., for an LED lighting measure with a
+        # longer lifetime than the comparable baseline lighting technology)
+        cashflows_s_delt, cashflows_s_tot = [numpy.where(
+            added_stockcost_gain_yrs, scost_base[:, None], 0.0) for
+            n in range(2)]
+        cashflows_s_delt[:, 0] = scost_meas_delt
+        cashflows_s_tot[:, 0] = scost_meas_arr
 
         # Construct complete incremental and total energy and carbon cash
-        # flows across measure lifetime. First term (reserved for initial
-        # investment) is zero
-        cashflows_e_delt, cashflows_c_delt = [
-            numpy.append(0, [x] * life_meas) for x in [ecostsave, ccostsave]]
-        cashflows_e_tot, cashflows_c_tot = [
-            numpy.append(0, [x] * life_meas) for x in [ecost_meas, ccost_meas]]
-
-        # Calculate net present values (NPVs) using the above cashflows
-        npv_s_delt, npv_e_delt, npv_c_delt = [
-            npf.npv(self.handyvars.discount_rate, x) for x in [
-                cashflows_s_delt, cashflows_e_delt, cashflows_c_delt]]
-
-        # Develop arrays of energy and carbon savings across measure
-        # lifetime (for use in cost of conserved energy and carbon calcs).
-        # First term (reserved for initial investment figure) is zero, and
-        # each array is normalized by number of captured stock units
-        esave_array = numpy.append(0, [esave] * life_meas)
-        csave_array = numpy.append(0, [csave] * life_meas)
-
-        # Calculate Net Present Value and annuity equivalent Net Present Value
-        # of the above energy and carbon savings
-        npv_esave = npf.npv(self.handyvars.discount_rate, esave_array)
-        npv_csave = npf.npv(self.handyvars.discount_rate, csave_array)
-
-        # Calculate portfolio-level financial metrics
-
-        # Calculate cost of conserved energy w/ and w/o carbon cost savings
-        # benefits. Restrict denominator values less than or equal to zero
-        if npv_esave > 0:
+        # flows, and energy and carbon savings (for use in cost of conserved
+        # energy and carbon calcs) across measure lifetime. First term
+        # (reserved for initial investment) is zero
+        cashflows_e_delt, cashflows_c_delt, cashflows_e_tot, \
+            cashflows_c_tot, esave_array, csave_array = [numpy.where(
+                in_life, x[:, None], 0.0) for x in [
+                ecostsave, ccostsave, ecost_meas_arr, ccost_meas_arr, esave,
+                csave]]
+
+        # Calculate net present values (NPVs) using the above cashflows, and
+        # NPVs of the above energy and carbon savings
+        npv_s_delt, npv_e_delt, npv_c_delt, npv_esave, npv_csave = [
+            self.npv_batch(self.handyvars.discount_rate, x) for x in [
+                cashflows_s_delt, cashflows_e_delt, cashflows_c_delt,
+                esave_array, csave_array]]
+
+        # Calculate portfolio-level financial metrics; restrict denominator
+        # values less than or equal to zero
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            # Cost of conserved energy w/ and w/o carbon cost savings benefits
             cce = (-npv_s_delt / npv_esave)
             cce_bens = (-(npv_s_delt + npv_c_delt) / npv_esave)
-        else:
-            cce, cce_bens = [999 for n in range(2)]
-
-        # Calculate cost of conserved carbon w/ and w/o energy cost savings
-        # benefits. Restrict denominator values less than or equal to zero
-        if npv_csave > 0:
+            # Cost of conserved carbon w/ and w/o energy cost savings benefits
             ccc = (-npv_s_delt / (npv_csave * 1000000))
-            ccc_bens = (-(npv_s_delt + npv_e_delt) /
-                        (npv_csave * 1000000))
-        else:
-            ccc, ccc_bens = [999 for n in range(2)]
+            ccc_bens = (-(npv_s_delt + npv_e_delt) / (npv_csave * 1000000))
 
         # Calculate internal rate of return and simple payback for capital
-        # + energy and capital + energy + carbon cash flows.  Use try/
-        # except to handle cases where IRR/payback cannot be calculated
-
-        # IRR and payback given capital + energy cash flows
-        try:
-            irr_e = npf.irr(cashflows_s_delt + cashflows_e_delt)
-            if not math.isfinite(irr_e):
-                raise (ValueError)
-        except (ValueError, LinAlgError):
-            irr_e = 999
-        try:
-            payback_e = self.payback(cashflows_s_delt + cashflows_e_delt)
-        except (ValueError, LinAlgError):
-            payback_e = 999
-        # IRR and payback given capital + energy + carbon cash flows
-        try:
-            irr_ec = npf.irr(
-                cashflows_s_delt + cashflows_e_delt + cashflows_c_delt)
-            if not math.isfinite(irr_ec):
-                raise (ValueError)
-        except (ValueError, LinAlgError):
-            irr_ec = 999
-        try:
-            payback_ec = \
-                self.payback(
-                    cashflows_s_delt + cashflows_e_delt + cashflows_c_delt)
-        except (ValueError, LinAlgError):
-            payback_ec = 999
+        # + energy and capital + energy + carbon cash flows
+        cashflows_se = cashflows_s_delt + cashflows_e_delt
+        cashflows_sec = cashflows_se + cashflows_c_delt
+        irr_e, irr_ec = [
+            self.irr_batch(x, life_meas) for x in [cashflows_se, cashflows_sec]]
+        payback_e, payback_ec = [
+            self.payback_batch(x, life_meas) for x in [
+                cashflows_se, cashflows_sec]]
 
         # Set unit capital and operating costs using the above
         # cashflows for later use in measure competition calculations. For
@@ -1111,53 +1178,149 @@ class Engine(object):
         # discount rate levels that reflect various degrees of risk
         # tolerance observed amongst commercial adopters.  These discount
         # rate levels are imported from commercial AEO demand module data.
-
-        # Populate unit costs for residential sector
-        # Check whether measure applies to residential sector
-        if any([x in ["single family home", "multi family home",
-                      "mobile home"] for x in m.bldg_type]):
-            unit_cost_s_res, unit_cost_e_res, unit_cost_c_res = [
-                scost_meas, ecost_meas, ccost_meas]
-        # If measure does not apply to residential sector, set residential
-        # unit costs to 'None'
-        else:
-            unit_cost_s_res, unit_cost_e_res, unit_cost_c_res = (
-                None for n in range(3))
-
-        # Populate unit costs for commercial sector
-        # Check whether measure applies to commercial sector
-        if any([x not in ["single family home", "multi family home",
-                          "mobile home"] for x in m.bldg_type]):
-            unit_cost_s_com, unit_cost_e_com, unit_cost_c_com = (
-                {} for n in range(3))
-            # Set unit cost values under 7 discount rate categories
-            try:
-                for ind, tps in enumerate(
-                        self.handyvars.com_timeprefs["rates"]):
-                    unit_cost_s_com["rate " + str(ind + 1)], \
-                        unit_cost_e_com["rate " + str(ind + 1)], \
-                        unit_cost_c_com["rate " + str(ind + 1)] = \
-                        [npf.npv(tps, x) for x in [
-                         cashflows_s_tot, cashflows_e_tot,
-                         cashflows_c_tot]]
-                    if any([not math.isfinite(x) for x in [
-                            unit_cost_s_com["rate " + str(ind + 1)],
-                            unit_cost_e_com["rate " + str(ind + 1)],
-                            unit_cost_c_com["rate " + str(ind + 1)]]]):
-                        raise (ValueError)
-            except ValueError:
+        unit_cost_com = [[self.npv_batch(tps, x) for tps in
+                          self.handyvars.com_timeprefs["rates"]] for x in [
+                         cashflows_s_tot, cashflows_e_tot, cashflows_c_tot]]
+        # Commercial unit costs are only set where finite for all rates
+        com_ok = com & numpy.all(numpy.isfinite(unit_cost_com), axis=(0, 1))
+
+        # Collect the metrics for each case
+        outputs = []
+        for ind in range(len(ms)):
+            # Populate unit costs for residential sector if measure applies
+            # to residential sector; otherwise set to 'None'
+            if res[ind]:
+                unit_cost_s_res, unit_cost_e_res, unit_cost_c_res = [
+                    scost_meas[ind], ecost_meas[ind], ccost_meas[ind]]
+            else:
+                unit_cost_s_res, unit_cost_e_res, unit_cost_c_res = (
+                    None for n in range(3))
+            # Populate unit costs under 7 discount rate categories for
+            # commercial sector if measure applies to commercial sector;
+            # otherwise set to 'None'
+            if com_ok[ind]:
+                unit_cost_s_com, unit_cost_e_com, unit_cost_c_com = ({
+                    "rate " + str(r_ind + 1): x[r_ind][ind] for r_ind in
+                    range(len(x))} for x in unit_cost_com)
+            else:
                 unit_cost_s_com, unit_cost_e_com, unit_cost_c_com = (
                     None for n in range(3))
-        # If measure does not apply to commercial sector, set commercial
-        # unit costs to 'None'
-        else:
-            unit_cost_s_com, unit_cost_e_com, unit_cost_c_com = (
-                None for n in range(3))
+            # Set cost of conserved energy/carbon to 999 where energy/carbon
+            # savings are not positive
+            if npv_esave[ind] > 0:
+                cce_ind, cce_bens_ind = cce[ind], cce_bens[ind]
+            else:
+                cce_ind, cce_bens_ind = [999 for n in range(2)]
+            if npv_csave[ind] > 0:
+                ccc_ind, ccc_bens_ind = ccc[ind], ccc_bens[ind]
+            else:
+                ccc_ind, ccc_bens_ind = [999 for n in range(2)]
+            outputs.append((
+                unit_cost_s_res, unit_cost_e_res, unit_cost_c_res,
+                unit_cost_s_com, unit_cost_e_com, unit_cost_c_com,
+                irr_e[ind], irr_ec[ind], payback_e[ind], payback_ec[ind],
+                cce_ind, cce_bens_ind, ccc_ind, ccc_bens_ind))
 
         # Return all updated economic metrics
-        return unit_cost_s_res, unit_cost_e_res, unit_cost_c_res, \
-            unit_cost_s_com, unit_cost_e_com, unit_cost_c_com, irr_e, \
-            irr_ec, payback_e, payback_ec, cce, cce_bens, ccc, ccc_bens
+        return outputs
+
+    @staticmethod
+    def npv_batch(rate, cashflows):
+        """Calculate net present values for a set of cash flow series.
+
+        Args:
+            rate (float): Discount rate.
+            cashflows (numpy.ndarray): Cash flow series (one per row).
+
+        Returns:
+            Net present value of each cash flow series.
+        """
+        return (cashflows / (1 + rate) ** numpy.arange(
+            cashflows.shape[1])).sum(axis=1)
+
+    def irr_batch(self, cashflows, life_meas):
+        """Calculate internal rates of return for a set of cash flow series.
+
+        Notes:
+            Rates are found by solving for the root x = 1 / (1 + irr) of the
+            cash flow polynomial. Where the cash flows change sign once, this
+            root is unique and is found for all series at once by safeguarded
+            Newton iteration; as in 'numpy_financial.irr', series with no
+            sign change have no rate of return. Any other series are passed
+            to 'numpy_financial.irr', which takes the rate closest to zero.
+            Rates that cannot be calculated are set to 999.
+
+        Args:
+            cashflows (numpy.ndarray): Cash flow series (one per row).
+            life_meas (numpy.ndarray): Measure lifetime for each series (the
+                series is the first life_meas + 1 cash flows of the row).
+
+        Returns:
+            List of internal rates of return.
+        """
+        irr = numpy.full(cashflows.shape[0], numpy.nan)
+        # Find the number of sign changes in each series (ignoring zeros)
+        finite = numpy.all(numpy.isfinite(cashflows), axis=1)
+        signs = numpy.sign(numpy.where(finite[:, None], cashflows, 0))
+        sign_chg = numpy.zeros(cashflows.shape[0], dtype=int)
+        sign_prev = signs[:, 0]
+        for col in range(1, cashflows.shape[1]):
+            sign_chg += (signs[:, col] * sign_prev) < 0
+            sign_prev = numpy.where(signs[:, col] != 0, signs[:, col], sign_prev)
+        # Solve series with one sign change for x within a bracket whose
+        # cash flow polynomial values do not overflow
+        solve = finite & (sign_chg == 1)
+        x_max = numpy.exp(600 / max(cashflows.shape[1] - 1, 1))
+        coefs = cashflows[solve]
+        lo, hi = (numpy.full(coefs.shape[0], x) for x in [1 / x_max, x_max])
+        with numpy.errstate(all="ignore"):
+            f_lo, f_hi = (self.poly_batch(coefs, x)[0] for x in [lo, hi])
+            bracket = numpy.isfinite(f_lo) & numpy.isfinite(f_hi) & (
+                numpy.sign(f_lo) * numpy.sign(f_hi) < 0)
+            x = numpy.sqrt(lo * hi)
+            for n in range(200):
+                f, df = self.poly_batch(coefs, x)
+                # Narrow the bracket around the root
+                on_lo = numpy.sign(f) == numpy.sign(f_lo)
+                lo, hi = numpy.where(on_lo, x, lo), numpy.where(on_lo, hi, x)
+                # Take Newton steps that remain within the bracket, and
+                # bisect the bracket (geometrically) otherwise
+                x_new = x - f / df
+                x_new = numpy.where((x_new > lo) & (x_new < hi), x_new,
+                                    numpy.sqrt(lo * hi))
+                done = (f == 0) | (abs(x_new - x) <= 1e-14 * x)
+                x = numpy.where(f == 0, x, x_new)
+                if numpy.all(done | ~bracket):
+                    break
+            irr[numpy.flatnonzero(solve)[bracket]] = 1 / x[bracket] - 1
+        # Pass series whose rates were not found above to numpy_financial
+        for ind in numpy.flatnonzero(finite & (sign_chg > 0) & numpy.isnan(
+                irr)):
+            try:
+                irr[ind] = npf.irr(cashflows[ind, :life_meas[ind] + 1])
+            except (ValueError, LinAlgError):
+                pass
+
+        return [float(x) if math.isfinite(x) else 999 for x in irr]
+
+    @staticmethod
+    def poly_batch(coefs, x):
+        """Evaluate cash flow polynomials and their derivatives.
+
+        Args:
+            coefs (numpy.ndarray): Cash flow series (one per row), used as
+                polynomial coefficients in increasing order of degree.
+            x (numpy.ndarray): Value at which to evaluate each polynomial.
+
+        Returns:
+            Polynomial values and derivatives at x.
+        """
+        f, df = (numpy.zeros(coefs.shape[0]) for n in range(2))
+        # Horner's method
+        for col in range(coefs.shape[1] - 1, -1, -1):
+            df = df * x + f
+            f = f * x + coefs[:, col]
+        return f, df
 
     def payback(self, cashflows):
         """Calculate simple payback period.
@@ -1173,46 +1336,156 @@ class Engine(object):
             Simple payback period for the input cash flows.
         """
         # Separate initial investment and subsequent cash flows
-        # from "cashflows" input; extend cashflows up until 100 years
-        # out to ensure calculation of all paybacks under 100 years
-        investment, cashflows = cashflows[0], list(
-            cashflows[1:]) + [cashflows[-1]] * (100 - len(cashflows[1:]))
+        investment = cashflows[0]
         # If initial investment is positive, payback = 0
         if investment >= 0:
-            payback_val = 0
+            return 0
+        # Find absolute value of initial investment to compare cumulative
+        # subsequent cash flows against
+        investment = abs(investment)
+        cumulative = numpy.cumsum(cashflows[1:], dtype=float)
+        # Find the number of years in which the cumulative cash flow is less
+        # than the investment; where all subsequent cash flows are
+        # non-negative, cumulative cash flows are sorted and can be searched
+        if numpy.all(cumulative[1:] >= cumulative[:-1]):
+            years = int(numpy.searchsorted(cumulative, investment))
         else:
-            # Find absolute value of initial investment to compare
-            # subsequent cash flows against
-            investment = abs(investment)
-            # Initialize cumulative cashflow and # years tracking
-            total, years, cumulative = 0, 0, []
-            # Add to years and cumulative cashflow trackers while cumulative
-            # cashflow < investment
-            for cashflow in cashflows:
-                total += cashflow
-                if total < investment:
-                    years += 1
-                cumulative.append(total)
-            # If investment pays back within the measure lifetime,
-            # calculate this payback period in years
-            if years < len(cashflows):
-                a = years
+            years = int(numpy.count_nonzero(cumulative < investment))
+        # Extend cashflows up until 100 years out to ensure calculation of
+        # all paybacks under 100 years, by repeating the last cash flow; add
+        # any extension years in which cumulative cash flow (cum_life +
+        # k * cf_last in the kth extension year) remains under investment
+        cum_life = cumulative[-1] if cumulative.size else numpy.float64(0)
+        cf_last, n_ext = numpy.float64(cashflows[-1]), max(
+            100 - cumulative.size, 0)
+        if n_ext > 0 and cf_last != 0:
+            k_max = (investment - cum_life) / cf_last
+            if math.isnan(k_max):
+                pass
+            elif cf_last > 0:
+                years += max(math.ceil(min(k_max, n_ext + 1)) - 1, 0)
+            else:
+                years += n_ext - min(math.floor(max(k_max, 0)), n_ext)
+        elif n_ext > 0 and investment > cum_life:
+            years += n_ext
+
+        # If investment pays back within the measure lifetime,
+        # calculate this payback period in years
+        if years < cumulative.size + n_ext:
+            def cum_yr(yr):
+                # Cumulative cash flow through a given year after the initial
+                # investment (within measure life or across extension years)
+                if yr <= cumulative.size:
+                    return cumulative[yr - 1]
+                return cum_life + (yr - cumulative.size) * cf_last
+            with numpy.errstate(divide="ignore", invalid="ignore"):
                 # Case where payback period < 1 year
-                if (years - 1) < 0:
-                    b = investment
-                    c = cumulative[0]
+                if years == 0:
+                    return investment / cum_yr(1)
                 # Case where payback period >= 1 year
-                else:
-                    b = investment - cumulative[years - 1]
-                    c = cumulative[years] - cumulative[years - 1]
-                payback_val = a + (b / c)
-            # If investment does not pay back within measure lifetime,
-            # set payback period to artifically high number
-            else:
-                payback_val = 999
+                return years + (investment - cum_yr(years)) / (
+                    cum_yr(years + 1) - cum_yr(years))
+        # If investment does not pay back within measure lifetime,
+        # set payback period to artifically high number
+        else:
+            return 999
+
+    @staticmethod
+    def payback_batch(cashflows, life_meas=None):
+        """Calculate simple payback periods for a set of cash flow series.
 
-        # Return updated payback period value in years
-        return payback_val
+        Notes:
+            Each series is the initial investment followed by the cash flows
+            across measure lifetime. As in 'payback', the cash flows are
+            extended up until 100 years out (repeating the last cash flow)
+            to ensure calculation of all paybacks under 100 years; the
+            cumulative cash flows over these extension years are found in
+            closed form rather than by padding each series.
+
+        Args:
+            cashflows (numpy.ndarray): Cash flow series (one per row).
+            life_meas (numpy.ndarray): Measure lifetime for each series, such
+                that the series is the first life_meas + 1 cash flows of the
+                row (defaults to the full row for all series).
+
+        Returns:
+            List of simple payback periods.
+        """
+        cashflows = numpy.asarray(cashflows, dtype=float)
+        rows = numpy.arange(cashflows.shape[0])
+        if life_meas is None:
+            life_meas = numpy.full(cashflows.shape[0], cashflows.shape[1] - 1)
+        # Separate initial investment and subsequent cash flows; find the
+        # absolute value of initial investment to compare cumulative
+        # subsequent cash flows against
+        investment = cashflows[:, 0]
+        inv_abs = abs(investment)
+        # Cumulative subsequent cash flows by year of measure life (where
+        # year zero is the year of initial investment)
+        life_yrs = numpy.arange(cashflows.shape[1])
+        in_life = (life_yrs > 0) & (life_yrs <= life_meas[:, None])
+        cumulative = numpy.cumsum(numpy.where(in_life, cashflows, 0), axis=1)
+        # Cumulative cash flow at the end of measure life and the last cash
+        # flow, which is repeated for the remaining years up until 100 years
+        cum_life = cumulative[rows, life_meas]
+        cf_last = cashflows[rows, life_meas]
+        n_ext = numpy.maximum(100 - life_meas, 0)
+        n_yrs = life_meas + n_ext
+
+        # Find the number of years in which the cumulative cashflow is less
+        # than the initial investment, within measure life and across the
+        # extension years (where cumulative cash flow is cum_life + k *
+        # cf_last in the kth extension year)
+        years = numpy.sum((cumulative < inv_abs[:, None]) & in_life, axis=1)
+        gap = inv_abs - cum_life
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            k_max = gap / cf_last
+            years_ext = numpy.where(
+                cf_last > 0, numpy.clip(numpy.ceil(k_max) - 1, 0, n_ext),
+                numpy.where(cf_last < 0, n_ext - numpy.clip(
+                    numpy.floor(k_max), 0, n_ext), numpy.where(
+                    gap > 0, n_ext, 0)))
+        years = years + numpy.where(
+            numpy.isnan(years_ext), 0, years_ext).astype(int)
+
+        # Calculate the payback period for investments that pay back within
+        # the measure lifetime (where years < n_yrs)
+        def cum_yr(yr):
+            # Cumulative cash flow through a given year after the initial
+            # investment (within measure life or across the extension years)
+            yr = numpy.clip(yr, 1, n_yrs)
+            return numpy.where(yr <= life_meas, cumulative[
+                rows, numpy.minimum(yr, life_meas)],
+                cum_life + (yr - life_meas) * cf_last)
+        cum_prev = numpy.where(years > 0, cum_yr(years), 0)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            payback_val = years + (inv_abs - cum_prev) / (
+                cum_yr(years + 1) - cum_prev)
+
+        # Payback is zero where initial investment is positive and set to an
+        # artifically high number where investment does not pay back
+        return [0 if investment[ind] >= 0 else (
+            payback_val[ind] if years[ind] < n_yrs[ind] else 999) for
+            ind in rows]
+
+    def parse_mseg_key(self, mseg_key):
+        """Convert a contributing microsegment key chain string to a tuple.
+
+        Notes:
+            Each key chain string is parsed once and reused, since the same
+            key chains are parsed repeatedly across measures and routines.
+
+        Args:
+            mseg_key (string): Contributing microsegment key chain.
+
+        Returns:
+            Tuple of the keys in the key chain.
+        """
+        try:
+            return self.mseg_key_tuples[mseg_key]
+        except KeyError:
+            keys = self.mseg_key_tuples[mseg_key] = literal_eval(mseg_key)
+            return keys
 
     def compete_measures(self, adopt_scheme, htcl_totals):
         """Compete/apportion total stock/energy/carbon/cost across measures.
@@ -1225,21 +1498,21 @@ class Engine(object):
         Args:
             adopt_scheme (string): Assumed consumer adoption scenario.
         """
-        # Establish list of key chains and supporting competition data for all
-        # stock/energy/carbon/cost microsegments that contribute to a measure's
-        # total stock/energy/carbon/cost microsegments, across active measures
-        mseg_keys, mkts_adj = ([] for n in range(2))
-        for x in self.measures:
-            mseg_keys.extend(x.markets[adopt_scheme]["competed"][
-                "mseg_adjust"]["contributing mseg keys and values"].keys())
-            mkts_adj.append(x.markets[adopt_scheme]["competed"]["mseg_adjust"])
-
-        # Establish list of unique key chains in mseg_keys list above,
+        # Establish an index of the measures (by position in the active
+        # measures list) that each stock/energy/carbon/cost microsegment
+        # contributes to
+        mseg_measures = {}
+        for ind, x in enumerate(self.measures):
+            for mseg_key in x.markets[adopt_scheme]["competed"]["mseg_adjust"][
+                    "contributing mseg keys and values"].keys():
+                mseg_measures.setdefault(mseg_key, []).append(ind)
+
+        # Establish list of unique key chains in the index above,
         # ensuring that all 'primary' microsegments (e.g., relating to direct
         # equipment replacement) are ordered and updated before 'secondary'
         # microsegments (e.g., relating to indirect effects of equipment
         # replacement, such as reduced waste heat from changes in lighting)
-        msegs = sorted(numpy.unique(mseg_keys))
+        msegs = sorted(mseg_measures)
 
         # Initialize a dict used to store data on overlaps between supply-side
         # heating/cooling ECMs (e.g., HVAC equipment) and demand-side
@@ -1252,7 +1525,162 @@ class Engine(object):
         else:
             htcl_adj_data = None
 
-        # Run through all unique contributing microsegments in the above list,
+        # Compete measures across all unique contributing microsegments,
+        # splitting the microsegments into groups of measures that share no
+        # microsegments with each other when multiple workers are available
+        # (such groups can be competed independently in worker processes)
+        if self.opts.workers > 1:
+            mseg_groups = self.group_msegs(mseg_measures)
+            n_workers = min(self.opts.workers, len(mseg_groups))
+        else:
+            n_workers = 1
+        if n_workers > 1:
+            self.compete_msegs_parallel(
+                adopt_scheme, mseg_groups, mseg_measures, n_workers)
+        else:
+            self.compete_msegs(adopt_scheme, msegs, mseg_measures)
+
+        # For any contributing microsegment that pertains to heating or
+        # cooling, record data needed for additional adjustments to remove
+        # overlaps between the supply-side and demand-side of heating
+        # and cooling energy (note that supply-side and demand-side heating
+        # and cooling ECMs are not directly competed). NOTE: EXCLUDE
+        # SECONDARY HEATING/COOLING MICROSEGMENTS FOR NOW UNTIL
+        # REASONABLE APPROACH FOR ADJUSTING THESE IS IMPLEMENTED. These data
+        # are recorded across all microsegments once competition is finished,
+        # since competition of other microsegments does not change them
+        for msu in msegs:
+            # Ensure the current contributing microsegment pertains to
+            # heating or cooling (marked by 'supply' or 'demand' keys) and
+            # that both supply and demand-side ECMs are present in the analysis
+            if ('primary' in msu and
+                ('supply' in msu or 'demand' in msu)) and \
+                    htcl_adj_data is not None:
+                # Create short name for all ECM competition data pertaining
+                # to current contributing microsegment
+                msu_mkts = [self.measures[x].markets[adopt_scheme][
+                    "competed"]["mseg_adjust"][
+                    "contributing mseg keys and values"][msu]
+                    for x in mseg_measures[msu]]
+                htcl_adj_data = self.htcl_adj_rec(
+                    htcl_adj_data, msu, msu_mkts, htcl_totals)
+
+        # Once all direct competition is finished, remove all recorded
+        # overlapping energy use and associated carbon/costs between
+        # supply-side and demand-side heating and cooling ECMs, provided both
+        # are present in the analysis
+        if htcl_adj_data is not None:
+            # Find the subset of ECMs that applies to heating and cooling
+            measures_htcl_adj = [m for m in self.measures if any([
+                z[0] in ["heating", "cooling", "secondary heating"] for
+                z in m.end_use.values() if z is not None])]
+
+            # Remove energy, carbon, and cost overlaps between supply-side and
+            # demand-side heating/cooling ECMs
+            self.htcl_adj(measures_htcl_adj, adopt_scheme, htcl_adj_data)
+
+    def group_msegs(self, mseg_measures):
+        """Group contributing microsegments by the measures they connect.
+
+        Notes:
+            Microsegments in different groups share no measures, directly or
+            through other microsegments, and are therefore competed
+            independently of each other.
+
+        Args:
+            mseg_measures (dict): Positions of the measures (in the active
+                measures list) that each contributing microsegment applies to.
+
+        Returns:
+            List of sorted contributing microsegment lists, one per group.
+        """
+        # Find groups of connected measures (union-find over measures)
+        parents = list(range(len(self.measures)))
+
+        def find_root(x):
+            while parents[x] != x:
+                parents[x] = parents[parents[x]]
+                x = parents[x]
+            return x
+
+        for meas_inds in mseg_measures.values():
+            root = find_root(meas_inds[0])
+            for x in meas_inds[1:]:
+                parents[find_root(x)] = root
+        # Assign each microsegment to the group of its measures
+        mseg_groups = {}
+        for msu in sorted(mseg_measures):
+            mseg_groups.setdefault(
+                find_root(mseg_measures[msu][0]), []).append(msu)
+
+        return list(mseg_groups.values())
+
+    def compete_msegs_parallel(
+            self, adopt_scheme, mseg_groups, mseg_measures, n_workers):
+        """Compete independent groups of microsegments in worker processes.
+
+        Notes:
+            Groups are combined into one batch per worker, balanced by
+            number of microsegments; each worker competes the measures in its
+            batch and returns their updated competed markets, which replace
+            the competed markets of the active measures.
+
+        Args:
+            adopt_scheme (string): Assumed consumer adoption scenario.
+            mseg_groups (list): Independent groups of contributing
+                microsegments (see 'group_msegs').
+            mseg_measures (dict): Positions of the measures (in the active
+                measures list) that each contributing microsegment applies to.
+            n_workers (int): Number of worker processes to use.
+        """
+        # Assign groups to batches, largest groups first, always adding to
+        # the batch with the fewest microsegments
+        batches = [[] for n in range(n_workers)]
+        for grp in sorted(mseg_groups, key=len, reverse=True):
+            min(batches, key=lambda b: sum(len(g) for g in b)).append(grp)
+        batch_tasks = []
+        for batch in batches:
+            # Competed microsegments and positions of their measures
+            batch_msegs = sorted(msu for grp in batch for msu in grp)
+            batch_meas = sorted(set(
+                x for msu in batch_msegs for x in mseg_measures[msu]))
+            # Measure positions within the batch
+            batch_pos = {x: ind for ind, x in enumerate(batch_meas)}
+            # Copy the engine with only the batch measures and the data for
+            # the current adoption scheme
+            batch_run = copy.copy(self)
+            batch_run.output_ecms, batch_run.output_all = ({}, {})
+            batch_run.output_ecms_cfs = None
+            batch_run.measures = []
+            for x in batch_meas:
+                m = copy.copy(self.measures[x])
+                m.markets = {adopt_scheme: self.measures[x].markets[adopt_scheme]}
+                batch_run.measures.append(m)
+            batch_tasks.append((batch_run, batch_msegs, {
+                msu: [batch_pos[x] for x in mseg_measures[msu]] for
+                msu in batch_msegs}, batch_meas))
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            batch_loads = [executor.submit(
+                compete_msegs_worker, batch_run, adopt_scheme, batch_msegs,
+                batch_mseg_measures) for batch_run, batch_msegs,
+                batch_mseg_measures, batch_meas in batch_tasks]
+            # Update measure competed markets in batch order
+            for batch_load, batch_task in zip(batch_loads, batch_tasks):
+                for x, competed in zip(batch_task[3], batch_load.result()):
+                    self.measures[x].markets[adopt_scheme]["competed"] = \
+                        competed
+
+    def compete_msegs(self, adopt_scheme, msegs, mseg_measures):
+        """Compete measures across a set of contributing microsegments.
+
+        Args:
+            adopt_scheme (string): Assumed consumer adoption scenario.
+            msegs (list): Sorted contributing microsegment key chains.
+            mseg_measures (dict): Positions of the measures (in the active
+                measures list) that each contributing microsegment applies to.
+        """
+        # Run through all contributing microsegments in the above list,
         # determining how the initial measure stock/energy/carbon/cost data
         # associated with each should be adjusted to reflect the effects of
         # measure competition
@@ -1260,14 +1688,7 @@ class Engine(object):
 
             # Determine the subset of measures that pertain to the current
             # contributing microsegment
-            measures_adj = [self.measures[x] for x in range(
-                0, len(self.measures)) if msu in mkts_adj[x][
-                "contributing mseg keys and values"].keys()]
-            # Create short name for all ECM competition data pertaining to
-            # current contributing microsegment
-            msu_mkts = [m.markets[adopt_scheme]["competed"][
-                "mseg_adjust"]["contributing mseg keys and values"][msu] for
-                m in measures_adj]
+            measures_adj = [self.measures[x] for x in mseg_measures[msu]]
 
             # If the current contributing microsegment is of the 'primary'
             # type, directly compete the microsegment across applicable
@@ -1294,7 +1715,7 @@ class Engine(object):
                 # Determine the climate zone, building type, and structure type
                 # needed to link the secondary microsegment and associated3
                 # primary microsegment(s)
-                cz_bldg_struct = literal_eval(msu)
+                cz_bldg_struct = self.parse_mseg_key(msu)
                 secnd_mseg_adjkey = str((
                     cz_bldg_struct[1], cz_bldg_struct[2], cz_bldg_struct[-1]))
                 # Determine the subset of measures pertaining to the given
@@ -1302,12 +1723,10 @@ class Engine(object):
                 # adjustments due to changes in associated primary
                 # microsegment(s) (note that secondary microsegments do not
                 # affect stock totals, only energy/carbon and associated costs)
-                measures_adj_scnd = [self.measures[x] for x in range(
-                    0, len(self.measures)) if self.measures[x] in
-                    measures_adj and any(
-                    [(y[1] > 0) for y in mkts_adj[x][
-                        "secondary mseg adjustments"]["market share"][
-                        "original energy (total captured)"][
+                measures_adj_scnd = [m for m in measures_adj if any(
+                    [(y[1] > 0) for y in m.markets[adopt_scheme]["competed"][
+                        "mseg_adjust"]["secondary mseg adjustments"][
+                        "market share"]["original energy (total captured)"][
                         secnd_mseg_adjkey].items()])]
                 # If at least one applicable measure requires adjustments to
                 # total secondary energy/carbon/cost, proceed with the
@@ -1316,37 +1735,6 @@ class Engine(object):
                     self.secondary_adj(measures_adj_scnd, msu,
                                        secnd_mseg_adjkey, adopt_scheme)
 
-            # For any contributing microsegment that pertains to heating or
-            # cooling, record data needed for additional adjustments to remove
-            # overlaps between the supply-side and demand-side of heating
-            # and cooling energy (note that supply-side and demand-side heating
-            # and cooling ECMs are not directly competed). NOTE: EXCLUDE
-            # SECONDARY HEATING/COOLING MICROSEGMENTS FOR NOW UNTIL
-            # REASONABLE APPROACH FOR ADJUSTING THESE IS IMPLEMENTED
-
-            # Ensure the current contributing microsegment pertains to
-            # heating or cooling (marked by 'supply' or 'demand' keys) and
-            # that both supply and demand-side ECMs are present in the analysis
-            if ('primary' in msu and
-                ('supply' in msu or 'demand' in msu)) and \
-                    htcl_adj_data is not None:
-                htcl_adj_data = self.htcl_adj_rec(
-                    htcl_adj_data, msu, msu_mkts, htcl_totals)
-
-        # Once all direct competition is finished, remove all recorded
-        # overlapping energy use and associated carbon/costs between
-        # supply-side and demand-side heating and cooling ECMs, provided both
-        # are present in the analysis
-        if htcl_adj_data is not None:
-            # Find the subset of ECMs that applies to heating and cooling
-            measures_htcl_adj = [m for m in self.measures if any([
-                z[0] in ["heating", "cooling", "secondary heating"] for
-                z in m.end_use.values() if z is not None])]
-
-            # Remove energy, carbon, and cost overlaps between supply-side and
-            # demand-side heating/cooling ECMs
-            self.htcl_adj(measures_htcl_adj, adopt_scheme, htcl_adj_data)
-
     def compete_res_primary(self, measures_adj, mseg_key, adopt_scheme):
         """Apportion stock/energy/carbon/cost across residential measures.
 
@@ -1362,15 +1750,9 @@ class Engine(object):
                  ->structure type).
             adopt_scheme (string): Assumed consumer adoption scenario.
         """
-        # Initialize list of dicts that each store the annual market fractions
-        # captured by competing measures; also initialize a dict that sums
-        # market fractions by year across competing measures (used to normalize
-        # the measure market fractions such that they all sum to 1)
-        mkt_fracs = [{} for meas in range(0, len(measures_adj))]
-        mkt_fracs_tot = dict.fromkeys(self.handyvars.aeo_years, 0)
-
-        # Loop through competing measures and calculate market shares for each
-        # based on their annualized capital and operating costs.
+        # Set the number of competing measures and the years in the
+        # time horizon
+        n_meas, aeo_years = len(measures_adj), self.handyvars.aeo_years
 
         # Set abbreviated names for the dictionaries containing measure
         # capital and operating cost values, accessed further below
@@ -1392,91 +1774,104 @@ class Engine(object):
         mkt_entry_yrs = [
             m.market_entry_year for m in measures_adj]
 
-        # Loop through competing measures and calculate market shares for
-        # each based on their annualized capital and operating costs
+        # Flag the years in which each competing measure is on the market
+        # (measures x years)
+        on_mkt = [[yr in yrs_on_mkt for yr in aeo_years] for yrs_on_mkt in [
+            set(m.yrs_on_mkt) for m in measures_adj]]
+
+        # Set measure capital and operating cost inputs and the capital and
+        # operating cost weights of the log-linear regression equation that
+        # determines market fractions (measures x years). * Note: operating
+        # cost is set to just energy costs (for now), but could be expanded
+        # to include maintenance and carbon costs
+        cap_cost, op_cost, b1, b2 = ([[0.0] * len(aeo_years) for
+                                      m in measures_adj] for n in range(4))
+        # Flag measures/years with valid cost inputs (e.g., cost is not None)
+        # and record capital and/or operating cost inputs that are arrays
+        # rather than point values (resultant of distributions on measure
+        # inputs) by measure/year
+        cost_ok = [[False] * len(aeo_years) for m in measures_adj]
+        cost_arrays = {}
         for ind, m in enumerate(measures_adj):
-            # Set measure markets and market adjustment information
-
-            # Loop through all years in time horizon
-            for yr in self.handyvars.aeo_years:
+            choice_params = m.markets[adopt_scheme]["competed"]["mseg_adjust"][
+                "competed choice parameters"][str(mseg_key)]
+            for ind_y, yr in enumerate(aeo_years):
                 # Ensure measure is on the market in given year
-                if yr in m.yrs_on_mkt:
-                    # Set measure capital and operating cost inputs. * Note:
-                    # operating cost is set to just energy costs (for now), but
-                    # could be expanded to include maintenance and carbon costs
-
-                    # Set capital cost (handle as numpy array or point value)
-                    if isinstance(unit_cost_s_in[ind][yr], numpy.ndarray):
-                        cap_cost = numpy.zeros(len(unit_cost_s_in[ind][yr]))
-                        for i in range(0, len(unit_cost_s_in[ind][yr])):
-                            cap_cost[i] = unit_cost_s_in[ind][yr][i]
-                    else:
-                        cap_cost = unit_cost_s_in[ind][yr]
-                    # Set operating cost (handle as numpy array or point value)
-                    if isinstance(unit_cost_e_in[ind][yr], numpy.ndarray):
-                        op_cost = numpy.zeros(len(unit_cost_e_in[ind][yr]))
-                        for i in range(0, len(unit_cost_e_in[ind][yr])):
-                            op_cost[i] = unit_cost_e_in[ind][yr][i]
-                    else:
-                        op_cost = unit_cost_e_in[ind][yr]
-
-                    # Calculate measure market fraction using log-linear
-                    # regression equation that takes capital/operating
-                    # costs as inputs
-
-                    # Handle case where cost is None
-                    try:
-                        # Calculate weighted sum of incremental capital and
-                        # operating costs
-                        sum_wt = cap_cost * \
-                            m.markets[adopt_scheme]["competed"][
-                                "mseg_adjust"]["competed choice parameters"][
-                                str(mseg_key)]["b1"][yr] + op_cost * \
-                            m.markets[adopt_scheme]["competed"]["mseg_adjust"][
-                                "competed choice parameters"][
-                                str(mseg_key)]["b2"][yr]
-
-                        # Guard against cases with very low weighted sums of
-                        # incremental capital and operating costs
-                        if not isinstance(sum_wt, numpy.ndarray) and \
-                                sum_wt < -500:
-                            sum_wt = -500
-                        elif isinstance(sum_wt, numpy.ndarray) and any([
-                                x < -500 for x in sum_wt]):
-                            sum_wt = [-500 if x < -500 else x for x in sum_wt]
-
-                        # Calculate market fraction
-                        mkt_fracs[ind][yr] = numpy.exp(sum_wt)
-                    except TypeError:
-                        mkt_fracs[ind][yr] = 0
-
-                    # Add calculated market fraction to mkt fraction sum
-                    mkt_fracs_tot[yr] = \
-                        mkt_fracs_tot[yr] + mkt_fracs[ind][yr]
-
-        # Loop through competing measures to normalize their calculated
-        # market shares to the total market share sum; use normalized
-        # market shares to make adjustments to each measure's master
-        # microsegment values
+                if not on_mkt[ind][ind_y]:
+                    continue
+                cost_in = [unit_cost_s_in[ind][yr], unit_cost_e_in[ind][yr],
+                           choice_params["b1"][yr], choice_params["b2"][yr]]
+                # Handle case where cost is None
+                if any([x is None for x in cost_in]):
+                    continue
+                cost_ok[ind][ind_y] = True
+                b1[ind][ind_y], b2[ind][ind_y] = cost_in[2:]
+                if isinstance(cost_in[0], numpy.ndarray) or isinstance(
+                        cost_in[1], numpy.ndarray):
+                    cost_arrays[(ind, ind_y)] = cost_in[:2]
+                else:
+                    cap_cost[ind][ind_y], op_cost[ind][ind_y] = cost_in[:2]
+        # Find the number of samples in the array inputs for each year (one
+        # for years with only point value inputs); the number of samples may
+        # differ across years
+        length_array = numpy.ones(len(aeo_years), dtype=int)
+        for (ind, ind_y), cost_in in cost_arrays.items():
+            length_array[ind_y] = max([length_array[ind_y]] + [
+                len(x) for x in cost_in if isinstance(x, numpy.ndarray)])
+        # Combine point value and array inputs (measures x years x samples),
+        # repeating point values across the samples of any arrays; samples
+        # beyond a year's number of samples are flagged and not used
+        n_samp = max(length_array)
+        samp_ok = numpy.arange(n_samp)[None, :] < length_array[:, None]
+        cap_cost, op_cost = (numpy.repeat(numpy.array(
+            x, dtype=float)[:, :, None], n_samp, axis=2) for x in [
+            cap_cost, op_cost])
+        for (ind, ind_y), (cap, op) in cost_arrays.items():
+            cap_cost[ind, ind_y, :length_array[ind_y]] = cap
+            op_cost[ind, ind_y, :length_array[ind_y]] = op
+        b1, b2 = (numpy.array(x, dtype=float)[:, :, None] for x in [b1, b2])
+        cost_ok = numpy.array(cost_ok, dtype=bool)
+
+        # Calculate measure market fractions using log-linear regression
+        # equation that takes capital/operating costs as inputs, guarding
+        # against cases with very low weighted sums of incremental capital
+        # and operating costs; market fractions are zero where costs are None
+        # or the measure is not on the market
+        sum_wt = numpy.maximum(cap_cost * b1 + op_cost * b2, -500)
+        mkt_fracs_all = numpy.where(
+            cost_ok[:, :, None], numpy.exp(sum_wt), 0)
+        # Sum market fractions by year across competing measures (used to
+        # normalize the measure market fractions such that they all sum to 1);
+        # these sums are arrays in years where any competing measure's market
+        # fraction is an array
+        mkt_fracs_tot = mkt_fracs_all.sum(axis=0)
+        tot_array = [any([(ind, ind_y) in cost_arrays for ind in range(
+            n_meas)]) for ind_y in range(len(aeo_years))]
+        tot_nonzero = numpy.all((mkt_fracs_tot != 0) | ~samp_ok, axis=1)
+        mkt_fracs_all = numpy.divide(
+            mkt_fracs_all, mkt_fracs_tot, out=numpy.zeros_like(mkt_fracs_all),
+            where=tot_nonzero[:, None])
+        tot_nonzero = tot_nonzero.tolist()
+
+        # Set the normalized market shares for each competing measure
+        mkt_fracs = [{} for meas in range(0, n_meas)]
         for ind, m in enumerate(measures_adj):
-            # Calculate annual market share fraction for the measure and
-            # adjust measure's master microsegment values accordingly
-            for yr in self.handyvars.aeo_years:
+            mkt_fracs_pt = list(mkt_fracs_all[ind, :, 0])
+            for ind_y, yr in enumerate(aeo_years):
                 # Ensure measure is on the market in given year; if not,
                 # the measure either splits the market with other
                 # competing measures if none of those measures is on
                 # the market either, or else has a market share of zero
-                if yr in m.yrs_on_mkt:
-                    if ((not isinstance(mkt_fracs_tot[yr], numpy.ndarray) and
-                         mkt_fracs_tot[yr] != 0) or (
-                        isinstance(mkt_fracs_tot[yr], numpy.ndarray) and all(
-                            mkt_fracs_tot[yr] != 0))):
-                        mkt_fracs[ind][yr] = \
-                            mkt_fracs[ind][yr] / mkt_fracs_tot[yr]
+                if on_mkt[ind][ind_y]:
+                    if tot_nonzero[ind_y] and tot_array[ind_y]:
+                        mkt_fracs[ind][yr] = mkt_fracs_all[
+                            ind, ind_y, :length_array[ind_y]].copy()
+                    elif tot_nonzero[ind_y]:
+                        mkt_fracs[ind][yr] = mkt_fracs_pt[ind_y]
                     else:
-                        mkt_fracs[ind][yr] = 1 / len(measures_adj)
+                        mkt_fracs[ind][yr] = 1 / n_meas
                 elif yr not in years_on_mkt_all:
-                    mkt_fracs[ind][yr] = 1 / len(measures_adj)
+                    mkt_fracs[ind][yr] = 1 / n_meas
                 else:
                     mkt_fracs[ind][yr] = 0
 
@@ -1522,13 +1917,9 @@ class Engine(object):
                  ->structure type).
             adopt_scheme (string): Assumed consumer adoption scenario.
         """
-        # Initialize list of dicts that each store the annual market fractions
-        # captured by competing measures; also initialize a dict that records
-        # the total annualized capital + operating costs for each measure
-        # and discount rate level (used to choose which measure is adopted
-        # under each discount rate level)
-        mkt_fracs = [{} for meas in range(0, len(measures_adj))]
-        tot_cost = [{} for meas in range(0, len(measures_adj))]
+        # Set the number of competing measures and the years in the
+        # time horizon
+        n_meas, aeo_years = len(measures_adj), self.handyvars.aeo_years
 
         # Calculate the total annualized cost (capital + operating) needed to
         # determine market shares below
@@ -1553,14 +1944,19 @@ class Engine(object):
         mkt_entry_yrs = [
             m.market_entry_year for m in measures_adj]
 
+        # Flag the years in which each competing measure is on the market
+        # (measures x years)
+        on_mkt = [[yr in yrs_on_mkt for yr in aeo_years] for yrs_on_mkt in [
+            set(m.yrs_on_mkt) for m in measures_adj]]
+
         # Initialize a flag that indicates whether any competing measures
         # have arrays of annualized capital and/or operating costs rather
         # than point values (resultant of distributions on measure inputs),
         # for each year in the range above
-        length_array = numpy.repeat(0, len(self.handyvars.aeo_years))
+        length_array = numpy.repeat(0, len(aeo_years))
 
         # Loop through all years in time horizon
-        for ind_l, yr in enumerate(self.handyvars.aeo_years):
+        for ind_l, yr in enumerate(aeo_years):
             # Determine whether any of the competing measures have
             # arrays of annualized capital and/or operating costs for
             # the given year; if so, find the array length. * Note: all
@@ -1575,185 +1971,105 @@ class Engine(object):
                         x[yr], numpy.ndarray) or isinstance(
                             y[yr], numpy.ndarray)),
                     length_array[ind_l])
-
-        # Loop through competing measures and calculate market shares for
-        # each based on their annualized capital and operating costs
+        # Point values are repeated across the samples of any arrays
+        n_samp = max(max(length_array), 1)
+
+        # Set the total annualized capital + operating costs (measures x
+        # years x samples x discount rate levels), flagging the measures/
+        # years that have these costs (e.g., cost is not None), and the
+        # fractions of commercial adopters who fall into each discount rate
+        # category for the microsegment (measures x years x rate levels)
+        tot_cost, mkt_dists, cost_ok = None, None, numpy.zeros(
+            (n_meas, len(aeo_years)), dtype=bool)
         for ind, m in enumerate(measures_adj):
-            # Set measure markets and market adjustment information
-            # Loop through all years in time horizon
-            for ind_l, yr in enumerate(self.handyvars.aeo_years):
+            for ind_l, yr in enumerate(aeo_years):
                 # Ensure measure is on the market in given year
-                if yr in m.yrs_on_mkt:
-                    # Set measure capital and operating cost inputs. * Note:
-                    # operating cost is set to just energy costs (for now), but
-                    # could be expanded to include maintenance and carbon costs
-
-                    # Handle cases where capital and/or operating cost inputs
-                    # are specified as arrays for at least one of the competing
-                    # measures. In this case, the capital and operating costs
-                    # for all measures must be formatted consistently as arrays
-                    # of the same length
-                    if length_array[ind_l] > 0:
-                        cap_cost, op_cost = ([
-                            {} for n in range(length_array[ind_l])] for
-                            n in range(2))
-                        for i in range(length_array[ind_l]):
-                            # Set capital cost input array
-                            if isinstance(
-                                    unit_cost_s_in[ind][yr], numpy.ndarray):
-                                cap_cost[i] = unit_cost_s_in[ind][yr][i]
-                            else:
-                                cap_cost[i] = unit_cost_s_in[ind][yr]
-                            # Set operating cost input array
-                            if isinstance(
-                                    unit_cost_e_in[ind][yr], numpy.ndarray):
-                                op_cost[i] = unit_cost_e_in[ind][yr][i]
-                            else:
-                                op_cost[i] = unit_cost_e_in[ind][yr]
-                        # Sum capital and operating cost arrays and add to the
-                        # total cost dict entry for the given measure
-                        tot_cost[ind][yr] = [
-                            [] for n in range(length_array[ind_l])]
-                        # Handle case where cost is None
-                        try:
-                            for c_l in range(0, len(tot_cost[ind][yr])):
-                                for dr in sorted(cap_cost[c_l].keys()):
-                                    tot_cost[ind][yr][c_l].append(
-                                        cap_cost[c_l][dr] + op_cost[c_l][dr])
-                        except AttributeError:
-                            pass
-                    # Handle cases where capital and/or operating cost inputs
-                    # are specified as point values for all competing measures
-                    else:
-                        # Set capital cost point value
-                        cap_cost = unit_cost_s_in[ind][yr]
-                        # Set operating cost point value
-                        op_cost = unit_cost_e_in[ind][yr]
-
-                        # Sum capital and operating cost point values and add
-                        # to the total cost dict entry for the given measure
-                        tot_cost[ind][yr] = []
-                        # Handle case where cost is None
-                        try:
-                            for dr in sorted(cap_cost.keys()):
-                                tot_cost[ind][yr].append(
-                                    cap_cost[dr] + op_cost[dr])
-                        except AttributeError:
-                            pass
-
-        # Loop through competing measures and use total annualized capital
-        # + operating costs to determine the overall share of the market
-        # that is captured by each measure; use market shares to make
-        # adjustments to each measure's master microsegment values
+                if not on_mkt[ind][ind_l]:
+                    continue
+                # Set measure capital and operating cost inputs for each
+                # sample. * Note: operating cost is set to just energy costs
+                # (for now), but could be expanded to include maintenance and
+                # carbon costs
+                cap_cost, op_cost = [
+                    x[yr] if isinstance(x[yr], numpy.ndarray) else
+                    [x[yr]] * max(length_array[ind_l], 1) for x in [
+                        unit_cost_s_in[ind], unit_cost_e_in[ind]]]
+                # Sum capital and operating costs across discount rate levels;
+                # handle case where cost is None
+                try:
+                    cost = [[c[dr] + o[dr] for dr in sorted(c.keys())] for
+                            c, o in zip(cap_cost, op_cost)]
+                except AttributeError:
+                    continue
+                if len(cost[0]) == 0:
+                    continue
+                if tot_cost is None:
+                    tot_cost = numpy.zeros(
+                        (n_meas, len(aeo_years), n_samp, len(cost[0])))
+                    mkt_dists = numpy.zeros(
+                        (n_meas, len(aeo_years), len(cost[0])))
+                # Fill the year's samples (the first sample for years with
+                # only point value inputs); the number of samples may differ
+                # across years, and samples beyond a year's number of samples
+                # are not used
+                tot_cost[ind, ind_l, :len(cost)] = cost
+                mkt_dists[ind, ind_l] = m.markets[adopt_scheme]["competed"][
+                    "mseg_adjust"]["competed choice parameters"][
+                    str(mseg_key)]["rate distribution"][yr]
+                cost_ok[ind, ind_l] = True
+
+        # For each discount rate category, find which measure has the lowest
+        # annualized cost and assign that measure the share of commercial
+        # market adopters defined for that category above, divided by the
+        # total number of competing measures that share the lowest
+        # annualized cost; sum these shares across rate categories
+        mkt_fracs_all = numpy.zeros((n_meas, len(aeo_years), n_samp))
+        if tot_cost is not None:
+            # Find the lowest annualized cost for the set of competing
+            # measures/discount rate level
+            min_val = numpy.where(
+                cost_ok[:, :, None, None], tot_cost, numpy.inf).min(axis=0)
+            # Flag the competing measures with the lowest annualized cost
+            # under each discount rate level, and find how many there are
+            min_val_ecms = cost_ok[:, :, None, None] & (tot_cost == min_val)
+            n_min_val_ecms = min_val_ecms.sum(axis=0)
+            for ind2 in range(tot_cost.shape[3]):
+                mkt_fracs_all += numpy.where(
+                    min_val_ecms[..., ind2], mkt_dists[:, :, None, ind2] /
+                    numpy.maximum(n_min_val_ecms[..., ind2], 1), 0)
+
+        # Set the market shares for each competing measure
+        mkt_fracs = [{} for meas in range(0, n_meas)]
         for ind, m in enumerate(measures_adj):
-            # Calculate annual market share fraction for the measure and
-            # adjust measure's master microsegment values accordingly
-
-            # Loop through all years in time horizon
-            for ind_l, yr in enumerate(self.handyvars.aeo_years):
+            for ind_l, yr in enumerate(aeo_years):
                 # Ensure measure is on the market in given year; if not,
                 # the measure either splits the market with other
                 # competing measures if none of those measures is on
                 # the market either, or else has a market share of zero
-                if yr in m.yrs_on_mkt:
-                    # Set the fractions of commericial adopters who fall into
-                    # each discount rate category for this particular
-                    # microsegment
-                    mkt_dists = m.markets[adopt_scheme]["competed"][
-                        "mseg_adjust"]["competed choice parameters"][
-                            str(mseg_key)]["rate distribution"][yr]
-                    # For each discount rate category, find which measure has
-                    # the lowest annualized cost and assign that measure the
-                    # share of commercial market adopters defined for that
-                    # category above
-
+                if on_mkt[ind][ind_l]:
                     # Handle cases where capital and/or operating cost inputs
-                    # are specified as lists for at least one of the competing
-                    # measures.
-                    if length_array[ind_l] > 0 and len(
-                            tot_cost[ind][yr][0]) != 0:
-                        mkt_fracs[ind][yr] = [
-                            [] for n in range(length_array[ind_l])]
-                        for c_l in range(length_array[ind_l]):
-                            for ind2, dr in enumerate(
-                                    tot_cost[ind][yr][c_l]):
-                                # Find the lowest annualized cost for the
-                                # set of competing measures/discount bin
-                                min_val = min([
-                                    tot_cost[x][yr][c_l][ind2] for x in
-                                    range(0, len(measures_adj)) if
-                                    (yr in tot_cost[x].keys() and
-                                     len(tot_cost[x][yr][0]) != 0)])
-                                # Determine how many competing measures
-                                # have the lowest annualized cost under
-                                # the given discount rate bin
-                                min_val_ecms = [
-                                    x for x in range(0, len(measures_adj)) if
-                                    (yr in tot_cost[x].keys() and
-                                     len(tot_cost[x][yr][0]) != 0) and
-                                    tot_cost[x][yr][c_l][ind2] == min_val]
-                                # If the current measure has the lowest
-                                # annualized cost, assign it appropriate
-                                # market share for current discount rate
-                                # category being looped through, divided by
-                                # total number of competing measures that
-                                # share the lowest annualized cost
-                                if tot_cost[ind][yr][c_l][ind2] == min_val:
-                                    mkt_fracs[ind][yr][c_l].append(
-                                        mkt_dists[ind2] /
-                                        len(min_val_ecms))
-                                # Otherwise, set its market share for that
-                                # discount rate bin to zero
-                                else:
-                                    mkt_fracs[ind][yr][c_l].append(0)
-                            mkt_fracs[ind][yr][c_l] = sum(
-                                mkt_fracs[ind][yr][c_l])
-                        # Convert market fractions list to numpy array for
-                        # use in compete_adj function below
-                        mkt_fracs[ind][yr] = numpy.array(
-                            mkt_fracs[ind][yr])
+                    # are specified as arrays for at least one of the
+                    # competing measures
+                    if cost_ok[ind, ind_l] and length_array[ind_l] > 0:
+                        mkt_fracs[ind][yr] = mkt_fracs_all[
+                            ind, ind_l, :length_array[ind_l]].copy()
+                        # Market shares are integer zeros where the measure
+                        # does not have the lowest cost under any rate level
+                        if not min_val_ecms[
+                                ind, ind_l, :length_array[ind_l]].any():
+                            mkt_fracs[ind][yr] = mkt_fracs[ind][yr].astype(
+                                int)
                     # Handle cases where capital and/or operating cost inputs
                     # are specified as point values for all competing measures
-                    elif length_array[ind_l] == 0:
-                        if len(tot_cost[ind][yr]) != 0:
-                            mkt_fracs[ind][yr] = []
-                            for ind2, dr in enumerate(tot_cost[ind][yr]):
-                                # Find the lowest annualized cost for the given
-                                # set of competing measures and discount bin
-                                min_val = min([
-                                    tot_cost[x][yr][ind2] for x in
-                                    range(0, len(measures_adj)) if (
-                                        yr in tot_cost[x].keys() and
-                                        len(tot_cost[x][yr]) != 0)])
-                                # Determine how many of the competing measures
-                                # have the lowest annualized cost under
-                                # the given discount rate bin
-                                min_val_ecms = [
-                                    x for x in range(0, len(measures_adj)) if
-                                    (yr in tot_cost[x].keys() and
-                                     len(tot_cost[x][yr]) != 0) and
-                                    tot_cost[x][yr][ind2] == min_val]
-                                # If the current measure has the lowest
-                                # annualized cost, assign it the appropriate
-                                # market share for the current discount rate
-                                # category being looped through, divided by the
-                                # total number of competing measures that share
-                                # the lowest annualized cost
-                                if tot_cost[ind][yr][ind2] == min_val:
-                                    mkt_fracs[ind][yr].append(
-                                        mkt_dists[ind2] / len(min_val_ecms))
-                                # Otherwise, set its market share for that
-                                # discount rate bin to zero
-                                else:
-                                    mkt_fracs[ind][yr].append(0)
-                            mkt_fracs[ind][yr] = sum(mkt_fracs[ind][yr])
-                        else:
-                            mkt_fracs[ind][yr] = 0
+                    elif cost_ok[ind, ind_l] and \
+                            min_val_ecms[ind, ind_l, 0].any():
+                        mkt_fracs[ind][yr] = mkt_fracs_all[
+                            ind, ind_l, 0].item()
                     else:
                         mkt_fracs[ind][yr] = 0
                 elif yr not in years_on_mkt_all:
-                    if len(measures_adj) > 1:
-                        mkt_fracs[ind][yr] = 1 / len(measures_adj)
+                    if n_meas > 1:
+                        mkt_fracs[ind][yr] = 1 / n_meas
                     else:
                         mkt_fracs[ind][yr] = 0
                 else:
@@ -2243,7 +2559,7 @@ class Engine(object):
         # type)
 
         # Convert contributing microsegment key chain string to a list
-        keys = literal_eval(msu)
+        keys = self.parse_mseg_key(msu)
         # Pull out climate zone, building type, structure type, fuel type,
         # and end use
         msu_split = [str(x) for x in [keys[1], keys[2], keys[-1],
@@ -2330,7 +2646,7 @@ class Engine(object):
             # overlaps across the heating/cooling supply-side and demand-side
             for mseg in htcl_keys:
                 # Convert contributing microsegment key chain string to a list
-                keys = literal_eval(mseg)
+                keys = self.parse_mseg_key(mseg)
                 # Pull out climate zone, building type, structure type,
                 # fuel type, and end use
                 msu_split = [str(x) for x in [keys[1], keys[2], keys[-1],
@@ -2684,7 +3000,7 @@ class Engine(object):
         # combination of categories will be adjusted to reflect competition)
 
         # Convert microsegment string to a list
-        key_list = literal_eval(mseg_key)
+        key_list = self.parse_mseg_key(mseg_key)
         # Establish applicable climate zone breakout
         for cz in self.handyvars.out_break_czones.items():
             if key_list[1] in cz[1]:
@@ -3034,7 +3350,7 @@ class Engine(object):
                 "cooling" not in mseg_key))):
             # Decompose contributing microsegment key information into a list,
             # to be modified per comment above
-            key_list = list(literal_eval(mseg_key))
+            key_list = list(self.parse_mseg_key(mseg_key))
             # Strip any additional information that is added to the
             # EIA technology name to further distinguish msegs with exogenous
             # rates and/or specific heating and cooling pairings
@@ -3685,7 +4001,7 @@ class Engine(object):
             # type for the current contributing primary microsegment from the
             # microsegment key chain information and use as the key for linking
             # the primary and its associated secondary microsegment
-            cz_bldg_struct = literal_eval(mseg_key)
+            cz_bldg_struct = self.parse_mseg_key(mseg_key)
             secnd_mseg_adjkey = str((
                 cz_bldg_struct[1], cz_bldg_struct[2], cz_bldg_struct[-1]))
 
@@ -4612,82 +4928,53 @@ class Engine(object):
             # building type, and end use output categories by the total
             # baseline energy/carbon/cost and efficient energy/carbon/cost for
             # the measure (all post-competition); this yields fractions to use
-            # in apportioning energy, carbon, and cost results by category
-
-            # Energy
-            # Calculate baseline energy fractions by output breakout category
-            frac_base_energy = self.out_break_walk(
-                m.markets[adopt_scheme]["competed"]["mseg_out_break"][
-                    "energy"]["baseline"], energy_base_avg, focus_yrs,
-                divide=True)
-            # Calculate efficient energy fractions by output breakout category
-            frac_eff_energy = self.out_break_walk(
-                m.markets[adopt_scheme]["competed"]["mseg_out_break"][
-                    "energy"]["efficient"], energy_eff_avg, focus_yrs,
-                divide=True)
-            # Calculate efficient captured energy fractions by output breakout
-            # category if efficient-captured energy data are present
+            # in apportioning energy, carbon, and cost results by category.
+            # Breakouts are flattened into arrays of breakout categories x
+            # focus years, such that normalizing and partitioning results by
+            # category is an array operation that leaves the measure's
+            # breakout data unchanged (no copies are needed)
+            out_break = m.markets[adopt_scheme]["competed"]["mseg_out_break"]
+            # Set the totals to normalize each set of breakouts by
+            brk_totals = {
+                ("energy", "baseline"): energy_base_avg,
+                ("energy", "efficient"): energy_eff_avg,
+                ("cost", "baseline"): energy_cost_base_avg,
+                ("cost", "efficient"): energy_cost_eff_avg,
+                ("carbon", "baseline"): carb_base_avg,
+                ("carbon", "efficient"): carb_eff_avg}
+            # Add efficient captured energy if these data are present
             if eff_capt:
-                frac_eff_energy_capt = self.out_break_walk(
-                    m.markets[adopt_scheme]["competed"]["mseg_out_break"][
-                        "energy"]["efficient-captured"], energy_eff_capt_avg,
-                    focus_yrs, divide=True)
-            # Cost
-            # Calculate baseline energy cost fractions by output breakout
-            # category
-            frac_base_cost = self.out_break_walk(
-                m.markets[adopt_scheme]["competed"]["mseg_out_break"][
-                    "cost"]["baseline"], energy_cost_base_avg,
-                focus_yrs, divide=True)
-            # Calculate efficient energy cost fractions by output breakout
-            # category
-            frac_eff_cost = self.out_break_walk(
-                m.markets[adopt_scheme]["competed"]["mseg_out_break"][
-                    "cost"]["efficient"], energy_cost_eff_avg,
-                focus_yrs, divide=True)
-            # Carbon
-            # Calculate baseline carbon fractions by output breakout category
-            frac_base_carb = self.out_break_walk(
-                m.markets[adopt_scheme]["competed"]["mseg_out_break"][
-                    "carbon"]["baseline"], carb_base_avg, focus_yrs,
-                divide=True)
-            # Calculate efficient carbon fractions by output breakout category
-            frac_eff_carb = self.out_break_walk(
-                m.markets[adopt_scheme]["competed"]["mseg_out_break"][
-                    "carbon"]["efficient"], carb_eff_avg, focus_yrs,
-                divide=True)
+                brk_totals[("energy", "efficient-captured")] = \
+                    energy_eff_capt_avg
             # Add stock breakouts if desired
-            if any([x is True for x in [self.opts.mkt_fracs, self.opts.report_stk]]):
-                if self.opts.report_stk is True:
-                    # Calculate baseline stock fractions by breakout category
-                    frac_base_stk = self.out_break_walk(
-                        m.markets[adopt_scheme]["competed"]["mseg_out_break"][
-                            "stock"]["baseline"], stk_base_avg, focus_yrs,
-                        divide=True)
-                # Case with market penetration fractions/breakouts; copy
-                # measure stock totals to avoid manipulation via "frac_eff_stk"
-                # calculation
-                if all([x is True for x in [self.opts.mkt_fracs, self.opts.report_stk]]):
-                    eff_stk = copy.deepcopy(m.markets[adopt_scheme][
-                        "competed"]["mseg_out_break"]["stock"]["efficient"])
-                else:
-                    eff_stk = m.markets[adopt_scheme][
-                        "competed"]["mseg_out_break"]["stock"]["efficient"]
-                if self.opts.report_stk is True:
-                    # Calculate efficient stock fractions by breakout category
-                    frac_eff_stk = self.out_break_walk(
-                        m.markets[adopt_scheme]["competed"][
-                            "mseg_out_break"]["stock"]["efficient"],
-                        stk_eff_avg, focus_yrs, divide=True)
-                if self.opts.mkt_fracs is True:
-                    # Calculate market penetration percentages for the current
-                    # measure and scenario by output breakout category; divide
-                    # post-competition measure stock by the total stock that
-                    # the measure could possibly affect (before competition)
-                    frac_mkt_stk = self.out_break_walk(
-                        eff_stk, m.markets[adopt_scheme]["uncompeted"][
+            if self.opts.report_stk is True:
+                brk_totals[("stock", "baseline")] = stk_base_avg
+                brk_totals[("stock", "efficient")] = stk_eff_avg
+            # Flatten the breakouts to be normalized
+            brk_arrays = {
+                key: self.out_break_array(
+                    out_break[key[0]][key[1]], focus_yrs)
+                for key in brk_totals.keys()}
+            # Calculate fractions by output breakout category
+            brk_fracs = {
+                key: self.out_break_div(
+                    brk_arrays[key][-1], brk_totals[key], focus_yrs)
+                for key in brk_totals.keys()}
+            if self.opts.mkt_fracs is True:
+                # Calculate market penetration percentages for the current
+                # measure and scenario by output breakout category; divide
+                # post-competition measure stock by the total stock that
+                # the measure could possibly affect (before competition)
+                if ("stock", "efficient") not in brk_arrays.keys():
+                    brk_arrays[("stock", "efficient")] = self.out_break_array(
+                        out_break["stock"]["efficient"], focus_yrs)
+                brk_struct, brk_paths, brk_yrs, brk_vals = brk_arrays[
+                    ("stock", "efficient")]
+                frac_mkt_stk = self.out_break_dict(
+                    brk_struct, brk_yrs, self.out_break_div(
+                        brk_vals, m.markets[adopt_scheme]["uncompeted"][
                             "master_mseg"]["stock"]["total"]["all"],
-                        focus_yrs, divide=True, mkt_frac=True)
+                        focus_yrs, mkt_frac=True), focus_yrs, prune=1)
 
             # Create shorthand variable for results by breakout category
             mkt_save_brk = self.output_ecms[m.name][
@@ -4697,57 +4984,38 @@ class Engine(object):
             mkt_keys = mkt_base_keys + mkt_eff_keys
             # Apply output breakout fractions to total baseline and efficient
             # stock, energy, carbon, and cost results initialized above
+            brk_results = {}
             for k in mkt_keys:
                 # Apply baseline partitioning fractions to baseline values
                 if "Baseline" in k:
-                    # Stock results
-                    if "Stock" in k:
-                        mkt_save_brk[k] = self.out_break_walk(
-                            copy.deepcopy(frac_base_stk), mkt_save_brk[k],
-                            focus_yrs, divide=False)
-                    # Energy results
-                    elif "Energy Use" in k:
-                        mkt_save_brk[k] = self.out_break_walk(
-                            copy.deepcopy(frac_base_energy), mkt_save_brk[k],
-                            focus_yrs, divide=False)
-                    # Energy cost results
-                    elif "Energy Cost" in k:
-                        mkt_save_brk[k] = self.out_break_walk(
-                            copy.deepcopy(frac_base_cost), mkt_save_brk[k],
-                            focus_yrs, divide=False)
-                    # Carbon results
-                    else:
-                        mkt_save_brk[k] = self.out_break_walk(
-                            copy.deepcopy(frac_base_carb), mkt_save_brk[k],
-                            focus_yrs, divide=False)
+                    var_sub = "baseline"
+                # Apply efficient captured partitioning fractions to
+                # efficient captured energy values
+                elif eff_capt and "Stock" not in k and \
+                        "Energy Use" in k and "Measure" in k:
+                    var_sub = "efficient-captured"
                 # Apply efficient partitioning fractions to efficient values
                 elif any([x in k for x in ["Efficient", "Measure"]]):
-                    # Stock results
-                    if "Stock" in k:
-                        mkt_save_brk[k] = self.out_break_walk(
-                            copy.deepcopy(frac_eff_stk), mkt_save_brk[k],
-                            focus_yrs, divide=False)
-                    # Energy results
-                    elif "Energy Use" in k and "Measure" not in k:
-                        mkt_save_brk[k] = self.out_break_walk(
-                            copy.deepcopy(frac_eff_energy), mkt_save_brk[k],
-                            focus_yrs, divide=False)
-                    # Efficient captured energy results
-                    elif eff_capt and "Energy Use" in k and "Measure" in k:
-                        mkt_save_brk[k] = self.out_break_walk(
-                            copy.deepcopy(frac_eff_energy_capt),
-                            mkt_save_brk[k],
-                            focus_yrs, divide=False)
-                    # Energy cost results
-                    elif "Energy Cost" in k:
-                        mkt_save_brk[k] = self.out_break_walk(
-                            copy.deepcopy(frac_eff_cost), mkt_save_brk[k],
-                            focus_yrs, divide=False)
-                    # Carbon results
-                    else:
-                        mkt_save_brk[k] = self.out_break_walk(
-                            copy.deepcopy(frac_eff_carb), mkt_save_brk[k],
-                            focus_yrs, divide=False)
+                    var_sub = "efficient"
+                else:
+                    continue
+                # Stock results
+                if "Stock" in k:
+                    var = "stock"
+                # Energy results
+                elif "Energy Use" in k:
+                    var = "energy"
+                # Energy cost results
+                elif "Energy Cost" in k:
+                    var = "cost"
+                # Carbon results
+                else:
+                    var = "carbon"
+                brk_struct, brk_paths, brk_yrs, brk_vals = brk_arrays[
+                    (var, var_sub)]
+                brk_results[k] = (
+                    brk_struct, brk_paths, brk_yrs, brk_fracs[(var, var_sub)] *
+                    numpy.array([mkt_save_brk[k][yr] for yr in focus_yrs]))
             # Assess final output breakouts of savings as the difference
             # between finalized baseline and efficient breakouts from above
             for ind_k, k in enumerate(save_keys):
@@ -4758,16 +5026,24 @@ class Engine(object):
                     ind_adj = ind_k + 1
                 else:
                     ind_adj = ind_k
-                # Copy baseline breakouts dict to use in establishing the
-                # structure of the final savings output breakouts dict
-                orig_dict_struct = copy.deepcopy(
-                    mkt_save_brk[mkt_base_keys[ind_adj]])
-                # Loop through all nested levels of the dict above; when
-                # reaching terminal nodes, finalize savings values as
-                # difference between finalized baseline and efficient results
-                mkt_save_brk[k] = self.out_break_walk_subtr(
-                    orig_dict_struct, mkt_save_brk[mkt_base_keys[ind_adj]],
-                    mkt_save_brk[mkt_eff_keys[ind_adj]], focus_yrs)
+                # Use the baseline breakouts to establish the structure of the
+                # final savings output breakouts
+                base_struct, base_paths, base_yrs, base_vals = brk_results[
+                    mkt_base_keys[ind_adj]]
+                eff_paths, eff_vals = brk_results[mkt_eff_keys[ind_adj]][1::2]
+                # Align efficient breakout categories with baseline categories
+                # if the breakouts are not structured identically
+                if eff_paths != base_paths:
+                    eff_rows = {p: ind for ind, p in enumerate(eff_paths)}
+                    eff_vals = eff_vals[[eff_rows[p] for p in base_paths]]
+                mkt_save_brk[k] = self.out_break_dict(
+                    base_struct, base_yrs, base_vals - eff_vals, focus_yrs,
+                    prune=3)
+            # Write out finalized baseline and efficient breakouts
+            for k, (brk_struct, brk_paths, brk_yrs, brk_vals) in \
+                    brk_results.items():
+                mkt_save_brk[k] = self.out_break_dict(
+                    brk_struct, brk_yrs, brk_vals, focus_yrs)
 
             # Record low and high estimates on markets, if available and
             # user has not specified trimmed output
@@ -5028,74 +5304,295 @@ class Engine(object):
                     "Efficient Energy Use, Measure (high) (MMBtu)"] = \
                     [energy_eff_all_capt_low, energy_eff_all_capt_high]
 
-    def out_break_walk(self, adjust_dict, adjust_vals, focus_yrs, divide,
-                       mkt_frac=False):
-        """Partition measure results by climate, building sector, and end use.
+    def out_break_array(self, adjust_dict, focus_yrs):
+        """Flatten measure results by climate, building sector, and end use.
+
+        Notes:
+            Years outside the years of focus are dropped; values for focus
+            years that are missing from a breakout category are set to zero
+            in the output array. Empty breakout categories are kept in the
+            results partitioning structure (see 'out_break_dict').
+
+        Args:
+            adjust_dict (dict): Measure results by climate zone, building
+                sector, end use, and possibly fuel type.
+            focus_yrs (list): Optional years of focus within overall yr. range
+
+        Returns:
+            Results partitioning structure (with each category's yearly
+            results replaced by a row index), the keys for each row, the focus
+            years present in each row, and an array of the results with rows
+            for each breakout category and columns for each focus year.
+        """
+        paths, rows = [], []
+
+        def flatten(node, path):
+            struct = {}
+            for (k, i) in node.items():
+                # Keep empty breakout categories
+                if len(i.keys()) == 0:
+                    struct[k] = {}
+                # Continue to the next level of breakout categories
+                elif isinstance(next(iter(i.values())), dict):
+                    struct[k] = flatten(i, path + (k,))
+                # Record the yearly results for the breakout category
+                else:
+                    struct[k] = len(rows)
+                    paths.append(path + (k,))
+                    rows.append(i)
+            return struct
+
+        adjust_struct = flatten(adjust_dict, ())
+        # Find the focus years present in each row; rows with all of the
+        # focus years in order share the focus years list
+        focus_yrs_set = set(focus_yrs)
+        row_yrs = [[yr for yr in i.keys() if yr in focus_yrs_set]
+                   for i in rows]
+        row_yrs = [focus_yrs if yrs == focus_yrs else yrs for yrs in row_yrs]
+        vals = [list(map(i.__getitem__, focus_yrs)) if yrs is focus_yrs
+                else [i.get(yr, 0) for yr in focus_yrs]
+                for i, yrs in zip(rows, row_yrs)]
+        try:
+            vals = numpy.array(vals, dtype=float).reshape(
+                len(rows), len(focus_yrs))
+        # Handle breakout results that are arrays (e.g., with uncertainty)
+        except (TypeError, ValueError):
+            vals_obj = numpy.empty((len(rows), len(focus_yrs)), dtype=object)
+            for ind, v in enumerate(vals):
+                vals_obj[ind, :] = v
+            vals = vals_obj
+
+        return adjust_struct, paths, row_yrs, vals
+
+    def out_break_div(self, vals, adjust_vals, focus_yrs, mkt_frac=False):
+        """Normalize flattened measure results by total results in each year.
 
         Args:
-            adjust_dict (dict): Results partitioning structure and fractions
-                for climate zone, building sector, and end use.
+            vals (numpy.ndarray): Measure results by breakout category
+                (rows) and focus year (columns).
             adjust_vals (dict): Unpartitioned energy, carbon, and cost
                 markets/savings.
             focus_yrs (list): Optional years of focus within overall yr. range
-            divide (boolean): Optional flag to divide terminal values instead
-                of multiplying them (the default option).
-            mkt_frac (boolean): Optional flag to convert terminal values to
+            mkt_frac (boolean): Optional flag to convert fractions to
                 percentages for market penetration percentages (the default
                 option is False)
 
         Returns:
-            Measure baseline or efficient results partitioned by climate,
-            building sector, end use, and possibly fuel type.
+            Fractions of the total results by breakout category and focus year
+            (zero in years where the total results are zero).
         """
-        for (k, i) in sorted(adjust_dict.items()):
-            if isinstance(i, dict) and len(i.keys()) > 0:
-                self.out_break_walk(i, adjust_vals, focus_yrs, divide,
-                                    mkt_frac)
-            elif isinstance(i, dict):
-                del adjust_dict[k]
-            elif k in focus_yrs:
-                # Apply appropriate climate zone/building type/end use
-                # partitioning fraction to the overall market/savings
-                # value
-                if divide is False:
-                    adjust_dict[k] = adjust_dict[k] * adjust_vals[k]
-                else:
-                    if adjust_vals[k] != 0:
-                        adjust_dict[k] = adjust_dict[k] / adjust_vals[k]
-                        if mkt_frac is True:
-                            adjust_dict[k] = adjust_dict[k] * 100
-                    else:
-                        adjust_dict[k] = 0
-            else:
-                del adjust_dict[k]
-        return adjust_dict
+        totals = numpy.array([adjust_vals[yr] for yr in focus_yrs])
+        fracs = numpy.zeros(vals.shape, dtype=vals.dtype)
+        nonzero = (totals != 0)
+        fracs[:, nonzero] = vals[:, nonzero] / totals[nonzero]
+        if mkt_frac is True:
+            fracs[:, nonzero] = fracs[:, nonzero] * 100
+
+        return fracs
 
-    def out_break_walk_subtr(self, orig_dict, base_val, eff_val, focus_yrs):
-        """Subtract efficient from base values in nested dicts to get savings.
+    def out_break_dict(self, adjust_struct, row_yrs, vals, focus_yrs,
+                       prune=2):
+        """Restore nested dict of measure results by breakout category.
+
+        Notes:
+            Breakout categories are removed when they are empty after
+            removing the years outside the years of focus and, successively,
+            'prune' - 1 levels of the empty categories beneath them. E.g., with
+            'prune' set to 2, categories that were empty to begin with and
+            categories without data for any of the focus years are removed,
+            while a category that only held such categories is reported as
+            empty.
 
         Args:
-            orig_dict (dict): The final dict/dict structure to be produced.
-            base_val (dict): Baseline values in nested dict.
-            eff_val (list): Efficient values in nested dict.
+            adjust_struct (dict): Results partitioning structure, with row
+                indices in place of each category's yearly results.
+            row_yrs (list): Focus years present in each row.
+            vals (numpy.ndarray): Measure results by breakout category
+                (rows) and focus year (columns).
             focus_yrs (list): Optional years of focus within overall yr. range
+            prune (int): Optional number of levels of empty categories to
+                remove (the default option is 2).
 
         Returns:
-            Measure savings results partitioned by climate, building sector,
-            end use, and possibly fuel type.
+            Measure results partitioned by climate, building sector, end use,
+            and possibly fuel type.
         """
-        for (k, i) in sorted(orig_dict.items()):
-            if isinstance(i, dict) and len(i.keys()) > 0:
-                self.out_break_walk_subtr(
-                    i, base_val[k], eff_val[k], focus_yrs)
-            elif isinstance(i, dict):
-                del orig_dict[k]
-            elif k in focus_yrs:
-                # Subtract efficient from baseline values at terminal nodes
-                orig_dict[k] = base_val[k] - eff_val[k]
-            else:
-                del orig_dict[k]
-        return orig_dict
+        yr_cols = {yr: ind for ind, yr in enumerate(focus_yrs)}
+        rows = vals.tolist()
+
+        def build(node):
+            # Yearly results for a breakout category; the category is empty
+            # once years outside the years of focus are removed if it has no
+            # data for the focus years
+            if not isinstance(node, dict):
+                if row_yrs[node] == focus_yrs:
+                    out_dict = dict(zip(focus_yrs, rows[node]))
+                else:
+                    out_dict = {
+                        yr: rows[node][yr_cols[yr]] for yr in row_yrs[node]}
+                return out_dict, (2 if len(out_dict.keys()) == 0 else numpy.inf)
+            # Breakout category that holds further categories; the category
+            # is empty one level after all of the categories beneath it are
+            out_dict, levels = {}, [0]
+            for (k, i) in node.items():
+                out_dict_k, level_k = build(i)
+                levels.append(level_k)
+                if level_k > prune:
+                    out_dict[k] = out_dict_k
+            return out_dict, max(levels) + 1
+
+        return build(adjust_struct)[0]
+
+    def scheme_copy(self, adopt_scheme):
+        """Copy the engine with only the data needed for one adoption scheme.
+
+        Notes:
+            Measures in the copy hold only their markets and savings for the
+            adoption scheme (plus the uncompeted technical potential markets
+            used to calculate financial metrics, if these are not yet
+            calculated), such that the copy can be sent to a worker process.
+
+        Args:
+            adopt_scheme (string): Assumed consumer adoption scenario.
+
+        Returns:
+            Copy of the engine for the adoption scheme.
+        """
+        scheme_run = copy.copy(self)
+        scheme_run.measures = []
+        for m in self.measures:
+            m_scheme = copy.copy(m)
+            m_scheme.markets = {adopt_scheme: m.markets[adopt_scheme]}
+            if m.update_results["financial metrics"] is True and \
+                    adopt_scheme != "Technical potential":
+                m_scheme.markets["Technical potential"] = {"uncompeted": {
+                    "master_mseg": m.markets["Technical potential"][
+                        "uncompeted"]["master_mseg"]}}
+            m_scheme.savings = {adopt_scheme: m.savings[adopt_scheme]}
+            scheme_run.measures.append(m_scheme)
+
+        return scheme_run
+
+    def scheme_results(self, adopt_scheme):
+        """Collect measure and summary outputs for one adoption scheme.
+
+        Args:
+            adopt_scheme (string): Assumed consumer adoption scenario.
+
+        Returns:
+            Dict of competed markets, savings, and financial metrics by
+            measure, and of the summary outputs for the adoption scheme.
+        """
+        return {
+            "measures": [(
+                m.markets[adopt_scheme]["competed"], m.savings[adopt_scheme],
+                m.update_results, m.financial_metrics) for m in self.measures],
+            "output_ecms": {m.name: (
+                self.output_ecms[m.name]["Markets and Savings (Overall)"][
+                    adopt_scheme],
+                self.output_ecms[m.name]["Markets and Savings (by Category)"][
+                    adopt_scheme],
+                self.output_ecms[m.name]["Financial Metrics"]) for
+                m in self.measures},
+            "output_all": self.output_all["All ECMs"][
+                "Markets and Savings (Overall)"][adopt_scheme],
+            "output_ecms_cfs": self.output_ecms_cfs}
+
+    def merge_scheme_results(self, adopt_scheme, results):
+        """Update measures and summary outputs with one adoption scheme's results.
+
+        Notes:
+            Results must be merged in adoption scheme order, since outputs
+            that do not vary by adoption scheme (financial metrics and
+            competition adjustment fractions) are taken from the last
+            adoption scheme merged, as when schemes are run in sequence.
+
+        Args:
+            adopt_scheme (string): Assumed consumer adoption scenario.
+            results (dict): Results for the adoption scheme (see
+                'scheme_results').
+        """
+        for m, (competed, savings, update_results, fin_metrics) in zip(
+                self.measures, results["measures"]):
+            m.markets[adopt_scheme]["competed"] = competed
+            m.savings[adopt_scheme] = savings
+            m.update_results["savings"][adopt_scheme] = \
+                update_results["savings"][adopt_scheme]
+            m.update_results["financial metrics"] = \
+                update_results["financial metrics"]
+            m.financial_metrics = fin_metrics
+            output_m = self.output_ecms[m.name]
+            output_m["Markets and Savings (Overall)"][adopt_scheme], \
+                output_m["Markets and Savings (by Category)"][adopt_scheme], \
+                output_m["Financial Metrics"] = results["output_ecms"][m.name]
+        self.output_all["All ECMs"]["Markets and Savings (Overall)"][
+            adopt_scheme] = results["output_all"]
+        if self.output_ecms_cfs is not None:
+            self.output_ecms_cfs = results["output_ecms_cfs"]
+
+
+def run_scheme_worker(engine, adopt_scheme, htcl_totals, trim_out, trim_yrs):
+    """Calculate savings and metrics for one adoption scheme in a worker process.
+
+    Args:
+        engine (Engine): Engine copy for the adoption scheme (see
+            'Engine.scheme_copy').
+        adopt_scheme (string): Assumed consumer adoption scenario.
+        htcl_totals (dict): Heating/cooling energy totals by climate zone,
+            building type, and structure type.
+        trim_out (boolean): Flag for trimmed down results file.
+        trim_yrs (list): Optional list of years to focus results on.
+
+    Returns:
+        Results for the adoption scheme (see 'Engine.scheme_results').
+    """
+    engine.calc_savings_metrics(adopt_scheme, "uncompeted")
+    engine.compete_measures(adopt_scheme, htcl_totals)
+    engine.calc_savings_metrics(adopt_scheme, "competed")
+    engine.finalize_outputs(adopt_scheme, trim_out, trim_yrs)
+    return engine.scheme_results(adopt_scheme)
+
+
+def run_schemes_parallel(engine, htcl_totals, trim_out, trim_yrs):
+    """Calculate savings and metrics for all adoption schemes in parallel.
+
+    Note:
+        Each adoption scheme is run in its own worker process on a copy of
+        the engine with only that scheme's data, and the results are merged
+        back into the engine in adoption scheme order.
+
+    Args:
+        engine (Engine): Engine with the measures to run.
+        htcl_totals (dict): Heating/cooling energy totals by climate zone,
+            building type, and structure type.
+        trim_out (boolean): Flag for trimmed down results file.
+        trim_yrs (list): Optional list of years to focus results on.
+    """
+    adopt_schemes = engine.handyvars.adopt_schemes
+    with ProcessPoolExecutor(max_workers=len(adopt_schemes)) as executor:
+        scheme_loads = [executor.submit(
+            run_scheme_worker, engine.scheme_copy(adopt_scheme),
+            adopt_scheme, htcl_totals, trim_out, trim_yrs) for
+            adopt_scheme in adopt_schemes]
+        for adopt_scheme, scheme_load in zip(adopt_schemes, scheme_loads):
+            engine.merge_scheme_results(adopt_scheme, scheme_load.result())
+
+
+def compete_msegs_worker(engine, adopt_scheme, msegs, mseg_measures):
+    """Compete measures across a set of microsegments in a worker process.
+
+    Args:
+        engine (Engine): Engine with the measures to compete.
+        adopt_scheme (string): Assumed consumer adoption scenario.
+        msegs (list): Sorted contributing microsegment key chains.
+        mseg_measures (dict): Positions of the measures (in the engine's
+            measures list) that each contributing microsegment applies to.
+
+    Returns:
+        Competed markets of the engine's measures.
+    """
+    engine.compete_msegs(adopt_scheme, msegs, mseg_measures)
+    return [m.markets[adopt_scheme]["competed"] for m in engine.measures]
 
 
 def measure_opts_match(option_dicts: list[dict]) -> bool:
@@ -5110,7 +5607,8 @@ def measure_opts_match(option_dicts: list[dict]) -> bool:
     """
 
     ignore_opts = ["verbose", "yaml", "ecm_directory", "ecm_files", "ecm_files_user",
-                   "ecm_packages", "ecm_files_regex"]
+                   "ecm_packages", "ecm_files_regex", "workers", "no_cache",
+                   "comp_data_format", "profile"]
     keys_to_check = [key for key in option_dicts[0].keys() if key not in ignore_opts]
     if any(opts[x] != option_dicts[0][x] for opts in option_dicts[1:] for x in keys_to_check):
         return False
@@ -5172,6 +5670,10 @@ def main(opts: argparse.NameSpace):  # noqa: F821
     else:
         trim_out, trim_yrs = (False for n in range(2))
 
+    # Record the time and memory use of each phase of the analysis if desired
+    profiler = Profiler(opts.profile)
+    prof_rec = profiler.start("load inputs")
+
     # Import measure files
     with open(handyfiles.meas_summary_data, 'r') as mjs:
         try:
@@ -5341,22 +5843,25 @@ def main(opts: argparse.NameSpace):  # noqa: F821
     else:
         print('Importing ECM competition data...', end="", flush=True)
 
-    for m in measures_objlist:
-        # Assemble file name for measure competition data
-        meas_file_name = m.name + ".pkl.gz"
-        # Assemble folder path for measure competition data
-        comp_folder_name = handyfiles.meas_compete_data
-        with gzip.open(comp_folder_name / meas_file_name, 'r') as zp:
-            try:
-                meas_comp_data = pickle.load(zp)
-            except Exception as e:
-                raise Exception(
-                    f"Error reading in competition data of ECM '{m.name}': {str(e)}") from None
-        # Assemble folder path for measure efficient fuel split data
-        fs_splt_folder_name = handyfiles.meas_eff_fs_splt_data
+    # Read measure competition and efficient fuel split data files
+    # concurrently (decompression and file reads release the GIL)
+    with ThreadPoolExecutor() as executor:
+        meas_comp_loads = [executor.submit(
+            Utils.load_comp_data, handyfiles.meas_compete_data, m.name)
+            for m in measures_objlist]
+        meas_eff_fs_loads = [executor.submit(
+            Utils.load_comp_data, handyfiles.meas_eff_fs_splt_data, m.name)
+            for m in measures_objlist]
+
+    for m, comp_load, eff_fs_load in zip(
+            measures_objlist, meas_comp_loads, meas_eff_fs_loads):
+        try:
+            meas_comp_data = comp_load.result()
+        except Exception as e:
+            raise Exception(
+                f"Error reading in competition data of ECM '{m.name}': {str(e)}") from None
         try:
-            with gzip.open(fs_splt_folder_name / meas_file_name, 'r') as zp:
-                meas_eff_fs_data = pickle.load(zp)
+            meas_eff_fs_data = eff_fs_load.result()
         except FileNotFoundError:
             meas_eff_fs_data = None
         for adopt_scheme in handyvars.adopt_schemes:
@@ -5364,12 +5869,16 @@ def main(opts: argparse.NameSpace):  # noqa: F821
             # initialize an uncompeted and post-competition copy of these data
             # (the former of which will be used to establish a common set of
             # stock turnover constraints in the competition, the latter of
-            # which will be adjusted by the competition)
+            # which will be adjusted by the competition). Contributing
+            # microsegment data are only copied to the post-competition data
+            # as they are accessed, since many are never adjusted
             m.markets[adopt_scheme]["uncompeted"]["mseg_adjust"] = \
                 meas_comp_data[adopt_scheme]
-            m.markets[adopt_scheme]["competed"]["mseg_adjust"] = \
-                copy.deepcopy(
-                    m.markets[adopt_scheme]["uncompeted"]["mseg_adjust"])
+            m.markets[adopt_scheme]["competed"]["mseg_adjust"] = {
+                k: (CopyOnAccessDict(v) if
+                    k == "contributing mseg keys and values" else
+                    copy.deepcopy(v)) for k, v in
+                meas_comp_data[adopt_scheme].items()}
             # Reset measure fuel split attribute to imported values
             m.eff_fs_splt = meas_eff_fs_data
         # Print data import message for each ECM if in verbose mode
@@ -5391,53 +5900,64 @@ def main(opts: argparse.NameSpace):  # noqa: F821
         print('ECM competition data load complete')
     else:
         print('Data load complete')
+    profiler.stop(prof_rec)
 
     # Instantiate an Engine object using active measures list
     a_run = Engine(handyvars, opts, measures_objlist, energy_out, brkout)
 
     # Calculate uncompeted and competed measure savings and financial
-    # metrics, and write key outputs to JSON file
-    for adopt_scheme in handyvars.adopt_schemes:
+    # metrics, and write key outputs to JSON file; if requested, run each
+    # adoption scheme in its own worker process and merge the results in
+    # adoption scheme order
+    if opts.parallel_schemes is True and len(handyvars.adopt_schemes) > 1:
+        print("Calculating savings/metrics and competing ECMs for all "
+              "adoption scenarios in parallel...", end="", flush=True)
+        prof_rec = profiler.start("parallel adoption schemes")
+        run_schemes_parallel(a_run, htcl_totals, trim_out, trim_yrs)
+        profiler.stop(prof_rec)
+        print("Results finalized")
+        adopt_schemes_serial = []
+    else:
+        adopt_schemes_serial = handyvars.adopt_schemes
+    for adopt_scheme in adopt_schemes_serial:
         # Calculate each measure's uncompeted savings and metrics,
         # and print progress update to user
         print("Calculating uncompeted '" + adopt_scheme +
               "' savings/metrics...", end="", flush=True)
-        a_run.calc_savings_metrics(adopt_scheme, "uncompeted")
+        with profiler.phase(
+                "calc_savings_metrics (uncompeted, " + adopt_scheme + ")"):
+            a_run.calc_savings_metrics(adopt_scheme, "uncompeted")
         print("Calculations complete")
         # Update each measure's competed markets to reflect the
         # removal of savings overlaps with competing measures,
         # and print progress update to user
         print("Competing ECMs for '" + adopt_scheme + "' scenario...",
               end="", flush=True)
-        a_run.compete_measures(adopt_scheme, htcl_totals)
+        with profiler.phase("compete_measures (" + adopt_scheme + ")"):
+            a_run.compete_measures(adopt_scheme, htcl_totals)
         print("Competition complete")
         # Calculate each measure's competed measure savings and metrics
         # using updated competed markets, and print progress update to user
         print("Calculating competed '" + adopt_scheme +
               "' savings/metrics...", end="", flush=True)
-        a_run.calc_savings_metrics(adopt_scheme, "competed")
+        with profiler.phase(
+                "calc_savings_metrics (competed, " + adopt_scheme + ")"):
+            a_run.calc_savings_metrics(adopt_scheme, "competed")
         print("Calculations complete")
         print("Finalizing results...", end="", flush=True)
         # Write selected outputs to a summary JSON file for post-processing
-        a_run.finalize_outputs(adopt_scheme, trim_out, trim_yrs)
+        with profiler.phase("finalize_outputs (" + adopt_scheme + ")"):
+            a_run.finalize_outputs(adopt_scheme, trim_out, trim_yrs)
         print("Results finalized")
 
     # Notify user that all analysis engine calculations are completed
     print("All calculations complete; writing output data...", end="",
           flush=True)
+    prof_rec = profiler.start("on-site generation")
 
-    # Import baseline microsegments
-    if regions in ['EMM', 'State']:  # Extract compressed EMM/state data
-        bjszip = handyfiles.msegs_in
-        with gzip.GzipFile(bjszip, 'r') as zip_ref:
-            msegs = json.loads(zip_ref.read().decode('utf-8'))
-    else:
-        with open(handyfiles.msegs_in, 'r') as msi:
-            try:
-                msegs = json.load(msi)
-            except ValueError as e:
-                raise ValueError(
-                    f"Error reading in '{handyfiles.msegs_in}': {str(e)}") from None
+    # Import baseline microsegments (compressed for EMM/state data) via
+    # the memory-mapped copy shared with ecm_prep
+    msegs = MappedJSON(handyfiles.mapped_inputs).load(handyfiles.msegs_in)
 
     # Import site-source conversions
     with open(handyfiles.ss_data, 'r') as ss:
@@ -5553,30 +6073,38 @@ def main(opts: argparse.NameSpace):  # noqa: F821
     # Add onsite generation data as additional measure-level data
     # written with ECM results output
     a_run.output_ecms['On-site Generation'] = osg_temp
-
-    # Recursively navigate dictionary and round values
-    def round_values(data, precision):
-        if isinstance(data, dict):
-            for k, v in data.items():
-                data[k] = round_values(v, precision)
-        elif isinstance(data, float):
-            data = round(data, precision)
-        return data
-
-    a_run.output_ecms = round_values(a_run.output_ecms, 6)
-    a_run.output_all = round_values(a_run.output_all, 6)
-
-    # Write summary outputs for individual measures to a JSON
-    with open(handyfiles.meas_engine_out_ecms, "w") as jso:
-        json.dump(a_run.output_ecms, jso, indent=2)
-    # Write summary outputs across all measures to a JSON
-    with open(handyfiles.meas_engine_out_agg, "w") as jso:
-        json.dump(a_run.output_all, jso, indent=2)
-    print("Data writing complete")
-    # Write competition adjustment fractions to a JSON, if applicable
+    profiler.stop(prof_rec)
+    prof_rec = profiler.start("write outputs")
+
+    # Write summary outputs for individual measures and across all measures
+    # (and competition adjustment fractions, if applicable) to JSONs; write
+    # one top-level entry (e.g., measure) at a time, rounding its values to
+    # six decimal places as it is written. The 'results_format' option sets
+    # whether the JSONs are indented, compact (no indentation), or gzipped
+    # (compact, with '.gz' appended to the file names)
+    if opts.results_format == "indented":
+        indent = 2
+    else:
+        indent = None
+    compress = (opts.results_format == "gzip")
+    json_outputs = [
+        (a_run.output_ecms, handyfiles.meas_engine_out_ecms, 6),
+        (a_run.output_all, handyfiles.meas_engine_out_agg, 6)]
+    # Competition adjustment fractions are written without rounding
     if a_run.output_ecms_cfs is not None:
-        with open(handyfiles.comp_fracs_out, "w") as jso:
-            json.dump(a_run.output_ecms_cfs, jso, indent=2)
+        json_outputs.append(
+            (a_run.output_ecms_cfs, handyfiles.comp_fracs_out, None))
+    for data, filepath, precision in json_outputs:
+        if compress is True:
+            filepath = filepath.with_name(filepath.name + ".gz")
+        dump_json(data, filepath, indent=indent, precision=precision,
+                  compress=compress)
+    # Write summary outputs for individual measures to a columnar table, if
+    # desired
+    if opts.results_table is True:
+        ResultsTable.write(a_run.output_ecms, handyfiles.meas_engine_out_table)
+    profiler.stop(prof_rec)
+    print("Data writing complete")
 
     # Do not plot for the case where a user has trimmed down the results
     # (not all data required for the plots will be available)
@@ -5584,9 +6112,16 @@ def main(opts: argparse.NameSpace):  # noqa: F821
         # Notify user that the output data are being plotted
         print("Plotting output data...", end="", flush=True)
         # Execute plots
-        run_plot(meas_summary, a_run, handyvars, measures_objlist, regions)
+        with profiler.phase("plots"):
+            run_plot(meas_summary, a_run, handyvars, measures_objlist, regions)
         print("Plotting complete")
 
+    # Write reports of the time and memory use of each phase if desired
+    if opts.profile is True:
+        profiler.write(handyfiles.profile)
+        print("Profile of the analysis written to " + str(handyfiles.profile) +
+              ".json/.csv")
+
 
 def parse_args(args: list = None) -> argparse.NameSpace:  # noqa: F821
     """Parse arguments for run.py using Config class
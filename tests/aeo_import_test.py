@@ -0,0 +1,132 @@
+import os
+import unittest
+import tempfile
+import importlib.util
+from unittest import mock
+from pathlib import Path
+import numpy as np
+from scout import aeo_import
+from scout.aeo_import import ImportCache, strip_nulls
+from scout import com_mseg as cm
+
+
+class TestImportCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp_path = Path(self.tmp_dir.name)
+        self.import_cache = ImportCache(self.tmp_path / "aeo_import_cache")
+        self.data_file = self.tmp_path / "KDBOUT.txt"
+        # Sample data with NULL characters, as found in some AEO files
+        self.data_file.write_text(
+            "Division,BuildingType,Label,Year,Amount\n"
+            "1,1,\"ElecCons\",2020,1.5\x00\x00\n"
+            "1,2,\"ElecCons\",2021,2\n"
+            "2,1,\"Sqft\",2020,3.25\n")
+        self.calls = []
+
+    def import_data(self, fpath, delim_char, cols=None):
+        self.calls.append(fpath)
+        return cm.eia_data_import(fpath, delim_char)
+
+    def test_strip_nulls(self):
+        self.assertEqual(list(strip_nulls(["a\x00,b\n", "\x00\n"])),
+                         ["a,b\n", "\n"])
+
+    def test_import_with_null_characters(self):
+        data = cm.eia_data_import(self.data_file)
+        self.assertEqual(data.dtype.names, (
+            "Division", "BuildingType", "Label", "Year", "Amount"))
+        np.testing.assert_array_equal(data["Amount"], [1.5, 2, 3.25])
+        self.assertEqual(data["Label"].tolist(), ["ElecCons"] * 2 + ["Sqft"])
+
+    def test_cache(self):
+        # Test that a file is imported once and then loaded from the cache
+        first = self.import_cache.load(self.data_file, self.import_data, ",")
+        second = self.import_cache.load(self.data_file, self.import_data, ",")
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(first.dtype, second.dtype)
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(len(list(self.import_cache.cache_dir.glob("*.npy"))), 1)
+        # Changes to the file contents or the import arguments lead to the
+        # file being imported again
+        self.import_cache.load(
+            self.data_file, self.import_data, ",", ["Amount"])
+        self.assertEqual(len(self.calls), 2)
+        with open(self.data_file, "a") as handle:
+            handle.write("2,2,\"Sqft\",2021,4\n")
+        updated = self.import_cache.load(
+            self.data_file, self.import_data, ",")
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(len(updated), 4)
+
+    def test_file_hashes(self):
+        # Test that the data file is only read in full to check the cache
+        # when its size or modification time has changed
+        self.import_cache.load(self.data_file, self.import_data, ",")
+        with mock.patch.object(aeo_import, "file_hash",
+                               wraps=aeo_import.file_hash) as hashes:
+            # The index of file checksums is kept across cache instances
+            import_cache = ImportCache(self.import_cache.cache_dir)
+            import_cache.load(self.data_file, self.import_data, ",")
+            self.assertEqual(hashes.call_count, 0)
+            f_stat = self.data_file.stat()
+            os.utime(self.data_file, ns=(
+                f_stat.st_atime_ns, f_stat.st_mtime_ns + 10 ** 9))
+            import_cache.load(self.data_file, self.import_data, ",")
+            self.assertEqual(hashes.call_args_list, [
+                mock.call(self.data_file)])
+        # The contents are unchanged, such that the cached array is loaded
+        self.assertEqual(len(self.calls), 1)
+
+    def test_parser_modules(self):
+        # Write a module of parsers that an import function draws on
+        parser_file = self.tmp_path / "sample_parsers.py"
+        parser_file.write_text("DELIM = ','\n")
+        spec = importlib.util.spec_from_file_location(
+            "sample_parsers", parser_file)
+        parsers = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(parsers)
+        import_cache = ImportCache(self.import_cache.cache_dir, [parsers])
+        self.assertNotEqual(
+            import_cache.cache_path(self.data_file, self.import_data, ","),
+            self.import_cache.cache_path(
+                self.data_file, self.import_data, ","))
+        import_cache.load(self.data_file, self.import_data, ",")
+        import_cache.load(self.data_file, self.import_data, ",")
+        self.assertEqual(len(self.calls), 1)
+        # A change to the code of the parsers leads to the file being
+        # imported again
+        parser_file.write_text("DELIM = ','  # Comma delimiter\n")
+        import_cache.load(self.data_file, self.import_data, ",")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_remove_stale(self):
+        cache_dir = self.import_cache.cache_dir
+        # Arrays for the same file imported with different arguments, and
+        # for a file of the same name in another folder, are all kept
+        other_file = self.tmp_path / "other" / self.data_file.name
+        other_file.parent.mkdir()
+        other_file.write_text(self.data_file.read_text())
+        self.import_cache.load(self.data_file, self.import_data, ",")
+        self.import_cache.load(
+            self.data_file, self.import_data, ",", ["Amount"])
+        self.import_cache.load(other_file, self.import_data, ",")
+        self.assertEqual(len(list(cache_dir.glob("*.npy"))), 3)
+        # The array cached from the previous contents of a file is removed
+        # once the updated file is imported
+        old_path = self.import_cache.cache_path(
+            self.data_file, self.import_data, ",")
+        with open(self.data_file, "a") as handle:
+            handle.write("2,2,\"Sqft\",2021,4\n")
+        self.import_cache.load(self.data_file, self.import_data, ",")
+        new_path = self.import_cache.cache_path(
+            self.data_file, self.import_data, ",")
+        self.assertFalse(old_path.exists())
+        self.assertTrue(new_path.exists())
+        self.assertEqual(len(list(cache_dir.glob("*.npy"))), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
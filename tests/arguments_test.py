@@ -104,6 +104,10 @@ class TestConfig(unittest.TestCase, Utils):
             "pkg_env_sep": False,
             "detail_brkout": [],
             "fugitive_emissions": [],
+            "workers": 1,
+            "no_cache": False,
+            "comp_data_format": "gzip",
+            "profile": False,
         },
         "run": {
             "results_directory": None,
@@ -112,6 +116,11 @@ class TestConfig(unittest.TestCase, Utils):
             "trim_results": False,
             "report_stk": False,
             "report_cfs": False,
+            "workers": 1,
+            "parallel_schemes": False,
+            "results_format": "indented",
+            "results_table": False,
+            "profile": False,
         },
     }
 
@@ -333,6 +342,15 @@ class TestConfig(unittest.TestCase, Utils):
         )
         self.assertTrue(expected_err in actual_err, f"Expected {expected_err} in {actual_err}")
 
+        cli_args = ["--workers", "0"]
+        actual_err = self._get_cfg_args_err_message("ecm_prep", cli_args)
+        expected_err = "`workers` must be an integer of 1 or greater."
+        self.assertTrue(expected_err in actual_err, f"Expected {expected_err} in {actual_err}")
+
+        cli_args = ["--workers", "0"]
+        actual_err = self._get_cfg_args_err_message("run", cli_args)
+        self.assertTrue(expected_err in actual_err, f"Expected {expected_err} in {actual_err}")
+
 
 class TestECMPrepArgsTranslate(unittest.TestCase, Utils):
     """Tests to confirm accurate translation of cli/yml arguments to values used in ecm_prep.py.
@@ -0,0 +1,101 @@
+from __future__ import annotations
+from pathlib import Path
+from argparse import ArgumentParser
+import sys
+import timeit
+import numpy
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from scout.run import Engine  # noqa: E402
+
+
+def legacy_payback(cashflows):
+    """Calculate simple payback period by accumulating cash flows in a loop
+
+    Note:
+        This is the implementation of 'Engine.payback' prior to the
+        closed-form/batched version, kept as the benchmark baseline.
+
+    Args:
+        cashflows (list): Cash flows across measure lifetime.
+
+    Returns:
+        Simple payback period for the input cash flows.
+    """
+    investment, cashflows = cashflows[0], list(
+        cashflows[1:]) + [cashflows[-1]] * (100 - len(cashflows[1:]))
+    if investment >= 0:
+        return 0
+    investment = abs(investment)
+    total, years, cumulative = 0, 0, []
+    for cashflow in cashflows:
+        total += cashflow
+        if total < investment:
+            years += 1
+        cumulative.append(total)
+    if years < len(cashflows):
+        if (years - 1) < 0:
+            b, c = investment, cumulative[0]
+        else:
+            b = investment - cumulative[years - 1]
+            c = cumulative[years] - cumulative[years - 1]
+        return years + (b / c)
+    return 999
+
+
+def sample_cashflows(n_series: int, seed: int = 0):
+    """Generate measure cash flow series with realistic lifetimes
+
+    Args:
+        n_series (int): Number of cash flow series to generate.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        Cash flow series as a 2D array (padded with zeros beyond each
+        series' lifetime) and the lifetime of each series.
+    """
+    rng = numpy.random.default_rng(seed)
+    # Lifetimes typical of lighting, envelope, and HVAC/appliance measures
+    life_meas = rng.choice([5, 10, 15, 20, 25, 30, 40], size=n_series)
+    cashflows = numpy.zeros((n_series, life_meas.max() + 1))
+    cashflows[:, 0] = -rng.uniform(100, 2000, n_series)
+    annual = rng.uniform(-5, 150, n_series)
+    for ind, life in enumerate(life_meas):
+        cashflows[ind, 1:life + 1] = annual[ind]
+    return cashflows, life_meas
+
+
+def run_benchmark(n_series: int = 10000, repeat: int = 5) -> None:
+    """Time simple payback calculations per cash flow series
+
+    Args:
+        n_series (int, optional): Number of cash flow series. Defaults to 10000.
+        repeat (int, optional): Number of timing repeats (the best is
+            reported). Defaults to 5.
+    """
+    cashflows, life_meas = sample_cashflows(n_series)
+    series = [cashflows[ind, :life + 1] for ind, life in enumerate(life_meas)]
+    engine = Engine.__new__(Engine)
+
+    timings = {
+        "legacy loop (per call)": lambda: [legacy_payback(x) for x in series],
+        "Engine.payback (per call)": lambda: [engine.payback(x) for x in series],
+        "Engine.payback_batch": lambda: Engine.payback_batch(cashflows, life_meas)}
+    for name, func in timings.items():
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f"{name:<28}{best / n_series * 1e6:>10.2f} us/series")
+
+    # Check that the batched paybacks match the baseline implementation
+    numpy.testing.assert_allclose(
+        Engine.payback_batch(cashflows, life_meas),
+        [legacy_payback(x) for x in series], rtol=1e-9)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--n_series", type=int, default=10000,
+                        help="Number of cash flow series to time")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Number of timing repeats")
+    opts = parser.parse_args()
+    run_benchmark(opts.n_series, opts.repeat)
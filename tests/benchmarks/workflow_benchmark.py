@@ -0,0 +1,394 @@
+from __future__ import annotations
+from pathlib import Path
+from argparse import ArgumentParser
+from datetime import datetime
+import itertools
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import numpy
+import yaml
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from scout import ecm_prep, run  # noqa: E402
+from scout.config import FilePaths as fp  # noqa: E402
+from scout.ecm_prep_args import ecm_args  # noqa: E402
+
+# Measure definitions that synthetic portfolios are generated from
+TEMPLATE_DIR = Path(__file__).parents[2] / "ecm_definitions"
+# File that the timings of each benchmark case are appended to (kept with
+# other generated data, outside of the tracked source tree)
+HISTORY_FILE = fp.GENERATED / "workflow_history.jsonl"
+# Time-sensitive valuation settings used when TSV metrics are switched on
+TSV_OPTS = {
+    "tsv_type": "energy", "tsv_daily_hr_restrict": "all",
+    "tsv_energy_agg": "sum", "tsv_season": "summer",
+    "tsv_average_days": "all"}
+
+
+def load_templates(template_dir: Path = TEMPLATE_DIR):
+    """Load the measure and package definitions used as portfolio templates
+
+    Args:
+        template_dir (Path, optional): Directory of measure definitions and
+            package_ecms.json. Defaults to ./ecm_definitions.
+
+    Returns:
+        Dict of measure definitions by measure name and list of package
+        definitions whose contributing measures are all among the templates.
+    """
+    measures = {}
+    for fpath in sorted(template_dir.glob("*.json")):
+        if fpath.name == "package_ecms.json":
+            continue
+        with open(fpath, "r") as handle:
+            meas = json.load(handle)
+        measures[meas["name"]] = meas
+    with open(template_dir / "package_ecms.json", "r") as handle:
+        packages = [pkg for pkg in json.load(handle) if all(
+            x in measures for x in pkg["contributing_ECMs"])]
+    return measures, packages
+
+
+def make_portfolio(n_measures: int, packages: bool, out_dir: Path,
+                   seed: int = 0, template_dir: Path = TEMPLATE_DIR):
+    """Write a synthetic portfolio of measure definitions
+
+    Note:
+        Templates are drawn in a random (seeded) order, and once all of them
+        have been drawn, they are drawn again as further copies; every measure
+        is named after its template and copy number (e.g., '(R) Best Gas WH
+        #2'), such that copies of a template compete with one another in the
+        analysis engine as distinct measures. With packages, the templates
+        that contribute to packages are drawn first, and each copy of a
+        template package whose contributing measures were all drawn in that
+        copy is added to the portfolio.
+
+    Args:
+        n_measures (int): Number of individual measures in the portfolio.
+        packages (bool): Flag for whether to add packages to the portfolio.
+        out_dir (Path): Directory to write the measure definitions to.
+        seed (int, optional): Random seed for the order templates are drawn
+            in. Defaults to 0.
+        template_dir (Path, optional): Directory of template definitions.
+            Defaults to ./ecm_definitions.
+
+    Returns:
+        Lists of the names of the portfolio's measures and packages.
+    """
+    templates, pkg_templates = load_templates(template_dir)
+    rng = numpy.random.default_rng(seed)
+    names = list(templates.keys())
+    if packages is True:
+        in_pkg = sorted(set(x for pkg in pkg_templates for x in pkg[
+            "contributing_ECMs"]))
+        not_in_pkg = [x for x in names if x not in in_pkg]
+        names = list(rng.permutation(in_pkg)) + list(
+            rng.permutation(not_in_pkg))
+    else:
+        names = list(rng.permutation(names))
+        pkg_templates = []
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    meas_names, pkg_defs = [], []
+    for ind in range(n_measures):
+        copy_ind, name = divmod(ind, len(names))
+        meas = dict(templates[names[name]])
+        meas["name"] = f"{meas['name']} #{copy_ind + 1}"
+        with open(out_dir / (meas["name"] + ".json"), "w") as handle:
+            json.dump(meas, handle, indent=2)
+        meas_names.append(meas["name"])
+    # Add packages for each copy of the templates
+    for copy_ind in range(-(-n_measures // len(names))):
+        for pkg in pkg_templates:
+            ctrb = [f"{x} #{copy_ind + 1}" for x in pkg["contributing_ECMs"]]
+            if all(x in meas_names for x in ctrb):
+                pkg_defs.append(dict(
+                    pkg, name=f"{pkg['name']} #{copy_ind + 1}",
+                    contributing_ECMs=ctrb))
+    with open(out_dir / "package_ecms.json", "w") as handle:
+        json.dump(pkg_defs, handle, indent=2)
+    # Measures draw on EnergyPlus data and savings shapes in the measure
+    # definitions folder
+    eplus_dir = out_dir / "energyplus_data"
+    if not eplus_dir.exists():
+        try:
+            eplus_dir.symlink_to(template_dir.resolve() / "energyplus_data",
+                                 target_is_directory=True)
+        except OSError:
+            shutil.copytree(template_dir / "energyplus_data", eplus_dir)
+
+    return meas_names, [pkg["name"] for pkg in pkg_defs]
+
+
+def write_config(case: dict, case_dir: Path, pkg_names: list) -> Path:
+    """Write the configuration file for a benchmark case
+
+    Args:
+        case (dict): Benchmark case settings.
+        case_dir (Path): Directory of the case's measures and results.
+        pkg_names (list): Names of the packages in the case's portfolio.
+
+    Returns:
+        Path of the configuration file.
+    """
+    config = {
+        "description": "Workflow benchmark case",
+        "ecm_prep": {
+            "ecm_directory": str(case_dir / "ecm_definitions"),
+            "ecm_packages": pkg_names,
+            "alt_regions": case["regions"],
+            "workers": case["workers"],
+            "no_cache": True,
+            "profile": True},
+        "run": {
+            "results_directory": str(case_dir / "results"),
+            "workers": case["workers"],
+            "profile": True}}
+    if case["tsv"] is True:
+        config["ecm_prep"]["tsv_metrics"] = TSV_OPTS
+    config_file = case_dir / "config.yml"
+    with open(config_file, "w") as handle:
+        yaml.safe_dump(config, handle, sort_keys=False)
+    return config_file
+
+
+def check_inputs(cases: list) -> None:
+    """Ensure that the baseline data needed to prepare measures are present
+
+    Note:
+        The baseline microsegment and cost, performance, and lifetime data
+        are not bundled with the repository, and must be added to
+        ./scout/supporting_data/stock_energy_tech_data before measures can
+        be prepared.
+
+    Args:
+        cases (list): Benchmark case settings.
+
+    Raises:
+        FileNotFoundError: If any baseline data files needed for the cases
+            are missing, naming those files.
+    """
+    required = []
+    for case in cases:
+        handyfiles = ecm_prep.UsefulInputFiles(
+            ecm_args(["--alt_regions", case["regions"]]))
+        required.extend([handyfiles.msegs_in, handyfiles.msegs_cpl_in])
+        if case["tsv"] is True:
+            required.append(handyfiles.tsv_load_data)
+    missing = sorted(set(str(x) for x in required if not x.exists()))
+    if missing:
+        raise FileNotFoundError(
+            "Baseline data needed to prepare measures for the benchmark "
+            "cases are missing; add the following files before running "
+            "the benchmark:\n  " + "\n  ".join(missing))
+
+
+def phase_times(profile_file: Path) -> dict:
+    """Sum the wall time of each profiled phase across measures
+
+    Args:
+        profile_file (Path): JSON report written by the profiler.
+
+    Returns:
+        Dict of total wall time (s) by phase name.
+    """
+    with open(profile_file, "r") as handle:
+        phases = json.load(handle)["phases"]
+    totals = {}
+    for rec in phases:
+        totals[rec["phase"]] = round(
+            totals.get(rec["phase"], 0) + rec["wall_s"], 4)
+    return totals
+
+
+def git_commit() -> str | None:
+    """Find the commit of the code being benchmarked
+
+    Returns:
+        Commit hash, or None if it cannot be determined.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(case: dict, work_dir: Path, steps: list) -> dict:
+    """Generate a portfolio and time the workflow steps for a benchmark case
+
+    Args:
+        case (dict): Benchmark case settings.
+        work_dir (Path): Directory to write the case's inputs and outputs to.
+        steps (list): Workflow steps to time ('ecm_prep' and/or 'run').
+
+    Returns:
+        Dict history record with the total and per-phase wall time of each
+        step.
+    """
+    case_dir = work_dir / "_".join(str(case[k]) for k in [
+        "measures", "regions", "tsv", "packages"])
+    meas_names, pkg_names = make_portfolio(
+        case["measures"], case["packages"], case_dir / "ecm_definitions",
+        case["seed"])
+    config_file = write_config(case, case_dir, pkg_names)
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(), "python": platform.python_version(),
+        "platform": platform.platform(), "case": case,
+        "portfolio": {"measures": len(meas_names),
+                      "packages": len(pkg_names)}}
+    # Keep generated data for each case apart from that of other cases,
+    # restoring the file paths in use before the case afterwards
+    paths = {attr: val for attr, val in vars(fp).items() if isinstance(
+        val, Path)}
+    fp.set_paths({"GENERATED": case_dir / "generated"})
+    try:
+        for step in steps:
+            if step == "ecm_prep":
+                opts = ecm_args(["-y", str(config_file)])
+                main, profile_file = ecm_prep.main, (
+                    fp.GENERATED / "profile_ecm_prep.json")
+            else:
+                opts = run.parse_args(["-y", str(config_file)])
+                main, profile_file = run.main, (
+                    fp.GENERATED / "profile_run.json")
+            start = time.perf_counter()
+            main(opts)
+            record[step] = {
+                "wall_s": round(time.perf_counter() - start, 4),
+                "phases": phase_times(profile_file)}
+    finally:
+        for attr, val in paths.items():
+            setattr(fp, attr, val)
+    return record
+
+
+def previous_record(case: dict, history_file: Path) -> dict | None:
+    """Find the latest history record for the same benchmark case
+
+    Args:
+        case (dict): Benchmark case settings.
+        history_file (Path): History of benchmark records (JSON lines).
+
+    Returns:
+        Latest record for the case, or None if the case has no history.
+    """
+    if not history_file.exists():
+        return None
+    prev = None
+    with open(history_file, "r") as handle:
+        for line in handle:
+            if line.strip() and json.loads(line)["case"] == case:
+                prev = json.loads(line)
+    return prev
+
+
+def run_benchmark(measures: list, regions: list, tsv: list, packages: list,
+                  workers: int = 1, seed: int = 0, steps: list = None,
+                  history_file: Path = HISTORY_FILE,
+                  work_dir: Path = None) -> list:
+    """Time ecm_prep and run on synthetic portfolios for each benchmark case
+
+    Args:
+        measures (list): Portfolio sizes (numbers of measures).
+        regions (list): Regional breakouts {AIA, EMM, State}.
+        tsv (list): Flags for whether time-sensitive valuation metrics are on.
+        packages (list): Flags for whether packages are in the portfolio.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        seed (int, optional): Random seed for portfolio generation.
+            Defaults to 0.
+        steps (list, optional): Workflow steps to time. Defaults to both
+            'ecm_prep' and 'run'.
+        history_file (Path, optional): File the records are appended to.
+            Defaults to ./generated/workflow_history.jsonl.
+        work_dir (Path, optional): Directory to keep the cases' inputs and
+            outputs in; if not provided, a temporary directory is used and
+            removed afterwards.
+
+    Returns:
+        List of history records for the benchmark cases.
+    """
+    if steps is None:
+        steps = ["ecm_prep", "run"]
+    cases = []
+    for n, reg, tsv_on, pkg_on in itertools.product(
+            measures, regions, tsv, packages):
+        # Time-sensitive valuation metrics require EMM or state baseline data
+        if tsv_on is True and reg == "AIA":
+            print(f"Skipping {n} measure AIA case with TSV metrics (TSV "
+                  "metrics require EMM or State regions)")
+            continue
+        cases.append({"measures": n, "regions": reg, "tsv": tsv_on,
+                      "packages": pkg_on, "workers": workers, "seed": seed})
+
+    # Check for missing baseline data before any case is run
+    if "ecm_prep" in steps:
+        check_inputs(cases)
+
+    tmp_dir = None
+    if work_dir is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        work_dir = Path(tmp_dir.name)
+    records = []
+    try:
+        for case in cases:
+            prev = previous_record(case, history_file)
+            record = run_case(case, Path(work_dir), steps)
+            with open(history_file, "a") as handle:
+                handle.write(json.dumps(record) + "\n")
+            records.append(record)
+            # Report each step's time and its change since the last record
+            for step in steps:
+                change = ""
+                if prev is not None and step in prev:
+                    change = (f" ({record[step]['wall_s'] / prev[step]['wall_s']:.2f}x"
+                              f" vs. {prev['commit'] and prev['commit'][:8]})")
+                print(f"{case['measures']:>5} measures, {case['regions']:<5} "
+                      f"TSV {'on ' if case['tsv'] else 'off'} packages "
+                      f"{'on ' if case['packages'] else 'off'} {step:<9}"
+                      f"{record[step]['wall_s']:>10.2f} s{change}")
+    finally:
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+    return records
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--measures", type=int, nargs="+", default=[20],
+                        help="Numbers of measures in the synthetic portfolios")
+    parser.add_argument("--regions", nargs="+", default=["AIA"],
+                        choices=["AIA", "EMM", "State"],
+                        help="Regional breakouts to benchmark")
+    parser.add_argument("--tsv", nargs="+", default=["off"],
+                        choices=["off", "on"],
+                        help="Whether time-sensitive valuation metrics are on")
+    parser.add_argument("--packages", nargs="+", default=["off"],
+                        choices=["off", "on"],
+                        help="Whether packages are in the portfolios")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes for ecm_prep and run")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed for portfolio generation")
+    parser.add_argument("--steps", nargs="+", default=["ecm_prep", "run"],
+                        choices=["ecm_prep", "run"],
+                        help="Workflow steps to time")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE,
+                        help="File the benchmark records are appended to")
+    parser.add_argument("--work_dir", type=Path, default=None,
+                        help="Directory to keep portfolios and outputs in")
+    opts = parser.parse_args()
+    try:
+        run_benchmark(
+            opts.measures, opts.regions, [x == "on" for x in opts.tsv],
+            [x == "on" for x in opts.packages], opts.workers, opts.seed,
+            opts.steps, opts.history, opts.work_dir)
+    except FileNotFoundError as err:
+        parser.exit(1, f"{err}\n")
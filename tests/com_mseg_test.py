@@ -927,6 +927,39 @@ class PercentageCalculationTest(CommonUnitTest):
                 self.e_pct - self.sd_percentages[2], decimals=5) == 0).all())
 
 
+class GroupedMicrosegmentDataTest(CommonUnitTest):
+    """ Test that the service demand data grouped for all microsegments
+    and the commercial data indexed by microsegment yield the same
+    results as selecting the data for each microsegment separately """
+
+    def test_grouped_service_demand_shares(self):
+        shares = cm.ServiceDemandShares(self.sample_sd_array, self.years)
+        for sel in self.selections + [[9, 9, 1, 1]]:
+            for grouped, single in zip(
+                    cm.sd_mseg_percent(shares, sel, self.years),
+                    cm.sd_mseg_percent(self.sample_sd_array, sel, self.years)):
+                np.testing.assert_array_equal(grouped, single)
+        # Placeholder rows are removed and the rows for each technology
+        # in a microsegment are combined
+        self.assertEqual(len(shares.technames), sum(
+            len(names) for names in self.technames))
+
+    def test_indexed_data_selection(self):
+        db_index = cm.GroupedIndex(self.sample_db_array, cm.catg_index_cols)
+        for sel, label in [([2, 1, 2, 1], 'EndUseConsump'),
+                           ([9, 9], 'CMNewFloorSpace'),
+                           ([9, 9], 'SurvFloorTotal'),
+                           ([1, 1, 1, 1], 'EndUseConsump')]:
+            np.testing.assert_array_equal(
+                cm.catg_data_selector(db_index, sel, label, self.years),
+                cm.catg_data_selector(
+                    self.sample_db_array, sel, label, self.years))
+        # Selections do not modify the indexed data
+        np.testing.assert_array_equal(
+            db_index.data[np.argsort(db_index.positions)],
+            self.sample_db_array)
+
+
 class CommercialDataSelectionTest(CommonUnitTest):
     """ Test function that selects a subset of data from the combined
     commercial building energy and characteristics array and outputs
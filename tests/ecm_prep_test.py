@@ -0,0 +1,877 @@
+#!/usr/bin/env python3
+
+""" Tests for preparing measure markets and savings """
+
+# Import code to be tested
+from scout import ecm_prep
+from scout.ecm_prep_args import ecm_args
+
+# Import needed packages
+import unittest
+import copy
+import json
+import pickle
+import shutil
+import tempfile
+import numpy
+from collections import OrderedDict
+from pathlib import Path
+from unittest import mock
+
+
+class CommonTestData(object):
+    """Sample baseline data and measure definitions for tests.
+
+    Note:
+        The baseline data cover residential lighting in a single EMM region
+        and building type, which is sufficient to finalize the markets of
+        a lighting measure restricted to that region and building type.
+
+    Attributes:
+        BASE_DIR (Path): Base directory.
+        OPTS (object): Default user-specified execution options.
+        HANDYFILES (object): Input files of use across Measure methods.
+        HANDYVARS (object): Global variables of use across Measure methods.
+        CONVERT_DATA (dict): Measure cost unit conversion data.
+        MEAS_DEF (dict): Sample lighting measure definition.
+    """
+
+    BASE_DIR = Path.cwd()
+    OPTS = ecm_args([])
+    HANDYFILES = ecm_prep.UsefulInputFiles(OPTS)
+    HANDYVARS = ecm_prep.UsefulVars(BASE_DIR, HANDYFILES, OPTS)
+    CONVERT_DATA = ecm_prep.Utils.load_json(HANDYFILES.cost_convert_in)
+    with open(BASE_DIR / "ecm_definitions" /
+              "(R) Best Residential LED Lighting.json", "r") as handle:
+        MEAS_DEF = dict(
+            json.load(handle), climate_zone="TRE",
+            bldg_type="single family home")
+
+    @classmethod
+    def sample_handyvars(cls):
+        """Copy the global variables for use in a single test.
+
+        Returns:
+            Copy of the global variables, with shared variables read-only.
+        """
+        # Copies of read-only shared data are modifiable; freeze them again
+        handyvars = copy.deepcopy(cls.HANDYVARS)
+        handyvars.freeze()
+        return handyvars
+
+    @classmethod
+    def year_vals(cls, val, growth=0):
+        """Generate values for each year in the modeling time horizon.
+
+        Args:
+            val (float): Value in the first year.
+            growth (float): Change in value each year, relative to 'val'.
+
+        Returns:
+            Dict of values by year.
+        """
+        return {yr: val * (1 + growth * ind) for ind, yr in
+                enumerate(cls.HANDYVARS.aeo_years)}
+
+    @classmethod
+    def sample_msegs(cls):
+        """Generate baseline stock/energy and cost/performance/lifetime data.
+
+        Returns:
+            Baseline microsegment stock and energy use, and baseline
+            technology cost, performance, and lifetime.
+        """
+        techs = {"general service (CFL)": 60,
+                 "general service (incandescent)": 15,
+                 "general service (LED)": 90}
+        msegs = {"TRE": {"single family home": {
+            "total homes": cls.year_vals(1e6, 0.01),
+            "new homes": cls.year_vals(1e4),
+            "total square footage": cls.year_vals(2e9, 0.01),
+            "electricity": {"lighting": {
+                tech: {"stock": cls.year_vals(1e6 * (ind + 1), 0.02),
+                       "energy": cls.year_vals(1e12 * (ind + 1), -0.01)}
+                for ind, tech in enumerate(techs)}}}}}
+        msegs_cpl = {"TRE": {"single family home": {"electricity": {
+            "lighting": {tech: {
+                "installed cost": {
+                    "typical": cls.year_vals(2 + ind),
+                    "units": "2013$/unit", "source": "sample"},
+                "performance": {
+                    "typical": cls.year_vals(perf), "units": "lm/W",
+                    "source": "sample"},
+                "lifetime": {
+                    "average": cls.year_vals(5 + 3 * ind),
+                    "range": cls.year_vals(1), "units": "years",
+                    "source": "sample"},
+                "consumer choice": {"competed market share": {
+                    "model type": "logistic regression",
+                    "parameters": {
+                        "b1": cls.year_vals(-0.003),
+                        "b2": cls.year_vals(-0.012),
+                        "typical": {"b1": cls.year_vals(-0.003),
+                                    "b2": cls.year_vals(-0.012)}},
+                    "source": "sample"}}}
+                for ind, (tech, perf) in enumerate(techs.items())}}}}}
+        return msegs, msegs_cpl
+
+    @classmethod
+    def sample_measures(cls):
+        """Generate sample measure definitions.
+
+        Returns:
+            List of measure definitions, the last of which is invalid.
+        """
+        meas_defs = [copy.deepcopy(cls.MEAS_DEF) for n in range(4)]
+        meas_defs[1].update({
+            "name": "sample measure 2", "energy_efficiency": 120,
+            "installed_cost": 3, "product_lifetime": 15})
+        meas_defs[2].update({
+            "name": "sample measure 3", "market_entry_year": 2030,
+            "diffusion": {"bass_model_p": 0.03, "bass_model_q": 0.4}})
+        # Measure with performance units inconsistent with the baseline
+        meas_defs[3].update({
+            "name": "sample measure 4", "energy_efficiency_units": "kWh/yr"})
+        return meas_defs
+
+
+class PrepareMeasuresTest(unittest.TestCase, CommonTestData):
+    """Test the preparation of measures in serial and in worker processes.
+
+    Verify that finalized measure markets are the same when measures are
+    prepared across worker processes as when prepared in serial, and that
+    measures that cannot be prepared are skipped in both cases.
+    """
+
+    def prepare(self, workers):
+        """Prepare the sample measures with a given number of workers.
+
+        Args:
+            workers (int): Number of worker processes to use.
+
+        Returns:
+            Prepared Measure objects and the global variables they share.
+        """
+        opts = copy.deepcopy(self.OPTS)
+        opts.workers = workers
+        handyvars = self.sample_handyvars()
+        msegs, msegs_cpl = self.sample_msegs()
+        meas_objs = ecm_prep.prepare_measures(
+            self.sample_measures(), self.CONVERT_DATA, msegs, msegs_cpl,
+            handyvars, self.HANDYFILES, None, None, self.BASE_DIR, opts, [],
+            None)
+        return meas_objs, handyvars
+
+    def test_parallel_matches_serial(self):
+        """Test for the same outputs from serial and parallel preparation."""
+        meas_serial, handyvars_serial = self.prepare(1)
+        meas_parallel, handyvars_parallel = self.prepare(2)
+        self.assertEqual(handyvars_serial.skipped_ecms, ["sample measure 4"])
+        self.assertEqual(handyvars_parallel.skipped_ecms,
+                         handyvars_serial.skipped_ecms)
+        self.assertEqual([m.name for m in meas_parallel],
+                         [m.name for m in meas_serial])
+        for m_serial, m_parallel in zip(meas_serial, meas_parallel):
+            self.assertEqual(m_parallel.markets, m_serial.markets)
+            self.assertEqual(m_parallel.eff_fs_splt, m_serial.eff_fs_splt)
+            # Global variables are re-attached to measures returned by workers
+            self.assertIs(m_parallel.handyvars.shared, handyvars_parallel)
+
+
+class ECMPrepCacheTest(unittest.TestCase, CommonTestData):
+    """Test the cache of prepared individual measure data.
+
+    Verify that cached data are restored for an unchanged measure, and that
+    changes to the measure definition, results-relevant user options, or
+    input file contents lead to the measure being prepared again.
+
+    Attributes:
+        handyfiles (object): Input files, with the cache folder and cost
+            conversion data redirected to a temporary folder.
+        cached (dict): Sample prepared measure data.
+    """
+
+    def setUp(self):
+        """Define objects/variables for use across all class functions."""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.handyfiles = copy.copy(self.HANDYFILES)
+        self.handyfiles.ecm_prep_cache = Path(tmp_dir.name) / "cache"
+        self.handyfiles.cost_convert_in = Path(tmp_dir.name) / "convert.json"
+        shutil.copy(self.HANDYFILES.cost_convert_in,
+                    self.handyfiles.cost_convert_in)
+        self.cached = {
+            "compete": {"Technical potential": {"stock": 1}},
+            "summary": {"name": self.MEAS_DEF["name"], "markets": {}},
+            "shapes": None, "eff_fs_splt": {"Technical potential": {}}}
+
+    def cache_lookup(self, meas_def=None, opts=None, ctrb_ms_pkg_prep=()):
+        """Look up the sample measure in a newly instantiated cache.
+
+        Args:
+            meas_def (dict): Measure definition; defaults to the sample.
+            opts (object): User options; defaults to the default options.
+            ctrb_ms_pkg_prep (list): Names of measures that contribute to pkgs.
+
+        Returns:
+            Cache object, measure definitions that require preparation, and
+            cached measure data.
+        """
+        cache = ecm_prep.ECMPrepCache(
+            self.handyfiles, self.HANDYVARS, opts or self.OPTS)
+        meas_toprep, meas_cached = cache.restore(
+            [meas_def or self.MEAS_DEF], list(ctrb_ms_pkg_prep),
+            self.handyfiles)
+        return cache, meas_toprep, meas_cached
+
+    def test_hit_miss(self):
+        """Test for restoring cached data only for unchanged measures."""
+        # Nothing is cached initially
+        cache, meas_toprep, meas_cached = self.cache_lookup()
+        self.assertEqual((meas_toprep, meas_cached), ([self.MEAS_DEF], []))
+        cache.store(**self.cached)
+        cache.save()
+        # Unchanged measure (including under options that do not bear on
+        # results) is restored from the cache
+        opts = copy.deepcopy(self.OPTS)
+        opts.workers, opts.verbose = 4, True
+        for opts_chk in [None, opts]:
+            meas_toprep, meas_cached = self.cache_lookup(opts=opts_chk)[1:]
+            self.assertEqual((meas_toprep, meas_cached), ([], [self.cached]))
+        # Measures that contribute to packages are always prepared
+        self.assertEqual(self.cache_lookup(
+            ctrb_ms_pkg_prep=[self.MEAS_DEF["name"]])[1], [self.MEAS_DEF])
+        # Changes to the measure definition or to results-relevant options
+        # lead to the measure being prepared again
+        meas_def = dict(self.MEAS_DEF, energy_efficiency=100)
+        self.assertEqual(
+            self.cache_lookup(meas_def=meas_def)[1:], ([meas_def], []))
+        opts = copy.deepcopy(self.OPTS)
+        opts.site_energy = True
+        self.assertEqual(self.cache_lookup(opts=opts)[2], [])
+        # Unreadable cache entries are handled as cache misses
+        with open(next(cache.cache_dir.glob("*.pkl.gz")), "wb") as handle:
+            handle.write(b"not a cache entry")
+        self.assertEqual(self.cache_lookup()[2], [])
+
+    def test_input_change(self):
+        """Test for invalidation of cached data when input files change."""
+        cache = self.cache_lookup()[0]
+        cache.store(**self.cached)
+        cache.save()
+        # Input file checksums are reused while file size and modification
+        # time are unchanged
+        f_key = str(self.handyfiles.cost_convert_in.resolve())
+        with open(cache.file_hashes_path, "r") as handle:
+            self.assertIn(f_key, json.load(handle))
+        self.assertEqual(self.cache_lookup()[2], [self.cached])
+        # Changed input file contents lead to the measure being prepared again
+        with open(self.handyfiles.cost_convert_in, "a") as handle:
+            handle.write("\n")
+        cache, meas_toprep, meas_cached = self.cache_lookup()
+        self.assertEqual((meas_toprep, meas_cached), ([self.MEAS_DEF], []))
+        with open(cache.file_hashes_path, "r") as handle:
+            self.assertNotEqual(cache.file_hashes[f_key][2],
+                                json.load(handle)[f_key][2])
+
+    def test_code_change(self):
+        """Test for invalidation of cached data when prep code changes."""
+        # Write a module standing in for one that measure prep draws on
+        code_file = Path(self.handyfiles.ecm_prep_cache.parent) / "sample_mod.py"
+        code_file.write_text("VALUE = 1\n")
+        sample_mod = mock.Mock(__file__=str(code_file))
+        with mock.patch.dict("sys.modules", {"sample_mod": sample_mod}), \
+                mock.patch.object(ecm_prep.ECMPrepCache, "code_modules",
+                                  ecm_prep.ECMPrepCache.code_modules + ["sample_mod"]):
+            cache = self.cache_lookup()[0]
+            cache.store(**self.cached)
+            cache.save()
+            self.assertEqual(self.cache_lookup()[2], [self.cached])
+            # Changed module code leads to the measure being prepared again
+            code_file.write_text("VALUE = 2\n")
+            self.assertEqual(self.cache_lookup()[2], [])
+
+    def test_remove_stale(self):
+        """Test for removal of data cached under previous keys."""
+        cache = self.cache_lookup()[0]
+        cache.store(**self.cached)
+        # Data for other measures are kept
+        other_def = dict(self.MEAS_DEF, name="Other measure")
+        cache.restore([other_def], [], self.handyfiles)
+        cache.store(**dict(self.cached, summary={
+            "name": "Other measure", "markets": {}}))
+        self.assertEqual(len(list(cache.cache_dir.glob("*.pkl.gz"))), 2)
+        old_file = cache.cache_path(self.MEAS_DEF["name"])
+        # Data cached for a measure's previous definition are removed once
+        # the measure is cached again
+        meas_def = dict(self.MEAS_DEF, energy_efficiency=100)
+        cache = self.cache_lookup(meas_def=meas_def)[0]
+        cache.store(**self.cached)
+        self.assertFalse(old_file.exists())
+        self.assertTrue(cache.cache_path(self.MEAS_DEF["name"]).exists())
+        self.assertEqual(len(list(cache.cache_dir.glob("*.pkl.gz"))), 2)
+
+
+class TSVFactorCacheTest(unittest.TestCase, CommonTestData):
+    """Test the cache of time-sensitive valuation factors.
+
+    Verify that cached factors are retrieved only for the key they were
+    stored under and as copies, that least recently used factors are
+    discarded once the cache is full, that data checksums reflect content
+    rather than order or identity, and that lookups in worker processes are
+    counted in the parent process.
+
+    Attributes:
+        cache (object): Sample cache with room for two factor entries.
+        fracs (dict): Sample annual re-weighting factors.
+        shapes (dict): Sample hourly load shapes.
+    """
+
+    def setUp(self):
+        """Define objects/variables for use across all class functions."""
+        self.cache = ecm_prep.TSVFactorCache(maxsize=2)
+        self.fracs = {"energy": {"baseline": 1, "efficient": 0.8},
+                      "cost": {"baseline": {"2026": 1.1},
+                               "efficient": {"2026": 0.9}}}
+        self.shapes = {"baseline": [0.5, 0.5], "efficient": [0.4, 0.4]}
+
+    def test_keying(self):
+        """Test for cached factors retrieved by key as copies."""
+        key = ("TRE", "residential", "single family home", "lighting")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, self.fracs, self.shapes, ())
+        self.assertIsNone(self.cache.get(key[:-1] + ("heating",)))
+        fracs, shapes = self.cache.get(key)
+        self.assertEqual((fracs, shapes), (self.fracs, self.shapes))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+        # Changes to retrieved or stored factors do not change the cache
+        fracs["energy"]["efficient"] = 0
+        shapes["efficient"][0] = 0
+        self.fracs["cost"]["efficient"]["2026"] = 0
+        self.assertEqual(self.cache.get(key)[0]["energy"]["efficient"], 0.8)
+        self.assertEqual(self.cache.get(key)[0]["cost"]["efficient"], {
+            "2026": 0.9})
+        self.assertEqual(self.cache.get(key)[1]["efficient"], [0.4, 0.4])
+        # Factors without load shapes are cached as such
+        self.cache.put("no shapes", self.fracs, None, ())
+        self.assertIsNone(self.cache.get("no shapes")[1])
+        # Clearing the cache discards factors and resets counts
+        self.cache.scaling["prices"] = ({}, {})
+        self.cache.clear()
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+        self.assertEqual(len(self.cache.factors), 0)
+        self.assertEqual(self.cache.scaling, {})
+
+    def test_eviction(self):
+        """Test for discarding the least recently used factors."""
+        refs = numpy.ones(8760)
+        for key in ["a", "b"]:
+            self.cache.put(key, self.fracs, None, (refs,))
+        # Retrieving factors makes them the most recently used
+        self.cache.get("a")
+        self.cache.put("c", self.fracs, None, (refs,))
+        self.assertEqual(list(self.cache.factors.keys()), ["a", "c"])
+        self.assertIsNone(self.cache.get("b"))
+        # Storing factors again under a key also makes them the most recent
+        self.cache.put("a", self.fracs, None, (refs,))
+        self.cache.put("d", self.fracs, None, (refs,))
+        self.assertEqual(list(self.cache.factors.keys()), ["a", "d"])
+        # Cached data referenced by identity in keys are kept with entries
+        self.assertIs(self.cache.factors["a"][0][0], refs)
+
+    def test_digest(self):
+        """Test for checksums that reflect data content."""
+        digest = ecm_prep.TSVFactorCache.digest
+        features = {"shed": {"start_hour": 13, "stop_hour": 19,
+                             "relative energy change fraction": 0.3},
+                    "shape": {"custom_daily_savings": numpy.zeros(24)}}
+        reordered = {"shape": {"custom_daily_savings": numpy.zeros(24)},
+                     "shed": {"relative energy change fraction": 0.3,
+                              "stop_hour": 19, "start_hour": 13}}
+        self.assertEqual(digest(features), digest(reordered))
+        for changed in [
+                dict(features, shed=dict(features["shed"], stop_hour=20)),
+                dict(features, shape={"custom_daily_savings": numpy.full(
+                    24, 0.1)}),
+                dict(features, shape={"custom_daily_savings": numpy.zeros(
+                    (2, 12))}),
+                dict(features, shape={"custom_daily_savings": [0] * 24}),
+                None]:
+            self.assertNotEqual(digest(changed), digest(features))
+        # Lists and tuples with the same content are not distinguished
+        self.assertEqual(digest([1, "2"]), digest((1, "2")))
+        self.assertNotEqual(digest(["1", 2]), digest([1, "2"]))
+
+    def test_worker_counts(self):
+        """Test for counting lookups in workers in the parent process."""
+        msegs, msegs_cpl = self.sample_msegs()
+
+        def lookup(meas, *args):
+            # Look up factors for each measure twice, caching them on the
+            # first (missed) lookup
+            for n in range(2):
+                if ecm_prep.tsv_factor_cache.get(meas.name) is None:
+                    ecm_prep.tsv_factor_cache.put(
+                        meas.name, self.fracs, None, ())
+
+        counts = []
+        for workers in [1, 2]:
+            opts = copy.deepcopy(self.OPTS)
+            opts.workers = workers
+            with mock.patch.object(ecm_prep.Measure, "fill_mkts",
+                                   autospec=True, side_effect=lookup):
+                with self.assertLogs(ecm_prep.logger, "INFO") as cm:
+                    ecm_prep.prepare_measures(
+                        self.sample_measures()[:3], self.CONVERT_DATA, msegs,
+                        msegs_cpl, self.sample_handyvars(), self.HANDYFILES,
+                        None, None, self.BASE_DIR, opts, [], None)
+            counts.append((ecm_prep.tsv_factor_cache.hits,
+                           ecm_prep.tsv_factor_cache.misses))
+            self.assertIn("Time-sensitive valuation factors reused 3 times, "
+                          "calculated 3 times", "\n".join(cm.output))
+        self.assertEqual(counts, [(3, 3), (3, 3)])
+
+
+class DiffusionTest(unittest.TestCase, CommonTestData):
+    """Test the diffusion of measures into their markets.
+
+    Verify the fractions of a measure's market reached by diffusion for each
+    form of diffusion input, that these fractions are found once per measure
+    rather than for each microsegment partitioned, and that the partitioned
+    markets of measures with diffusion inputs are unchanged from those found
+    when fractions were recalculated for each microsegment.
+
+    Attributes:
+        meas_attrs (dict): Sample measure diffusion inputs and other
+            attributes.
+        ok_out (dict): Measure stock and efficient energy in the partitioned
+            markets of the sample measures, by adoption scenario and year.
+    """
+
+    meas_attrs = {
+        "bass": {
+            "market_entry_year": 2030,
+            "diffusion": {"bass_model_p": 0.03, "bass_model_q": 0.4}},
+        "fractions": {
+            "diffusion": {"fraction_2030": 0.2, "fraction_2040": 0.6,
+                          "fraction_2050": 0.9}}}
+    ok_out = {
+        "bass": {
+            "Technical potential": {
+                "stock": [0.0, 1570354.2380388328, 7420934.550264282,
+                          8875805.789180884],
+                "energy": [0.0, 1284158420882.6309, 3596357376408.6,
+                           3144158401482.435]},
+            "Max adoption potential": {
+                "stock": [0.0, 38150.295910329034, 1281277.6616824453,
+                          3089708.6406396534],
+                "energy": [0.0, 2932588091988.8916, 7488477845373.475,
+                           5798327156347.838]}},
+        "fractions": {
+            "Technical potential": {
+                "stock": [1200000.0178813934, 1296000.019311905,
+                          4608000.183105469, 7991999.788284302],
+                "energy": [1189404276716.3103, 1059805041403.8362,
+                           2233143997801.914, 2831079664858.1143]},
+            "Max adoption potential": {
+                "stock": [29887.500445358455, 153482.009764128,
+                          860547.0866918251, 2255904.3636314576],
+                "energy": [2715194384218.1816, 2284684812286.3423,
+                           4449283824311.204, 5168856993477.911]}}}
+
+    def measure(self, diffusion=None, **kwargs):
+        """Initialize the sample measure with given diffusion inputs.
+
+        Args:
+            diffusion (dict): Diffusion inputs (None if not given).
+            **kwargs: Other measure attributes to set.
+
+        Returns:
+            Sample Measure object.
+        """
+        meas_def = dict(copy.deepcopy(self.MEAS_DEF), **kwargs)
+        if diffusion is not None:
+            meas_def["diffusion"] = diffusion
+        return ecm_prep.Measure(
+            self.BASE_DIR, self.sample_handyvars(), self.HANDYFILES,
+            vars(self.OPTS), **meas_def)
+
+    def test_diffuse_fracs(self):
+        """Test for diffusion fractions by year for each type of input."""
+        years = self.HANDYVARS.aeo_years
+        # Bass diffusion model
+        warn_list = []
+        fracs = self.measure(**self.meas_attrs["bass"]).find_diffuse_fracs(
+            warn_list)
+        self.assertEqual(list(fracs.keys()), years)
+        p, q = 0.03, 0.4
+        for ind, yr in enumerate(years):
+            self.assertAlmostEqual(fracs[yr], (1 - numpy.exp(-(p + q) * ind)) /
+                                   (1 + (q / p) * numpy.exp(-(p + q) * ind)))
+        self.assertEqual(warn_list, [])
+        # Fractions for given years, interpolated between those years and
+        # extended to the first year
+        fracs = self.measure(
+            **self.meas_attrs["fractions"]).find_diffuse_fracs(warn_list)
+        numpy.testing.assert_allclose(
+            [fracs[yr] for yr in ["2026", "2030", "2035", "2040", "2045",
+                                  "2050"]],
+            [0.2, 0.2, 0.4, 0.6, 0.75, 0.9], rtol=1e-6)
+        self.assertEqual(len(warn_list), 1)
+        # Fractions outside of zero to one are limited to that range
+        warn_list = []
+        fracs = self.measure({"fraction_2030": 1.5, "fraction_2040": -0.1}
+                             ).find_diffuse_fracs(warn_list)
+        self.assertEqual([fracs[yr] for yr in ["2030", "2035", "2040", "2050"]],
+                         [1, 0.5, 0, 0])
+        self.assertEqual(len(warn_list), 3)
+        # No or invalid diffusion inputs give full diffusion in all years
+        for diffusion, n_warn in [
+                (None, 0), ({"bass_model_p": "x", "bass_model_q": 0.4}, 1),
+                ({"fraction_2030": "x"}, 1), ({"other": 1}, 1)]:
+            warn_list = []
+            fracs = self.measure(diffusion).find_diffuse_fracs(warn_list)
+            self.assertEqual(fracs, {yr: 1 for yr in years})
+            self.assertEqual(len(warn_list), n_warn)
+
+    def test_partitioned_markets(self):
+        """Test for fractions found once and unchanged partitioned markets."""
+        msegs, msegs_cpl = self.sample_msegs()
+        opts = copy.deepcopy(self.OPTS)
+        for name, meas_attrs in self.meas_attrs.items():
+            with self.subTest(diffusion=name):
+                meas = self.measure(name="sample measure " + name,
+                                    **meas_attrs)
+                with mock.patch.object(
+                        ecm_prep.Measure, "find_diffuse_fracs", autospec=True,
+                        side_effect=ecm_prep.Measure.find_diffuse_fracs) as \
+                        find_fracs, mock.patch.object(
+                            ecm_prep.Measure, "partition_microsegment",
+                            autospec=True, side_effect=ecm_prep.Measure.
+                            partition_microsegment) as partition:
+                    meas.fill_mkts(msegs, msegs_cpl, self.CONVERT_DATA, None,
+                                   opts, [], None)
+                self.assertEqual(find_fracs.call_count, 1)
+                # Three technologies in new and existing homes, each in two
+                # adoption scenarios
+                self.assertEqual(partition.call_count, 12)
+                for adopt_scheme, ok_vals in self.ok_out[name].items():
+                    mseg = meas.markets[adopt_scheme]["master_mseg"]
+                    for var, vals in [
+                            ("stock", mseg["stock"]["total"]["measure"]),
+                            ("energy", mseg["energy"]["total"]["efficient"])]:
+                        numpy.testing.assert_allclose(
+                            [vals[yr] for yr in ["2026", "2030", "2040",
+                                                 "2050"]],
+                            ok_vals[var], rtol=1e-12)
+
+
+class SharedDataTest(unittest.TestCase, CommonTestData):
+    """Test the read-only global variables shared across measures.
+
+    Verify that shared data are frozen at all levels, that in-place updates
+    of shared data raise an error that measure preparation does not handle
+    as an input data issue, that copies of shared data are modifiable, and
+    that measures see per-measure copies of the variables they update.
+
+    Attributes:
+        data (OrderedDict): Sample shared data.
+    """
+
+    def setUp(self):
+        """Define objects/variables for use across all class functions."""
+        self.data = OrderedDict([
+            ("years", ["2026", "2027"]),
+            ("shapes", [{"2026": 1.0}, numpy.arange(3.0)]),
+            ("nested", {"hourly": numpy.ones(4), "units": "MMBtu"})])
+
+    def test_freeze(self):
+        """Test for read-only dicts and arrays at all levels of the data."""
+        frozen = ecm_prep.ReadOnlyDict.freeze(self.data)
+        self.assertIsInstance(frozen, ecm_prep.ReadOnlyDict)
+        self.assertIs(frozen.thaw_type, OrderedDict)
+        self.assertEqual(frozen, self.data)
+        self.assertIsInstance(frozen["years"], list)
+        self.assertIsInstance(frozen["shapes"][0], ecm_prep.ReadOnlyDict)
+        self.assertIsInstance(frozen["nested"], ecm_prep.ReadOnlyDict)
+        self.assertIs(frozen["nested"].thaw_type, dict)
+        for arr in [frozen["shapes"][1], frozen["nested"]["hourly"]]:
+            with self.assertRaises(ValueError):
+                arr[0] = 5
+        # Freezing frozen data returns the data unchanged
+        self.assertIs(ecm_prep.ReadOnlyDict.freeze(frozen), frozen)
+
+    def test_blocked_mutators(self):
+        """Test for errors on each way of modifying a read-only dict."""
+        frozen = ecm_prep.ReadOnlyDict.freeze(self.data)
+        for mutate in [
+                lambda d: d.__setitem__("years", []),
+                lambda d: d.__delitem__("years"),
+                lambda d: d.__ior__({"years": []}),
+                lambda d: d.clear(), lambda d: d.pop("years"),
+                lambda d: d.popitem(), lambda d: d.setdefault("new", 1),
+                lambda d: d.update(years=[])]:
+            for d in [frozen, frozen["nested"], frozen["shapes"][0]]:
+                with self.assertRaises(ecm_prep.SharedDataError) as cm:
+                    mutate(d)
+                # The error is not one that measure preparation handles as
+                # missing or malformed data
+                self.assertNotIsInstance(
+                    cm.exception, (TypeError, KeyError, ValueError))
+        self.assertEqual(frozen, self.data)
+
+    def test_copies(self):
+        """Test for modifiable copies of the original dict types."""
+        frozen = ecm_prep.ReadOnlyDict.freeze(self.data)
+        for thawed in [copy.deepcopy(frozen),
+                       pickle.loads(pickle.dumps(frozen, -1))]:
+            self.assertIs(type(thawed), OrderedDict)
+            self.assertIs(type(thawed["nested"]), dict)
+            self.assertIs(type(thawed["shapes"][0]), dict)
+            self.assertEqual(list(thawed.keys()), list(self.data.keys()))
+            thawed["nested"]["units"] = "kWh"
+            thawed["years"].append("2028")
+            self.assertEqual(frozen["nested"]["units"], "MMBtu")
+            self.assertEqual(frozen["years"], ["2026", "2027"])
+        self.assertIs(type(copy.copy(frozen)), OrderedDict)
+
+    def test_measure_vars(self):
+        """Test for per-measure copies of updated variables only."""
+        handyvars = self.sample_handyvars()
+        meas_vars = ecm_prep.MeasureVars(handyvars)
+        # Variables updated by measures are copied; all others are shared
+        meas_vars.save_shp_warn.append("warning")
+        self.assertEqual(handyvars.save_shp_warn, [])
+        self.assertIs(meas_vars.aeo_years, handyvars.aeo_years)
+        self.assertIsInstance(
+            meas_vars.cap_facts, ecm_prep.ReadOnlyDict)
+        with self.assertRaises(ecm_prep.SharedDataError):
+            meas_vars.cap_facts["data"] = {}
+        # Copies share the global variables but not the per-measure ones
+        meas_vars_copy = copy.deepcopy(meas_vars)
+        self.assertIs(meas_vars_copy.shared, handyvars)
+        self.assertIsNot(
+            meas_vars_copy.save_shp_warn, meas_vars.save_shp_warn)
+        self.assertEqual(meas_vars_copy.save_shp_warn, ["warning"])
+        # Pickled views omit the global variables until re-attached
+        meas_vars_pkl = pickle.loads(pickle.dumps(meas_vars, -1))
+        self.assertEqual(meas_vars_pkl.save_shp_warn, ["warning"])
+        with self.assertRaises(AttributeError):
+            meas_vars_pkl.aeo_years
+        meas_vars_pkl.shared = handyvars
+        self.assertIs(meas_vars_pkl.aeo_years, handyvars.aeo_years)
+
+    def test_error_raised_from_preparation(self):
+        """Test that measure preparation does not skip shared data errors."""
+        msegs, msegs_cpl = self.sample_msegs()
+
+        def modify_shared(meas):
+            meas.handyvars.cap_facts["data"] = {}
+
+        # Check both serial preparation and preparation in worker processes
+        for workers in [1, 2]:
+            handyvars = self.sample_handyvars()
+            opts = copy.deepcopy(self.OPTS)
+            opts.workers = workers
+            with mock.patch.object(ecm_prep.Measure, "check_meas_inputs",
+                                   autospec=True, side_effect=modify_shared):
+                with self.assertRaises(ecm_prep.SharedDataError):
+                    ecm_prep.prepare_measures(
+                        self.sample_measures()[:2], self.CONVERT_DATA, msegs,
+                        msegs_cpl, handyvars, self.HANDYFILES, None, None,
+                        self.BASE_DIR, opts, [], None)
+            self.assertEqual(handyvars.skipped_ecms, [])
+
+
+class TimeSensitiveValuationTest(unittest.TestCase, CommonTestData):
+    """Test the application of time-sensitive valuation features.
+
+    Verify that the energy, cost, and emissions scaling factors and the
+    sector-level load shapes that result from applying shed, shift, and
+    custom daily shape features (alone and in combination) and from
+    restricting outputs to a time-sensitive metric period match those
+    calculated hour by hour from the same baseline load shape.
+
+    Attributes:
+        meas (object): Sample measure.
+        base_load (numpy.ndarray): Sample 8760 baseline load shape.
+        cost_fact (dict): Sample 8760 price scaling factors by year.
+        carb_fact (dict): Sample 8760 emissions scaling factors by year.
+        yr_map (dict): Mapping of 8760 data years -> AEO years.
+        mskeys (tuple): Sample microsegment information.
+        features (dict): Sample time-sensitive valuation features.
+    """
+
+    def setUp(self):
+        """Define objects/variables for use across all class functions."""
+        self.meas = ecm_prep.Measure(
+            self.BASE_DIR, self.sample_handyvars(), self.HANDYFILES,
+            vars(self.OPTS), **self.MEAS_DEF)
+        rng = numpy.random.default_rng(0)
+        self.base_load = rng.random(8760)
+        self.base_load = self.base_load / self.base_load.sum()
+        self.cost_fact = {"2026": 0.59 + 0.41 * rng.random(8760)}
+        self.carb_fact = {"2026": rng.random(8760)}
+        self.yr_map = {"2026": self.HANDYVARS.aeo_years}
+        self.mskeys = ("primary", "TRE", "single family home",
+                       "electricity", "lighting", "general service (LED)",
+                       "existing")
+        self.features = {
+            "shed": {
+                "shed": {"start_day": 152, "stop_day": 243,
+                         "start_hour": 13, "stop_hour": 19,
+                         "relative energy change fraction": 0.3}},
+            "shift": {
+                "shift": {"start_day": 100, "stop_day": 200,
+                          "offset_hrs_earlier": 2}},
+            "shift window": {
+                "shift": {"start_day": [1, 300], "stop_day": [60, 365],
+                          "start_hour": 16, "stop_hour": 20,
+                          "offset_hrs_earlier": 3,
+                          "relative energy change fraction": 0.5}},
+            "shift window overnight": {
+                "shift": {"start_day": 1, "stop_day": 365,
+                          "start_hour": 22, "stop_hour": 3,
+                          "offset_hrs_earlier": 4,
+                          "relative energy change fraction": 0.25}},
+            "shape": {
+                "shape": {"start_day": 32, "stop_day": 90,
+                          "custom_daily_savings": list(
+                              numpy.linspace(0, 0.46, 24))}},
+            "shed and shape": {
+                "shed": {"start_day": 1, "stop_day": 365,
+                         "start_hour": 8, "stop_hour": 12,
+                         "relative energy change fraction": 0.1},
+                "shape": {"custom_daily_savings": [0.2] * 24}}}
+
+    def scalar_eff_load(self, features):
+        """Apply time-sensitive valuation features one hour at a time.
+
+        Args:
+            features (dict): Time-sensitive valuation features.
+
+        Returns:
+            List of 8760 efficient load values.
+        """
+        base = list(self.base_load)
+        eff = list(base)
+        for a in sorted(features.keys()):
+            feat = features[a]
+            start_dy, stop_dy = [feat.get(x, 0) for x in [
+                "start_day", "stop_day"]] if "start_day" in feat else [1, 365]
+            if isinstance(start_dy, list):
+                days = [d for s, e in zip(start_dy, stop_dy)
+                        for d in range(s - 1, e)]
+            else:
+                days = list(range(start_dy - 1, stop_dy))
+            if "start_hour" not in feat:
+                hrs = list(range(24))
+            elif feat["start_hour"] <= feat["stop_hour"]:
+                hrs = list(range(feat["start_hour"] - 1, feat["stop_hour"]))
+            else:
+                hrs = list(range(0, feat["stop_hour"])) + list(
+                    range(feat["start_hour"], 24))
+            rel = feat.get("relative energy change fraction", 0)
+            new = list(eff)
+            for i in range(8760):
+                x, y = divmod(i, 24)
+                if "shed" in a:
+                    if x in days and y in hrs:
+                        new[i] = base[i] * (1 - rel)
+                elif "shift" in a:
+                    off = feat["offset_hrs_earlier"]
+                    # Shifts past the end of the year draw on the same day
+                    if i + off <= 8759 and x in days:
+                        shifted = base[i + off]
+                    else:
+                        shifted = base[(y + off) - 24]
+                    if len(hrs) == 24:
+                        new[i] = shifted
+                        continue
+                    to_hrs = [(h - off) % 24 for h in range(
+                        min(hrs), max(hrs) + 1)]
+                    if y in to_hrs and x in days:
+                        new[i] = base[i] * (1 - rel * (y in hrs)) + \
+                            shifted * rel
+                    elif y in hrs and x in days:
+                        new[i] = eff[i] * (1 - rel)
+                elif x in days:
+                    new[i] = base[i] * (1 - feat["custom_daily_savings"][y])
+            eff = new
+        return eff
+
+    def apply_tsv(self, features, opts):
+        """Apply time-sensitive valuation features to the sample measure.
+
+        Args:
+            features (dict): Time-sensitive valuation features.
+            opts (object): User-specified execution options.
+
+        Returns:
+            Energy, cost, and emissions scaling factors and sector-level
+            load shapes.
+        """
+        self.meas.tsv_features = features
+        load_fact = {"lighting": {
+            "represented building types": "all",
+            "load shape": list(self.base_load)}}
+        return self.meas.apply_tsv(
+            load_fact, [], {"single family home": 1}, self.cost_fact,
+            self.carb_fact, self.mskeys, "residential", "lighting", opts,
+            self.yr_map, self.yr_map)
+
+    def test_features(self):
+        """Test for factors and load shapes matching hourly calculations."""
+        opts = copy.deepcopy(self.OPTS)
+        opts.sect_shapes = True
+        for name, features in self.features.items():
+            with self.subTest(features=name):
+                fracs, shapes = self.apply_tsv(features, opts)
+                eff = numpy.array(self.scalar_eff_load(features))
+                # Check that the features change the load shape
+                self.assertFalse(numpy.allclose(eff, self.base_load))
+                numpy.testing.assert_allclose(
+                    shapes["baseline"], self.base_load)
+                numpy.testing.assert_allclose(shapes["efficient"], eff)
+                self.assertAlmostEqual(fracs["energy"]["baseline"], 1)
+                self.assertAlmostEqual(
+                    fracs["energy"]["efficient"], eff.sum())
+                for yr in self.HANDYVARS.aeo_years:
+                    for key, fact in [("cost", self.cost_fact["2026"]),
+                                      ("carbon", self.carb_fact["2026"])]:
+                        self.assertAlmostEqual(
+                            fracs[key]["baseline"][yr],
+                            sum(self.base_load * fact))
+                        self.assertAlmostEqual(
+                            fracs[key]["efficient"][yr], sum(eff * fact))
+
+    def test_metrics(self):
+        """Test for factors restricted to a time-sensitive metric period."""
+        opts = copy.deepcopy(self.OPTS)
+        # Energy use summed over summer peak hours on all days
+        opts.tsv_metrics = ["1", "2", "1", "1", "1"]
+        days = list(range(152, 244))
+        hrs = [15, 16, 17, 18]
+        self.meas.handyvars.tsv_metrics_data = {
+            "season days": {"all": {"summer": days}},
+            "system load hours": {"summer": {"2050": {
+                "TRE": {"peak range": hrs}}}}}
+        features = self.features["shed"]
+        fracs, shapes = self.apply_tsv(features, opts)
+        self.assertIsNone(shapes)
+        eff = self.scalar_eff_load(features)
+        # Hours of the year are numbered from one in the metrics data
+        in_period = [i for i in range(8760) if (
+            (i // 24) + 1 in days and (i % 24) + 1 in hrs)]
+        self.assertAlmostEqual(
+            fracs["energy"]["baseline"],
+            sum(self.base_load[i] for i in in_period))
+        self.assertAlmostEqual(
+            fracs["energy"]["efficient"], sum(eff[i] for i in in_period))
+        self.assertAlmostEqual(
+            fracs["cost"]["efficient"]["2030"],
+            sum(eff[i] * self.cost_fact["2026"][i] for i in in_period))
+
+
+if __name__ == "__main__":
+    unittest.main()
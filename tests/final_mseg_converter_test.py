@@ -14,6 +14,13 @@ import unittest
 import numpy as np
 import copy
 import itertools
+import argparse
+import gzip
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
 
 
 class CommonUnitTest(unittest.TestCase):
@@ -2894,6 +2901,35 @@ class ToClimateZoneConversionTest(CommonUnitTest):
         dict2 = self.test_cpl_output_emm
         self.dict_check(dict1, dict2)
 
+    # Compare the converted dicts to those found by adding the contribution
+    # of each census division to each region in turn with merge_sum, for
+    # each type of data and conversion array
+    def test_conversion_matches_merge_sum(self):
+        for input_dict, res_array, com_array, data_in, reg_list in [
+                (self.test_energy_stock_input, self.res_cd_cz_array,
+                 self.com_cd_cz_array, self.user_input_nrgstk, self.aia_list),
+                (self.test_energy_stock_input, self.res_cd_cz_array_fuelsplit,
+                 self.com_cd_cz_array_fuelsplit, self.user_input_nrgstk,
+                 self.emm_list),
+                (self.test_cpl_input, self.res_cd_cz_wtavg_array_fuelsplit,
+                 self.com_cd_cz_wtavg_array_fuelsplit, self.user_input_cpl,
+                 self.emm_list)]:
+            dict1 = fmc.clim_converter(
+                input_dict, res_array, com_array, data_in,
+                self.flag_map_dat, reg_list, self.cdiv_list, ak_hi_res=None)
+            first_cd = list(input_dict.keys())[0]
+            for reg_name in reg_list:
+                dict2 = copy.deepcopy(input_dict[first_cd])
+                for cdiv_ind, cdiv_name in enumerate(self.cdiv_list):
+                    if cdiv_name not in input_dict:
+                        continue
+                    dict2 = fmc.merge_sum(
+                        dict2, copy.deepcopy(input_dict[cdiv_name]),
+                        cdiv_ind, reg_name, res_array, com_array,
+                        data_in == '2', self.flag_map_dat,
+                        cdiv_name == first_cd, None)
+                self.assertEqual(dict1[reg_name], dict2)
+
 
 class EnvelopeDataUnitTest(CommonUnitTest):
     """ Set up a CommonUnitTest subclass with additional data to be
@@ -4030,6 +4066,72 @@ class CostUnitsConversionTest(EnvelopeDataUnitTest):
                                    self.cost_convert_data)
 
 
+class BatchModeTest(unittest.TestCase):
+    """Test the conversion and writing of several targets in batch mode."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Define census division inputs for all census divisions."""
+        cdiv_list = ToClimateZoneConversionTest.cdiv_list
+
+        def all_cdivs(data):
+            keys = list(data.keys())
+            return {cd: copy.deepcopy(data[keys[ind % len(keys)]])
+                    for ind, cd in enumerate(cdiv_list)}
+        cls.msegs_in = all_cdivs(
+            ToClimateZoneConversionTest.test_energy_stock_input)
+        cls.cpl_in = all_cdivs(ToClimateZoneConversionTest.test_cpl_input)
+
+    def setUp(self):
+        """Write the inputs to and run the conversions in a temp. folder."""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_path = Path(tmp_dir.name)
+        for name, data in [("mseg_res_com_cdiv.json", self.msegs_in),
+                           ("cpl_res_com_cdiv.json", self.cpl_in)]:
+            with open(self.tmp_path / name, "w") as handle:
+                json.dump(data, handle)
+        patch = mock.patch.object(fmc.fp, "INPUTS", self.tmp_path)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp_path)
+
+    def test_parse_target(self):
+        self.assertEqual(fmc.parse_target("EMM:energy"), ('1', '2'))
+        self.assertEqual(fmc.parse_target("state:cpl"), ('2', '3'))
+        opts = fmc.parse_args(["-t", "AIA:stock", "emm:cpl", "-w", "2"])
+        self.assertEqual(opts.targets, [('1', '1'), ('2', '2')])
+        self.assertEqual(opts.workers, 2)
+        for target in ["EMM", "cdiv:energy", "AIA:cost"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                fmc.parse_target(target)
+
+    def test_batch_convert(self):
+        # Duplicate targets are converted once, and census division inputs
+        # are not modified across targets
+        files_out = fmc.batch_convert(
+            [('1', '1'), ('2', '3'), ('2', '1'), ('1', '1')], workers=1)
+        self.assertEqual(files_out, [
+            "mseg_res_com_cz.json", "cpl_res_com_cdiv.gz", "cpl_res_com_cz.gz"])
+        for input_var, json_in, file_out in [
+                (['1', '1', 0, 0], self.msegs_in, "mseg_res_com_cz.json"),
+                (['2', '3', 0, 0], self.cpl_in, "cpl_res_com_cdiv.gz"),
+                (['2', '1', 0, 0], self.cpl_in, "cpl_res_com_cz.gz")]:
+            if file_out.endswith(".gz"):
+                handle = gzip.open(self.tmp_path / file_out, "rt")
+            else:
+                handle = open(self.tmp_path / file_out, "r")
+            with handle:
+                self.assertEqual(json.load(handle), fmc.convert_target(
+                    input_var, copy.deepcopy(json_in))[0])
+        # The indented JSON file is also written for gzipped outputs if
+        # desired
+        files_out = fmc.batch_convert([('2', '3')], compressed_only=False)
+        self.assertEqual(files_out,
+                         ["cpl_res_com_cdiv.json", "cpl_res_com_cdiv.gz"])
+
+
 # Offer external code execution (include all lines below this point in all
 # test files)
 def main():
@@ -1,10 +1,12 @@
 import pandas as pd
 import argparse
+import gzip
 import json
 import re
 from pathlib import Path
 import logging
 from scout.config import LogConfig
+from scout.results_table import ResultsTable
 LogConfig.configure_logging()
 logger = logging.getLogger(__name__)
 
@@ -15,9 +17,43 @@ class ScoutCompare():
         summary report files (Summary_Data-TP.xlsx, Summary_Data-MAP.xlsx)
     """
 
+    @staticmethod
+    def find_results_json(directory: Path, name: str):
+        """Find a results json file, which may be gzipped with '.gz' appended to its name
+            (see the 'results_format' option of run.py)
+
+        Args:
+            directory (Path): directory containing the results json file
+            name (str): name of the uncompressed results json file (e.g., agg_results.json)
+
+        Returns:
+            Path: filepath of the uncompressed json file if it exists, otherwise of the
+                gzipped json file if it exists, otherwise of the uncompressed json file
+        """
+        file_path = directory / name
+        gz_path = directory / f"{name}.gz"
+        if not file_path.exists() and gz_path.exists():
+            return gz_path
+        return file_path
+
+    @staticmethod
+    def json_stem(file_path: Path):
+        """Find the name of a (possibly gzipped) json file without its suffixes
+
+        Args:
+            file_path (Path): filepath of json file
+
+        Returns:
+            str: file name without the '.json' and '.gz' suffixes
+        """
+        name = file_path.name
+        for suffix in [".gz", ".json"]:
+            name = name.removesuffix(suffix)
+        return name
+
     @staticmethod
     def load_json(file_path: Path):
-        """Load json file as dictionary
+        """Load json file as dictionary, reading gzipped json files ('.gz' suffix) as such
 
         Args:
             file_path (Path): filepath of json file
@@ -25,6 +61,9 @@ class ScoutCompare():
         Returns:
             dict: json as a dictionary
         """
+        if file_path.suffix == ".gz":
+            with gzip.open(file_path, 'rt') as file:
+                return json.load(file)
         with open(file_path, 'r') as file:
             return json.load(file)
 
@@ -217,11 +256,67 @@ class ScoutCompare():
         key_diffs = self.compare_dict_keys(json1, json2, [json1_path, json2_path])
         if output_dir is None:
             output_dir = json2_path.parent
-        self.write_dict_key_report(key_diffs, output_dir / f"{json2_path.stem}_key_diffs.csv")
+        json2_stem = self.json_stem(json2_path)
+        self.write_dict_key_report(key_diffs, output_dir / f"{json2_stem}_key_diffs.csv")
 
         # Compare differences in json values
         val_diffs = self.compare_dict_values(json1, json2, percent_threshold=percent_threshold)
-        self.write_dict_value_report(val_diffs, output_dir / f"{json2_path.stem}_value_diffs.csv")
+        self.write_dict_value_report(val_diffs, output_dir / f"{json2_stem}_value_diffs.csv")
+
+    def compare_tables(self,
+                       table1_path: Path,
+                       table2_path: Path,
+                       percent_threshold: float,
+                       output_dir: Path = None):
+        """Compare two columnar results tables and report differences in rows and in values
+
+        Args:
+            table1_path (Path): baseline results table directory to compare
+            table2_path (Path): new results table directory to compare
+            percent_threshold (float): threshold for reporting percent difference if values
+            output_dir (Path, optional): output directory where comparison reports are saved.
+                                         Defaults to None.
+        """
+        key_cols = ResultsTable.name_cols + [ResultsTable.year_col]
+        tables = [ResultsTable(pth).load() for pth in [table1_path, table2_path]]
+        for table in tables:
+            table[ResultsTable.name_cols] = table[ResultsTable.name_cols].astype(object)
+        merged = tables[0].merge(tables[1], how="outer", on=key_cols, suffixes=(" base", " new"),
+                                 indicator=True)
+        if output_dir is None:
+            output_dir = table2_path.parent
+
+        # Compare differences in the results (other than years) found in each table
+        key_diffs = merged.loc[merged["_merge"] != "both", ResultsTable.name_cols + ["_merge"]]
+        key_diffs = key_diffs.drop_duplicates(subset=ResultsTable.name_cols)
+        key_diffs.insert(0, "Results file", key_diffs.pop("_merge").map({
+            "left_only": table1_path.as_posix(), "right_only": table2_path.as_posix()}))
+        self.write_dict_key_report(key_diffs.reset_index(drop=True),
+                                   output_dir / f"{table2_path.name}_key_diffs.csv")
+
+        # Compare differences in values for the results found in both tables, applying the same
+        # thresholds as for results jsons
+        abs_threshold_map = {"USD": 1000, "MMBtu": 1000, "MMTons": 10}
+        both = merged.loc[merged["_merge"] == "both"].drop(columns="_merge")
+        val1, val2 = both["value base"], both["value new"]
+        percent_change = ((val2 - val1) / val1.where(val1 != 0)) * 100
+        percent_change = percent_change.where(
+            val1 != 0, (val2 != 0).map({True: float("inf"), False: 0}))
+        abs_threshold = both["metric"].map(lambda metric: next(
+            (thres for unit, thres in abs_threshold_map.items() if unit in metric),
+            float("inf")))
+        report = both.loc[(percent_change.abs() >= percent_threshold) & (
+            (val1.abs() >= abs_threshold) | (val2.abs() >= abs_threshold))].copy()
+        output_path = output_dir / f"{table2_path.name}_value_diffs.csv"
+        if report.empty:
+            logger.info(f"No changes above the threshold found, {output_path} not written")
+            return
+        report["Percent difference"] = percent_change[report.index].round(2)
+        report["Base value"] = report.pop("value base").round(2)
+        report["New value"] = report.pop("value new").round(2)
+        report = report.dropna(axis=1, how="all")
+        report.to_csv(output_path, index=False)
+        logger.info(f"Wrote table value report to {output_path}")
 
     def compare_summary_reports(self,
                                 report1_path: Path,
@@ -252,6 +347,10 @@ def main():
     parser = argparse.ArgumentParser(description="Compare results files for Scout.")
     parser.add_argument("--json-baseline", type=Path, help="Path to the baseline JSON file")
     parser.add_argument("--json-new", type=Path, help="Path to the new JSON file")
+    parser.add_argument("--table-baseline", type=Path,
+                        help="Path to the baseline columnar results table directory")
+    parser.add_argument("--table-new", type=Path,
+                        help="Path to the new columnar results table directory")
     parser.add_argument("--summary-baseline", type=Path,
                         help="Path to the baseline summary report (Excel file)")
     parser.add_argument("--summary-new", type=Path,
@@ -267,18 +366,27 @@ def main():
         # Compare all files
         base_dir = args.base_dir.resolve()
         new_dir = args.new_dir.resolve()
-        agg_json_base = base_dir / "agg_results.json"
-        agg_json_new = new_dir / "agg_results.json"
+        agg_json_base = compare.find_results_json(base_dir, "agg_results.json")
+        agg_json_new = compare.find_results_json(new_dir, "agg_results.json")
         compare.compare_jsons(agg_json_base,
                               agg_json_new,
                               percent_threshold=args.threshold,
                               output_dir=new_dir)
-        ecm_json_base = base_dir / "ecm_results.json"
-        ecm_json_new = new_dir / "ecm_results.json"
+        ecm_json_base = compare.find_results_json(base_dir, "ecm_results.json")
+        ecm_json_new = compare.find_results_json(new_dir, "ecm_results.json")
         compare.compare_jsons(ecm_json_base,
                               ecm_json_new,
                               percent_threshold=args.threshold,
                               output_dir=new_dir)
+        # Additionally compare individual measure markets and savings through their columnar
+        # tables, if written for both runs
+        ecm_table_base = base_dir / "ecm_results_table"
+        ecm_table_new = new_dir / "ecm_results_table"
+        if ecm_table_base.exists() and ecm_table_new.exists():
+            compare.compare_tables(ecm_table_base,
+                                   ecm_table_new,
+                                   percent_threshold=args.threshold,
+                                   output_dir=new_dir)
 
         summary_tp_base = base_dir / "Summary_Data-TP.xlsx"
         summary_tp_new = new_dir / "plots" / "tech_potential" / "Summary_Data-TP.xlsx"
@@ -292,6 +400,10 @@ def main():
             compare.compare_jsons(args.json_baseline,
                                   args.json_new,
                                   percent_threshold=args.threshold)
+        if args.table_baseline and args.table_new:
+            compare.compare_tables(args.table_baseline,
+                                   args.table_new,
+                                   percent_threshold=args.threshold)
         if args.summary_baseline and args.summary_new:
             compare.compare_summary_reports(args.summary_baseline, args.summary_new)
 
@@ -0,0 +1,75 @@
+import unittest
+import gzip
+import json
+import tempfile
+from pathlib import Path
+import numpy
+from scout.json_writer import dump_json
+
+
+class TestDumpJSON(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp_path = Path(self.tmp_dir.name)
+        self.data = {
+            "ECM 1": {
+                "Markets and Savings (Overall)": {
+                    "Technical potential": {
+                        "Energy Savings (MMBtu)": {
+                            "2020": 1.123456789, "2021": 2}}},
+                "CO₂ Cost Savings (USD)": [0.123456789, None]},
+            "ECM 2": {},
+            2020: True}
+
+    def test_indented(self):
+        # Test output text matches that of json.dump with the same indentation
+        for data in [self.data, [self.data, {}, [1, 2]], {}, []]:
+            for indent in [2, 4]:
+                fpath = self.tmp_path / "results.json"
+                dump_json(data, fpath, indent=indent)
+                self.assertEqual(
+                    fpath.read_text(), json.dumps(data, indent=indent))
+
+    def test_compact_gzip(self):
+        # Test compact and gzipped outputs hold the same data
+        fpath = self.tmp_path / "results.json"
+        dump_json(self.data, fpath, indent=None)
+        self.assertNotIn("\n", fpath.read_text())
+        self.assertEqual(json.loads(fpath.read_text()),
+                         json.loads(json.dumps(self.data)))
+        fpath = self.tmp_path / "results.json.gz"
+        dump_json(self.data, fpath, indent=None, compress=True)
+        with gzip.open(fpath, "rt") as handle:
+            self.assertEqual(json.load(handle),
+                             json.loads(json.dumps(self.data)))
+
+    def test_precision(self):
+        # Test float values in dicts are rounded as the data are written
+        fpath = self.tmp_path / "results.json"
+        dump_json(self.data, fpath, precision=6)
+        saved = json.loads(fpath.read_text())
+        self.assertEqual(saved["ECM 1"]["Markets and Savings (Overall)"][
+            "Technical potential"]["Energy Savings (MMBtu)"],
+            {"2020": 1.123457, "2021": 2})
+        # Values in lists are not rounded
+        self.assertEqual(saved["ECM 1"]["CO₂ Cost Savings (USD)"],
+                         [0.123456789, None])
+
+    def test_encoder(self):
+        # Test an encoder class is used for values JSON cannot serialize
+        class ArrayEncoder(json.JSONEncoder):
+            def default(self, obj):
+                if isinstance(obj, numpy.ndarray):
+                    return obj.tolist()
+                return super().default(obj)
+        fpath = self.tmp_path / "results.json"
+        dump_json([{"a": numpy.array([1.5, 2])}], fpath, cls=ArrayEncoder)
+        self.assertEqual(json.loads(fpath.read_text()), [{"a": [1.5, 2]}])
+        with self.assertRaises(TypeError):
+            dump_json([{"a": numpy.array([1.5, 2])}], fpath)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import copy
+import gzip
+import json
+import pickle
+import tempfile
+from pathlib import Path
+from scout.mapped_json import MappedJSON, MappedDict, MappedLeaf
+
+
+class TestMappedJSON(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp_path = Path(self.tmp_dir.name)
+        self.mapped_json = MappedJSON(self.tmp_path / "mapped_inputs")
+        self.data = {
+            "AIA_CZ1": {
+                "single family home": {
+                    "total homes": {"2020": 100, "2021": 105},
+                    "electricity": {
+                        "heating": {
+                            "stock": {"2020": 1.5, "2021": 2},
+                            "energy": {"2020": 3.25, "2021": 3.5}},
+                        "lighting": {"stock": "NA", "energy": {}}}}},
+            "load shape": [0.1, 0.2, 0.3],
+            "years": [{"2020": 1}],
+            "units": "MMBtu",
+            "missing": {"2020": None, "2021": 1.0}}
+
+    def write_json(self, name, data, zipped=False):
+        fpath = self.tmp_path / name
+        if zipped:
+            with gzip.GzipFile(fpath, "w") as zip_ref:
+                zip_ref.write(json.dumps(data).encode("utf-8"))
+        else:
+            with open(fpath, "w") as handle:
+                json.dump(data, handle)
+        return fpath
+
+    def test_round_trip(self):
+        # Test compiled copies of plain and gzipped files match the source data
+        for name, zipped in [("msegs.json", False), ("msegs.gz", True)]:
+            fpath = self.write_json(name, self.data, zipped)
+            for n in range(2):  # First load compiles, second reads the copy
+                loaded = self.mapped_json.load(fpath)
+                self.assertIsInstance(loaded, MappedDict)
+                self.assertEqual(loaded, self.data)
+                self.assertEqual(json.dumps(loaded), json.dumps(self.data))
+        # Integer and float leaf values keep their types
+        heat = loaded["AIA_CZ1"]["single family home"]["electricity"]["heating"]
+        self.assertEqual([type(x) for x in heat["stock"].values()], [float, int])
+
+    def test_lazy_leaves(self):
+        # Test leaves are only built when accessed
+        fpath = self.write_json("msegs.json", self.data)
+        self.mapped_json.load(fpath)
+        loaded = self.mapped_json.load(fpath)
+        homes = loaded["AIA_CZ1"]["single family home"]
+        self.assertIsInstance(dict.__getitem__(homes, "total homes"), MappedLeaf)
+        self.assertEqual(homes["total homes"], {"2020": 100, "2021": 105})
+        self.assertIsInstance(dict.__getitem__(homes, "total homes"), dict)
+
+    def test_copies(self):
+        # Test pickled and deep copied data match the source data
+        fpath = self.write_json("msegs.json", self.data)
+        loaded = self.mapped_json.load(fpath)
+        self.assertEqual(pickle.loads(pickle.dumps(loaded)), self.data)
+        self.assertEqual(copy.deepcopy(loaded), self.data)
+
+    def test_recompile(self):
+        # Test a changed source file is compiled again
+        fpath = self.write_json("msegs.json", self.data)
+        self.mapped_json.load(fpath)
+        new_data = {"AIA_CZ2": {"total homes": {"2020": 1, "2021": 2, "2022": 3}}}
+        fpath = self.write_json("msegs.json", new_data)
+        self.assertEqual(self.mapped_json.load(fpath), new_data)
+
+    def test_remove_stale(self):
+        # Test the copy of a changed source file replaces the previous copy,
+        # while copies of other files (including files of the same name in
+        # other folders) are kept
+        store_dir = self.mapped_json.store_dir
+        fpath = self.write_json("msegs.json", self.data)
+        other_dir = self.tmp_path / "other"
+        other_dir.mkdir()
+        other_fpath = other_dir / "msegs.json"
+        other_fpath.write_text(json.dumps({"units": "kWh"}))
+        for f in [fpath, other_fpath, self.write_json("msegs.gz", self.data, True)]:
+            self.mapped_json.load(f)
+        old_copy = self.mapped_json.copy_dir(fpath)
+        new_data = {"AIA_CZ2": {"total homes": {"2020": 1, "2021": 2, "2022": 3}}}
+        fpath = self.write_json("msegs.json", new_data)
+        new_copy = self.mapped_json.copy_dir(fpath)
+        self.assertNotEqual(new_copy, old_copy)
+        self.assertEqual(self.mapped_json.load(fpath), new_data)
+        self.assertFalse(old_copy.exists())
+        self.assertEqual(sorted(x.name for x in store_dir.iterdir()), sorted(
+            self.mapped_json.copy_dir(f).name for f in [
+                fpath, other_fpath, self.tmp_path / "msegs.gz"]))
+        self.assertEqual(self.mapped_json.load(other_fpath), {"units": "kWh"})
+
+    def test_bad_json(self):
+        # Test invalid JSON raises the same error as other JSON inputs
+        fpath = self.tmp_path / "bad.json"
+        fpath.write_text("{")
+        with self.assertRaisesRegex(ValueError, "Error reading in"):
+            self.mapped_json.load(fpath)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -399,6 +399,17 @@ class NumpyArrayReductionTest(unittest.TestCase):
             # Compare square footage
             self.assertEqual(a, self.EIA_sqft_homes_out[n])
 
+    # Test that rows selected by the values of leading key columns
+    # are returned in their original order
+    def test_grouped_index_selection(self):
+        index = rm.GroupedIndex(self.EIA_nrg_stock, rm.nrg_stock_index_cols)
+        for key in [(1, 1), (2, 3, 'HT'), (9, 2, 'HT', 'GS', 'NG_RAD'),
+                    (5, 1, 'HT')]:
+            mask = np.all([self.EIA_nrg_stock[col] == val for col, val in
+                           zip(rm.nrg_stock_index_cols, key)], axis=0)
+            np.testing.assert_array_equal(
+                index.select(*key), self.EIA_nrg_stock[mask])
+
     # Test extraction of the correct value from the thermal load
     # components data
     def test_recording_of_thermal_loads_data(self):
@@ -726,6 +737,23 @@ class DataToListFormatTest(unittest.TestCase):
             # Check the contents of the output dict
             self.dict_check(a, self.ok_out[idx][0])
 
+    # Test that the same stock/energy data are generated from the
+    # stock/energy and thermal loads data when indexed in advance
+    def test_ok_filters_indexed(self):
+        nrg_stock_index = rm.GroupedIndex(
+            self.nrg_stock_array, rm.nrg_stock_index_cols)
+        loads_index = rm.GroupedIndex(
+            self.loads_array, rm.tloads_index_cols)
+        for idx, afilter in enumerate(self.ok_filters):
+            a = rm.list_generator(nrg_stock_index,
+                                  loads_index,
+                                  afilter,
+                                  self.aeo_years,
+                                  self.lt_factor_expected)
+
+            # Check the contents of the output dict
+            self.dict_check(a, self.ok_out[idx][0])
+
     # Test filters that should match but ultimately do not make sense
     def test_nonsense_filters(self):
         for idx, afilter in enumerate(self.nonsense_filters):
@@ -0,0 +1,82 @@
+import unittest
+import csv
+import json
+import tempfile
+from pathlib import Path
+from scout.profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp_path = Path(self.tmp_dir.name)
+
+    def test_records(self):
+        # Test that phases are recorded in the order they finish, with any
+        # details added to a record during its phase
+        profiler = Profiler(enabled=True)
+        with profiler.phase("prepare_measures"):
+            with profiler.phase("fill_mkts", "ECM 1") as rec:
+                sum(range(10000))
+                rec["msegs"] = 4
+            rec = profiler.start("fill_mkts", "ECM 2", 2)
+            profiler.stop(rec)
+        self.assertEqual([(r["phase"], r["measure"], r["msegs"]) for r in
+                          profiler.records], [
+            ("fill_mkts", "ECM 1", 4), ("fill_mkts", "ECM 2", 2),
+            ("prepare_measures", None, None)])
+        for rec in profiler.records:
+            self.assertEqual(set(rec.keys()), set(Profiler.fields))
+            self.assertGreaterEqual(rec["wall_s"], 0)
+            self.assertGreaterEqual(rec["cpu_s"], 0)
+        # Phases that raise errors are still recorded
+        with self.assertRaises(ValueError):
+            with profiler.phase("check_meas_inputs", "ECM 3"):
+                raise ValueError
+        self.assertEqual(profiler.records[-1]["measure"], "ECM 3")
+
+    def test_disabled(self):
+        # Test that nothing is recorded or written when profiling is disabled
+        profiler = Profiler()
+        with profiler.phase("load inputs"):
+            pass
+        profiler.add([{"phase": "fill_mkts", "measure": "ECM 1"}])
+        profiler.write(self.tmp_path / "profile")
+        self.assertEqual(profiler.records, [])
+        self.assertEqual(list(self.tmp_path.iterdir()), [])
+
+    def test_measure_totals_write(self):
+        # Test that phase times are summed by measure and written to reports
+        profiler = Profiler(enabled=True)
+        recs = [
+            {"phase": "check_meas_inputs", "measure": "ECM 1", "msegs": None,
+             "wall_s": 0.5, "cpu_s": 0.25, "peak_rss_mb": 100},
+            {"phase": "fill_mkts", "measure": "ECM 1", "msegs": 3,
+             "wall_s": 1, "cpu_s": 1, "peak_rss_mb": 120},
+            {"phase": "fill_mkts", "measure": "ECM 2", "msegs": 8,
+             "wall_s": 2, "cpu_s": 1.5, "peak_rss_mb": 150},
+            {"phase": "split_clean_data", "measure": None, "msegs": None,
+             "wall_s": 4, "cpu_s": 4, "peak_rss_mb": 150}]
+        profiler.add(recs)
+        totals = [
+            {"measure": "ECM 2", "msegs": 8, "wall_s": 2, "cpu_s": 1.5},
+            {"measure": "ECM 1", "msegs": 3, "wall_s": 1.5, "cpu_s": 1.25}]
+        self.assertEqual(profiler.measure_totals(), totals)
+        profiler.write(self.tmp_path / "profile")
+        with open(self.tmp_path / "profile.json", "r") as handle:
+            self.assertEqual(json.load(handle),
+                             {"phases": recs, "measures": totals})
+        with open(self.tmp_path / "profile.csv", "r") as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual([r["phase"] for r in rows],
+                         [r["phase"] for r in recs])
+        with open(self.tmp_path / "profile_measures.csv", "r") as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual([(r["measure"], r["msegs"]) for r in rows],
+                         [("ECM 2", "8"), ("ECM 1", "3")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import tempfile
+from pathlib import Path
+import numpy
+import pandas as pd
+from scout.results_table import ResultsTable
+
+
+class TestResultsTable(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp_path = Path(self.tmp_dir.name)
+        by_cat = {
+            "AIA_CZ1": {
+                "Residential (New)": {
+                    "Heating (Equip.)": {"2020": 1.5, "2021": 2.5}},
+                "Commercial (Existing)": {
+                    "Cooling (Equip.)": {
+                        "Electric": {"2020": 3, "2021": None},
+                        "Non-Electric": {}}}},
+            "AIA_CZ2": {
+                "Residential (New)": {
+                    "Heating (Equip.)": {"2020": 4.5, "2021": 5.5}}}}
+        self.results = {
+            "ECM 1": {
+                "Filter Variables": {"Applicable Regions": ["AIA_CZ1"]},
+                "Markets and Savings (Overall)": {
+                    "Technical potential": {
+                        "Energy Savings (MMBtu)": {"2020": 9, "2021": 8}}},
+                "Markets and Savings (by Category)": {
+                    "Technical potential": {
+                        "Energy Savings (MMBtu)": by_cat}},
+                "Financial Metrics": {}},
+            "ECM 2": {
+                "Markets and Savings (Overall)": {
+                    "Max adoption potential": {
+                        "Energy Savings (MMBtu)": {"2020": 7, "2021": 6}}},
+                "Markets and Savings (by Category)": {
+                    "Max adoption potential": {
+                        "Energy Savings (MMBtu)": {
+                            "AIA_CZ2": {"Residential (New)": {
+                                "Lighting": {"2020": 7, "2021": 6}}}}}}},
+            "On-site Generation": {"Energy (MMBtu)": {"Overall": {}}}}
+
+    def test_round_trip(self):
+        # Test that all yearly results values are written as table rows
+        ResultsTable.write(self.results, self.tmp_path / "table")
+        table = ResultsTable(self.tmp_path / "table").load()
+        self.assertEqual(len(table), 12)
+        self.assertEqual(list(table.columns), ResultsTable.name_cols + [
+            ResultsTable.year_col, ResultsTable.value_col])
+        fuel_rows = table[table["fuel"] == "Electric"]
+        self.assertEqual(fuel_rows["year"].tolist(), [2020, 2021])
+        self.assertEqual(fuel_rows["value"].iloc[0], 3)
+        self.assertTrue(numpy.isnan(fuel_rows["value"].iloc[1]))
+        overall = table[table["markets and savings type"] == "Overall"]
+        self.assertEqual(overall["value"].tolist(), [9, 8, 7, 6])
+        self.assertTrue(overall["region"].isna().all())
+        self.assertNotIn("On-site Generation", table["measure"].tolist())
+
+    def test_filters(self):
+        # Test that loading rows for a given region and measure matches
+        # filtering the full table
+        table = ResultsTable.write(self.results, self.tmp_path / "table")
+        full = table.load()
+        for filters in [{"region": "AIA_CZ2"},
+                        {"measure": "ECM 2", "region": ["AIA_CZ1", "AIA_CZ2"]},
+                        {"metric": "Energy Savings (MMBtu)", "year": "2021"},
+                        {"region": "AIA_CZ5"}]:
+            selected = table.load(filters)
+            expected = full
+            for col, names in filters.items():
+                names = [names] if isinstance(names, str) else names
+                if col == "year":
+                    names = [int(x) for x in names]
+                expected = expected[expected[col].isin(names)]
+            pd.testing.assert_frame_equal(
+                selected, expected.reset_index(drop=True))
+        with self.assertRaises(ValueError):
+            table.load({"units": "MMBtu"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@
 
 # Import code to be tested
 from scout import run
+from scout.ecm_prep import Utils
 
 # Import needed packages
 import unittest
@@ -11,6 +12,10 @@ import numpy
 import copy
 import itertools
 import numpy_financial as npf
+import gzip
+import pickle
+import tempfile
+from unittest import mock
 from pathlib import Path
 
 base_args = run.parse_args([])
@@ -334,6 +339,50 @@ class CommonMethods(object):
                         "Tested values " + str(i) + " and " + str(i2) +
                         " are not of the same type")
 
+    def truncate_cost_arrays(self, measures, bldg_sect, years, n_samp):
+        """Copy measures, truncating their unit cost arrays in given years.
+
+        Args:
+            measures (list): Measure objects to copy.
+            bldg_sect (string): Building sector of the unit costs to truncate.
+            years (list): Years in which to truncate the unit cost arrays.
+            n_samp (int): Number of samples to keep in each array.
+
+        Returns:
+            List of copied measure objects.
+        """
+        measures = copy.deepcopy(measures)
+        for m in measures:
+            for cost_type in ["stock cost", "energy cost"]:
+                costs = m.financial_metrics["unit cost"][cost_type][bldg_sect]
+                for yr in years:
+                    if isinstance(costs[yr], numpy.ndarray):
+                        costs[yr] = costs[yr][:n_samp]
+        return measures
+
+    def compete_mkt_fracs(self, engine, compete_func, measures, mseg_key,
+                          adopt_scheme):
+        """Find the market shares set by a primary competition routine.
+
+        Notes:
+            The market shares are not applied to the measures' markets.
+
+        Args:
+            engine (object): Analysis engine to run the competition with.
+            compete_func (string): Name of the primary competition routine.
+            measures (list): Competing measure objects.
+            mseg_key (string): Competed market microsegment key chain.
+            adopt_scheme (string): Consumer adoption scheme.
+
+        Returns:
+            List of market share dicts (by year) for each competing measure.
+        """
+        with mock.patch.object(engine, "find_added_sbmkt_fracs") as \
+                sbmkt_fracs, mock.patch.object(engine, "compete_adj"):
+            sbmkt_fracs.return_value = [None] * len(measures)
+            getattr(engine, compete_func)(measures, mseg_key, adopt_scheme)
+        return sbmkt_fracs.call_args[0][0]
+
 
 class TestMeasureInit(unittest.TestCase, Constants):
     """Ensure that measure attributes are correctly initiated.
@@ -360,9 +409,9 @@ class TestMeasureInit(unittest.TestCase, Constants):
 
 
 class OutputBreakoutDictWalkTest(unittest.TestCase, CommonMethods, Constants):
-    """Test operation of 'out_break_walk' function.
+    """Test operation of 'out_break_array' and related functions.
 
-    Verify that function properly applies a climate zone/building
+    Verify that functions properly apply a climate zone/building
     type/end use partition to a total energy or carbon
     market/savings value.
 
@@ -418,12 +467,33 @@ class OutputBreakoutDictWalkTest(unittest.TestCase, CommonMethods, Constants):
 
     def test_ok(self):
         """Test for correct function output given valid inputs."""
-        dict1 = self.a_run.out_break_walk(
-            self.ok_partitions, self.ok_total, self.focus_yrs_test,
-            divide=False)
+        struct, paths, row_yrs, vals = self.a_run.out_break_array(
+            self.ok_partitions, self.focus_yrs_test)
+        dict1 = self.a_run.out_break_dict(
+            struct, row_yrs, vals * numpy.array([
+                self.ok_total.get(yr, 0) for yr in self.focus_yrs_test]),
+            self.focus_yrs_test)
         dict2 = self.ok_out
         self.dict_check(dict1, dict2)
 
+    def test_ok_divide(self):
+        """Test for correct function output when normalizing by totals."""
+        struct, paths, row_yrs, vals = self.a_run.out_break_array(
+            self.ok_out, self.focus_yrs_test)
+        # Set a zero total in one year; fractions should be zero in that year
+        totals = dict(self.ok_total, **{"2010": 0})
+        dict1 = self.a_run.out_break_dict(
+            struct, row_yrs, self.a_run.out_break_div(
+                vals, {yr: totals.get(yr, 0) for yr in self.focus_yrs_test},
+                self.focus_yrs_test), self.focus_yrs_test)
+        dict2 = {
+            cz: {bldg: {eu: {"2009": frac, "2010": 0} for eu, frac in [
+                ("Heating", self.ok_partitions[cz][bldg]["Heating"]["2009"]),
+                ("Cooling", self.ok_partitions[cz][bldg]["Cooling"]["2009"])]}
+                for bldg in ["Residential", "Commercial"]}
+            for cz in ["AIA CZ1", "AIA CZ2"]}
+        self.dict_check(dict1, dict2)
+
 
 class PrioritizationMetricsTest(unittest.TestCase, CommonMethods, Constants):
     """Test the operation of the 'calc_savings_metrics' function.
@@ -1446,8 +1516,10 @@ class MetricUpdateTest(unittest.TestCase, CommonMethods, Constants):
         """Define objects/variables for use across all class functions."""
 
         cls.handyvars = run.UsefulVars(Constants.HANDYFILES)
-        sample_measure = CommonTestMeasures().sample_measure4
-        cls.measure_list = [run.Measure(cls.handyvars, **sample_measure)]
+        sample_measures = CommonTestMeasures()
+        cls.measure_list = [run.Measure(cls.handyvars, **x) for x in [
+            sample_measures.sample_measure4, sample_measures.sample_measure3,
+            sample_measures.sample_measure5]]
         cls.ok_base_life = 3
         cls.ok_product_lifetime = 6.2
         cls.ok_life_ratio = 2
@@ -1463,6 +1535,20 @@ class MetricUpdateTest(unittest.TestCase, CommonMethods, Constants):
 
         cls.ok_out_array = [2, 0.5, 1, None, None, None, 0.62, 1.59,
                             2, 0.67, 0.005, -0.13, 7.7e-10, -9.2e-9]
+        # Measure index, baseline life, measure life, baseline stock cost,
+        # stock cost delta, energy savings, energy cost savings, carbon
+        # savings, carbon cost savings, and measure stock, energy, and
+        # carbon costs for several cases, which cover residential and
+        # commercial measures, lighting measures with avoided baseline
+        # purchases, measure lifetimes of less than 1 year, and cash flows
+        # with no sign change or more than one sign change
+        cls.ok_batch_cases = [
+            [0, 3, 6, 1, -1, 7.5, 0.5, 50, 1, 2, 0.5, 1],
+            [0, 2, 9, 5, 10, 2, -1, 1, 0, 12, 3, 1],
+            [1, 10, 15, 20, 30, 3, 4, 0.5, 0.2, 40, 6, 2],
+            [2, 1, 0, 1, 2, 0, 0, 0, 0, 2, 0, 0],
+            [1, 5, 5, 3, -2, -1, -0.5, -2, -0.1, 1, 1, 1],
+            [2, 4, 12, 6, 8, 1, 1.5, 2, 0.1, 9, 2, 0.5]]
 
     def test_metric_updates(self):
         """Test for correct outputs given valid inputs."""
@@ -1486,6 +1572,108 @@ class MetricUpdateTest(unittest.TestCase, CommonMethods, Constants):
             else:
                 self.assertEqual(function_output[ind], x)
 
+    def test_metric_updates_batch(self):
+        """Test batch outputs against outputs for each case on its own."""
+        # Create an Engine instance using sample_measure list
+        engine_instance = run.Engine(
+            self.handyvars, base_args, self.measure_list, energy_out=[
+                "fossil_equivalent", "NA", "NA", "NA", "NA"], brkout="basic")
+        cases = [[self.measure_list[x[0]]] + x[1:] for x in
+                 self.ok_batch_cases]
+        batch_output = engine_instance.metric_update_batch(*zip(*cases))
+        self.assertEqual(len(batch_output), len(cases))
+        for case, case_batch_output in zip(cases, batch_output):
+            with self.subTest(case=case[1:]):
+                case_output = engine_instance.metric_update(*case)
+                for x, y in zip(case_batch_output, case_output):
+                    if isinstance(y, dict):
+                        self.dict_check(x, y)
+                    elif y is not None:
+                        self.assertAlmostEqual(x, y, places=10)
+                    else:
+                        self.assertEqual(x, y)
+                # Test the capital + energy cost IRR against a direct
+                # calculation on the unpadded cash flows for the case
+                m, life_base, life_meas, scost_base, scost_meas_delt, \
+                    ecostsave = [case[x] for x in [0, 1, 2, 3, 4, 6]]
+                gain = ("lighting" in m.end_use["primary"]) and (
+                    life_meas > life_base)
+                cashflows = [scost_meas_delt] + [ecostsave + (
+                    scost_base if (gain and yr < life_meas and
+                                   yr % life_base == 0) else 0)
+                    for yr in range(1, max(life_meas, 1) + 1)]
+                irr_ok = npf.irr(cashflows)
+                if not numpy.isfinite(irr_ok):
+                    irr_ok = 999
+                self.assertAlmostEqual(case_batch_output[6], irr_ok, places=8)
+
+
+class IrrBatchTest(unittest.TestCase, Constants):
+    """Test the operation of the 'irr_batch' function.
+
+    Verify that internal rates of return for a set of cash flows match
+    those from 'numpy_financial.irr', and that 'numpy_financial.irr' is
+    only used for cash flows that Newton iteration does not solve.
+
+    Attributes:
+        handyvars (object): Useful variables across the class.
+        measure_list (list): List for Engine including one sample
+            residential measure.
+        ok_cashflows (list): Set of sample input cash flows.
+        ok_out (list): Outputs that should be generated for each
+            set of sample cash flows.
+        ok_fallback (list): Indices of the sample cash flows that should
+            be passed to 'numpy_financial.irr'.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Define objects/variables for use across all class functions."""
+
+        cls.handyvars = run.UsefulVars(Constants.HANDYFILES)
+        sample_measure = CommonTestMeasures().sample_measure
+        cls.measure_list = [run.Measure(cls.handyvars, **sample_measure)]
+        # Cash flows with one sign change (solved by Newton iteration),
+        # more than one sign change (with and without a real rate of
+        # return), one sign change but overflowing polynomial values (not
+        # bracketed for Newton iteration), and no sign change
+        cls.ok_cashflows = [
+            [-10, 3, 3, 3, 3, 3], [-100, 0, 1], [-10, 0, 0, 0, 0, 0, 0, 20],
+            [-1, 6, -11, 6], [10, -1, -1, 4, -1, -1], [1, -1, 1],
+            [-1e300, 2e300], [2, 1, 1], [-2, -1, -1], [0, 0, 0]]
+        cls.ok_out = [0.1524, -0.9, 0.1041, 0, -0.4358, 999, 1, 999, 999,
+                      999]
+        cls.ok_fallback = [3, 4, 5, 6]
+
+    def test_cashflow_irrs_batch(self):
+        """Test for correct outputs given valid inputs as one array."""
+        # Create an Engine instance using sample_measure list
+        engine_instance = run.Engine(
+            self.handyvars, base_args, self.measure_list, energy_out=[
+                "fossil_equivalent", "NA", "NA", "NA", "NA"], brkout="basic")
+        # Pad the sample cash flows into a single array, noting the lifetime
+        # (number of cash flows after the initial investment) of each
+        life_meas = numpy.array([len(cf) - 1 for cf in self.ok_cashflows])
+        cashflows = numpy.zeros((len(self.ok_cashflows), max(life_meas) + 1))
+        for idx, cf in enumerate(self.ok_cashflows):
+            cashflows[idx, :len(cf)] = cf
+        with mock.patch.object(run.npf, "irr", wraps=npf.irr) as npf_irr:
+            irrs = engine_instance.irr_batch(cashflows, life_meas)
+        # Test that only the expected cash flows are passed (unpadded) to
+        # numpy_financial
+        self.assertEqual(len(npf_irr.call_args_list), len(self.ok_fallback))
+        for call, idx in zip(npf_irr.call_args_list, self.ok_fallback):
+            numpy.testing.assert_array_equal(
+                call.args[0], self.ok_cashflows[idx])
+        # Test that valid input cashflows yield correct output IRR values,
+        # which match those from numpy_financial where it finds a rate
+        for idx, (irr, ok_out) in enumerate(zip(irrs, self.ok_out)):
+            with self.subTest(cashflows=self.ok_cashflows[idx]):
+                self.assertAlmostEqual(irr, ok_out, places=4)
+                irr_npf = npf.irr(self.ok_cashflows[idx])
+                if numpy.isfinite(irr_npf):
+                    self.assertAlmostEqual(irr, irr_npf, places=10)
+
 
 class PaybackTest(unittest.TestCase, Constants):
     """Test the operation of the 'payback' function.
@@ -1523,6 +1711,76 @@ class PaybackTest(unittest.TestCase, Constants):
             self.assertAlmostEqual(engine_instance.payback(cf),
                                    self.ok_out[idx], places=2)
 
+    def test_cashflow_paybacks_batch(self):
+        """Test for correct outputs given valid inputs as one array."""
+        # Pad the sample cash flows into a single array, noting the lifetime
+        # (number of cash flows after the initial investment) of each
+        life_meas = numpy.array([len(cf) - 1 for cf in self.ok_cashflows])
+        cashflows = numpy.zeros((len(self.ok_cashflows), max(life_meas) + 1))
+        for idx, cf in enumerate(self.ok_cashflows):
+            cashflows[idx, :len(cf)] = cf
+        # Test that valid input cashflows yield correct output payback values
+        for payback, ok_out in zip(run.Engine.payback_batch(
+                cashflows, life_meas), self.ok_out):
+            self.assertAlmostEqual(payback, ok_out, places=2)
+
+
+class CompDataLoadTest(unittest.TestCase):
+    """Test the loading and copying of ECM competition data.
+
+    Verify that competition data are loaded from gzipped or uncompressed
+    pickle files, and that post-competition copies of contributing
+    microsegment data are independent of the uncompeted data.
+
+    Attributes:
+        comp_data (dict): Sample competition data.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Define objects/variables for use across all class functions."""
+
+        cls.comp_data = {
+            "Technical potential": {
+                "contributing mseg keys and values": {
+                    "key 1": {"stock": {"2009": 10, "2010": 20}},
+                    "key 2": {"stock": {"2009": 30, "2010": 40}}}}}
+
+    def test_load_formats(self):
+        """Test for correct outputs given each file format."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            folder = Path(tmp_dir)
+            with gzip.open(folder / "ECM 1.pkl.gz", "wb") as zp:
+                pickle.dump(self.comp_data, zp, -1)
+            with open(folder / "ECM 2.pkl", "wb") as fp:
+                pickle.dump(self.comp_data, fp, -1)
+            for name in ["ECM 1", "ECM 2"]:
+                self.assertEqual(Utils.load_comp_data(folder, name),
+                                 self.comp_data)
+            with self.assertRaises(FileNotFoundError):
+                Utils.load_comp_data(folder, "ECM 3")
+            # Data written in one format replace data in the other format
+            Utils.dump_comp_data(
+                {"updated": True}, folder, "ECM 1", "pickle")
+            self.assertEqual([x.name for x in folder.glob("ECM 1*")],
+                             ["ECM 1.pkl"])
+            self.assertEqual(Utils.load_comp_data(folder, "ECM 1"),
+                             {"updated": True})
+
+    def test_copy_on_access(self):
+        """Test that accessed data are copied and other data are shared."""
+        uncompeted = copy.deepcopy(self.comp_data["Technical potential"][
+            "contributing mseg keys and values"])
+        competed = run.CopyOnAccessDict(uncompeted)
+        self.assertIs(dict.__getitem__(competed, "key 2"), uncompeted["key 2"])
+        competed["key 1"]["stock"]["2009"] = 0
+        self.assertEqual(uncompeted["key 1"]["stock"]["2009"], 10)
+        self.assertEqual(competed["key 1"]["stock"]["2009"], 0)
+        self.assertEqual(dict(competed), {
+            "key 1": {"stock": {"2009": 0, "2010": 20}},
+            "key 2": {"stock": {"2009": 30, "2010": 40}}})
+        self.assertIsNot(dict.__getitem__(competed, "key 2"), uncompeted["key 2"])
+
 
 class ResCompeteTest(unittest.TestCase, CommonMethods, Constants):
     """Test 'compete_res_primary,' and 'htcl_adj'.
@@ -16093,6 +16351,113 @@ class ResCompeteTest(unittest.TestCase, CommonMethods, Constants):
                 self.a_run_dist.measures[ind].markets[self.test_adopt_scheme][
                     "competed"]["master_mseg"])
 
+    def test_compete_res_dist_mixed(self):
+        """Test outcomes given array inputs w/ sample sizes that vary by year."""
+        # Array inputs with three samples in 2010 and two samples in 2009
+        measures_mixed = self.truncate_cost_arrays(
+            self.measures_demand_dist, "residential", ["2009"], 2)
+        # Array inputs with three samples and two samples in all years
+        measures_long, measures_short = [self.truncate_cost_arrays(
+            self.measures_demand_dist, "residential", ["2009", "2010"],
+            n) for n in [3, 2]]
+        mkt_fracs_mixed, mkt_fracs_long, mkt_fracs_short = [
+            self.compete_mkt_fracs(
+                self.a_run_dist, "compete_res_primary", m, self.adjust_key1,
+                self.test_adopt_scheme) for m in [
+                measures_mixed, measures_long, measures_short]]
+        # Market shares in each year match those found with the same number
+        # of samples in all years
+        for ind in range(len(measures_mixed)):
+            for yr, fracs_chk in [("2009", mkt_fracs_short),
+                                  ("2010", mkt_fracs_long)]:
+                self.assertEqual(
+                    numpy.size(mkt_fracs_mixed[ind][yr]),
+                    numpy.size(fracs_chk[ind][yr]))
+                self.dict_check({yr: mkt_fracs_mixed[ind][yr]},
+                                {yr: fracs_chk[ind][yr]})
+
+    def test_compete_parallel(self):
+        """Test that parallel competition matches serial competition."""
+        # Set heating/cooling totals for all sample microsegments
+        htcl_totals, mseg_measures = ({} for n in range(2))
+        for ind, m in enumerate(self.a_run.measures):
+            for msu in m.markets[self.test_adopt_scheme]["competed"][
+                    "mseg_adjust"]["contributing mseg keys and values"]:
+                mseg_measures.setdefault(msu, []).append(ind)
+                keys = [str(x) for x in self.a_run.parse_mseg_key(msu)]
+                htcl_totals.setdefault(keys[1], {}).setdefault(
+                    keys[2], {}).setdefault(keys[-1], {}).setdefault(
+                    keys[3], {})[keys[4]] = {
+                        yr: 1e9 for yr in self.handyvars.aeo_years}
+        a_runs = []
+        for workers in [1, 2]:
+            a_run = copy.deepcopy(self.a_run)
+            a_run.opts = copy.copy(base_args)
+            a_run.opts.workers = workers
+            a_run.compete_measures(self.test_adopt_scheme, htcl_totals)
+            a_runs.append(a_run)
+        # Check that the sample measures split into independent groups
+        self.assertGreater(len(self.a_run.group_msegs(mseg_measures)), 1)
+        for m_serial, m_parallel in zip(a_runs[0].measures, a_runs[1].measures):
+            self.dict_check(
+                m_serial.markets[self.test_adopt_scheme]["competed"][
+                    "master_mseg"],
+                m_parallel.markets[self.test_adopt_scheme]["competed"][
+                    "master_mseg"])
+
+    def test_parallel_schemes(self):
+        """Test that running adoption schemes in parallel matches serial."""
+        a_run = copy.deepcopy(self.a_run)
+        htcl_totals = {}
+        for m in a_run.measures:
+            for adopt_scheme, mkts in m.markets.items():
+                for msu in mkts["competed"]["mseg_adjust"][
+                        "contributing mseg keys and values"]:
+                    keys = [str(x) for x in a_run.parse_mseg_key(msu)]
+                    htcl_totals.setdefault(keys[1], {}).setdefault(
+                        keys[2], {}).setdefault(keys[-1], {}).setdefault(
+                        keys[3], {})[keys[4]] = {
+                            yr: 1e9 for yr in self.handyvars.aeo_years}
+                # Report efficient-captured energy, as ecm_prep does, which
+                # the summary outputs for each adoption scheme require
+                for mkt in mkts.values():
+                    for adj in [mkt["master_mseg"]] + list(mkt["mseg_adjust"][
+                            "contributing mseg keys and values"].values()):
+                        adj["energy"]["total"]["efficient-captured"] = \
+                            copy.deepcopy(adj["energy"]["total"]["efficient"])
+                    if "energy" in mkt["mseg_out_break"]:
+                        out_break = mkt["mseg_out_break"]["energy"]
+                        out_break["efficient-captured"] = copy.deepcopy(
+                            out_break["efficient"])
+        a_runs = [copy.deepcopy(a_run) for n in range(2)]
+        # Run adoption schemes in sequence, as in 'main' by default
+        for adopt_scheme in self.handyvars.adopt_schemes:
+            a_runs[0].calc_savings_metrics(adopt_scheme, "uncompeted")
+            a_runs[0].compete_measures(adopt_scheme, htcl_totals)
+            a_runs[0].calc_savings_metrics(adopt_scheme, "competed")
+            a_runs[0].finalize_outputs(adopt_scheme, False, False)
+        # Run adoption schemes in parallel worker processes
+        run.run_schemes_parallel(a_runs[1], htcl_totals, False, False)
+        self.assertEqual(len(self.handyvars.adopt_schemes), 2)
+        for adopt_scheme in self.handyvars.adopt_schemes:
+            self.assertGreater(len(a_runs[0].output_all["All ECMs"][
+                "Markets and Savings (Overall)"][adopt_scheme]), 0)
+        numpy.testing.assert_equal(a_runs[1].output_all, a_runs[0].output_all)
+        numpy.testing.assert_equal(
+            a_runs[1].output_ecms, a_runs[0].output_ecms)
+        numpy.testing.assert_equal(
+            a_runs[1].output_ecms_cfs, a_runs[0].output_ecms_cfs)
+        for m_serial, m_parallel in zip(a_runs[0].measures, a_runs[1].measures):
+            for adopt_scheme in self.handyvars.adopt_schemes:
+                self.dict_check(
+                    m_serial.markets[adopt_scheme]["competed"],
+                    m_parallel.markets[adopt_scheme]["competed"])
+                self.dict_check(m_serial.savings[adopt_scheme],
+                                m_parallel.savings[adopt_scheme])
+            self.assertEqual(m_serial.update_results, m_parallel.update_results)
+            numpy.testing.assert_equal(
+                m_parallel.financial_metrics, m_serial.financial_metrics)
+
 
 class ComCompeteTest(unittest.TestCase, CommonMethods, Constants):
     """Test 'compete_com_primary' and 'secondary_adj' functions.
@@ -26617,6 +26982,37 @@ class ComCompeteTest(unittest.TestCase, CommonMethods, Constants):
                 self.a_run_dist.measures[ind].markets[self.test_adopt_scheme][
                     "competed"]["mseg_out_break"]["energy"])
 
+    def test_compete_com_dist_mixed(self):
+        """Test outcomes given array inputs w/ sample sizes that vary by year."""
+        # Add array inputs in 2009 for the measure with array inputs in 2010
+        measures = copy.deepcopy(self.measures_all_dist)
+        for m in measures:
+            costs = m.financial_metrics["unit cost"]["stock cost"][
+                "commercial"]
+            if isinstance(costs["2010"], numpy.ndarray):
+                costs["2009"] = copy.deepcopy(costs["2010"])
+        # Array inputs with three samples in 2010 and two samples in 2009
+        measures_mixed = self.truncate_cost_arrays(
+            measures, "commercial", ["2009"], 2)
+        # Array inputs with three samples and two samples in all years
+        measures_long, measures_short = [self.truncate_cost_arrays(
+            measures, "commercial", ["2009", "2010"], n) for n in [3, 2]]
+        mkt_fracs_mixed, mkt_fracs_long, mkt_fracs_short = [
+            self.compete_mkt_fracs(
+                self.a_run_dist, "compete_com_primary", m, self.overlap_key,
+                self.test_adopt_scheme) for m in [
+                measures_mixed, measures_long, measures_short]]
+        # Market shares in each year match those found with the same number
+        # of samples in all years
+        for ind in range(len(measures_mixed)):
+            for yr, fracs_chk in [("2009", mkt_fracs_short),
+                                  ("2010", mkt_fracs_long)]:
+                self.assertEqual(
+                    numpy.size(mkt_fracs_mixed[ind][yr]),
+                    numpy.size(fracs_chk[ind][yr]))
+                self.dict_check({yr: mkt_fracs_mixed[ind][yr]},
+                                {yr: fracs_chk[ind][yr]})
+
 
 class NumpyConversionTest(unittest.TestCase, CommonMethods, Constants):
     """Test the operation of the 'convert_to_numpy' function.